@@ -14,78 +14,206 @@ Description:
     Parses Libero's exported memory map JSON and generates a C header file
     with peripheral base address definitions suitable for embedded firmware.
 
+Library usage:
+    The module can also be imported and driven in-process, which avoids
+    spawning one Python interpreter per design:
+
+        from generate_hw_platform import load_memory_map, render
+
+        address_map = load_memory_map("memory_map.json")
+        text = render(address_map, "c_header", sys_clk_freq=100000000)
+
+    Parsed maps are kept in an LRU cache keyed by (path, mtime, size), so
+    repeated calls for an unchanged export skip the JSON parse entirely.
+
+Note:
+    This is the only copy of the generator. The toolkit ships on its own
+    (zip) and needs nothing outside this directory;
+    scripts/generate_hw_platform.py is a thin wrapper that runs or imports
+    this file.
+
 Author: TCL Monster automation toolkit
 """
 
 import json
+import os
 import sys
-from pathlib import Path
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
-
-
-def parse_memory_map(json_file):
-    """Parse Libero memory map JSON and extract base addresses."""
-    with open(json_file, 'r') as f:
-        data = json.load(f)
-
-    peripherals = []
-
-    # Extract project info
-    project_name = data.get('project_name', 'Unknown')
-    smartdesign_name = data.get('SmartDesign name', 'Unknown')
-
-    # Recursive function to walk the tree and find all peripherals (Type == "Target")
-    def extract_targets(nodes):
-        """Recursively extract all peripheral targets from nested structure."""
-        targets = []
-        if not isinstance(nodes, list):
-            return targets
-
-        for node in nodes:
-            node_type = node.get('Type', '')
-            component_name = node.get('Component name', '')
-            offset_addr = node.get('Offset Address', '')
-
-            # If this is a target peripheral with address, add it
-            if node_type == 'Target' and component_name and offset_addr:
-                # Clean up address format: remove underscores (0x7000_0000 → 0x70000000)
-                clean_addr = offset_addr.replace('_', '')
-                targets.append({
-                    'name': component_name,
-                    'base_addr': clean_addr
-                })
-
-            # Recursively process any connected nodes
-            connected = node.get('Connected Node', [])
-            if connected:
-                targets.extend(extract_targets(connected))
-
-        return targets
-
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from ccc_planner import UART_ERROR_LIMIT_PCT, UART_OVERSAMPLE
+except ImportError:  # shipped toolkit: scripts/ccc_planner.py is not alongside
+    UART_OVERSAMPLE = 16
+    UART_ERROR_LIMIT_PCT = 2.0
+
+
+DEFAULT_SYS_CLK_FREQ = 50000000
+
+# Number of parsed memory maps kept in the in-process cache
+CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class Peripheral:
+    """A bus target with a base address."""
+    name: str
+    base_addr: str
+
+    @property
+    def macro_name(self) -> str:
+        """C macro prefix for this peripheral (e.g. COREUARTAPB0)."""
+        return self.name.upper().replace('-', '_').replace(' ', '_')
+
+
+@dataclass(frozen=True)
+class AddressMap:
+    """Parsed Libero memory map export."""
+    project_name: str = 'Unknown'
+    smartdesign_name: str = 'Unknown'
+    peripherals: Tuple[Peripheral, ...] = field(default_factory=tuple)
+    system_clock_hz: Optional[int] = None
+
+    def resolve_clock(self, override: Optional[int] = None) -> Tuple[int, str]:
+        """Return (sys_clk_freq_hz, source) using cmdline > JSON > default."""
+        if override:
+            return override, "command-line"
+        if self.system_clock_hz:
+            return self.system_clock_hz, "auto-detected from design"
+        return DEFAULT_SYS_CLK_FREQ, "default (50 MHz)"
+
+    def to_dict(self) -> Dict:
+        """Legacy dict form returned by parse_memory_map()."""
+        return {
+            'project_name': self.project_name,
+            'smartdesign_name': self.smartdesign_name,
+            'peripherals': [{'name': p.name, 'base_addr': p.base_addr}
+                            for p in self.peripherals],
+            'system_clock_hz': self.system_clock_hz
+        }
+
+
+def _extract_targets(nodes) -> List[Peripheral]:
+    """Walk the connection tree and collect all nodes with Type == "Target"."""
+    targets = []
+    # Explicit stack of iterators instead of recursion; keeps document order
+    stack = [iter(nodes)] if isinstance(nodes, list) else []
+
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            continue
+
+        node_type = node.get('Type', '')
+        component_name = node.get('Component name', '')
+        offset_addr = node.get('Offset Address', '')
+
+        # If this is a target peripheral with address, add it
+        if node_type == 'Target' and component_name and offset_addr:
+            # Clean up address format: remove underscores (0x7000_0000 → 0x70000000)
+            targets.append(Peripheral(component_name, offset_addr.replace('_', '')))
+
+        # Descend into any connected nodes
+        connected = node.get('Connected Node', [])
+        if isinstance(connected, list) and connected:
+            stack.append(iter(connected))
+
+    return targets
+
+
+def address_map_from_json(data: Dict) -> AddressMap:
+    """Build an AddressMap from already-loaded memory map JSON."""
     # Parse initiator/target connections
     # Format: "Initiator/Bus/Bridge/Target OffsetAddress Range HighAddress"
     connections = data.get('Initiator/Bus/Bridge/Target OffsetAddress Range HighAddress', [])
-    peripherals = extract_targets(connections)
 
-    return {
-        'project_name': project_name,
-        'smartdesign_name': smartdesign_name,
-        'peripherals': peripherals
-    }
+    # system_clock_hz is added by the enhanced export script
+    system_clock_hz = data.get('system_clock_hz', None)
 
+    return AddressMap(
+        project_name=data.get('project_name', 'Unknown'),
+        smartdesign_name=data.get('SmartDesign name', 'Unknown'),
+        peripherals=tuple(_extract_targets(connections)),
+        system_clock_hz=int(system_clock_hz) if system_clock_hz else None
+    )
 
-def generate_header(memory_map, output_file, sys_clk_freq=50000000):
-    """Generate hw_platform.h C header file.
 
-    Args:
-        memory_map: Parsed memory map dictionary
-        output_file: Output header file path
-        sys_clk_freq: System clock frequency in Hz (default: 50MHz)
-    """
+class _MapCache:
+    """LRU cache of parsed memory maps keyed by path, mtime and size."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[str, Tuple[Tuple[int, int], AddressMap]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str) -> AddressMap:
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        with open(key, 'r') as f:
+            address_map = address_map_from_json(json.load(f))
+
+        self._entries[key] = (stamp, address_map)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        return address_map
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_cache = _MapCache()
+
+
+def load_memory_map(path) -> AddressMap:
+    """Load and parse a Libero memory map JSON export (cached)."""
+    return _cache.get(str(path))
+
+
+def clear_cache():
+    """Drop all cached memory maps."""
+    _cache.clear()
+
+
+def cache_info() -> Dict[str, int]:
+    """Return cache statistics (hits, misses, current size)."""
+    return {'hits': _cache.hits, 'misses': _cache.misses,
+            'size': len(_cache._entries), 'maxsize': _cache.maxsize}
+
 
-    project_name = memory_map['project_name']
-    smartdesign_name = memory_map['smartdesign_name']
-    peripherals = memory_map['peripherals']
+def _baud_comment(sys_clk_freq: int, bauds=(115200, 57600)) -> str:
+    """Achieved rate of each BAUD_VALUE_<baud> macro at the configured clock."""
+    lines = [f" * At SYS_CLK_FREQ = {sys_clk_freq} Hz:"]
+    for baud in bauds:
+        # Same integer division the macro performs
+        value = sys_clk_freq // (UART_OVERSAMPLE * baud) - 1
+        actual = sys_clk_freq / (UART_OVERSAMPLE * (value + 1)) if value >= 0 else 0.0
+        error = (actual - baud) / baud * 100
+        note = " - exceeds UART tolerance, see scripts/ccc_planner.py" if abs(error) > UART_ERROR_LIMIT_PCT else ""
+        lines.append(f" *   {baud:<7} BAUD_VALUE {value} -> {actual:.0f} baud ({error:+.2f}%){note}")
+    return "\n".join(lines)
+
+
+def _render_c_header(address_map: AddressMap, sys_clk_freq: int) -> str:
+    """Render hw_platform.h text for firmware projects."""
+    smartdesign_name = address_map.smartdesign_name
 
     # Generate header content
     header = f"""/*******************************************************************************
@@ -95,7 +223,7 @@ def generate_header(memory_map, output_file, sys_clk_freq=50000000):
  * @brief Hardware platform definitions for {smartdesign_name}
  *
  * Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
- * Project: {project_name}
+ * Project: {address_map.project_name}
  * SmartDesign: {smartdesign_name}
  *
  * IMPORTANT: This file is auto-generated from Libero memory map export.
@@ -115,16 +243,18 @@ def generate_header(memory_map, output_file, sys_clk_freq=50000000):
 """
 
     # Add peripheral base addresses
-    if peripherals:
-        for peripheral in peripherals:
-            name = peripheral['name'].upper().replace('-', '_').replace(' ', '_')
-            addr = peripheral['base_addr']
+    if address_map.peripherals:
+        lines = []
+        for peripheral in address_map.peripherals:
+            name = peripheral.macro_name
+            addr = peripheral.base_addr
 
             # Ensure address is in proper hex format
             if not addr.startswith('0x'):
                 addr = f"0x{addr}"
 
-            header += f"#define {name}_BASE_ADDR{' ' * (40 - len(name))}({addr}UL)\n"
+            lines.append(f"#define {name}_BASE_ADDR{' ' * (40 - len(name))}({addr}UL)\n")
+        header += ''.join(lines)
     else:
         header += "/* No peripherals found in memory map */\n"
 
@@ -141,6 +271,8 @@ def generate_header(memory_map, output_file, sys_clk_freq=50000000):
 
 /******************************************************************************
  * Baud Rate Calculations
+ *
+{_baud_comment(sys_clk_freq)}
  *****************************************************************************/
 #define BAUD_VALUE_115200                       ((SYS_CLK_FREQ / (16 * 115200)) - 1)
 #define BAUD_VALUE_57600                        ((SYS_CLK_FREQ / (16 * 57600)) - 1)
@@ -157,9 +289,71 @@ def generate_header(memory_map, output_file, sys_clk_freq=50000000):
 #endif /* HW_PLATFORM_H_ */
 """
 
+    return header
+
+
+def _render_json(address_map: AddressMap, sys_clk_freq: int) -> str:
+    """Render the address map as normalized JSON for other tools."""
+    data = address_map.to_dict()
+    data['system_clock_hz'] = sys_clk_freq
+    return json.dumps(data, indent=2) + "\n"
+
+
+# Output backends: name -> callable(address_map, sys_clk_freq) -> str
+BACKENDS: Dict[str, Callable[[AddressMap, int], str]] = {
+    'c_header': _render_c_header,
+    'json': _render_json,
+}
+
+
+def render(address_map: AddressMap, backend: str = 'c_header',
+           sys_clk_freq: Optional[int] = None) -> str:
+    """Render an AddressMap with the named backend.
+
+    Args:
+        address_map: Map returned by load_memory_map()
+        backend: Key into BACKENDS ('c_header' or 'json')
+        sys_clk_freq: Clock override in Hz; falls back to the value in the
+            export, then to 50 MHz
+
+    Returns:
+        Rendered text
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}' (available: {', '.join(sorted(BACKENDS))})")
+
+    sys_clk_freq, _ = address_map.resolve_clock(sys_clk_freq)
+    return BACKENDS[backend](address_map, sys_clk_freq)
+
+
+def parse_memory_map(json_file):
+    """Parse Libero memory map JSON and extract base addresses.
+
+    Kept for existing callers; returns the legacy dict form.
+    """
+    return load_memory_map(json_file).to_dict()
+
+
+def generate_header(memory_map, output_file, sys_clk_freq=DEFAULT_SYS_CLK_FREQ):
+    """Generate hw_platform.h C header file.
+
+    Args:
+        memory_map: AddressMap or legacy parsed memory map dictionary
+        output_file: Output header file path
+        sys_clk_freq: System clock frequency in Hz (default: 50MHz)
+    """
+    if not isinstance(memory_map, AddressMap):
+        memory_map = AddressMap(
+            project_name=memory_map['project_name'],
+            smartdesign_name=memory_map['smartdesign_name'],
+            peripherals=tuple(Peripheral(p['name'], p['base_addr'])
+                              for p in memory_map['peripherals']),
+            system_clock_hz=memory_map.get('system_clock_hz')
+        )
+
     # Write to file
     with open(output_file, 'w') as f:
-        f.write(header)
+        f.write(_render_c_header(memory_map, sys_clk_freq))
 
     return output_file
 
@@ -183,7 +377,7 @@ def main():
 
     json_file = sys.argv[1]
     output_file = sys.argv[2] if len(sys.argv) > 2 else "hw_platform.h"
-    sys_clk_freq = int(sys.argv[3]) if len(sys.argv) > 3 else 50000000
+    sys_clk_freq_cmdline = int(sys.argv[3]) if len(sys.argv) > 3 else None
 
     if not Path(json_file).exists():
         print(f"ERROR: Input file not found: {json_file}")
@@ -194,22 +388,26 @@ def main():
     print("=" * 60)
     print(f"Input:  {json_file}")
     print(f"Output: {output_file}")
-    print(f"System Clock: {sys_clk_freq} Hz ({sys_clk_freq/1000000:.1f} MHz)")
-    print("")
 
     try:
         # Parse memory map
+        print("")
         print("Parsing memory map...")
-        memory_map = parse_memory_map(json_file)
+        address_map = load_memory_map(json_file)
+
+        # Determine system clock frequency (priority: cmdline > JSON > default)
+        sys_clk_freq, clock_source = address_map.resolve_clock(sys_clk_freq_cmdline)
+
+        print(f"  System Clock: {sys_clk_freq} Hz ({sys_clk_freq/1000000:.1f} MHz) [{clock_source}]")
 
-        print(f"  Project: {memory_map['project_name']}")
-        print(f"  SmartDesign: {memory_map['smartdesign_name']}")
-        print(f"  Peripherals found: {len(memory_map['peripherals'])}")
+        print(f"  Project: {address_map.project_name}")
+        print(f"  SmartDesign: {address_map.smartdesign_name}")
+        print(f"  Peripherals found: {len(address_map.peripherals)}")
         print("")
 
         # Generate header
         print("Generating header file...")
-        output_path = generate_header(memory_map, output_file, sys_clk_freq)
+        output_path = generate_header(address_map, output_file, sys_clk_freq)
 
         print("")
         print(f"SUCCESS: Generated {output_path}")
@@ -222,11 +420,10 @@ def main():
         print("")
 
         # Show generated definitions
-        if memory_map['peripherals']:
+        if address_map.peripherals:
             print("Generated definitions:")
-            for p in memory_map['peripherals']:
-                name = p['name'].upper().replace('-', '_').replace(' ', '_')
-                print(f"  #define {name}_BASE_ADDR")
+            for p in address_map.peripherals:
+                print(f"  #define {p.macro_name}_BASE_ADDR")
 
     except Exception as e:
         print(f"ERROR: {e}")
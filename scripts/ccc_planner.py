@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+PF_CCC PLL frequency planner and UART baud-error table
+
+Searches every PF_CCC PLL divider setting for a requested set of output
+frequencies and ranks the solutions by worst output error, then by VCO
+margin (distance from the edges of the VCO range). For the chosen solution
+it tabulates the CoreUARTapb BAUD_VALUE and the achieved baud error of
+every fabric clock, and emits the result as PF_CCC component parameters
+(the create_and_configure_core format of
+tcl_scripts/lib/generators/ccc_config_generator.tcl) and C header macros.
+
+PLL model (PF_CCC, post-VCO feedback):
+    f_pfd = f_in / REFDIV                       REFDIV 1-63, f_pfd 1-312.5 MHz
+    f_vco = f_pfd * 4 * FBDIV                   f_vco 800-5000 MHz
+    f_GLx = f_vco / GLx_DIV                     GLx_DIV 1-127, up to 4 outputs
+
+Divider pairs that give the same VCO frequency are folded into one
+candidate (keeping the smallest REFDIV, i.e. the highest PFD frequency),
+so each distinct VCO is scored once against all outputs.
+
+CoreUARTapb divides its clock by 16 * (BAUD_VALUE + 1 + BAUD_VAL_FRCTN/8);
+BAUD_VAL_FRCTN (0-7) is only applied when BAUD_VAL_FRCTN_EN is set.
+
+Usage:
+    python3 ccc_planner.py <in_mhz> <out_mhz> [<out_mhz> ...] [--top N]
+                           [--bauds 115200,57600] [--component PF_CCC_C0]
+                           [--tcl <file>] [--header <file>] [--json]
+
+Example:
+    python3 ccc_planner.py 50 50 200
+    python3 ccc_planner.py 50 83.333 --tcl PF_CCC_C0.tcl --header clocks.h
+"""
+
+import heapq
+import json
+import math
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Sequence
+
+
+PFD_RANGE_MHZ = (1.0, 312.5)
+VCO_RANGE_MHZ = (800.0, 5000.0)
+REFDIV_RANGE = (1, 63)
+FBDIV_RANGE = (1, 4095)
+OUTDIV_RANGE = (1, 127)
+VCO_FEEDBACK_MULT = 4
+MAX_OUTPUTS = 4
+
+DEFAULT_TOP = 5
+DEFAULT_COMPONENT = "PF_CCC_C0"
+
+STANDARD_BAUDS = (9600, 19200, 38400, 57600, 115200, 230400, 460800, 921600)
+UART_OVERSAMPLE = 16
+UART_FRACTION_STEPS = 8
+# Combined TX/RX clock mismatch a 16x-oversampled UART tolerates comfortably
+UART_ERROR_LIMIT_PCT = 2.0
+
+
+@dataclass
+class CCCOutputPlan:
+    """One GLx output of a PLL solution."""
+    index: int
+    target_mhz: float
+    divider: int
+    freq_mhz: float
+
+    @property
+    def error_ppm(self) -> float:
+        return (self.freq_mhz - self.target_mhz) / self.target_mhz * 1e6
+
+
+@dataclass
+class CCCPlan:
+    """One PLL divider solution for all requested outputs."""
+    in_freq_mhz: float
+    refdiv: int
+    fbdiv: int
+    vco_mhz: float
+    outputs: List[CCCOutputPlan] = field(default_factory=list)
+
+    @property
+    def pfd_mhz(self) -> float:
+        return self.in_freq_mhz / self.refdiv
+
+    @property
+    def max_error_ppm(self) -> float:
+        return max(abs(o.error_ppm) for o in self.outputs)
+
+    @property
+    def vco_margin(self) -> float:
+        """Distance to the nearer VCO range edge, as a fraction of the range (0-0.5)."""
+        low, high = VCO_RANGE_MHZ
+        return min(self.vco_mhz - low, high - self.vco_mhz) / (high - low)
+
+
+@dataclass
+class BaudSetting:
+    """CoreUARTapb divider for one clock and baud rate."""
+    clock_hz: int
+    baud: int
+    baud_value: int
+    actual_baud: float
+    error_pct: float
+    fraction_value: int = 0         # BAUD_VALUE and BAUD_VAL_FRCTN with BAUD_VAL_FRCTN_EN
+    fraction: int = 0
+    fraction_baud: float = 0.0
+    fraction_error_pct: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return abs(self.error_pct) <= UART_ERROR_LIMIT_PCT
+
+
+def _best_divider(vco_mhz: float, target_mhz: float) -> int:
+    """Output divider whose frequency is nearest the target."""
+    low, high = OUTDIV_RANGE
+    below = min(max(int(vco_mhz / target_mhz), low), high)
+    above = min(below + 1, high)
+    return min((below, above), key=lambda d: abs(vco_mhz / d - target_mhz))
+
+
+def vco_candidates(in_mhz: float) -> Dict[int, tuple]:
+    """Distinct reachable VCO frequencies (in Hz) -> (REFDIV, FBDIV)."""
+    candidates: Dict[int, tuple] = {}
+    for refdiv in range(REFDIV_RANGE[0], REFDIV_RANGE[1] + 1):
+        pfd = in_mhz / refdiv
+        if pfd < PFD_RANGE_MHZ[0]:
+            break
+        if pfd > PFD_RANGE_MHZ[1]:
+            continue
+        step = pfd * VCO_FEEDBACK_MULT
+        first = max(FBDIV_RANGE[0], math.ceil(VCO_RANGE_MHZ[0] / step - 1e-9))
+        last = min(FBDIV_RANGE[1], math.floor(VCO_RANGE_MHZ[1] / step + 1e-9))
+        for fbdiv in range(first, last + 1):
+            # Smallest REFDIV wins: highest PFD frequency, lowest jitter
+            candidates.setdefault(round(step * fbdiv * 1e6), (refdiv, fbdiv))
+    return candidates
+
+
+def plan_ccc(in_mhz: float, targets_mhz: Sequence[float], top: int = DEFAULT_TOP) -> List[CCCPlan]:
+    """Best PLL solutions for the target output frequencies, best first."""
+    if not targets_mhz or len(targets_mhz) > MAX_OUTPUTS:
+        raise ValueError(f"1 to {MAX_OUTPUTS} output frequencies per PLL (got {len(targets_mhz)})")
+    if any(t <= 0 for t in targets_mhz) or in_mhz <= 0:
+        raise ValueError("Frequencies must be positive")
+
+    ranked = []
+    for vco_hz, (refdiv, fbdiv) in vco_candidates(in_mhz).items():
+        vco = vco_hz / 1e6
+        worst = 0.0
+        for target in targets_mhz:
+            div = _best_divider(vco, target)
+            worst = max(worst, abs(vco / div - target) / target)
+        margin = min(vco - VCO_RANGE_MHZ[0], VCO_RANGE_MHZ[1] - vco)
+        # Errors below 0.01 ppm are float noise: treat them as exact
+        ranked.append((round(worst * 1e8), -margin, refdiv, fbdiv, vco_hz))
+
+    plans = []
+    for _, _, refdiv, fbdiv, vco_hz in heapq.nsmallest(top, ranked):
+        vco = vco_hz / 1e6
+        plan = CCCPlan(in_freq_mhz=in_mhz, refdiv=refdiv, fbdiv=fbdiv, vco_mhz=vco)
+        for index, target in enumerate(targets_mhz):
+            div = _best_divider(vco, target)
+            plan.outputs.append(CCCOutputPlan(index=index, target_mhz=target, divider=div, freq_mhz=vco / div))
+        plans.append(plan)
+    return plans
+
+
+def uart_baud(clock_hz: int, baud: int) -> BaudSetting:
+    """CoreUARTapb BAUD_VALUE (and fractional setting) for a clock and baud rate."""
+    ideal = clock_hz / (UART_OVERSAMPLE * baud)
+    baud_value = max(0, round(ideal) - 1)
+    actual = clock_hz / (UART_OVERSAMPLE * (baud_value + 1))
+
+    eighths = max(UART_FRACTION_STEPS, round(ideal * UART_FRACTION_STEPS))
+    fraction_baud = clock_hz * UART_FRACTION_STEPS / (UART_OVERSAMPLE * eighths)
+    return BaudSetting(
+        clock_hz=clock_hz,
+        baud=baud,
+        baud_value=baud_value,
+        actual_baud=actual,
+        error_pct=(actual - baud) / baud * 100,
+        fraction_value=eighths // UART_FRACTION_STEPS - 1,
+        fraction=eighths % UART_FRACTION_STEPS,
+        fraction_baud=fraction_baud,
+        fraction_error_pct=(fraction_baud - baud) / baud * 100,
+    )
+
+
+def baud_table(clocks_hz: Sequence[int], bauds: Sequence[int] = STANDARD_BAUDS) -> List[BaudSetting]:
+    """uart_baud for every clock x baud rate."""
+    return [uart_baud(clock, baud) for clock in clocks_hz for baud in bauds]
+
+
+def _format_mhz(value: float) -> str:
+    """Frequency as Libero writes it: 50, 83.333, 166.667."""
+    return f"{round(value, 3):g}"
+
+
+def ccc_params(plan: CCCPlan) -> List[str]:
+    """PF_CCC "KEY:VALUE" parameters for a solution (PLL 0, GL0..GL3)."""
+    params = []
+    used = {o.index: o for o in plan.outputs}
+    for index in range(MAX_OUTPUTS):
+        prefix = f"GL{index}_0"
+        out = used.get(index)
+        if out is None:
+            params += [f"{prefix}_IS_USED:false", f"{prefix}_FABCLK_USED:false"]
+            continue
+        params += [
+            f"{prefix}_BANKCLK_USED:false",
+            f"{prefix}_DEDICATED_USED:false",
+            f"{prefix}_DIV:{out.divider}",
+            f"{prefix}_FABCLK_USED:true",
+            f"{prefix}_IS_USED:true",
+            f"{prefix}_OUT_FREQ:{_format_mhz(out.freq_mhz)}",
+        ]
+    for gl in ("GL0_1", "GL1_1", "GL2_1", "GL3_1"):
+        params += [f"{gl}_IS_USED:false", f"{gl}_FABCLK_USED:false"]
+    params += [
+        f"PLL_IN_FREQ_0:{_format_mhz(plan.in_freq_mhz)}",
+        "PLL_FEEDBACK_MODE_0:Post-VCO",
+        "PLL_VCO_MODE_0:MIN_JITTER",
+        f"PLL_REFDIV_0:{plan.refdiv}",
+        f"VCOFREQUENCY:{plan.vco_mhz:.1f}",
+    ]
+    return params
+
+
+def render_tcl(plan: CCCPlan, component: str = DEFAULT_COMPONENT) -> str:
+    """create_and_configure_core script for a solution."""
+    outputs = " + ".join(f"{_format_mhz(o.freq_mhz)} MHz (GL{o.index})" for o in plan.outputs)
+    lines = [
+        f"# Exporting core {component} to TCL",
+        f"# Configuration: {_format_mhz(plan.in_freq_mhz)} MHz → {outputs}",
+        f"# Auto-generated by ccc_planner.py: REFDIV={plan.refdiv}, FBDIV={plan.fbdiv}, "
+        f"VCO={plan.vco_mhz:.3f} MHz, worst error {plan.max_error_ppm:.1f} ppm",
+        f"create_and_configure_core -core_vlnv {{Actel:SgCore:PF_CCC:*}} -download_core "
+        f"-component_name {{{component}}} -params {{\\",
+    ]
+    params = ccc_params(plan)
+    lines += [f'"{p}"  \\' for p in params[:-1]]
+    lines.append(f'"{params[-1]}"  }}')
+    lines.append(f"# Exporting core {component} to TCL done")
+    return "\n".join(lines) + "\n"
+
+
+def render_header(plan: CCCPlan, bauds: Sequence[int] = STANDARD_BAUDS,
+                  component: str = DEFAULT_COMPONENT) -> str:
+    """C macros for the output clocks and their CoreUARTapb baud values."""
+    guard = f"{component.upper()}_CLOCKS_H_"
+    lines = [
+        "/* Auto-generated by ccc_planner.py - PF_CCC output clocks and UART dividers */",
+        f"#ifndef {guard}",
+        f"#define {guard}",
+        "",
+    ]
+    for out in plan.outputs:
+        name = f"{component.upper()}_GL{out.index}_FREQ"
+        lines.append(f"#define {name:<40}{round(out.freq_mhz * 1e6)}UL")
+    for out in plan.outputs:
+        lines.append("")
+        for setting in baud_table([round(out.freq_mhz * 1e6)], bauds):
+            name = f"{component.upper()}_GL{out.index}_BAUD_VALUE_{setting.baud}"
+            note = f"/* {setting.actual_baud:.0f} baud, {setting.error_pct:+.2f}%"
+            note += " */" if setting.ok else " - exceeds UART tolerance */"
+            lines.append(f"#define {name:<40}{setting.baud_value:<8}{note}")
+    lines += ["", f"#endif /* {guard} */", ""]
+    return "\n".join(lines)
+
+
+def print_plans(plans: List[CCCPlan], bauds: Sequence[int]):
+    """Print ranked solutions and the baud table of the best one."""
+    print("\n" + "=" * 70)
+    print("PF_CCC PLL PLAN")
+    print("=" * 70)
+    if not plans:
+        print("\nNo divider setting reaches the requested outputs.")
+        print("=" * 70)
+        return
+
+    print(f"\n{'#':>2} {'REFDIV':>6} {'FBDIV':>6} {'PFD MHz':>9} {'VCO MHz':>10} {'Margin':>7} "
+          f"{'Worst ppm':>10}  Dividers")
+    for rank, plan in enumerate(plans, 1):
+        divs = " ".join(f"GL{o.index}/{o.divider}" for o in plan.outputs)
+        print(f"{rank:>2} {plan.refdiv:>6} {plan.fbdiv:>6} {plan.pfd_mhz:>9.3f} {plan.vco_mhz:>10.3f} "
+              f"{plan.vco_margin:>6.0%} {plan.max_error_ppm:>10.1f}  {divs}")
+
+    best = plans[0]
+    print("\nOUTPUTS (best solution):")
+    for out in best.outputs:
+        print(f"  GL{out.index}: target {out.target_mhz:g} MHz -> {out.freq_mhz:.6f} MHz "
+              f"(VCO / {out.divider}, {out.error_ppm:+.1f} ppm)")
+
+    print("\nUART BAUD ERROR (CoreUARTapb, 16x oversampling):")
+    print(f"  {'Clock':>12} {'Baud':>7} {'BAUD_VALUE':>10} {'Actual':>10} {'Error':>8} "
+          f"{'w/ FRCTN':>10} {'Error':>8}")
+    for setting in baud_table([round(o.freq_mhz * 1e6) for o in best.outputs], bauds):
+        mark = "" if setting.ok else "  ✗"
+        print(f"  {setting.clock_hz:>12} {setting.baud:>7} {setting.baud_value:>10} {setting.actual_baud:>10.0f} "
+              f"{setting.error_pct:>+7.2f}% {f'{setting.fraction_value}+{setting.fraction}/8':>10} "
+              f"{setting.fraction_error_pct:>+7.2f}%{mark}")
+    print("=" * 70)
+
+
+def main():
+    args = sys.argv[1:]
+
+    def pop_option(name, default=None):
+        if name in args:
+            i = args.index(name)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        return default
+
+    top = int(pop_option('--top', DEFAULT_TOP))
+    bauds = [int(b) for b in pop_option('--bauds', ",".join(map(str, STANDARD_BAUDS))).split(',')]
+    component = pop_option('--component', DEFAULT_COMPONENT)
+    tcl_file = pop_option('--tcl')
+    header_file = pop_option('--header')
+    as_json = '--json' in args
+    args = [a for a in args if a != '--json']
+
+    if len(args) < 2:
+        print("Usage: python3 ccc_planner.py <in_mhz> <out_mhz> [<out_mhz> ...] [--top N] "
+              "[--bauds 115200,57600] [--component NAME] [--tcl FILE] [--header FILE] [--json]",
+              file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        plans = plan_ccc(float(args[0]), [float(a) for a in args[1:]], top=top)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if as_json:
+        print(json.dumps([dict(asdict(p), pfd_mhz=p.pfd_mhz, max_error_ppm=p.max_error_ppm,
+                               vco_margin=p.vco_margin) for p in plans], indent=2))
+    else:
+        print_plans(plans, bauds)
+
+    if plans and tcl_file:
+        with open(tcl_file, 'w') as f:
+            f.write(render_tcl(plans[0], component))
+        print(f"Wrote {tcl_file}", file=sys.stderr)
+    if plans and header_file:
+        with open(header_file, 'w') as f:
+            f.write(render_header(plans[0], bauds, component))
+        print(f"Wrote {header_file}", file=sys.stderr)
+
+    sys.exit(0 if plans else 1)
+
+
+if __name__ == "__main__":
+    main()
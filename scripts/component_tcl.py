@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+"""
+Libero component TCL parser and cached parameter index
+
+Tokenizes Libero component scripts in a single pass and turns every
+`create_and_configure_core ... -params {"KEY:VALUE" \\ ...}` block into a
+typed key/value map (booleans, integers, floats, strings). Parsed files are
+kept in a persistent JSON index keyed on file mtime and size, so repeated
+queries over thousands of component files only re-read what changed.
+
+Usage:
+    python3 component_tcl.py parse <component.tcl>
+    python3 component_tcl.py query <dir> <condition> [<condition> ...] [--vlnv <text>]
+
+Conditions:
+    KEY                     - parameter is present
+    KEY==VALUE, KEY!=VALUE  - equality (typed: 50 == 50.0, true == TRUE)
+    KEY>N, KEY>=N, KEY<N, KEY<=N
+
+Example:
+    python3 component_tcl.py query tcl_scripts "GL0_0_OUT_FREQ>100"
+    python3 component_tcl.py query tcl_scripts BAUD_VALUE --vlnv CoreUARTapb
+
+Note:
+    The index is stored as <dir>/.component_index.json by default
+    (override with --index <path>).
+"""
+
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_NAME = ".component_index.json"
+
+# Commands that create or configure a core from a -params list
+CORE_COMMANDS = ("create_and_configure_core",)
+
+# Options of CORE_COMMANDS that do not take a value
+FLAG_OPTIONS = ("-download_core",)
+
+# Whitespace between words: blanks and backslash-newline continuations
+_WS_RE = re.compile(r'(?:[ \t\r]|\\\r?\n)+')
+# Command separators (and the whitespace around them)
+_SEP_RE = re.compile(r'(?:[ \t\r\n;]|\\\r?\n)+')
+# Rest of a comment line, including backslash-continued lines
+_COMMENT_RE = re.compile(r'#(?:[^\\\n]|\\.)*', re.S)
+# Tokens that matter while matching braces: escapes and braces
+_BRACE_TOKEN_RE = re.compile(r'\\.|[{}]', re.S)
+# Body of a double-quoted word
+_QUOTED_RE = re.compile(r'"((?:[^"\\]|\\.)*)"', re.S)
+# Run of ordinary characters in a bare word
+_BARE_RE = re.compile(r'[^\s;\\\[{}"]+')
+# Backslash sequences inside quoted/bare words
+_ESCAPE_RE = re.compile(r'\\(\r?\n[ \t]*|.)', re.S)
+# Backslash-newline inside braces collapses to a single space
+_BRACE_CONT_RE = re.compile(r'\\\r?\n[ \t]*')
+
+_INT_RE = re.compile(r'[+-]?(?:0|[1-9][0-9_]*|0[0-9]+)$')
+_HEX_RE = re.compile(r'[+-]?0[xX][0-9a-fA-F_]+$')
+_FLOAT_RE = re.compile(r'[+-]?(?:[0-9]+\.[0-9]*|\.[0-9]+|[0-9]+)(?:[eE][+-]?[0-9]+)?$')
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+
+
+class TclSyntaxError(ValueError):
+    """Raised for unbalanced braces, brackets or quotes."""
+
+
+@dataclass
+class ComponentConfig:
+    """One create_and_configure_core command."""
+    component: str
+    core_vlnv: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    file: Optional[str] = None
+    line: int = 0
+
+    @property
+    def core_name(self) -> str:
+        """Core name from the VLNV (Actel:SgCore:PF_CCC:2.2.220 -> PF_CCC)."""
+        parts = self.core_vlnv.split(':')
+        return parts[2] if len(parts) > 2 else self.core_vlnv
+
+
+def coerce_value(text: str) -> Any:
+    """Convert a parameter string to bool, int, float or str."""
+    lowered = text.lower()
+    if lowered == 'true':
+        return True
+    if lowered == 'false':
+        return False
+    if _INT_RE.match(text):
+        return int(text.replace('_', ''), 10)
+    if _HEX_RE.match(text):
+        return int(text.replace('_', ''), 16)
+    if _FLOAT_RE.match(text):
+        return float(text)
+    return text
+
+
+def _unescape(text: str) -> str:
+    """Apply Tcl backslash substitution to a quoted or bare word."""
+    if '\\' not in text:
+        return text
+
+    def repl(m):
+        seq = m.group(1)
+        if seq[0] in '\r\n':
+            return ' '
+        return _ESCAPES.get(seq, seq)
+
+    return _ESCAPE_RE.sub(repl, text)
+
+
+def _match_brace(text: str, pos: int) -> int:
+    """Return the index just past the brace that closes text[pos] == '{'."""
+    depth = 0
+    for m in _BRACE_TOKEN_RE.finditer(text, pos):
+        token = m.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0:
+                return m.end()
+    raise TclSyntaxError(f"unbalanced '{{' at offset {pos}")
+
+
+def _match_bracket(text: str, pos: int) -> int:
+    """Return the index just past the bracket that closes text[pos] == '['."""
+    depth = 0
+    i = pos
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '{':
+            i = _match_brace(text, i)
+            continue
+        if c == '[':
+            depth += 1
+        elif c == ']':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise TclSyntaxError(f"unbalanced '[' at offset {pos}")
+
+
+def _read_word(text: str, pos: int) -> Tuple[str, int]:
+    """Read one Tcl word starting at pos. Returns (word, end)."""
+    c = text[pos]
+
+    if c == '{':
+        end = _match_brace(text, pos)
+        return _BRACE_CONT_RE.sub(' ', text[pos + 1:end - 1]), end
+
+    if c == '"':
+        m = _QUOTED_RE.match(text, pos)
+        if not m:
+            raise TclSyntaxError(f"unterminated '\"' at offset {pos}")
+        return _unescape(m.group(1)), m.end()
+
+    # Bare word: ordinary runs, escapes and [command] substitutions
+    start = pos
+    n = len(text)
+    while pos < n:
+        m = _BARE_RE.match(text, pos)
+        if m:
+            pos = m.end()
+            continue
+        c = text[pos]
+        if c == '\\':
+            if text.startswith('\n', pos + 1) or text.startswith('\r\n', pos + 1):
+                break
+            pos += 2
+        elif c == '[':
+            pos = _match_bracket(text, pos)
+        elif c in '{}"':
+            pos += 1
+        else:
+            break
+    return _unescape(text[start:pos]), pos
+
+
+def iter_commands(text: str) -> Iterator[Tuple[int, List[str]]]:
+    """Yield (line_number, words) for every command in a Tcl script."""
+    pos = 0
+    n = len(text)
+    line = 1
+    line_pos = 0
+
+    while pos < n:
+        m = _SEP_RE.match(text, pos)
+        if m:
+            pos = m.end()
+            if pos >= n:
+                break
+
+        if text[pos] == '#':
+            pos = _COMMENT_RE.match(text, pos).end()
+            continue
+
+        line += text.count('\n', line_pos, pos)
+        line_pos = pos
+        cmd_line = line
+
+        words = []
+        while pos < n:
+            start = pos
+            word, pos = _read_word(text, pos)
+            if pos == start:
+                # Stray character Tcl would reject; skip it rather than stall
+                pos += 1
+                continue
+            words.append(word)
+            m = _WS_RE.match(text, pos)
+            if m:
+                pos = m.end()
+            if pos >= n or text[pos] in '\n;':
+                break
+
+        if words:
+            yield cmd_line, words
+
+
+def split_list(text: str) -> List[str]:
+    """Split a Tcl list (e.g. the body of -params {...}) into elements."""
+    elements = []
+    pos = 0
+    n = len(text)
+    while pos < n:
+        m = _SEP_RE.match(text, pos)
+        if m:
+            pos = m.end()
+            if pos >= n:
+                break
+        start = pos
+        word, pos = _read_word(text, pos)
+        if pos == start:
+            pos += 1
+            continue
+        elements.append(word)
+    return elements
+
+
+def parse_param_list(elements: Iterable[str]) -> Dict[str, Any]:
+    """Turn ["KEY:VALUE", ...] into a typed dict."""
+    params = {}
+    for element in elements:
+        key, sep, value = element.partition(':')
+        if sep and key:
+            params[key] = coerce_value(value)
+    return params
+
+
+def parse_param_strings(raw: Iterable[str]) -> Dict[str, Any]:
+    """Parse the raw line list stored by the ref_designs indexes.
+
+    Those entries keep quotes and trailing backslashes, e.g.
+    ['\\\\', '"APB_DWIDTH:32"  \\\\', ...]. Joining them back into one
+    line-continued list body and tokenizing it gives the typed params.
+    """
+    return parse_param_list(split_list('\n'.join(raw)))
+
+
+def core_options(words: List[str]) -> Dict[str, str]:
+    """Map -option -> value for a create_and_configure_core command."""
+    options = {}
+    i = 1
+    while i < len(words):
+        word = words[i]
+        if word.startswith('-') and word not in FLAG_OPTIONS and i + 1 < len(words):
+            options[word] = words[i + 1]
+            i += 2
+        else:
+            i += 1
+    return options
+
+
+def parse_components(text: str, file: Optional[str] = None) -> List[ComponentConfig]:
+    """Parse every create_and_configure_core command in a TCL script."""
+    components = []
+
+    for line, words in iter_commands(text):
+        if words[0] not in CORE_COMMANDS:
+            continue
+
+        options = core_options(words)
+        components.append(ComponentConfig(
+            component=options.get('-component_name', ''),
+            core_vlnv=options.get('-core_vlnv', ''),
+            params=parse_param_list(split_list(options.get('-params', ''))),
+            file=file,
+            line=line
+        ))
+
+    return components
+
+
+def parse_file(path) -> List[ComponentConfig]:
+    """Parse a component TCL file."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return parse_components(f.read(), file=str(path))
+
+
+_CONDITION_RE = re.compile(r'^\s*([A-Za-z0-9_]+)\s*(==|!=|>=|<=|=|>|<)?\s*(.*?)\s*$')
+
+
+def parse_condition(text: str) -> Tuple[str, Optional[str], Any]:
+    """Parse "KEY OP VALUE" (or just "KEY") into (key, op, typed value)."""
+    m = _CONDITION_RE.match(text)
+    if not m:
+        raise ValueError(f"Invalid condition: {text}")
+    key, op, value = m.groups()
+    if op == '=':
+        op = '=='
+    if op is None:
+        if value:
+            raise ValueError(f"Invalid condition: {text}")
+        return key, None, None
+    return key, op, coerce_value(value)
+
+
+def compare_value(actual: Any, op: Optional[str], expected: Any) -> bool:
+    """Evaluate a parsed condition against a typed parameter value."""
+    if op is None:
+        return True
+    if isinstance(actual, str) or isinstance(expected, str):
+        actual, expected = str(actual).lower(), str(expected).lower()
+        if op == '==':
+            return actual == expected
+        if op == '!=':
+            return actual != expected
+        return False
+    if op == '==':
+        return actual == expected
+    if op == '!=':
+        return actual != expected
+    if op == '>':
+        return actual > expected
+    if op == '>=':
+        return actual >= expected
+    if op == '<':
+        return actual < expected
+    return actual <= expected
+
+
+def value_key(value: Any) -> str:
+    """Canonical text of a typed value for equality indexes.
+
+    Values compare_value() finds equal with '==' share a key: bools become
+    ints, integral floats become ints and strings are lowercased (quoted, so
+    "1" and 1 stay apart).
+    """
+    if isinstance(value, str):
+        return repr(value.lower())
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return repr(int(value) if isinstance(value, bool) else value)
+
+
+class ComponentIndex:
+    """Persistent index of component configurations keyed on file mtime.
+
+    Files whose (mtime, size) are unchanged are not re-read on refresh().
+    Queries run against an in-memory inverted map of parameter key ->
+    [(component id, value)] built once per load.
+    """
+
+    def __init__(self, index_path):
+        self.index_path = Path(index_path)
+        self.files: Dict[str, Dict] = {}
+        self._components: Optional[List[ComponentConfig]] = None
+        self._by_key: Optional[Dict[str, List[Tuple[int, Any]]]] = None
+        self._load()
+
+    def _load(self):
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Ignoring unreadable index {self.index_path}: {e}", file=sys.stderr)
+            return
+        if data.get('version') == INDEX_VERSION:
+            self.files = data.get('files', {})
+
+    def save(self):
+        """Write the index back to disk."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(self.index_path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self, paths: Iterable) -> Tuple[int, int]:
+        """Bring the index up to date for the given TCL files.
+
+        Entries for files that are not in paths are dropped.
+        Returns (files_parsed, files_reused).
+        """
+        parsed = reused = 0
+        files = {}
+
+        for path in paths:
+            key = os.path.abspath(path)
+            try:
+                st = os.stat(key)
+            except OSError:
+                continue
+
+            entry = self.files.get(key)
+            if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                files[key] = entry
+                reused += 1
+                continue
+
+            try:
+                components = parse_file(key)
+            except (OSError, TclSyntaxError) as e:
+                print(f"WARNING: Failed to parse {key}: {e}", file=sys.stderr)
+                components = []
+
+            files[key] = {
+                'mtime_ns': st.st_mtime_ns,
+                'size': st.st_size,
+                'components': [
+                    {'component': c.component, 'core_vlnv': c.core_vlnv,
+                     'line': c.line, 'params': c.params}
+                    for c in components
+                ]
+            }
+            parsed += 1
+
+        self.files = files
+        self._components = None
+        self._by_key = None
+        return parsed, reused
+
+    def refresh_dir(self, root) -> Tuple[int, int]:
+        """Refresh the index with every *.tcl file under root."""
+        return self.refresh(find_tcl_files(root))
+
+    @property
+    def components(self) -> List[ComponentConfig]:
+        if self._components is None:
+            self._components = [
+                ComponentConfig(component=c['component'], core_vlnv=c['core_vlnv'],
+                                params=c['params'], file=path, line=c.get('line', 0))
+                for path in sorted(self.files)
+                for c in self.files[path]['components']
+            ]
+        return self._components
+
+    def _postings(self, key: str) -> List[Tuple[int, Any]]:
+        if self._by_key is None:
+            by_key: Dict[str, List[Tuple[int, Any]]] = {}
+            for idx, component in enumerate(self.components):
+                for k, v in component.params.items():
+                    by_key.setdefault(k, []).append((idx, v))
+            self._by_key = by_key
+        return self._by_key.get(key, [])
+
+    def query(self, conditions: Iterable, vlnv: Optional[str] = None) -> List[ComponentConfig]:
+        """Return components matching all conditions.
+
+        Args:
+            conditions: Condition strings ("GL0_0_OUT_FREQ>100") or
+                (key, op, value) tuples
+            vlnv: Optional case-insensitive substring of the core VLNV
+        """
+        parsed = [parse_condition(c) if isinstance(c, str) else tuple(c) for c in conditions]
+        components = self.components
+
+        matches: Optional[set] = None
+        # Most selective key first keeps the candidate set small
+        for key, op, value in sorted(parsed, key=lambda c: len(self._postings(c[0]))):
+            hits = {idx for idx, actual in self._postings(key)
+                    if (matches is None or idx in matches) and compare_value(actual, op, value)}
+            matches = hits
+            if not matches:
+                break
+
+        if matches is None:
+            matches = set(range(len(components)))
+
+        if vlnv:
+            needle = vlnv.lower()
+            matches = {idx for idx in matches if needle in components[idx].core_vlnv.lower()}
+
+        return [components[idx] for idx in sorted(matches)]
+
+
+def find_tcl_files(root) -> List[str]:
+    """Return all *.tcl files under root (or root itself if it is a file)."""
+    root = str(root)
+    if os.path.isfile(root):
+        return [root]
+
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+        for name in filenames:
+            if name.endswith('.tcl'):
+                files.append(os.path.join(dirpath, name))
+    return sorted(files)
+
+
+def main():
+    args = sys.argv[1:]
+
+    def pop_option(name):
+        if name in args:
+            i = args.index(name)
+            if i + 1 >= len(args):
+                print(f"ERROR: {name} requires a value")
+                sys.exit(1)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        return None
+
+    index_path = pop_option('--index')
+    vlnv = pop_option('--vlnv')
+
+    if len(args) >= 2 and args[0] == 'parse':
+        components = []
+        for path in args[1:]:
+            components.extend(parse_file(path))
+        print(json.dumps([asdict(c) for c in components], indent=2))
+        sys.exit(0)
+
+    if len(args) >= 2 and args[0] == 'query':
+        root = Path(args[1])
+        if not root.exists():
+            print(f"ERROR: Directory not found: {root}")
+            sys.exit(1)
+
+        if index_path is None:
+            index_dir = root if root.is_dir() else root.parent
+            index_path = index_dir / DEFAULT_INDEX_NAME
+
+        index = ComponentIndex(index_path)
+        parsed, reused = index.refresh_dir(root)
+        if parsed:
+            index.save()
+        print(f"Index: {len(index.files)} file(s), {parsed} parsed, {reused} cached", file=sys.stderr)
+
+        try:
+            results = index.query(args[2:], vlnv=vlnv)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+
+        keys = [parse_condition(c)[0] for c in args[2:]]
+        for c in results:
+            shown = ', '.join(f"{k}={c.params[k]}" for k in keys if k in c.params)
+            print(f"{c.component:<30} {c.core_vlnv:<40} {shown}  ({c.file}:{c.line})")
+        print(f"{len(results)} match(es)", file=sys.stderr)
+        sys.exit(0 if results else 1)
+
+    print("Usage:")
+    print("  python3 component_tcl.py parse <component.tcl> [...]")
+    print("  python3 component_tcl.py query <dir> <condition> [...] [--vlnv <text>] [--index <path>]")
+    print("")
+    print("Examples:")
+    print("  python3 component_tcl.py query tcl_scripts \"GL0_0_OUT_FREQ>100\"")
+    print("  python3 component_tcl.py query tcl_scripts BAUD_VALUE --vlnv CoreUARTapb")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
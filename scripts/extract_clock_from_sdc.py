@@ -7,40 +7,226 @@ and extracts the ACTUAL configured output frequency (not timing constraints).
 
 Usage:
     python3 extract_clock_from_sdc.py <project_dir>
+    python3 extract_clock_from_sdc.py <project_dir> --json
 
 Example:
     python3 extract_clock_from_sdc.py libero_projects/miv_rv32_demo
+    python3 extract_clock_from_sdc.py tcl_scripts/miv_components --json
 
 Output:
-    Prints the detected clock frequency in Hz, or 0 if not found
+    Prints the detected clock frequency in Hz, or 0 if not found.
+    With --json, prints the full clock tree of every PF_CCC instance
+    (each PLL and each GL0-GL3 output with frequency and enabled flag).
 
 Note:
-    Parses component TCL configuration (GL0_0_OUT_FREQ parameter) instead of
+    Parses component TCL configuration (GLx_y_OUT_FREQ parameters) instead of
     SDC timing constraints, since SDC can be artificially tightened for
     timing closure (e.g., 60 MHz constraint for 50 MHz actual clock).
+
+    PF_CCC parameter naming is GL<output>_<pll>_<FIELD>: GL1_0_OUT_FREQ is
+    output 1 of PLL 0, GL0_1_OUT_FREQ is output 0 of the second PLL in a
+    dual-PLL CCC. Older exports use GL<output>_<FIELD> for PLL 0.
 """
 
+import json
 import sys
-import re
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-import glob
+from typing import Dict, List, Optional
+
+from component_tcl import TclSyntaxError, parse_components
+from project_index import project_index
+
+
+NUM_PLLS = 2
+NUM_OUTPUTS = 4
+
+
+@dataclass
+class CCCOutput:
+    """One GLx output of a PF_CCC PLL."""
+    index: int
+    name: str                       # Parameter prefix, e.g. GL1_0
+    port: str                       # Fabric clock port, e.g. OUT1_FABCLK_0
+    enabled: bool = False
+    freq_mhz: Optional[float] = None
+    divider: Optional[int] = None
+    fabric_clock: bool = False
+
+    @property
+    def freq_hz(self) -> int:
+        return int(round(self.freq_mhz * 1_000_000)) if self.freq_mhz else 0
+
+
+@dataclass
+class CCCPll:
+    """One PLL inside a PF_CCC instance."""
+    index: int
+    in_freq_mhz: Optional[float] = None
+    ref_div: Optional[int] = None
+    vco_freq_mhz: Optional[float] = None
+    feedback_mode: Optional[str] = None
+    outputs: List[CCCOutput] = field(default_factory=list)
+
+    @property
+    def enabled(self) -> bool:
+        return any(o.enabled for o in self.outputs)
+
+
+@dataclass
+class CCCInstance:
+    """A PF_CCC component and all of its PLLs."""
+    name: str
+    file: str
+    vlnv: str = ""
+    plls: List[CCCPll] = field(default_factory=list)
+
+    @property
+    def enabled_outputs(self) -> List[CCCOutput]:
+        return [o for pll in self.plls for o in pll.outputs if o.enabled]
+
+
+def _to_float(value) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _to_int(value) -> Optional[int]:
+    number = _to_float(value)
+    return int(number) if number is not None else None
+
+
+def _to_bool(value) -> bool:
+    return value is True or value == 1
 
 
 def find_ccc_component_files(project_dir):
     """Find all PF_CCC component TCL configuration files in the project."""
     # Look for component TCL files, not SDC files
     patterns = [
-        f"{project_dir}/component/work/PF_CCC*/PF_CCC*.tcl",
-        f"{project_dir}/component/Actel/DirectCore/PF_CCC*/*/PF_CCC*.tcl",
+        "component/work/PF_CCC*/PF_CCC*.tcl",
+        "component/Actel/DirectCore/PF_CCC*/*/PF_CCC*.tcl",
     ]
 
+    index = project_index(project_dir)
     ccc_files = []
     for pattern in patterns:
-        ccc_files.extend(glob.glob(pattern))
+        ccc_files.extend(str(p) for p in index.glob(pattern))
 
     return ccc_files
 
 
+def find_component_tcl_files(project_dir):
+    """Find every component TCL that could hold a PF_CCC configuration.
+
+    Covers the standard Libero locations plus a flat directory of exported
+    component scripts (e.g. tcl_scripts/miv_components). CCC instances are
+    identified by their core VLNV, so renamed components are still found.
+    """
+    patterns = [
+        "component/work/*/*.tcl",
+        "component/Actel/DirectCore/PF_CCC*/*/*.tcl",
+        "*.tcl",
+    ]
+
+    index = project_index(project_dir)
+    seen = set()
+    files = []
+    for pattern in patterns:
+        for path in map(str, index.glob(pattern)):
+            if path not in seen:
+                seen.add(path)
+                files.append(path)
+
+    return files
+
+
+def build_ccc_instance(name, file, vlnv, params) -> CCCInstance:
+    """Build the PLL/output tree for one CCC from its parameter dict."""
+    ccc = CCCInstance(name=name, file=str(file), vlnv=vlnv)
+
+    for pll_idx in range(NUM_PLLS):
+        pll = CCCPll(
+            index=pll_idx,
+            in_freq_mhz=_to_float(params.get(f"PLL_IN_FREQ_{pll_idx}")),
+            ref_div=_to_int(params.get(f"PLL_REFDIV_{pll_idx}")),
+            feedback_mode=params.get(f"PLL_FEEDBACK_MODE_{pll_idx}"),
+        )
+        # Only a single VCO frequency is exported; it belongs to PLL 0
+        if pll_idx == 0:
+            pll.vco_freq_mhz = _to_float(params.get("VCOFREQUENCY"))
+
+        for out_idx in range(NUM_OUTPUTS):
+            prefix = f"GL{out_idx}_{pll_idx}"
+            keys = [prefix]
+            # Older format without the PLL suffix (PLL 0 only)
+            if pll_idx == 0:
+                keys.append(f"GL{out_idx}")
+
+            for key in keys:
+                if any(f"{key}_{f}" in params for f in ("OUT_FREQ", "IS_USED", "DIV")):
+                    break
+            else:
+                continue
+
+            pll.outputs.append(CCCOutput(
+                index=out_idx,
+                name=prefix,
+                port=f"OUT{out_idx}_FABCLK_{pll_idx}",
+                enabled=_to_bool(params.get(f"{key}_IS_USED", f"{key}_OUT_FREQ" in params)),
+                freq_mhz=_to_float(params.get(f"{key}_OUT_FREQ")),
+                divider=_to_int(params.get(f"{key}_DIV")),
+                fabric_clock=_to_bool(params.get(f"{key}_FABCLK_USED")),
+            ))
+
+        if pll.outputs or pll.in_freq_mhz is not None:
+            ccc.plls.append(pll)
+
+    return ccc
+
+
+def extract_clock_tree(project_dir) -> List[CCCInstance]:
+    """Parse every PF_CCC component TCL under project_dir in one pass.
+
+    Returns a list of CCCInstance, one per CCC component, sorted by name.
+    """
+    cccs = {}
+
+    for path in find_component_tcl_files(project_dir):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                components = parse_components(f.read(), file=path)
+        except (OSError, TclSyntaxError) as e:
+            print(f"WARNING: Failed to parse {path}: {e}", file=sys.stderr)
+            continue
+
+        for component in components:
+            # Identify CCCs by VLNV, so renamed components are still found
+            if component.core_name != 'PF_CCC' or not component.params:
+                continue
+
+            name = component.component or Path(path).stem
+            # First definition wins if the same component is exported twice
+            if name not in cccs:
+                cccs[name] = build_ccc_instance(name, path, component.core_vlnv, component.params)
+
+    return [cccs[name] for name in sorted(cccs)]
+
+
+def clock_tree_to_dict(cccs: List[CCCInstance]) -> Dict:
+    """Convert a clock tree into plain JSON-serializable data."""
+    result = []
+    for ccc in cccs:
+        data = asdict(ccc)
+        for pll_data, pll in zip(data['plls'], ccc.plls):
+            pll_data['enabled'] = pll.enabled
+            for out_data, out in zip(pll_data['outputs'], pll.outputs):
+                out_data['freq_hz'] = out.freq_hz
+        result.append(data)
+    return {'cccs': result}
+
+
 def parse_ccc_output_frequency(ccc_file):
     """Parse output frequency from CCC component TCL configuration.
 
@@ -49,20 +235,17 @@ def parse_ccc_output_frequency(ccc_file):
     """
     try:
         with open(ccc_file, 'r') as f:
-            content = f.read()
+            components = parse_components(f.read(), file=ccc_file)
 
-        # Match: "GL0_0_OUT_FREQ:50" (output 0 fabric clock frequency)
-        # This is the ACTUAL configured frequency, not a timing constraint
-        match = re.search(r'"GL0_0_OUT_FREQ:([0-9\.]+)"', content)
-        if match:
-            freq_mhz = float(match.group(1))
-            return freq_mhz
+        params = components[0].params if components else {}
 
+        # "GL0_0_OUT_FREQ:50" is the output 0 fabric clock frequency.
+        # This is the ACTUAL configured frequency, not a timing constraint.
         # Also check for GL0 (without the _0 suffix - older format)
-        match = re.search(r'"GL0_OUT_FREQ:([0-9\.]+)"', content)
-        if match:
-            freq_mhz = float(match.group(1))
-            return freq_mhz
+        for key in ("GL0_0_OUT_FREQ", "GL0_OUT_FREQ"):
+            freq_mhz = _to_float(params.get(key))
+            if freq_mhz is not None:
+                return freq_mhz
 
     except Exception as e:
         print(f"WARNING: Failed to parse {ccc_file}: {e}", file=sys.stderr)
@@ -70,56 +253,76 @@ def parse_ccc_output_frequency(ccc_file):
     return None
 
 
+def primary_output(cccs: List[CCCInstance]) -> Optional[CCCOutput]:
+    """Pick the system clock: GL0 of PLL 0 of the first CCC that has one."""
+    for ccc in cccs:
+        outputs = [o for pll in ccc.plls for o in pll.outputs if o.freq_mhz]
+        for out in outputs:
+            if out.name == "GL0_0":
+                return out
+        enabled = [o for o in outputs if o.enabled]
+        if enabled:
+            return enabled[0]
+    return None
+
+
 def extract_clock_frequency(project_dir):
     """Extract system clock frequency from project.
 
     Returns frequency in Hz, or 0 if not found.
     """
-    # Find CCC component configuration files
-    ccc_files = find_ccc_component_files(project_dir)
+    # Parse every CCC component configuration in one pass
+    cccs = extract_clock_tree(project_dir)
 
-    if not ccc_files:
+    if not cccs:
         print(f"WARNING: No PF_CCC component files found in {project_dir}", file=sys.stderr)
         return 0
 
-    print(f"Found {len(ccc_files)} CCC component file(s)", file=sys.stderr)
-
-    # Parse first CCC file
-    ccc_file = ccc_files[0]
-    print(f"Parsing: {ccc_file}", file=sys.stderr)
+    print(f"Found {len(cccs)} CCC component(s)", file=sys.stderr)
+    for ccc in cccs:
+        print(f"  {ccc.name} ({ccc.file})", file=sys.stderr)
+        for out in ccc.enabled_outputs:
+            print(f"    {out.port}: {out.freq_mhz} MHz", file=sys.stderr)
 
-    freq_mhz = parse_ccc_output_frequency(ccc_file)
+    out = primary_output(cccs)
 
-    if freq_mhz is None:
-        print(f"WARNING: Could not parse output frequency from {ccc_file}", file=sys.stderr)
+    if out is None:
+        print(f"WARNING: Could not parse output frequency from any CCC in {project_dir}", file=sys.stderr)
         return 0
 
-    # Convert MHz to Hz
-    freq_hz = int(freq_mhz * 1_000_000)
+    freq_hz = out.freq_hz
 
-    print(f"  CCC Output Frequency: {freq_mhz} MHz ({freq_hz} Hz)", file=sys.stderr)
-    print(f"  Source: Component configuration (GL0_0_OUT_FREQ parameter)", file=sys.stderr)
+    print(f"  CCC Output Frequency: {out.freq_mhz} MHz ({freq_hz} Hz)", file=sys.stderr)
+    print(f"  Source: Component configuration ({out.name}_OUT_FREQ parameter)", file=sys.stderr)
 
     return freq_hz
 
 
 def main():
-    if len(sys.argv) != 2:
+    args = [a for a in sys.argv[1:] if a != '--json']
+    as_json = '--json' in sys.argv[1:]
+
+    if len(args) != 1:
         print("ERROR: Missing required argument", file=sys.stderr)
         print("", file=sys.stderr)
         print("Usage:", file=sys.stderr)
-        print("  python3 extract_clock_from_sdc.py <project_dir>", file=sys.stderr)
+        print("  python3 extract_clock_from_sdc.py <project_dir> [--json]", file=sys.stderr)
         print("", file=sys.stderr)
         print("Example:", file=sys.stderr)
         print("  python3 extract_clock_from_sdc.py libero_projects/miv_rv32_demo", file=sys.stderr)
         sys.exit(1)
 
-    project_dir = sys.argv[1]
+    project_dir = args[0]
 
     if not Path(project_dir).exists():
         print(f"ERROR: Project directory not found: {project_dir}", file=sys.stderr)
         sys.exit(1)
 
+    if as_json:
+        cccs = extract_clock_tree(project_dir)
+        print(json.dumps(clock_tree_to_dict(cccs), indent=2))
+        sys.exit(0 if cccs else 1)
+
     # Extract clock frequency
     freq_hz = extract_clock_frequency(project_dir)
 
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Incremental, parallel indexer for the PolarFire reference-design corpus
+
+Walks every design folder under ref_designs/ (see ref_designs/README.md and
+ref_designs/appnote_archives.md for the intake workflow) and regenerates the
+snapshots in docs/ref_designs:
+
+    tcl_index.json         - TCL file count, entry candidates, Libero version
+    ip_config_index.json   - every create_and_configure_core per design
+    ip_config_focus.json   - the same, filtered to DDR/XCVR/JESD/MIPI/HDMI/PLL/CCC
+    custom_hdl_index.json  - custom HDL module -> files per design
+    index_manifest.json    - per-design file fingerprints and counts
+
+Each source file is fingerprinted by (mtime, size). Extraction results are
+cached per file, so re-runs only reprocess files that changed; the changed
+files are spread over a process pool.
+
+Usage:
+    python3 index_ref_designs.py [corpus_dir] [output_dir] [--jobs N] [--force]
+
+Defaults:
+    corpus_dir = ref_designs/
+    output_dir = docs/ref_designs/
+
+--force ignores the extraction cache. It is also required to write the
+snapshots when the corpus holds no designs (a bare checkout of ref_designs/
+only has the intake notes), so a default run cannot blank the checked-in
+indexes.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from component_tcl import TclSyntaxError, core_options, iter_commands, split_list
+
+
+CACHE_VERSION = 1
+CACHE_NAME = ".ref_index_cache.json"
+MANIFEST_NAME = "index_manifest.json"
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CORPUS_DIR = REPO_ROOT / "ref_designs"
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "docs" / "ref_designs"
+
+TCL_EXTENSIONS = (".tcl",)
+HDL_EXTENSIONS = (".v", ".sv", ".vh", ".vhd", ".vhdl")
+
+# File names that usually drive a whole design flow
+ENTRY_NAME_RE = re.compile(r'^(script|run_\w+|\w*top\w*)\.tcl$', re.IGNORECASE)
+README_RE = re.compile(r'^readme.*\.(txt|md)$', re.IGNORECASE)
+LIBERO_VERSION_RE = re.compile(r'^.*Libero\s+SoC.*Version.*$', re.IGNORECASE | re.MULTILINE)
+
+VERILOG_MODULE_RE = re.compile(r'^\s*(?:macro)?module\s+(\w+)', re.MULTILINE)
+VHDL_ENTITY_RE = re.compile(r'^\s*entity\s+(\w+)\s+is\b', re.IGNORECASE | re.MULTILINE)
+
+# Vendored IP trees and simulation models are not "custom" HDL
+IP_PATH_RE = re.compile(r'/component/(Actel|Microsemi|Microchip)/', re.IGNORECASE)
+BFM_NAME_RE = re.compile(r'^(bfm_|testbench)|_tb$', re.IGNORECASE)
+
+# High-signal cores kept in ip_config_focus.json
+FOCUS_CORE_RE = re.compile(r'DDR|XCVR|PCS|JESD|MIPI|HDMI|PLL|CCC', re.IGNORECASE)
+
+
+def _core_name(vlnv: str) -> str:
+    parts = vlnv.split(':')
+    return parts[2] if len(parts) > 2 else vlnv
+
+
+def _params_to_lines(elements: List[str]) -> List[str]:
+    """Rebuild the exported -params line layout stored in the JSON snapshots."""
+    if not elements:
+        return []
+    lines = ["\\"]
+    lines.extend(f'"{e}"  \\' for e in elements[:-1])
+    lines.append(f'"{elements[-1]}"')
+    return lines
+
+
+def extract_tcl(path: str, relpath: str) -> Dict:
+    """Extract core configurations and the entry-point flag from a TCL file."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        text = f.read()
+
+    components = []
+    try:
+        for _, words in iter_commands(text):
+            if words[0] != "create_and_configure_core":
+                continue
+            options = core_options(words)
+            components.append({
+                "file": relpath,
+                "core_vlnv": options.get("-core_vlnv", ""),
+                "component": options.get("-component_name", ""),
+                "params": _params_to_lines(split_list(options.get("-params", ""))),
+            })
+    except TclSyntaxError as e:
+        print(f"WARNING: {relpath}: {e}", file=sys.stderr)
+
+    entry = bool(ENTRY_NAME_RE.match(os.path.basename(path))) or "new_project" in text
+    return {"kind": "tcl", "components": components, "entry": entry}
+
+
+def extract_hdl(path: str, relpath: str) -> Dict:
+    """Extract Verilog module and VHDL entity names from an HDL file."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        text = f.read()
+
+    if path.lower().endswith((".vhd", ".vhdl")):
+        modules = VHDL_ENTITY_RE.findall(text)
+    else:
+        modules = VERILOG_MODULE_RE.findall(text)
+
+    custom = not IP_PATH_RE.search("/" + relpath)
+    return {"kind": "hdl", "modules": sorted(set(modules)), "custom": custom}
+
+
+def extract_readme(path: str, relpath: str) -> Dict:
+    """Extract the first Libero version line from a design readme."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        text = f.read()
+
+    match = LIBERO_VERSION_RE.search(text)
+    return {"kind": "readme", "libero_version": match.group(0).strip() if match else None}
+
+
+def classify(name: str) -> Optional[str]:
+    """Return the extractor kind for a file name, or None to skip it."""
+    lowered = name.lower()
+    if lowered.endswith(TCL_EXTENSIONS):
+        return "tcl"
+    if lowered.endswith(HDL_EXTENSIONS):
+        return "hdl"
+    if README_RE.match(name):
+        return "readme"
+    return None
+
+
+EXTRACTORS = {
+    "tcl": extract_tcl,
+    "hdl": extract_hdl,
+    "readme": extract_readme,
+}
+
+
+def _extract_job(job: Tuple[str, str, str]) -> Tuple[str, Dict]:
+    """Process-pool worker: (kind, abs path, relpath) -> (relpath, result)."""
+    kind, path, relpath = job
+    try:
+        return relpath, EXTRACTORS[kind](path, relpath)
+    except OSError as e:
+        return relpath, {"kind": kind, "error": str(e)}
+
+
+def scan_corpus(corpus_dir: Path) -> Dict[str, Dict[str, Tuple[str, int, int]]]:
+    """Stat every indexable file. Returns design -> relpath -> (kind, mtime_ns, size)."""
+    designs = {}
+    for entry in sorted(os.scandir(corpus_dir), key=lambda e: e.name):
+        if not entry.is_dir() or entry.name.startswith('.'):
+            continue
+
+        files = {}
+        for dirpath, dirnames, filenames in os.walk(entry.path):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for name in filenames:
+                kind = classify(name)
+                if kind is None:
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                relpath = os.path.relpath(path, corpus_dir).replace(os.sep, '/')
+                files[relpath] = (kind, st.st_mtime_ns, st.st_size)
+
+        designs[entry.name] = files
+    return designs
+
+
+def load_cache(path: Path) -> Dict[str, Dict]:
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get("files", {}) if data.get("version") == CACHE_VERSION else {}
+
+
+def build_indexes(designs: Dict, results: Dict[str, Dict]) -> Dict[str, object]:
+    """Assemble the JSON snapshots from per-file extraction results."""
+    tcl_index = []
+    ip_index: Dict[str, List] = {}
+    ip_focus: Dict[str, List] = {}
+    hdl_index: Dict[str, Dict[str, List[str]]] = {}
+
+    for design, files in designs.items():
+        tcl_files = sorted(p for p, (kind, _, _) in files.items() if kind == "tcl")
+        entries = [p for p in tcl_files if results[p].get("entry")]
+
+        version = version_source = None
+        for relpath in sorted(p for p, (kind, _, _) in files.items() if kind == "readme"):
+            if results[relpath].get("libero_version"):
+                version = results[relpath]["libero_version"]
+                version_source = relpath
+                break
+
+        tcl_index.append({
+            "design": design,
+            "libero_version": version,
+            "libero_version_source": version_source,
+            "tcl_file_count": len(tcl_files),
+            "entry_candidates": entries,
+        })
+
+        components = [c for p in tcl_files for c in results[p].get("components", [])]
+        if components:
+            ip_index[design] = components
+            focus = [c for c in components if FOCUS_CORE_RE.search(_core_name(c["core_vlnv"]))]
+            if focus:
+                ip_focus[design] = focus
+
+        modules: Dict[str, List[str]] = {}
+        for relpath in sorted(p for p, (kind, _, _) in files.items() if kind == "hdl"):
+            result = results[relpath]
+            if not result.get("custom"):
+                continue
+            for module in result.get("modules", []):
+                if BFM_NAME_RE.search(module):
+                    continue
+                modules.setdefault(module, []).append(relpath)
+        if modules:
+            hdl_index[design] = dict(sorted(modules.items()))
+
+    return {
+        "tcl_index.json": tcl_index,
+        "ip_config_index.json": ip_index,
+        "ip_config_focus.json": ip_focus,
+        "custom_hdl_index.json": hdl_index,
+    }
+
+
+def write_json(path: Path, data):
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def run_index(corpus_dir: Path, output_dir: Path, jobs: Optional[int] = None,
+              force: bool = False) -> Dict:
+    """Re-index the corpus and write all snapshots. Returns the manifest."""
+    start = time.time()
+    cache_path = output_dir / CACHE_NAME
+    cache = {} if force else load_cache(cache_path)
+
+    designs = scan_corpus(corpus_dir)
+    if not designs and not force:
+        raise ValueError(f"No designs found under {corpus_dir}; refusing to replace the snapshots "
+                         f"in {output_dir} with empty indexes (use --force to write them anyway)")
+
+    results: Dict[str, Dict] = {}
+    todo = []
+    for files in designs.values():
+        for relpath, (kind, mtime_ns, size) in files.items():
+            cached = cache.get(relpath)
+            if cached and cached["stamp"] == [mtime_ns, size] and "error" not in cached["result"]:
+                results[relpath] = cached["result"]
+            else:
+                todo.append((kind, str(corpus_dir / relpath), relpath))
+
+    if todo:
+        workers = jobs or os.cpu_count() or 1
+        if workers > 1 and len(todo) > 1:
+            chunksize = max(1, len(todo) // (workers * 8))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for relpath, result in pool.map(_extract_job, todo, chunksize=chunksize):
+                    results[relpath] = result
+        else:
+            for job in todo:
+                relpath, result = _extract_job(job)
+                results[relpath] = result
+
+    for relpath, result in results.items():
+        if "error" in result:
+            print(f"WARNING: {relpath}: {result['error']}", file=sys.stderr)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name, data in build_indexes(designs, results).items():
+        write_json(output_dir / name, data)
+
+    new_cache = {
+        relpath: {"stamp": [mtime_ns, size], "result": results[relpath]}
+        for files in designs.values()
+        for relpath, (_, mtime_ns, size) in files.items()
+    }
+    tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump({"version": CACHE_VERSION, "files": new_cache}, f, separators=(',', ':'))
+    os.replace(tmp_path, cache_path)
+
+    manifest = {
+        "generated": time.strftime('%Y-%m-%d %H:%M:%S'),
+        "corpus": str(corpus_dir),
+        "designs": {
+            design: {
+                "files": len(files),
+                "tcl_files": sum(1 for kind, _, _ in files.values() if kind == "tcl"),
+                "hdl_files": sum(1 for kind, _, _ in files.values() if kind == "hdl"),
+                "fingerprints": {p: [m, s] for p, (_, m, s) in sorted(files.items())},
+            }
+            for design, files in designs.items()
+        },
+        "stats": {
+            "files_total": len(new_cache),
+            "files_processed": len(todo),
+            "files_cached": len(new_cache) - len(todo),
+            "seconds": round(time.time() - start, 3),
+        },
+    }
+    write_json(output_dir / MANIFEST_NAME, manifest)
+    return manifest
+
+
+def main():
+    args = sys.argv[1:]
+    force = '--force' in args
+    args = [a for a in args if a != '--force']
+
+    jobs = None
+    if '--jobs' in args:
+        i = args.index('--jobs')
+        if i + 1 >= len(args):
+            print("ERROR: --jobs requires a value")
+            sys.exit(1)
+        jobs = int(args[i + 1])
+        del args[i:i + 2]
+
+    corpus_dir = Path(args[0]) if len(args) > 0 else DEFAULT_CORPUS_DIR
+    output_dir = Path(args[1]) if len(args) > 1 else DEFAULT_OUTPUT_DIR
+
+    if not corpus_dir.is_dir():
+        print(f"ERROR: Corpus directory not found: {corpus_dir}")
+        print("")
+        print("Usage:")
+        print("  python3 index_ref_designs.py [corpus_dir] [output_dir] [--jobs N] [--force]")
+        sys.exit(1)
+
+    print("=" * 60)
+    print("TCL Monster: Reference Design Indexer")
+    print("=" * 60)
+    print(f"Corpus: {corpus_dir}")
+    print(f"Output: {output_dir}")
+
+    try:
+        manifest = run_index(corpus_dir, output_dir, jobs=jobs, force=force)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    stats = manifest["stats"]
+
+    print("")
+    print(f"Designs:   {len(manifest['designs'])}")
+    print(f"Files:     {stats['files_total']} ({stats['files_processed']} processed, "
+          f"{stats['files_cached']} cached)")
+    print(f"Time:      {stats['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
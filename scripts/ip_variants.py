@@ -0,0 +1,980 @@
+#!/usr/bin/env python3
+"""
+Batch IP-configuration renderer for the generator/template library
+
+Python models of the component generators in tcl_scripts/lib/generators/
+(CoreUARTapb, PF_DDR4, PF_PCIE, PF_CCC, CoreGPIO). They render the same
+create_and_configure_core scripts as the templates in
+tcl_scripts/lib/templates/ without a Libero or tclsh process. A sweep
+expands the Cartesian product of per-IP option lists, renders every variant
+and writes one component TCL per distinct core configuration, plus a
+manifest.json that maps every variant to its file.
+
+Rendering is memoized per sub-block. The -params body of a variant is
+assembled from blocks (UART divisor settings, DDR4 latency/clock/geometry
+groups, PCIe BAR, slave and lane tables, GPIO pin tables, CCC output
+groups) that are cached on the options they depend on, so each distinct
+block is formatted once per sweep. Variants with an identical -params body
+configure the same core, e.g. two target baud rates that round to the same
+BAUD_VALUE, or DDR4 sizes whose row bits clamp to 16. They share one file
+and are listed against it in the manifest (disable with --no-dedup).
+Unchanged files are not rewritten, and files that an earlier sweep wrote
+into the same directory but this one no longer produces are removed.
+
+Usage:
+    python3 ip_variants.py render <ip> [option=value ...]
+    python3 ip_variants.py sweep <out_dir> [--spec <spec.json>] [--ip uart,ddr4]
+                           [--set <ip>.<option>=<v1>,<v2> ...] [--no-dedup]
+    python3 ip_variants.py check [<templates_dir>]
+
+IPs and options (defaults as in the Tcl generators):
+    uart   sys_clk_hz baud_rate data_bits parity rx_fifo tx_fifo
+    ddr4   size speed width axi_width axi_clk
+    pcie   port (endpoint | root_port) num_lanes speed bar0_size device_id
+           vendor_id ref_clk_freq
+    ccc    input_freq output_freq output1_freq (set for the dual-output PLL)
+    gpio   num_pins direction apb_width initial_values
+Every IP also takes component_name.
+
+A spec file maps each IP to {option: [values, ...]}. Options that are not
+listed keep their default. Without --spec, DEFAULT_SPEC is swept. In a
+sweep, component_name may be a format string over the options
+("UART_{baud_rate}"). Otherwise variants are named from the IP prefix and
+the values of the swept options.
+
+Example:
+    python3 ip_variants.py sweep build/ip_variants --ip uart,ddr4
+    python3 ip_variants.py sweep out --ip pcie --set pcie.num_lanes=1,2,4 --set pcie.speed=Gen1,Gen2
+    python3 ip_variants.py render ddr4 size=8GB speed=3200 width=16
+    python3 ip_variants.py check
+"""
+
+import difflib
+import hashlib
+import itertools
+import json
+import math
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ccc_planner import STANDARD_BAUDS, UART_ERROR_LIMIT_PCT, UART_OVERSAMPLE
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = REPO_ROOT / "tcl_scripts" / "lib" / "templates"
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# -core_vlnv tokens as written in the generated scripts
+UART_VLNV = "Actel:DirectCore:CoreUARTapb:*"
+DDR4_VLNV = "{Actel:SystemBuilder:PF_DDR4:2.5.113}"
+PCIE_VLNV = "{Actel:SgCore:PF_PCIE:*}"
+CCC_VLNV = "{Actel:SgCore:PF_CCC:*}"
+GPIO_VLNV = "Actel:DirectCore:CoreGPIO:*"
+
+UART_BAUD_VALUE_RANGE = (1, 8191)
+UART_PARITY = {"none": 0, "odd": 1, "even": 2}
+
+DDR4_BANK_BITS = 2
+DDR4_BANK_GROUP_BITS = 2
+DDR4_COL_BITS = 10
+DDR4_ROW_BITS_RANGE = (13, 16)
+# (max DDR clock MHz, CL, CWL); faster than the last entry uses DDR4_LATENCY_MAX
+DDR4_LATENCY = ((800, 12, 9), (1066, 15, 11), (1200, 16, 12), (1333, 18, 14))
+DDR4_LATENCY_MAX = (22, 16)
+
+PCIE_LANES = (1, 2, 4)
+PCIE_LANE_RATES = {"Gen1": "2.5 Gbps", "Gen2": "5.0 Gbps"}
+
+GPIO_PINS = 32
+GPIO_DIRECTIONS = {"input": 0, "output": 1, "bidir": 2, "bidirectional": 2}
+
+# Swept when no --spec is given: 480 UART, 1260 DDR4, 60 PCIe, 27 CCC and 18 GPIO variants
+DEFAULT_SPEC: Dict[str, Dict[str, List[Any]]] = {
+    "uart": {
+        "sys_clk_hz": [25000000, 40000000, 50000000, 62500000, 80000000,
+                       100000000, 125000000, 150000000, 160000000, 200000000],
+        "baud_rate": list(STANDARD_BAUDS),
+        "data_bits": [7, 8],
+        "parity": ["none", "odd", "even"],
+    },
+    "ddr4": {
+        "size": ["1GB", "2GB", "4GB", "8GB"],
+        "speed": [1600, 1866, 2133, 2400, 2666, 2933, 3200],
+        "width": [16, 32, 64],
+        "axi_width": [32, 64, 128],
+        "axi_clk": ["100.0", "150.0", "200.0", "266.0", "300.0"],
+    },
+    "pcie": {
+        "port": ["endpoint", "root_port"],
+        "num_lanes": list(PCIE_LANES),
+        "speed": list(PCIE_LANE_RATES),
+        "bar0_size": ["4 KB", "64 KB", "1 MB", "256 MB", "2 GB"],
+    },
+    "ccc": {
+        "input_freq": [25, 50, 100],
+        "output_freq": [25, 50, 100],
+        "output1_freq": [None, 100, 200],
+    },
+    "gpio": {
+        "num_pins": [1, 2, 4, 8, 16, 32],
+        "direction": ["input", "output", "bidirectional"],
+    },
+}
+
+
+@dataclass
+class Variant:
+    """One rendered component script."""
+    ip: str
+    component: str
+    vlnv: str
+    header: str          # comment lines and the create_and_configure_core line
+    body: str            # -params lines, up to and including the closing brace
+    footer: str
+    options: Dict[str, Any] = field(default_factory=dict)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """File contents as the generator writes them (puts adds a final newline)."""
+        return self.header + self.body + self.footer + "\n"
+
+    @property
+    def digest(self) -> str:
+        """Identity of the core configuration, independent of names and comments."""
+        return hashlib.sha1(f"{self.vlnv}\n{self.body}".encode()).hexdigest()
+
+
+def _block(params, sep: str = "  ") -> str:
+    """-params continuation lines ("KEY:VALUE"<sep>\\) for a run of parameters."""
+    return "".join(f'"{p}"{sep}\\\n' for p in params)
+
+
+def _create_line(vlnv: str, component: str, download: bool = False) -> str:
+    flag = " -download_core" if download else ""
+    return f"create_and_configure_core -core_vlnv {vlnv}{flag} -component_name {{{component}}} -params {{\\\n"
+
+
+# ==============================================================================
+# CoreUARTapb (uart_config_generator.tcl)
+# ==============================================================================
+
+@lru_cache(maxsize=None)
+def _uart_body(baud_value: int, prg_bit8: int, prg_parity: int, rx_fifo: int, tx_fifo: int) -> str:
+    return _block(("BAUD_VAL_FRCTN:0", "BAUD_VAL_FRCTN_EN:false", f"BAUD_VALUE:{baud_value}", "FIXEDMODE:0",
+                   f"PRG_BIT8:{prg_bit8}", f"PRG_PARITY:{prg_parity}", f"RX_FIFO:{rx_fifo}", "RX_LEGACY_MODE:0",
+                   f"TX_FIFO:{tx_fifo}")) + '"USE_SOFT_FIFO:0"   }\n'
+
+
+def _render_uart(o: Dict[str, Any]) -> Variant:
+    name = o["component_name"] or "CoreUARTapb_C0"
+    clk, baud = o["sys_clk_hz"], o["baud_rate"]
+    warnings = []
+
+    baud_value = int(clk // (baud * UART_OVERSAMPLE)) - 1
+    low, high = UART_BAUD_VALUE_RANGE
+    if not low <= baud_value <= high:
+        warnings.append(f"BAUD_VALUE={baud_value} outside {low}-{high}, clamped")
+        baud_value = max(low, min(high, baud_value))
+    error_pct = (clk / (UART_OVERSAMPLE * (baud_value + 1)) - baud) * 100.0 / baud
+    if abs(error_pct) > UART_ERROR_LIMIT_PCT:
+        warnings.append(f"baud error {error_pct:+.2f}% exceeds {UART_ERROR_LIMIT_PCT}%")
+
+    prg_parity = UART_PARITY.get(o["parity"])
+    if prg_parity is None:
+        warnings.append(f"unknown parity '{o['parity']}', using 'none'")
+        prg_parity = 0
+
+    body = _uart_body(baud_value, 1 if o["data_bits"] == 8 else 0, prg_parity,
+                      1 if o["rx_fifo"] == "enable" else 0, 1 if o["tx_fifo"] == "enable" else 0)
+    header = (f"# Exporting Component Description of {name} to TCL\n"
+              "# Auto-generated by UART Configuration Generator\n"
+              f"# Configuration: {baud} baud, {o['data_bits']} data bits, {o['parity']} parity\n"
+              f"# System Clock: {clk} Hz\n"
+              "# Family: PolarFire\n"
+              + _create_line(UART_VLNV, name))
+    footer = f"# Exporting Component Description of {name} to TCL done\n"
+    return Variant("uart", name, UART_VLNV, header, body, footer, o, warnings)
+
+
+# ==============================================================================
+# PF_DDR4 (ddr4_config_generator.tcl)
+# ==============================================================================
+
+# Parameters that no generator option changes, in generator order
+_DDR4_GEOMETRY = _block((
+    f"COL_ADDR_WIDTH:{DDR4_COL_BITS}", "DLL_ENABLE:1", "DM_MODE:DM", "DQ_DQS_GROUP_SIZE:8",
+    "ENABLE_ECC:false", "ENABLE_INIT_INTERFACE:false", "ENABLE_LOOKAHEAD_PRECHARGE_ACTIVATE:false",
+    "ENABLE_PAR_ALERT:false", "ENABLE_REINIT:false", "ENABLE_SELF_REFRESH:false", "ENABLE_TAG_IF:false",
+    "ENABLE_USER_ZQCALIB:false", "EXPOSE_TRAINING_DEBUG_IF:false",
+    "FABRIC_INTERFACE:AXI4", "GRANULARITY_MODE:0", "INTERNAL_VREF_MONITER:0", "MEMCTRLR_INST_NO:0",
+    "MEMORY_FORMAT:COMPONENT", "MINIMUM_READ_IDLE:1",
+    "ODT_ENABLE_RD_RNK0_ODT0:false", "ODT_ENABLE_RD_RNK0_ODT1:false", "ODT_ENABLE_RD_RNK1_ODT0:false",
+    "ODT_ENABLE_RD_RNK1_ODT1:false", "ODT_ENABLE_WR_RNK0_ODT0:true", "ODT_ENABLE_WR_RNK0_ODT1:false",
+    "ODT_ENABLE_WR_RNK1_ODT0:false", "ODT_ENABLE_WR_RNK1_ODT1:true",
+    "ODT_RD_OFF_SHIFT:0", "ODT_RD_ON_SHIFT:0", "ODT_WR_OFF_SHIFT:0", "ODT_WR_ON_SHIFT:0",
+    "OUTPUT_DRIVE_STRENGTH:RZQ7", "PHYONLY:false", "PIPELINE:false", "POWERDOWN_INPUT_BUFFER:1", "QOFF:0",
+    "QUEUE_DEPTH:3", "RDIMM_LAT:0", "READ_BURST_TYPE:SEQUENTIAL", "READ_DBI:0", "READ_PREAMBLE:0",
+), " ")
+
+_DDR4_TIMING = _block((
+    "RTT_NOM:RZQ4", "RTT_PARK:0", "RTT_WR:OFF",
+    "SDRAM_NB_RANKS:1", "SDRAM_NUM_CLK_OUTS:1", "SDRAM_TYPE:DDR4", "SELF_REFRESH_ABORT_MODE:0",
+    "SHIELD_ENABLED:true", "SIMULATION_MODE:FAST", "TEMPERATURE_REFRESH_MODE:0",
+    "TEMPERATURE_REFRESH_RANGE:NORMAL",
+    "TIMING_RAS:32.0", "TIMING_RC:45.5", "TIMING_RCD:13.5", "TIMING_RP:13.5", "TIMING_REFI:7.8",
+    "TIMING_RFC:350.0", "TIMING_WR:15.0", "TIMING_WTR_L:6.0", "TIMING_WTR_S:2.0", "TIMING_RTP:7.5",
+    "TIMING_RRD_L:5.0", "TIMING_RRD_S:4.0", "TIMING_CCD_L:4.0", "TIMING_CCD_S:4.0", "TIMING_FAW:25.0",
+    "TIMING_DH:150", "TIMING_DS:75", "TIMING_DQSQ:200", "TIMING_DQSCK:400", "TIMING_DQSS:0.25",
+    "TIMING_DSH:0.2", "TIMING_DSS:0.2", "TIMING_IH:275", "TIMING_IS:200", "TIMING_INIT:200",
+    "TIMING_MRD:4", "TIMING_QH:0.38", "TIMING_QSH:0.38",
+    "TURNAROUND_RTR_DIFFRANK:2", "TURNAROUND_RTW_DIFFRANK:2", "TURNAROUND_WTR_DIFFRANK:1",
+    "TURNAROUND_WTW_DIFFRANK:2",
+    "USER_POWER_DOWN:false", "VREF_CALIB_ENABLE:0", "VREF_CALIB_RANGE:0", "VREF_CALIB_VALUE:70.40",
+), " ")
+
+_DDR4_CALIBRATION = _block((
+    "WRITE_LEVELING:ENABLE", "WRITE_PREAMBLE:0", "ZQ_CALIB_PERIOD:200", "ZQ_CALIB_TYPE:0",
+    "ZQ_CALIB_TYPE_TEMP:false", "ZQ_CAL_INIT_TIME:1024", "ZQ_CAL_L_TIME:512",
+), " ") + '"ZQ_CAL_S_TIME:128" }\n'
+
+
+@lru_cache(maxsize=None)
+def _ddr4_row_bits(size: str, width: int) -> Tuple[int, Optional[str]]:
+    """ROW_ADDR_WIDTH for a device size ("4GB") and data width, and a warning if clamped."""
+    try:
+        size_bytes = float(size.replace("GB", "")) * 1024 ** 3
+    except ValueError:
+        raise ValueError(f"size must look like '4GB', got '{size}'") from None
+    width_bytes = int(width) // 8
+    if size_bytes < 1 or width_bytes < 1:
+        raise ValueError(f"invalid DDR4 geometry: size {size}, width {width}")
+    total_bits = int(math.log(size_bytes) / math.log(2))
+    width_bits = int(math.log(width_bytes) / math.log(2))
+    row_bits = total_bits - DDR4_BANK_BITS - DDR4_BANK_GROUP_BITS - width_bits - DDR4_COL_BITS
+    low, high = DDR4_ROW_BITS_RANGE
+    if low <= row_bits <= high:
+        return row_bits, None
+    clamped = max(low, min(high, row_bits))
+    return clamped, f"row_bits={row_bits} outside DDR4 range {low}-{high}, adjusted to {clamped}"
+
+
+@lru_cache(maxsize=None)
+def _ddr4_topology_block(axi_width: int) -> str:
+    return _block(("ADDRESS_MIRROR:false", "ADDRESS_ORDERING:CHIP_ROW_BG_BANK_COL", "AUTO_SELF_REFRESH:3",
+                   "AXI_ID_WIDTH:4", f"AXI_WIDTH:{axi_width}", "BANKSTATMODULES:4",
+                   f"BANK_ADDR_WIDTH:{DDR4_BANK_BITS}", f"BANK_GROUP_ADDR_WIDTH:{DDR4_BANK_GROUP_BITS}",
+                   "BURST_LENGTH:0"), " ")
+
+
+@lru_cache(maxsize=None)
+def _ddr4_latency_block(speed) -> str:
+    ddr_mhz = speed / 2.0
+    cl, cwl = next(((cl, cwl) for limit, cl, cwl in DDR4_LATENCY if ddr_mhz <= limit), DDR4_LATENCY_MAX)
+    return _block(("CAS_ADDITIVE_LATENCY:0", f"CAS_LATENCY:{cl}", f"CAS_WRITE_LATENCY:{cwl}",
+                   "CA_PARITY_LATENCY_MODE:0"), " ")
+
+
+@lru_cache(maxsize=None)
+def _ddr4_clock_block(speed, axi_clk: str) -> str:
+    ddr_clock = speed / 2.0
+    multiplier = int(ddr_clock / float(axi_clk))
+    return _block((f"CCC_PLL_CLOCK_MULTIPLIER:{multiplier}", "CK_CA_ADDITIVE_OFFSET:4", f"CLOCK_DDR:{ddr_clock}",
+                   f"CLOCK_PLL_REFERENCE:{axi_clk}", f"CLOCK_RATE:{multiplier}", f"CLOCK_USER:{axi_clk}"), " ")
+
+
+@lru_cache(maxsize=None)
+def _ddr4_body(axi_width: int, speed, axi_clk: str, row_bits: int, width: int) -> str:
+    return (_ddr4_topology_block(axi_width) + _ddr4_latency_block(speed) + _ddr4_clock_block(speed, axi_clk)
+            + _DDR4_GEOMETRY + _block((f"ROW_ADDR_WIDTH:{row_bits}",), " ") + _DDR4_TIMING
+            + _block((f"WIDTH:{width}",), " ") + _DDR4_CALIBRATION)
+
+
+def _render_ddr4(o: Dict[str, Any]) -> Variant:
+    name = o["component_name"] or "PF_DDR4_C0"
+    size, speed, width, axi_clk = o["size"], o["speed"], o["width"], o["axi_clk"]
+    warnings = []
+
+    row_bits, warning = _ddr4_row_bits(size, width)
+    if warning:
+        warnings.append(warning)
+    try:
+        if int(speed / 2.0 / float(axi_clk)) < 1:
+            warnings.append(f"AXI clock {axi_clk} MHz is above the DDR clock {speed / 2.0} MHz: CLOCK_RATE is 0")
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"invalid axi_clk '{axi_clk}'") from None
+
+    body = _ddr4_body(o["axi_width"], speed, axi_clk, row_bits, width)
+    header = (f"# Exporting Component Description of {name} to TCL\n"
+              "# Auto-generated by DDR4 Configuration Generator\n"
+              f"# Configuration: {size} DDR4 @ {speed} Mbps, x{width}\n"
+              "# Family: PolarFire\n"
+              f"# Create and Configure the core component {name}\n"
+              + _create_line(DDR4_VLNV, name))
+    footer = f"# Exporting Component Description of {name} to TCL done\n"
+    return Variant("ddr4", name, DDR4_VLNV, header, body, footer, o, warnings)
+
+
+# ==============================================================================
+# PF_PCIE (pcie_config_generator.tcl)
+# ==============================================================================
+
+@dataclass(frozen=True)
+class PCIePort:
+    """How the generator sets up one PCIe port type."""
+    label: str
+    controller: str          # PCIE_0 for endpoints, PCIE_1 for root ports
+    class_code: str
+    interrupts: str
+    port_type: str
+    slave_table_0: str
+    features: str            # advanced features named in the closing NOTE
+    component: str
+
+
+PCIE_PORTS = {
+    "endpoint": PCIePort("Endpoint", "PCIE_0", "0x0000", "MSI1", "End Point", "Disabled",
+                         "multiple BARs, MSI-X, AER, etc.", "PF_PCIE_EP"),
+    "root_port": PCIePort("Root Port", "PCIE_1", "0x0604", "MSI8", "Root Port", "Enabled",
+                          "AER, hotplug, ASPM, etc.", "PF_PCIE_RP"),
+}
+
+_PCIE_HEAD = _block(("EXPOSE_ALL_DEBUG_PORTS:false", "UI_DLL_JITTER_TOLERANCE:Medium_Low",
+                     "UI_EXPOSE_LANE_DRI_PORTS:true", "UI_IS_CONFIGURED:true"))
+
+_PCIE_TAIL = _block(tuple(f"UI_GPSS1_LANE{i}_IS_USED:false" for i in range(4)) + (
+    "UI_PROTOCOL_PRESET_USED:PCIe", "UI_SIMULATION_LEVEL:RTL", "UI_TX_CLK_DIV_FACTOR:1",
+    "UI_USE_EMBEDDED_DLL:true")) + '"XT_ES_DEVICE:false"   }\n'
+
+
+@lru_cache(maxsize=None)
+def _pcie_bar_block(controller: str, bar0_size: str) -> str:
+    params = [f"UI_{controller}_MASTER_SIZE_BAR_0_TABLE:{bar0_size}",
+              f"UI_{controller}_MASTER_TYPE_BAR_0_TABLE:64-bit prefetchable memory"]
+    for i in range(1, 6):
+        params += [f"UI_{controller}_MASTER_SIZE_BAR_{i}_TABLE:4 KB",
+                   f"UI_{controller}_MASTER_TYPE_BAR_{i}_TABLE:Disabled"]
+    return _block(params)
+
+
+@lru_cache(maxsize=None)
+def _pcie_slave_block(controller: str, table_0: str) -> str:
+    return _block([f"UI_{controller}_SLAVE_STATE_TABLE_0:{table_0}"]
+                  + [f"UI_{controller}_SLAVE_STATE_TABLE_{i}:Disabled" for i in range(1, 8)])
+
+
+@lru_cache(maxsize=None)
+def _pcie_lane_block(num_lanes: int) -> str:
+    return _block([f"UI_PCIESS_LANE{i}_IS_USED:{'true' if i < num_lanes else 'false'}" for i in range(4)])
+
+
+@lru_cache(maxsize=None)
+def _pcie_body(port: str, num_lanes: int, speed: str, bar0_size: str,
+               device_id: str, vendor_id: str, ref_clk_freq) -> str:
+    p = PCIE_PORTS[port]
+    c = f"UI_{p.controller}_"
+    controller = (
+        _block((f"{c}BAR_MODE:Custom", f"{c}CDR_REF_CLK_NUMBER:1", f"{c}CDR_REF_CLK_SOURCE:Dedicated",
+                f"{c}CLASS_CODE:{p.class_code}", f"{c}CONTROLLER_ENABLED:Enabled", f"{c}DE_EMPHASIS:-3.5 dB",
+                f"{c}DEVICE_ID:{device_id}", f"{c}EXPOSE_WAKE_SIG:Disabled", f"{c}INTERRUPTS:{p.interrupts}",
+                f"{c}L0_ACC_LATENCY:No limit", f"{c}L0_EXIT_LATENCY:64 ns to less than 128 ns",
+                f"{c}L1_ACC_LATENCY:No limit", f"{c}L1_ENABLE:Disabled",
+                f"{c}L1_EXIT_LATENCY:16 us to less than 32 us",
+                f"{c}LANE_RATE:{speed} ({PCIE_LANE_RATES[speed]})"))
+        + _pcie_bar_block(p.controller, bar0_size)
+        + _block((f"{c}NUM_FTS:63", f"{c}NUMBER_OF_LANES:x{num_lanes}", f"{c}PHY_REF_CLK_SLOT:Slot",
+                  f"{c}PORT_TYPE:{p.port_type}", f"{c}REF_CLK_FREQ:{ref_clk_freq}", f"{c}REVISION_ID:0x0000"))
+        + _pcie_slave_block(p.controller, p.slave_table_0)
+        + _block((f"{c}SUB_SYSTEM_ID:0x0000", f"{c}SUB_VENDOR_ID:0x0000", f"{c}TRANSMIT_SWING:Full Swing",
+                  f"{c}VENDOR_ID:{vendor_id}")))
+    # The unused controller is listed disabled: PCIE_1 after an endpoint, PCIE_0 before a root port
+    if p.controller == "PCIE_0":
+        controllers = controller + _block(("UI_PCIE_1_CONTROLLER_ENABLED:Disabled",))
+    else:
+        controllers = _block(("UI_PCIE_0_CONTROLLER_ENABLED:Disabled",)) + controller
+    return _PCIE_HEAD + controllers + _pcie_lane_block(num_lanes) + _PCIE_TAIL
+
+
+def _render_pcie(o: Dict[str, Any]) -> Variant:
+    port = PCIE_PORTS.get(o["port"])
+    if port is None:
+        raise ValueError(f"port must be one of {', '.join(PCIE_PORTS)}, got '{o['port']}'")
+    if o["num_lanes"] not in PCIE_LANES:
+        raise ValueError(f"num_lanes must be 1, 2, or 4, got {o['num_lanes']}")
+    if o["speed"] not in PCIE_LANE_RATES:
+        raise ValueError(f"speed must be one of {', '.join(PCIE_LANE_RATES)}, got '{o['speed']}'")
+    name = o["component_name"] or port.component
+    speed = o["speed"]
+
+    body = _pcie_body(o["port"], o["num_lanes"], speed, o["bar0_size"],
+                      o["device_id"], o["vendor_id"], o["ref_clk_freq"])
+    header = (f"# Exporting Component Description of {name} to TCL\n"
+              "# Auto-generated by PCIe Configuration Generator\n"
+              f"# Configuration: {port.label}, x{o['num_lanes']} lanes, {speed} ({PCIE_LANE_RATES[speed]})\n"
+              f"# BAR0: {o['bar0_size']}, Device ID: {o['device_id']}\n"
+              "# Family: PolarFire or PolarFireSoC\n"
+              + _create_line(PCIE_VLNV, name))
+    footer = (f"# Exporting Component Description of {name} to TCL done\n"
+              "# NOTE: This is a simplified configuration for common use cases.\n"
+              f"#       For advanced features ({port.features}), use Libero GUI.\n")
+    return Variant("pcie", name, PCIE_VLNV, header, body, footer, o, [])
+
+
+# ==============================================================================
+# PF_CCC (ccc_config_generator.tcl)
+# ==============================================================================
+
+_CCC_DLL = ("DLL_CLK_0_BANKCLK_EN:false", "DLL_CLK_0_DEDICATED_EN:false", "DLL_CLK_0_FABCLK_EN:false",
+            "DLL_CLK_1_BANKCLK_EN:false", "DLL_CLK_1_DEDICATED_EN:false", "DLL_CLK_1_FABCLK_EN:false",
+            "DLL_CLK_P_EN:false")
+_CCC_DLL_SINGLE = _block(_CCC_DLL + ("DLL_CLK_P_OPTIONS_EN:false", "DLL_CLK_REF_OPTION:DIVIDE_BY_1",
+                                     "DLL_CLK_REF_OPTIONS_EN:false", "DLL_CLK_S_EN:false",
+                                     "DLL_CLK_S_OPTION:DIVIDE_BY_1", "DLL_CLK_S_OPTIONS_EN:false"))
+_CCC_DLL_DUAL = _block(_CCC_DLL)
+_CCC_OUTPUTS = ("GL0_0", "GL0_1", "GL1_0", "GL1_1", "GL2_0", "GL2_1", "GL3_0", "GL3_1")
+
+
+@lru_cache(maxsize=None)
+def _ccc_unused_block(first: int) -> str:
+    return _block(p for gl in _CCC_OUTPUTS[first:] for p in (f"{gl}_IS_USED:false", f"{gl}_FABCLK_USED:false"))
+
+
+@lru_cache(maxsize=None)
+def _ccc_pll_block(input_freq) -> str:
+    return _block((f"PLL_IN_FREQ_0:{input_freq}", "PLL_FEEDBACK_MODE_0:Post-VCO",
+                   "PLL_VCO_MODE_0:MIN_JITTER")) + '"PLL_REFDIV_0:4"  }\n'
+
+
+@lru_cache(maxsize=None)
+def _ccc_single_body(input_freq, output_freq, divider: int) -> str:
+    return (_CCC_DLL_SINGLE
+            + _block(("GL0_0_BANKCLK_USED:false", "GL0_0_BYPASS:0", "GL0_0_BYPASS_EN:false",
+                      "GL0_0_DEDICATED_USED:false", f"GL0_0_DIV:{divider}", "GL0_0_DIVSTART:0",
+                      "GL0_0_FABCLK_GATED_USED:false", "GL0_0_FABCLK_USED:true", "GL0_0_IS_USED:true",
+                      f"GL0_0_OUT_FREQ:{output_freq}", "GL0_0_PHASE_INDEX:0"))
+            + _ccc_unused_block(1) + _ccc_pll_block(input_freq))
+
+
+@lru_cache(maxsize=None)
+def _ccc_output_block(gl: str, divider: int, freq) -> str:
+    return _block((f"{gl}_BANKCLK_USED:false", f"{gl}_DIV:{divider}", f"{gl}_FABCLK_USED:true",
+                   f"{gl}_IS_USED:true", f"{gl}_OUT_FREQ:{freq}"))
+
+
+def _render_ccc(o: Dict[str, Any]) -> Variant:
+    in_freq, out0, out1 = o["input_freq"], o["output_freq"], o["output1_freq"]
+    if in_freq <= 0 or out0 <= 0 or (out1 is not None and out1 <= 0):
+        raise ValueError("CCC frequencies must be positive")
+    warnings = []
+
+    if out1 is None:
+        name = o["component_name"] or "PF_CCC_C0"
+        divider = max(1, int(in_freq / out0))
+        if out0 > in_freq:
+            warnings.append(f"{out0} MHz is above the {in_freq} MHz input: the single-output model "
+                            f"only divides (see scripts/ccc_planner.py)")
+        body = _ccc_single_body(in_freq, out0, divider)
+        header = (f"# Exporting core {name} to TCL\n"
+                  f"# Configuration: {in_freq} MHz → {out0} MHz\n"
+                  "# Auto-generated by CCC Configuration Generator\n")
+        footer = f"# Exporting core {name} to TCL done\n"
+    else:
+        name = o["component_name"] or "PF_CCC_C1"
+        multiplier = max(1, int(max(out0, out1) / in_freq))
+        vco = in_freq * multiplier
+        div0, div1 = int(vco / out0), int(vco / out1)
+        if div0 < 1 or div1 < 1:
+            raise ValueError(f"VCO {vco} MHz ({in_freq} MHz x {multiplier}) is below an output; the dual-output "
+                             f"model needs integer ratios (see scripts/ccc_planner.py)")
+        body = (_CCC_DLL_DUAL + _ccc_output_block("GL0_0", div0, out0) + _ccc_output_block("GL0_1", div1, out1)
+                + _ccc_unused_block(2) + _ccc_pll_block(in_freq))
+        header = (f"# Exporting core {name} to TCL\n"
+                  f"# Configuration: {in_freq} MHz → {out0} MHz (OUT0) + {out1} MHz (OUT1)\n"
+                  "# Auto-generated by CCC Configuration Generator\n"
+                  f"# PLL: VCO={vco} MHz, Multiplier={multiplier}, Div0={div0}, Div1={div1}\n")
+        footer = (f"# Exporting core {name} to TCL done\n"
+                  "# NOTE: This is a simplified configuration. For production use, verify in Libero GUI.\n")
+
+    header += _create_line(CCC_VLNV, name, download=True)
+    return Variant("ccc", name, CCC_VLNV, header, body, footer, o, warnings)
+
+
+# ==============================================================================
+# CoreGPIO (gpio_config_generator.tcl)
+# ==============================================================================
+
+_GPIO_INT_TYPES = _block(("INT_BUS:0",) + tuple(f"IO_INT_TYPE_{i}:7" for i in range(GPIO_PINS)))
+
+
+@lru_cache(maxsize=None)
+def _gpio_fixed_block(num_pins: int) -> str:
+    return _block(f"FIXED_CONFIG_{i}:{'true' if i < num_pins else 'false'}" for i in range(GPIO_PINS))
+
+
+@lru_cache(maxsize=None)
+def _gpio_type_block(num_pins: int, io_type: int) -> str:
+    return _block(f"IO_TYPE_{i}:{io_type if i < num_pins else 0}" for i in range(GPIO_PINS))
+
+
+@lru_cache(maxsize=None)
+def _gpio_value_block(values: Tuple[str, ...]) -> str:
+    return _block(f"IO_VAL_{i}:{v}" for i, v in enumerate(values))
+
+
+@lru_cache(maxsize=None)
+def _gpio_body(apb_width: int, num_pins: int, io_type: int, values: Tuple[str, ...]) -> str:
+    return (_block((f"APB_WIDTH:{apb_width}",)) + _gpio_fixed_block(num_pins) + _GPIO_INT_TYPES
+            + _block((f"IO_NUM:{num_pins}",)) + _gpio_type_block(num_pins, io_type)
+            + _gpio_value_block(values) + '"OE_TYPE:1"   }\n')
+
+
+def _render_gpio(o: Dict[str, Any]) -> Variant:
+    name = o["component_name"] or "CoreGPIO_C0"
+    num_pins, values = o["num_pins"], o["initial_values"]
+    if not 1 <= num_pins <= GPIO_PINS:
+        raise ValueError(f"num_pins must be between 1 and {GPIO_PINS}, got {num_pins}")
+    if values and len(values) != num_pins:
+        raise ValueError(f"initial_values length ({len(values)}) must match num_pins ({num_pins})")
+    warnings = []
+
+    io_type = GPIO_DIRECTIONS.get(o["direction"])
+    if io_type is None:
+        warnings.append(f"unknown direction '{o['direction']}', using 'output'")
+        io_type = 1
+    values = (values or ("0",) * num_pins) + ("0",) * (GPIO_PINS - num_pins)
+
+    body = _gpio_body(o["apb_width"], num_pins, io_type, values)
+    header = (f"# Exporting Component Description of {name} to TCL\n"
+              "# Auto-generated by GPIO Configuration Generator\n"
+              f"# Configuration: {num_pins} pins, {o['direction']}\n"
+              "# Family: PolarFire\n"
+              + _create_line(GPIO_VLNV, name))
+    footer = f"# Exporting Component Description of {name} to TCL done\n"
+    return Variant("gpio", name, GPIO_VLNV, header, body, footer, o, warnings)
+
+
+# ==============================================================================
+# Models, options and template table
+# ==============================================================================
+
+@dataclass
+class IPModel:
+    prefix: str                          # component name prefix of sweep variants
+    defaults: Dict[str, Any]             # options and generator defaults
+    render: Callable[[Dict[str, Any]], Variant]
+
+
+MODELS: Dict[str, IPModel] = {
+    "uart": IPModel("CoreUARTapb", {"sys_clk_hz": 50000000, "baud_rate": 115200, "data_bits": 8,
+                                    "parity": "none", "rx_fifo": "enable", "tx_fifo": "enable",
+                                    "component_name": None}, _render_uart),
+    "ddr4": IPModel("PF_DDR4", {"size": "4GB", "speed": 1600, "width": 32, "axi_width": 64,
+                                "axi_clk": "200.0", "component_name": None}, _render_ddr4),
+    "pcie": IPModel("PF_PCIE", {"port": "endpoint", "num_lanes": 1, "speed": "Gen1", "bar0_size": "4 KB",
+                                "device_id": "0x1556", "vendor_id": "0x11AA", "ref_clk_freq": 100,
+                                "component_name": None}, _render_pcie),
+    "ccc": IPModel("PF_CCC", {"input_freq": 50, "output_freq": 50, "output1_freq": None,
+                              "component_name": None}, _render_ccc),
+    "gpio": IPModel("CoreGPIO", {"num_pins": 8, "direction": "output", "apb_width": 32,
+                                 "initial_values": (), "component_name": None}, _render_gpio),
+}
+
+# Block renderers whose cache statistics are reported by a sweep
+_BLOCK_CACHES = (
+    _uart_body, _ddr4_row_bits, _ddr4_topology_block, _ddr4_latency_block, _ddr4_clock_block, _ddr4_body,
+    _pcie_bar_block, _pcie_slave_block, _pcie_lane_block, _pcie_body,
+    _ccc_unused_block, _ccc_pll_block, _ccc_single_body, _ccc_output_block,
+    _gpio_fixed_block, _gpio_type_block, _gpio_value_block, _gpio_body,
+)
+
+# Library templates and the generator options that produce them
+TEMPLATES: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    "uart_115200.tcl": ("uart", {"component_name": "CoreUARTapb_115200"}),
+    "uart_115200_100mhz.tcl": ("uart", {"sys_clk_hz": 100000000, "component_name": "CoreUARTapb_100MHz"}),
+    "uart_460800.tcl": ("uart", {"baud_rate": 460800, "component_name": "CoreUARTapb_460800"}),
+    "uart_57600.tcl": ("uart", {"baud_rate": 57600, "component_name": "CoreUARTapb_57600"}),
+    "uart_9600.tcl": ("uart", {"baud_rate": 9600, "component_name": "CoreUARTapb_9600"}),
+    "pf_ddr4_1gb_1600.tcl": ("ddr4", {"size": "1GB", "width": 16, "axi_width": 32,
+                                      "component_name": "PF_DDR4_1GB_C0"}),
+    "pf_ddr4_2gb_1600.tcl": ("ddr4", {"size": "2GB", "component_name": "PF_DDR4_2GB_C0"}),
+    "pf_ddr4_4gb_1600.tcl": ("ddr4", {"component_name": "PF_DDR4_4GB_C0"}),
+    "pf_ddr4_4gb_2400.tcl": ("ddr4", {"speed": 2400, "axi_clk": "300.0", "component_name": "PF_DDR4_FAST_C0"}),
+    "pcie_ep_x1_gen1.tcl": ("pcie", {"component_name": "PF_PCIE_EP_X1"}),
+    "pcie_ep_x4_gen2.tcl": ("pcie", {"num_lanes": 4, "speed": "Gen2", "bar0_size": "1 MB",
+                                     "component_name": "PF_PCIE_EP_X4"}),
+    "pcie_ep_custom.tcl": ("pcie", {"num_lanes": 2, "bar0_size": "256 KB", "device_id": "0xABCD",
+                                    "vendor_id": "0x1234", "component_name": "PF_PCIE_CUSTOM"}),
+    "pcie_rp_x4_gen2.tcl": ("pcie", {"port": "root_port", "num_lanes": 4, "speed": "Gen2", "bar0_size": "2 GB",
+                                     "component_name": "PF_PCIE_RP_X4"}),
+    "pf_ccc_miv_50mhz.tcl": ("ccc", {"component_name": "PF_CCC_MIV_C0"}),
+    "pf_ccc_miv_ddr.tcl": ("ccc", {"output1_freq": 200, "component_name": "PF_CCC_MIV_DDR_C1"}),
+    "pf_ccc_custom.tcl": ("ccc", {"output_freq": 100, "output1_freq": 150, "component_name": "PF_CCC_CUSTOM_C0"}),
+    "gpio_leds_8.tcl": ("gpio", {"component_name": "CoreGPIO_LEDS"}),
+    "gpio_buttons_4.tcl": ("gpio", {"num_pins": 4, "direction": "input", "component_name": "CoreGPIO_BUTTONS"}),
+    "gpio_bidir_8.tcl": ("gpio", {"direction": "bidirectional", "component_name": "CoreGPIO_BIDIR"}),
+    "gpio_max_32.tcl": ("gpio", {"num_pins": 32, "initial_values": "0 1 " * 16, "component_name": "CoreGPIO_MAX"}),
+    "gpio_pattern_4.tcl": ("gpio", {"num_pins": 4, "initial_values": "1 0 1 0",
+                                    "component_name": "CoreGPIO_PATTERN"}),
+}
+
+
+def _number(value):
+    """int for integral values, float otherwise ("50" and "62.5" print back unchanged)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    text = str(value).strip()
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def normalize_options(ip: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Generator defaults overlaid with options, coerced to the type of each default."""
+    model = MODELS.get(ip)
+    if model is None:
+        raise ValueError(f"Unknown IP '{ip}' (known: {', '.join(MODELS)})")
+    opts = dict(model.defaults)
+    for key, value in options.items():
+        if key not in opts:
+            raise ValueError(f"Unknown option {key} for {ip} (options: {', '.join(model.defaults)})")
+        default = model.defaults[key]
+        try:
+            if key == "component_name":
+                opts[key] = str(value) if value else None
+            elif isinstance(default, str):
+                opts[key] = str(value)
+            elif isinstance(default, tuple):
+                opts[key] = tuple(value.replace(",", " ").split() if isinstance(value, str)
+                                  else (str(v) for v in value))
+            elif value is None or str(value).strip().lower() in ("", "none"):
+                if default is not None:
+                    raise ValueError
+                opts[key] = None
+            else:
+                opts[key] = _number(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid value {value!r} for {ip} option {key}") from None
+    return opts
+
+
+def render_variant(ip: str, options: Optional[Dict[str, Any]] = None) -> Variant:
+    """Render one component script from generator options."""
+    opts = normalize_options(ip, options or {})
+    return MODELS[ip].render(opts)
+
+
+def block_cache_info() -> Tuple[int, int]:
+    """(hits, misses) over every memoized block renderer."""
+    infos = [f.cache_info() for f in _BLOCK_CACHES]
+    return sum(i.hits for i in infos), sum(i.misses for i in infos)
+
+
+# ==============================================================================
+# Sweeps
+# ==============================================================================
+
+def _tag(value) -> str:
+    """Identifier-safe form of an option value: '200.0' -> '200', '62.5' -> '62p5', '4 KB' -> '4KB'."""
+    if isinstance(value, tuple):
+        return "".join(value)
+    text = re.sub(r'^(-?\d+)\.0+$', r'\1', str(value))
+    return re.sub(r'[^A-Za-z0-9]', '', text.replace('.', 'p'))
+
+
+def variant_name(ip: str, options: Dict[str, Any], axes: List[str]) -> str:
+    """Component name of a sweep variant.
+
+    A component_name option is used as a format string over the options;
+    otherwise the IP prefix is followed by the values of the swept axes.
+    """
+    if options.get("component_name"):
+        return options["component_name"].format(**options)
+    tags = (_tag(options[k]) for k in axes if k != "component_name" and options[k] is not None)
+    return "_".join([MODELS[ip].prefix] + [t for t in tags if t])
+
+
+def validate_spec(spec: Dict[str, Dict[str, Any]]):
+    for ip, axes in spec.items():
+        if ip not in MODELS:
+            raise ValueError(f"Unknown IP '{ip}' in spec (known: {', '.join(MODELS)})")
+        if not isinstance(axes, dict):
+            raise ValueError(f"Spec for {ip} must map options to value lists")
+        for key in axes:
+            if key not in MODELS[ip].defaults:
+                raise ValueError(f"Unknown option {key} for {ip} (options: {', '.join(MODELS[ip].defaults)})")
+
+
+def expand(spec: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any], List[str]]]:
+    """(ip, options, axes) for every point of each IP's Cartesian option space."""
+    for ip, axes in spec.items():
+        keys = list(axes)
+        values = [v if isinstance(v, list) else [v] for v in axes.values()]
+        for combo in itertools.product(*values):
+            yield ip, dict(zip(keys, combo)), keys
+
+
+@dataclass
+class SweepResult:
+    variants: Dict[str, int] = field(default_factory=dict)
+    configurations: Dict[str, int] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    written: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    render_seconds: float = 0.0
+    write_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """Write a file unless it already holds data (keeps mtimes of unchanged outputs)."""
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def _load_manifest(path: Path) -> Dict:
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if data.get('version') == MANIFEST_VERSION else {}
+
+
+def sweep(spec: Dict[str, Dict[str, Any]], out_dir, dedup: bool = True) -> SweepResult:
+    """Render every variant of spec and write the component scripts under out_dir/<ip>/."""
+    validate_spec(spec)
+    out_dir = Path(out_dir)
+    result = SweepResult()
+    hits0, misses0 = block_cache_info()
+    start = time.perf_counter()
+
+    files: Dict[str, Variant] = {}         # relpath -> variant that defines the file
+    by_digest: Dict[str, str] = {}         # configuration digest -> relpath
+    entries = []
+    for ip, combo, axes in expand(spec):
+        try:
+            opts = normalize_options(ip, combo)
+            opts["component_name"] = variant_name(ip, opts, axes)
+            variant = MODELS[ip].render(opts)
+        except (KeyError, IndexError, ValueError) as e:
+            described = ", ".join(f"{k}={v}" for k, v in combo.items())
+            result.skipped.append(f"{ip} {described}: {e}")
+            continue
+        result.variants[ip] = result.variants.get(ip, 0) + 1
+
+        rel = by_digest.get(variant.digest) if dedup else None
+        if rel is None:
+            rel = f"{ip}/{variant.component}.tcl"
+            if rel in files and files[rel].digest != variant.digest:
+                raise ValueError(f"Component name {variant.component} names two different {ip} configurations; "
+                                 f"sweep it with a component_name that includes the distinguishing options")
+            if rel not in files:
+                files[rel] = variant
+                result.configurations[ip] = result.configurations.get(ip, 0) + 1
+            by_digest.setdefault(variant.digest, rel)
+        entries.append({'ip': ip, 'options': opts, 'file': rel, 'component': files[rel].component,
+                        'digest': variant.digest, 'warnings': variant.warnings})
+
+    result.render_seconds = time.perf_counter() - start
+    hits, misses = block_cache_info()
+    result.cache_hits, result.cache_misses = hits - hits0, misses - misses0
+
+    start = time.perf_counter()
+    manifest_path = out_dir / MANIFEST_NAME
+    previous = {e['file'] for e in _load_manifest(manifest_path).get('variants', [])}
+    for rel, variant in files.items():
+        if _write_if_changed(out_dir / rel, variant.text.encode('utf-8')):
+            result.written += 1
+        else:
+            result.unchanged += 1
+    # Files of an earlier sweep into the same directory that this sweep no longer produces
+    for rel in sorted(previous - set(files)):
+        try:
+            (out_dir / rel).unlink()
+            result.removed += 1
+        except OSError:
+            pass
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump({'version': MANIFEST_VERSION, 'spec': spec, 'variants': entries}, f, indent=1)
+    os.replace(tmp, manifest_path)
+    result.write_seconds = time.perf_counter() - start
+    return result
+
+
+def print_sweep(result: SweepResult, out_dir):
+    print("=" * 70)
+    print(f"IP VARIANT SWEEP: {out_dir}")
+    print("=" * 70)
+    print(f"  {'IP':<8} {'Variants':>9} {'Files':>9}")
+    for ip, count in result.variants.items():
+        print(f"  {ip:<8} {count:>9} {result.configurations.get(ip, 0):>9}")
+    total = sum(result.variants.values())
+    print(f"  {'total':<8} {total:>9} {sum(result.configurations.values()):>9}")
+    print()
+    print(f"  Rendered {total} variants in {result.render_seconds:.2f}s "
+          f"(sub-blocks: {result.cache_hits} reused, {result.cache_misses} rendered)")
+    print(f"  Files: {result.written} written, {result.unchanged} unchanged, {result.removed} removed "
+          f"in {result.write_seconds:.2f}s (index: {MANIFEST_NAME})")
+    if result.skipped:
+        print(f"\n  Skipped {len(result.skipped)} invalid variants:")
+        for line in result.skipped[:10]:
+            print(f"    ✗ {line}")
+        if len(result.skipped) > 10:
+            print(f"    ... and {len(result.skipped) - 10} more")
+    print("=" * 70)
+
+
+# ==============================================================================
+# Template check
+# ==============================================================================
+
+def check_templates(templates_dir=TEMPLATES_DIR) -> Tuple[List[str], Dict[str, List[str]], List[str]]:
+    """Re-render the template library and compare it with the files.
+
+    Returns (matching, mismatching file -> diff lines, files without a model).
+    Line endings are not compared (the library mixes CRLF and LF files).
+    """
+    templates_dir = Path(templates_dir)
+    matching, mismatching = [], {}
+    for name, (ip, options) in TEMPLATES.items():
+        path = templates_dir / name
+        if not path.exists():
+            continue
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            expected = f.read().replace('\r\n', '\n')
+        actual = render_variant(ip, options).text
+        if actual == expected:
+            matching.append(name)
+        else:
+            mismatching[name] = list(difflib.unified_diff(expected.splitlines(), actual.splitlines(),
+                                                          f"{name} (file)", f"{name} (model)", lineterm="", n=1))
+    unmodelled = sorted(p.name for p in templates_dir.glob("*.tcl") if p.name not in TEMPLATES)
+    return matching, mismatching, unmodelled
+
+
+# ==============================================================================
+# CLI
+# ==============================================================================
+
+def _parse_assignments(items: List[str]) -> Dict[str, str]:
+    options = {}
+    for item in items:
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"Expected option=value, got '{item}'")
+        options[key.strip()] = value
+    return options
+
+
+def main():
+    args = sys.argv[1:]
+
+    def pop_option(name, default=None):
+        if name in args:
+            i = args.index(name)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        return default
+
+    def pop_all(name):
+        values = []
+        while name in args:
+            values.append(pop_option(name))
+        return values
+
+    usage = ("Usage:\n"
+             "  python3 ip_variants.py render <ip> [option=value ...]\n"
+             "  python3 ip_variants.py sweep <out_dir> [--spec FILE] [--ip uart,ddr4] "
+             "[--set ip.option=v1,v2 ...] [--no-dedup]\n"
+             "  python3 ip_variants.py check [<templates_dir>]")
+    if not args or args[0] not in ('render', 'sweep', 'check'):
+        print(usage, file=sys.stderr)
+        sys.exit(1)
+    command = args.pop(0)
+
+    try:
+        if command == 'render':
+            if not args:
+                print(usage, file=sys.stderr)
+                sys.exit(1)
+            variant = render_variant(args[0], _parse_assignments(args[1:]))
+            for warning in variant.warnings:
+                print(f"WARNING: {warning}", file=sys.stderr)
+            sys.stdout.write(variant.text)
+            sys.exit(0)
+
+        if command == 'check':
+            templates_dir = Path(args[0]) if args else TEMPLATES_DIR
+            matching, mismatching, unmodelled = check_templates(templates_dir)
+            print("=" * 70)
+            print(f"TEMPLATE CHECK: {templates_dir}")
+            print("=" * 70)
+            for name in sorted(matching + list(mismatching)):
+                print(f"  {'✗' if name in mismatching else '✓'} {name}")
+                for line in mismatching.get(name, [])[:20]:
+                    print(f"      {line}")
+            for name in unmodelled:
+                print(f"  - {name} (no model)")
+            print("=" * 70)
+            print(f"{len(matching)}/{len(matching) + len(mismatching)} templates match the Python models")
+            sys.exit(1 if mismatching else 0)
+
+        spec_file = pop_option('--spec')
+        ips = pop_option('--ip')
+        overrides = pop_all('--set')
+        dedup = '--no-dedup' not in args
+        args = [a for a in args if a != '--no-dedup']
+        if len(args) != 1:
+            print(usage, file=sys.stderr)
+            sys.exit(1)
+
+        if spec_file:
+            with open(spec_file, 'r') as f:
+                spec = json.load(f)
+        else:
+            spec = {ip: dict(axes) for ip, axes in DEFAULT_SPEC.items()}
+        for item in overrides:
+            target, sep, values = item.partition('=')
+            ip, dot, key = target.partition('.')
+            if not sep or not dot:
+                raise ValueError(f"Expected --set <ip>.<option>=<v1>,<v2>, got '{item}'")
+            spec.setdefault(ip, {})[key] = values.split(',')
+        if ips:
+            wanted = [ip.strip() for ip in ips.split(',')]
+            unknown = [ip for ip in wanted if ip not in MODELS]
+            if unknown:
+                raise ValueError(f"Unknown IP '{unknown[0]}' (known: {', '.join(MODELS)})")
+            spec = {ip: spec.get(ip, {}) for ip in wanted}
+
+        result = sweep(spec, args[0], dedup=dedup)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print_sweep(result, args[0])
+    sys.exit(0 if result.variants else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Libero project tree index
+
+Walks a project directory once with os.scandir, pruning directories that
+hold thousands of intermediate files (synwork, syntmp, simulation), and
+classifies every file into an artifact kind (project, synthesis log/report,
+layout log, pin report, component TCL, constraint, HDL, ...). The listing
+is cached in <project>/.project_index.json keyed on directory mtimes: a
+refresh stats each directory and only re-lists the ones whose mtime
+changed, so the tools can query the index instead of re-globbing the tree.
+
+A directory's mtime changes when entries are added, removed or renamed, not
+when a file's contents change; the index lists paths, not contents.
+
+Usage:
+    python3 project_index.py <project_dir>                 # artifact summary
+    python3 project_index.py <project_dir> <kind>          # files of one kind
+    python3 project_index.py <project_dir> --glob <pattern>
+
+Patterns are relative to the project directory; '*' does not cross '/',
+'**' matches any number of directories.
+"""
+
+import fnmatch
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_NAME = ".project_index.json"
+
+# Directories never descended into (tool scratch space, simulator runs, VCS)
+PRUNE_DIRS = frozenset(("synwork", "syntmp", "simulation", ".git", "__pycache__"))
+
+# (kind, pattern) in priority order; the first matching pattern wins
+ARTIFACT_RULES: Tuple[Tuple[str, str], ...] = (
+    ("project", "*.prjx"),
+    ("log_archive", "build_logs.lgz"),
+    ("synthesis_log", "synthesis/*.log"),
+    ("synthesis_report", "synthesis/*.srr"),
+    ("netlist", "synthesis/*.vm"),
+    ("layout_log", "designer/*/*_layout_log.log"),
+    ("designer_log", "designer/*/*.log"),
+    ("pin_report", "designer/*/*_pinrpt_*"),
+    ("memory_map", "designer/*/*memory_map*.json"),
+    ("report", "synthesis/*.rpt"),
+    ("report", "designer/*/*.rpt"),
+    ("report", "designer/*/*_Report.*"),
+    ("component_tcl", "component/work/*/*.tcl"),
+    ("component_tcl", "component/*/*/*/*/*.tcl"),
+    ("constraint", "**/*.sdc"),
+    ("constraint", "**/*.pdc"),
+    ("constraint", "**/*.fdc"),
+    ("constraint", "**/*.ndc"),
+    ("hdl", "hdl/**/*.v"),
+    ("hdl", "hdl/**/*.sv"),
+    ("hdl", "hdl/**/*.vh"),
+    ("hdl", "hdl/**/*.vhd"),
+    ("tcl", "**/*.tcl"),
+)
+
+# KEY ActiveRoot "counter::work" in the .prjx names the top-level design
+PRJX_ROOT_RE = re.compile(r'^KEY\s+ActiveRoot\s+"([^":]+)::')
+
+
+def match_path(pattern: str, relpath: str) -> bool:
+    """Match a POSIX relpath against a pattern ('*' within one part, '**' across parts)."""
+    return _match_parts(pattern.split('/'), relpath.split('/'))
+
+
+def _match_parts(pattern: List[str], parts: List[str]) -> bool:
+    if not pattern:
+        return not parts
+    if pattern[0] == '**':
+        return any(_match_parts(pattern[1:], parts[i:]) for i in range(len(parts) + 1))
+    return bool(parts) and fnmatch.fnmatchcase(parts[0], pattern[0]) and _match_parts(pattern[1:], parts[1:])
+
+
+def classify(relpath: str) -> str:
+    """Artifact kind of a file, 'other' if no rule matches."""
+    for kind, pattern in ARTIFACT_RULES:
+        if match_path(pattern, relpath):
+            return kind
+    return "other"
+
+
+class ProjectIndex:
+    """Cached, mtime-validated listing of a project tree.
+
+    dirs maps each directory (relative, '' for the root) to its mtime, its
+    files with their kind and its unpruned subdirectories.
+    """
+
+    def __init__(self, root, index_path=None):
+        self.root = Path(root)
+        self.index_path = Path(index_path) if index_path else self.root / DEFAULT_INDEX_NAME
+        self.dirs: Dict[str, Dict] = {}
+        self.prjx: Dict = {}
+        self._by_kind: Optional[Dict[str, List[str]]] = None
+        self._load()
+
+    def _load(self):
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Ignoring unreadable index {self.index_path}: {e}", file=sys.stderr)
+            return
+        if data.get('version') == INDEX_VERSION:
+            self.dirs = data.get('dirs', {})
+            self.prjx = data.get('prjx', {})
+
+    def save(self):
+        """Write the index back to disk.
+
+        Written in place, not renamed over: a rename would change the root
+        directory's mtime and force it to be re-listed on every refresh. A
+        torn write reads back as invalid JSON and only costs a full walk.
+        """
+        with open(self.index_path, 'w') as f:
+            json.dump({'version': INDEX_VERSION, 'dirs': self.dirs, 'prjx': self.prjx}, f, separators=(',', ':'))
+
+    def refresh(self) -> Tuple[int, int]:
+        """Bring the index up to date with the tree.
+
+        Returns (directories_listed, directories_reused).
+        """
+        listed = reused = 0
+        dirs = {}
+        pending = ['']
+        while pending:
+            rel = pending.pop()
+            path = os.path.join(self.root, rel)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+
+            entry = self.dirs.get(rel)
+            if entry and entry['mtime_ns'] == mtime_ns:
+                reused += 1
+            else:
+                entry = {'mtime_ns': mtime_ns, 'files': {}, 'dirs': []}
+                prefix = f"{rel}/" if rel else ""
+                try:
+                    with os.scandir(path) as it:
+                        for e in it:
+                            if e.is_dir(follow_symlinks=False):
+                                if e.name not in PRUNE_DIRS:
+                                    entry['dirs'].append(e.name)
+                            elif e.is_file() and e.name != self.index_path.name:
+                                entry['files'][e.name] = classify(prefix + e.name)
+                except OSError:
+                    continue
+                entry['dirs'].sort()
+                listed += 1
+
+            dirs[rel] = entry
+            pending.extend(f"{rel}/{d}" if rel else d for d in entry['dirs'])
+
+        self.dirs = dirs
+        self._by_kind = None
+        return listed, reused
+
+    def relpaths(self) -> List[str]:
+        """Every indexed file, relative to the root."""
+        return sorted(f"{rel}/{name}" if rel else name
+                      for rel, entry in self.dirs.items() for name in entry['files'])
+
+    def by_kind(self) -> Dict[str, List[str]]:
+        if self._by_kind is None:
+            by_kind: Dict[str, List[str]] = {}
+            for rel, entry in self.dirs.items():
+                for name, kind in entry['files'].items():
+                    by_kind.setdefault(kind, []).append(f"{rel}/{name}" if rel else name)
+            for paths in by_kind.values():
+                paths.sort()
+            self._by_kind = by_kind
+        return self._by_kind
+
+    def files(self, kind: str) -> List[Path]:
+        """Files of one artifact kind."""
+        return [self.root / p for p in self.by_kind().get(kind, [])]
+
+    def glob(self, pattern: str) -> List[Path]:
+        """Indexed files matching a project-relative pattern."""
+        parts = pattern.split('/')
+        if '**' not in parts:
+            # Only the one directory the pattern can match needs to be looked at
+            parent = '/'.join(parts[:-1])
+            if '*' not in parent and '?' not in parent and '[' not in parent:
+                entry = self.dirs.get(parent, {'files': {}})
+                prefix = f"{parent}/" if parent else ""
+                return [self.root / (prefix + n) for n in sorted(entry['files'])
+                        if fnmatch.fnmatchcase(n, parts[-1])]
+        return [self.root / p for p in self.relpaths() if match_path(pattern, p)]
+
+    def subdirs(self, rel: str) -> List[Path]:
+        """Indexed (unpruned) subdirectories of a project-relative directory."""
+        entry = self.dirs.get(rel)
+        prefix = f"{rel}/" if rel else ""
+        return [self.root / (prefix + d) for d in entry['dirs']] if entry else []
+
+    @property
+    def root_design(self) -> Optional[str]:
+        """Top-level design named by the .prjx ActiveRoot key (cached on its mtime)."""
+        projects = self.files("project")
+        if not projects:
+            return None
+        path = projects[0]
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        stamp = [path.name, st.st_mtime_ns, st.st_size]
+        if self.prjx.get('stamp') != stamp:
+            root = None
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    match = PRJX_ROOT_RE.match(line)
+                    if match:
+                        root = match.group(1)
+                        break
+            self.prjx = {'stamp': stamp, 'root': root}
+        return self.prjx.get('root')
+
+    def design_dirs(self) -> List[Path]:
+        """designer/<design> directories, best candidate first.
+
+        The .prjx ActiveRoot design comes first, then directories holding a
+        layout log (most recently written first), then the rest by name.
+        """
+        dirs = self.subdirs("designer")
+        root = self.root_design
+        layout = {p.parent.name: p.stat().st_mtime for p in self.files("layout_log") if p.exists()}
+
+        def rank(d: Path):
+            return (d.name != root, d.name not in layout, -layout.get(d.name, 0), d.name)
+
+        return sorted(dirs, key=rank)
+
+
+# Indexes refreshed during this process, keyed by resolved root
+_INDEXES: Dict[str, ProjectIndex] = {}
+
+
+def project_index(root, refresh: bool = False) -> ProjectIndex:
+    """The refreshed index of a project tree, shared by every caller in the process.
+
+    The tree is validated against the on-disk cache once per process (or
+    again with refresh=True); the cache is rewritten when anything changed.
+    """
+    key = str(Path(root).resolve())
+    index = _INDEXES.get(key)
+    if index is None or refresh:
+        index = index or ProjectIndex(root)
+        listed, _ = index.refresh()
+        prjx = index.prjx
+        index.root_design
+        if listed or index.prjx != prjx:
+            try:
+                index.save()
+            except OSError:
+                pass  # read-only checkout: keep the in-memory index
+        _INDEXES[key] = index
+    return index
+
+
+def find_projects(roots: Iterable) -> List[Path]:
+    """Libero project directories (holding a .prjx) under the given roots.
+
+    A root that is itself a project is returned as is. Otherwise the tree
+    is walked with os.scandir, skipping PRUNE_DIRS and not descending into
+    the projects it finds, so vendored component trees are never listed.
+    """
+    projects = set()
+    for root in roots:
+        pending = [str(Path(root).resolve())]
+        while pending:
+            path = pending.pop()
+            subdirs, is_project = [], False
+            try:
+                with os.scandir(path) as it:
+                    for e in it:
+                        if e.is_dir(follow_symlinks=False):
+                            if e.name not in PRUNE_DIRS:
+                                subdirs.append(e.path)
+                        elif e.name.endswith('.prjx'):
+                            is_project = True
+            except OSError:
+                continue
+            if is_project:
+                projects.add(Path(path))
+            else:
+                pending.extend(subdirs)
+    return sorted(projects)
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or not Path(args[0]).is_dir():
+        print("Usage: python3 project_index.py <project_dir> [<kind> | --glob <pattern>]", file=sys.stderr)
+        sys.exit(1)
+
+    index = ProjectIndex(args[0])
+    listed, reused = index.refresh()
+    index.root_design
+    try:
+        index.save()
+    except OSError as e:
+        print(f"WARNING: Could not save index: {e}", file=sys.stderr)
+
+    if len(args) >= 3 and args[1] == '--glob':
+        for path in index.glob(args[2]):
+            print(path)
+    elif len(args) >= 2:
+        for path in index.files(args[1]):
+            print(path)
+    else:
+        print(f"Directories: {listed} listed, {reused} reused from cache", file=sys.stderr)
+        for kind, paths in sorted(index.by_kind().items()):
+            print(f"  {kind:<18} {len(paths)}")
+        print(f"  root design: {index.root_design or '-'}")
+        for path in index.design_dirs():
+            print(f"  design dir: {path.relative_to(index.root)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Query the reference-design indexes in docs/ref_designs
+
+Compiles ip_config_index.json, ip_config_focus.json, custom_hdl_index.json
+and tcl_index.json into one compact on-disk index with inverted indexes on
+core name/VLNV, parameter key, parameter key=value, design, HDL module and
+Libero version. Values are indexed typed (1 == 1.0, 0 == false): '=='
+conditions are answered by the key=value index, range conditions filter
+the parameter-key postings with compare_value(). Each source JSON is
+fingerprinted (mtime + size); only sources that changed since the last run
+are recompiled.
+
+Usage:
+    python3 ref_design_query.py ip [--core <name>] [--param <cond>]... [--design <name>] [--libero <ver>]
+    python3 ref_design_query.py module <module_name>
+    python3 ref_design_query.py designs [--core <name>] [--libero <ver>]
+    python3 ref_design_query.py rebuild
+
+Examples:
+    python3 ref_design_query.py ip --core CoreUARTapb --param BAUD_VAL_FRCTN_EN
+    python3 ref_design_query.py ip --core PF_CCC --param "GL0_0_OUT_FREQ>=100"
+    python3 ref_design_query.py designs --libero 2024.2
+
+Note:
+    Parameter conditions use the component_tcl.py syntax (KEY, KEY==VALUE,
+    KEY>N ...). The compiled index is written to
+    docs/ref_designs/.ref_design_index.json (override with --index <path>,
+    and point at another corpus with --source-dir <dir>).
+"""
+
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from component_tcl import compare_value, parse_condition, parse_param_strings, value_key
+
+
+INDEX_VERSION = 3
+
+DEFAULT_SOURCE_DIR = Path(__file__).resolve().parent.parent / "docs" / "ref_designs"
+DEFAULT_INDEX_NAME = ".ref_design_index.json"
+
+# Source file -> section kind
+SOURCES = {
+    "ip_config_index.json": "ip",
+    "ip_config_focus.json": "ip",
+    "custom_hdl_index.json": "hdl",
+    "tcl_index.json": "tcl",
+}
+
+_VERSION_RE = re.compile(r'v?(\d{4}\.\d+|\d{1,2}\.\d+)\s*$', re.IGNORECASE)
+
+
+@dataclass
+class IpRecord:
+    """One configured core instance from a reference design."""
+    design: str
+    file: str
+    component: str
+    core_vlnv: str
+    params: Dict[str, Any]
+
+    @property
+    def core_name(self) -> str:
+        return _core_name(self.core_vlnv)
+
+
+def normalize_libero_version(text: Optional[str]) -> Optional[str]:
+    """Reduce 'Libero SoC Version : Libero SoC  v2024.1' to '2024.1'."""
+    if not text:
+        return None
+    m = _VERSION_RE.search(text.strip())
+    return m.group(1) if m else None
+
+
+def _core_name(vlnv: str) -> str:
+    parts = vlnv.split(':')
+    return parts[2] if len(parts) > 2 else vlnv
+
+
+def _add(index: Dict[str, List[int]], key: str, rec_id: int):
+    postings = index.setdefault(key, [])
+    if not postings or postings[-1] != rec_id:
+        postings.append(rec_id)
+
+
+def compile_ip_section(data: Dict) -> Dict:
+    """Compile an ip_config_*.json blob into records plus inverted indexes."""
+    records = []
+    by_core: Dict[str, List[int]] = {}
+    by_vlnv: Dict[str, List[int]] = {}
+    by_param: Dict[str, List[int]] = {}
+    by_param_value: Dict[str, List[int]] = {}
+    by_design: Dict[str, List[int]] = {}
+
+    for design in sorted(data):
+        for entry in data[design]:
+            raw = entry.get("params") or []
+            params = parse_param_strings(raw) if isinstance(raw, list) else dict(raw)
+            vlnv = entry.get("core_vlnv", "")
+            rec_id = len(records)
+            # Records are stored as compact rows: design, file, component, vlnv, params
+            records.append([design, entry.get("file", ""), entry.get("component", ""), vlnv, params])
+
+            _add(by_core, _core_name(vlnv).lower(), rec_id)
+            _add(by_vlnv, vlnv.lower(), rec_id)
+            _add(by_design, design.lower(), rec_id)
+            for key, value in params.items():
+                _add(by_param, key, rec_id)
+                _add(by_param_value, f"{key}={value_key(value)}", rec_id)
+
+    return {
+        "records": records,
+        "by_core": by_core,
+        "by_vlnv": by_vlnv,
+        "by_param": by_param,
+        "by_param_value": by_param_value,
+        "by_design": by_design,
+    }
+
+
+def compile_hdl_section(data: Dict) -> Dict:
+    """Compile custom_hdl_index.json into module -> [[design, file]]."""
+    by_module: Dict[str, List[List[str]]] = {}
+    for design in sorted(data):
+        for module, files in data[design].items():
+            for file in files:
+                by_module.setdefault(module.lower(), []).append([design, module, file])
+    return {"by_module": by_module}
+
+
+def compile_tcl_section(data: List) -> Dict:
+    """Compile tcl_index.json into per-design info and version -> designs."""
+    designs = {}
+    by_version: Dict[str, List[str]] = {}
+    for entry in data:
+        design = entry.get("design")
+        if not design:
+            continue
+        version = normalize_libero_version(entry.get("libero_version"))
+        designs[design] = {
+            "libero_version": version,
+            "entry_candidates": entry.get("entry_candidates", []),
+            "tcl_file_count": entry.get("tcl_file_count", 0),
+        }
+        if version:
+            by_version.setdefault(version, []).append(design)
+    return {"designs": designs, "by_version": by_version}
+
+
+COMPILERS = {
+    "ip": compile_ip_section,
+    "hdl": compile_hdl_section,
+    "tcl": compile_tcl_section,
+}
+
+
+class RefDesignIndex:
+    """Compiled, incrementally rebuilt index over the ref_designs JSON."""
+
+    def __init__(self, source_dir=DEFAULT_SOURCE_DIR, index_path=None):
+        self.source_dir = Path(source_dir)
+        self.index_path = Path(index_path) if index_path else self.source_dir / DEFAULT_INDEX_NAME
+        self.sections: Dict[str, Dict] = {}
+        self.rebuilt: List[str] = []
+        self._load()
+        self.refresh()
+
+    def _load(self):
+        if not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Ignoring unreadable index {self.index_path}: {e}", file=sys.stderr)
+            return
+        if data.get("version") == INDEX_VERSION:
+            self.sections = data.get("sections", {})
+
+    def refresh(self, force: bool = False) -> List[str]:
+        """Recompile sources whose fingerprint changed. Returns their names."""
+        self.rebuilt = []
+        for name, kind in SOURCES.items():
+            path = self.source_dir / name
+            if not path.exists():
+                if self.sections.pop(name, None) is not None:
+                    self.rebuilt.append(name)
+                continue
+
+            st = os.stat(path)
+            stamp = [st.st_mtime_ns, st.st_size]
+            section = self.sections.get(name)
+            if not force and section and section.get("stamp") == stamp:
+                continue
+
+            with open(path, 'r') as f:
+                data = json.load(f)
+            section = COMPILERS[kind](data)
+            section["stamp"] = stamp
+            section["kind"] = kind
+            self.sections[name] = section
+            self.rebuilt.append(name)
+
+        if self.rebuilt:
+            self.save()
+        return self.rebuilt
+
+    def save(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(self.index_path.suffix + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": INDEX_VERSION, "sections": self.sections}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+    def _sections(self, kind: str) -> List[Dict]:
+        return [s for s in self.sections.values() if s.get("kind") == kind]
+
+    def design_versions(self) -> Dict[str, Optional[str]]:
+        """Map design -> normalized Libero version (from tcl_index.json)."""
+        versions = {}
+        for section in self._sections("tcl"):
+            for design, info in section["designs"].items():
+                versions[design] = info["libero_version"]
+        return versions
+
+    def query_ip(self, core: Optional[str] = None, params: Optional[List[str]] = None,
+                 design: Optional[str] = None, libero: Optional[str] = None) -> List[IpRecord]:
+        """Return configured core instances matching every given filter.
+
+        Args:
+            core: Core name (CoreUARTapb) or VLNV substring
+            params: Condition strings, e.g. ["BAUD_VALUE==1", "RX_FIFO"]
+            design: Design name (exact, case-insensitive)
+            libero: Libero version, e.g. "2024.2" or "v2024.2"
+        """
+        conditions = [parse_condition(p) for p in (params or [])]
+        libero = normalize_libero_version(libero) if libero else None
+        versions = self.design_versions() if libero else {}
+
+        results = []
+        seen = set()
+        for section in self._sections("ip"):
+            candidates = self._ip_candidates(section, core, conditions, design)
+            records = section["records"]
+            for rec_id in sorted(candidates):
+                row = records[rec_id]
+                key = (row[0], row[1], row[2])
+                if key in seen:
+                    continue
+                if libero and versions.get(row[0]) != libero:
+                    continue
+                # '==' candidates are exact already (key=value postings)
+                if not all(op == '==' or k in row[4] and compare_value(row[4][k], op, v)
+                           for k, op, v in conditions):
+                    continue
+                seen.add(key)
+                results.append(IpRecord(*row))
+
+        return sorted(results, key=lambda r: (r.design, r.component))
+
+    def _ip_candidates(self, section: Dict, core: Optional[str],
+                       conditions: List, design: Optional[str]) -> Set[int]:
+        """Intersect the inverted-index postings for the given filters."""
+        postings: List[List[int]] = []
+
+        if core:
+            needle = core.lower()
+            ids = section["by_core"].get(needle)
+            if ids is None:
+                ids = [i for vlnv, vids in section["by_vlnv"].items() if needle in vlnv for i in vids]
+            postings.append(ids)
+
+        if design:
+            postings.append(section["by_design"].get(design.lower(), []))
+
+        # Range conditions are checked by compare_value() in query_ip()
+        for key, op, value in conditions:
+            if op == '==':
+                postings.append(section["by_param_value"].get(f"{key}={value_key(value)}", []))
+            else:
+                postings.append(section["by_param"].get(key, []))
+
+        if not postings:
+            return set(range(len(section["records"])))
+
+        postings.sort(key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result.intersection_update(ids)
+            if not result:
+                break
+        return result
+
+    def query_module(self, module: str) -> List[List[str]]:
+        """Return [design, module, file] rows for a custom HDL module name."""
+        rows = []
+        for section in self._sections("hdl"):
+            rows.extend(section["by_module"].get(module.lower(), []))
+        return rows
+
+    def query_designs(self, core: Optional[str] = None, libero: Optional[str] = None) -> List[str]:
+        """Return design names using a core and/or built with a Libero version."""
+        designs: Optional[Set[str]] = None
+
+        if libero:
+            version = normalize_libero_version(libero)
+            designs = set()
+            for section in self._sections("tcl"):
+                designs.update(section["by_version"].get(version, []))
+
+        if core:
+            with_core = {r.design for r in self.query_ip(core=core)}
+            designs = with_core if designs is None else designs & with_core
+
+        if designs is None:
+            designs = set(self.design_versions())
+            for section in self._sections("ip"):
+                designs.update(row[0] for row in section["records"])
+
+        return sorted(designs)
+
+
+def main():
+    args = sys.argv[1:]
+
+    def pop_option(name, multiple=False):
+        values = []
+        while name in args:
+            i = args.index(name)
+            if i + 1 >= len(args):
+                print(f"ERROR: {name} requires a value")
+                sys.exit(1)
+            values.append(args[i + 1])
+            del args[i:i + 2]
+        if multiple:
+            return values
+        return values[-1] if values else None
+
+    index_path = pop_option('--index')
+    source_dir = pop_option('--source-dir') or DEFAULT_SOURCE_DIR
+    core = pop_option('--core')
+    params = pop_option('--param', multiple=True)
+    design = pop_option('--design')
+    libero = pop_option('--libero')
+
+    if not args or args[0] not in ('ip', 'module', 'designs', 'rebuild'):
+        print("Usage:")
+        print("  python3 ref_design_query.py ip [--core <name>] [--param <cond>]... [--design <name>] [--libero <ver>]")
+        print("  python3 ref_design_query.py module <module_name>")
+        print("  python3 ref_design_query.py designs [--core <name>] [--libero <ver>]")
+        print("  python3 ref_design_query.py rebuild")
+        print("")
+        print("Example:")
+        print("  python3 ref_design_query.py ip --core CoreUARTapb --param BAUD_VAL_FRCTN_EN")
+        sys.exit(1)
+
+    if not Path(source_dir).is_dir():
+        print(f"ERROR: Source directory not found: {source_dir}")
+        sys.exit(1)
+
+    index = RefDesignIndex(source_dir, index_path)
+    command = args[0]
+
+    if command == 'rebuild':
+        rebuilt = index.refresh(force=True)
+        print(f"Rebuilt {len(rebuilt)} section(s): {', '.join(rebuilt)}")
+        print(f"Index: {index.index_path}")
+        sys.exit(0)
+
+    if index.rebuilt:
+        print(f"Recompiled: {', '.join(index.rebuilt)}", file=sys.stderr)
+
+    if command == 'ip':
+        try:
+            results = index.query_ip(core=core, params=params, design=design, libero=libero)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        keys = [parse_condition(p)[0] for p in params]
+        for r in results:
+            shown = ', '.join(f"{k}={r.params[k]}" for k in keys if k in r.params)
+            print(f"{r.design:<32} {r.component:<28} {r.core_vlnv:<45} {shown}")
+        print(f"{len(results)} match(es)", file=sys.stderr)
+        sys.exit(0 if results else 1)
+
+    if command == 'module':
+        if len(args) < 2:
+            print("ERROR: module requires a module name")
+            sys.exit(1)
+        rows = index.query_module(args[1])
+        for design_name, module, file in rows:
+            print(f"{design_name:<32} {module:<24} {file}")
+        print(f"{len(rows)} match(es)", file=sys.stderr)
+        sys.exit(0 if rows else 1)
+
+    designs = index.query_designs(core=core, libero=libero)
+    versions = index.design_versions()
+    for name in designs:
+        print(f"{name:<40} {versions.get(name) or '-'}")
+    print(f"{len(designs)} design(s)", file=sys.stderr)
+    sys.exit(0 if designs else 1)
+
+
+if __name__ == "__main__":
+    main()
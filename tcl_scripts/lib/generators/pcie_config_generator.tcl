@@ -42,10 +42,16 @@ proc generate_pcie_endpoint {args} {
         return
     }
 
+    # Map speed to description
+    set speed_desc "5.0 Gbps"
+    if {$opts(-speed) eq "Gen1"} {
+        set speed_desc "2.5 Gbps"
+    }
+
     # Generate configuration
     set config "# Exporting Component Description of $opts(-component_name) to TCL\n"
     append config "# Auto-generated by PCIe Configuration Generator\n"
-    append config "# Configuration: Endpoint, $lane_config lanes, $opts(-speed) (2.5 Gbps)\n"
+    append config "# Configuration: Endpoint, $lane_config lanes, $opts(-speed) ($speed_desc)\n"
     append config "# BAR0: $opts(-bar0_size), Device ID: $opts(-device_id)\n"
     append config "# Family: PolarFire or PolarFireSoC\n"
     append config "create_and_configure_core -core_vlnv {Actel:SgCore:PF_PCIE:*} -component_name {$opts(-component_name)} -params {\\\n"
@@ -71,7 +77,7 @@ proc generate_pcie_endpoint {args} {
     append config "\"UI_PCIE_0_L1_ACC_LATENCY:No limit\"  \\\n"
     append config "\"UI_PCIE_0_L1_ENABLE:Disabled\"  \\\n"
     append config "\"UI_PCIE_0_L1_EXIT_LATENCY:16 us to less than 32 us\"  \\\n"
-    append config "\"UI_PCIE_0_LANE_RATE:$opts(-speed) (2.5 Gbps)\"  \\\n"
+    append config "\"UI_PCIE_0_LANE_RATE:$opts(-speed) ($speed_desc)\"  \\\n"
 
     # BAR configuration (BAR0 enabled, others disabled)
     append config "\"UI_PCIE_0_MASTER_SIZE_BAR_0_TABLE:$opts(-bar0_size)\"  \\\n"
@@ -129,7 +135,7 @@ proc generate_pcie_endpoint {args} {
         close $fp
         puts "Generated PCIe Endpoint configuration: $opts(-output_file)"
         puts "  Lanes: $lane_config"
-        puts "  Speed: $opts(-speed) (2.5 Gbps)"
+        puts "  Speed: $opts(-speed) ($speed_desc)"
         puts "  BAR0: $opts(-bar0_size)"
         puts "  Device ID: $opts(-device_id), Vendor ID: $opts(-vendor_id)"
     } else {
@@ -1,6 +1,6 @@
 # Exporting Component Description of PF_PCIE_EP_X4 to TCL
 # Auto-generated by PCIe Configuration Generator
-# Configuration: Endpoint, x4 lanes, Gen2 (2.5 Gbps)
+# Configuration: Endpoint, x4 lanes, Gen2 (5.0 Gbps)
 # BAR0: 1 MB, Device ID: 0x1556
 # Family: PolarFire or PolarFireSoC
 create_and_configure_core -core_vlnv {Actel:SgCore:PF_PCIE:*} -component_name {PF_PCIE_EP_X4} -params {\
@@ -22,7 +22,7 @@ create_and_configure_core -core_vlnv {Actel:SgCore:PF_PCIE:*} -component_name {P
 "UI_PCIE_0_L1_ACC_LATENCY:No limit"  \
 "UI_PCIE_0_L1_ENABLE:Disabled"  \
 "UI_PCIE_0_L1_EXIT_LATENCY:16 us to less than 32 us"  \
-"UI_PCIE_0_LANE_RATE:Gen2 (2.5 Gbps)"  \
+"UI_PCIE_0_LANE_RATE:Gen2 (5.0 Gbps)"  \
 "UI_PCIE_0_MASTER_SIZE_BAR_0_TABLE:1 MB"  \
 "UI_PCIE_0_MASTER_TYPE_BAR_0_TABLE:64-bit prefetchable memory"  \
 "UI_PCIE_0_MASTER_SIZE_BAR_1_TABLE:4 KB"  \
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Stage-Level Build Cache
+
+Content-addressed cache for Libero build stages. Each stage is keyed by a
+fingerprint of its inputs, chained to the previous stage's key:
+
+    SYNTHESIZE   hdl/**, constraint/**, component TCLs (project
+                 component/work and tcl_scripts/miv_components), the Libero
+                 version from libero_setup_info.txt, the project options
+                 from the .prjx
+    PLACEROUTE   SYNTHESIZE key + constraint/**
+    GENERATEPROGRAMMINGFILE
+                 PLACEROUTE key
+
+Keys are taken from sources, constraints and options only, never from files
+a stage writes (synthesis/run_options.txt, the designer/*/*.pdc P&R derives,
+the output files and run states Libero records in the .prjx), so the key
+computed before a build is the key its outputs are stored under.
+
+On a hit the stage outputs (synthesis/*.vm, designer reports, ...) are
+restored from the local store instead of re-running the tool. Output files
+are stored once per content hash (objects/ab/abcdef...), and entries are
+evicted least-recently-used when the store exceeds its size bound. Stores,
+restores and evictions hold a lock (per process, plus a lock file in the
+cache root across processes), so parallel scheduler jobs can share a cache.
+
+Usage:
+    python build_cache.py key <project_dir>
+    python build_cache.py store <project_dir> [--stage SYNTHESIZE ...]
+    python build_cache.py restore <project_dir> [--stage SYNTHESIZE ...]
+    python build_cache.py stats
+    python build_cache.py evict [--max-size 5G]
+
+Environment:
+    TCL_MONSTER_BUILD_CACHE      store location (default <repo>/.build_cache)
+    TCL_MONSTER_BUILD_CACHE_MAX  size bound, e.g. 5G, 500M (default 5G)
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+
+CACHE_VERSION = 1
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_DIR = REPO_ROOT / ".build_cache"
+DEFAULT_MAX_BYTES = 5 * 2**30
+LOCK_NAME = ".lock"
+
+# Unreferenced objects younger than this may belong to a store in progress
+OBJECT_GRACE_SECONDS = 600
+
+HDL_PATTERNS = ("hdl/**/*.v", "hdl/**/*.sv", "hdl/**/*.vh", "hdl/**/*.vhd")
+CONSTRAINT_PATTERNS = ("constraint/**/*.sdc", "constraint/**/*.pdc", "constraint/**/*.fdc", "constraint/**/*.ndc")
+COMPONENT_PATTERNS = ("component/work/*/*.tcl",)
+REPO_COMPONENT_PATTERNS = ("tcl_scripts/miv_components/*.tcl",)
+
+LIBERO_VERSION_RE = re.compile(r'^Libero (?:Release|Version)\s*:.*$', re.MULTILINE)
+
+# .prjx lines that record build state or machine paths rather than options
+PRJX_VOLATILE_RE = re.compile(
+    r'^(?:KEY (?:ProjectLocation|DEFAULT_IMPORT_LOC|DEFAULT_OPEN_LOC)\b|(?:STATE|TIME|SIZE)=|.*\)=State\w*$'
+    r'|FILE "<project>\\(?:synthesis|designer)\\)')
+
+SIZE_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*([KMGT]?)B?$', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """Inputs and outputs of one cacheable stage (patterns relative to the project)."""
+    name: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    previous: Optional[str] = None
+
+
+STAGES = {
+    "SYNTHESIZE": StageSpec(
+        name="SYNTHESIZE",
+        inputs=HDL_PATTERNS + CONSTRAINT_PATTERNS + COMPONENT_PATTERNS,
+        outputs=(
+            "synthesis/*.vm", "synthesis/*.srr", "synthesis/*_vm.sdc", "synthesis/synplify.log",
+            "synthesis/run_options.txt", "synthesis/synlog/report/*",
+        ),
+    ),
+    "PLACEROUTE": StageSpec(
+        name="PLACEROUTE",
+        inputs=CONSTRAINT_PATTERNS,
+        outputs=(
+            "designer/*/*_layout_log.log", "designer/*/*.rpt", "designer/*/*.xml",
+            "designer/*/*_pinrpt_*.csv", "designer/*/*.csv", "designer/*/*.adl",
+            "designer/*/*.afl", "designer/*/*.loc", "designer/*/*.seg",
+        ),
+        previous="SYNTHESIZE",
+    ),
+    "GENERATEPROGRAMMINGFILE": StageSpec(
+        name="GENERATEPROGRAMMINGFILE",
+        inputs=(),
+        outputs=("designer/*/*.ppd", "designer/*/*.stp", "designer/*/*.job", "designer/*/export/*"),
+        previous="PLACEROUTE",
+    ),
+}
+
+
+@dataclass
+class CacheEntry:
+    """Manifest of one cached stage result."""
+    stage: str
+    key: str
+    files: Dict[str, str] = field(default_factory=dict)   # relpath -> sha256
+    size: int = 0
+    created: float = 0.0
+    last_used: float = 0.0
+
+
+def parse_size(text: str) -> int:
+    """'5G' -> bytes."""
+    match = SIZE_RE.match(text.strip())
+    if not match:
+        raise ValueError(f"Invalid size: {text}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " KMGT".index(unit.upper() or " "))
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _glob(root: Path, patterns: Iterable[str]) -> List[Path]:
+    files = set()
+    for pattern in patterns:
+        files.update(p for p in root.glob(pattern) if p.is_file())
+    return sorted(files)
+
+
+def libero_version(project_dir: Path) -> str:
+    """Tool version lines from libero_setup_info.txt (the rest changes every run)."""
+    path = project_dir / "libero_setup_info.txt"
+    try:
+        text = path.read_text(encoding='utf-8', errors='ignore')
+    except OSError:
+        return ""
+    return "\n".join(LIBERO_VERSION_RE.findall(text))
+
+
+def project_options(project_dir: Path) -> str:
+    """Project and tool settings from the .prjx.
+
+    The file list (LIST FileManager) is left out: Libero adds the synthesis
+    outputs to it and stamps every entry with a state and time. Source file
+    contents are hashed separately.
+    """
+    lines = []
+    for path in sorted(project_dir.glob("*.prjx")):
+        try:
+            text = path.read_text(encoding='utf-8', errors='ignore')
+        except OSError:
+            continue
+        in_files = False
+        for line in text.splitlines():
+            line = line.strip()
+            if line == "LIST FileManager":
+                in_files = True
+            elif in_files:
+                in_files = line != "ENDLIST"
+            elif line and not PRJX_VOLATILE_RE.match(line):
+                lines.append(line)
+    return "\n".join(lines)
+
+
+class BuildCache:
+    """Content-addressed, size-bounded store of stage outputs."""
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: Optional[int] = None,
+                 repo_root: Path = REPO_ROOT):
+        self.root = Path(root or os.environ.get("TCL_MONSTER_BUILD_CACHE", DEFAULT_CACHE_DIR))
+        env_max = os.environ.get("TCL_MONSTER_BUILD_CACHE_MAX")
+        self.max_bytes = max_bytes or (parse_size(env_max) if env_max else DEFAULT_MAX_BYTES)
+        self.repo_root = Path(repo_root)
+        self.objects = self.root / "objects"
+        self.entries = self.root / "entries"
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive access to the store, across threads and processes."""
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / LOCK_NAME, 'a') as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                yield  # closing the file releases the flock
+
+    # Fingerprints
+
+    def fingerprint(self, project_dir: Path, stage: str,
+                    _keys: Optional[Dict[str, str]] = None) -> str:
+        """Cache key of a stage for the project's current inputs."""
+        keys = {} if _keys is None else _keys
+        if stage in keys:
+            return keys[stage]
+
+        spec = STAGES[stage]
+        project_dir = Path(project_dir)
+        h = hashlib.sha256()
+        h.update(f"v{CACHE_VERSION}:{stage}\n".encode())
+        if spec.previous:
+            h.update(f"previous:{self.fingerprint(project_dir, spec.previous, keys)}\n".encode())
+
+        for path in _glob(project_dir, spec.inputs):
+            h.update(f"{path.relative_to(project_dir).as_posix()}:{file_digest(path)}\n".encode())
+
+        if stage == "SYNTHESIZE":
+            for path in _glob(self.repo_root, REPO_COMPONENT_PATTERNS):
+                h.update(f"repo/{path.relative_to(self.repo_root).as_posix()}:{file_digest(path)}\n".encode())
+            h.update(f"libero:{libero_version(project_dir)}\n".encode())
+            h.update(f"options:{project_options(project_dir)}\n".encode())
+
+        keys[stage] = h.hexdigest()
+        return keys[stage]
+
+    def fingerprints(self, project_dir: Path, stages: Iterable[str] = STAGES) -> Dict[str, str]:
+        keys: Dict[str, str] = {}
+        for stage in stages:
+            self.fingerprint(project_dir, stage, keys)
+        return {stage: keys[stage] for stage in stages}
+
+    # Store
+
+    def _entry_path(self, stage: str, key: str) -> Path:
+        return self.entries / stage / f"{key}.json"
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def lookup(self, stage: str, key: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._entry_path(stage, key), 'r') as f:
+                return CacheEntry(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _write_entry(self, entry: CacheEntry):
+        path = self._entry_path(entry.stage, entry.key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(entry.__dict__, f, indent=1)
+        os.replace(tmp, path)
+
+    def store(self, project_dir: Path, stage: str, key: Optional[str] = None,
+              allow_empty: bool = False) -> Optional[CacheEntry]:
+        """Store a stage's outputs from the project.
+
+        Returns None if the stage has no outputs, unless allow_empty is set
+        (the caller saw the stage succeed, so an empty result is still a hit).
+        """
+        project_dir = Path(project_dir)
+        key = key or self.fingerprint(project_dir, stage)
+        outputs = _glob(project_dir, STAGES[stage].outputs)
+        if not outputs and not allow_empty:
+            return None
+
+        now = time.time()
+        entry = CacheEntry(stage=stage, key=key, created=now, last_used=now)
+        with self._locked():
+            for path in outputs:
+                digest = file_digest(path)
+                target = self._object_path(digest)
+                if not target.exists():
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = target.with_suffix('.tmp')
+                    shutil.copyfile(path, tmp)
+                    os.replace(tmp, target)
+                entry.files[path.relative_to(project_dir).as_posix()] = digest
+                entry.size += path.stat().st_size
+
+            self._write_entry(entry)
+            self._evict(self.max_bytes)
+        return entry
+
+    def restore(self, project_dir: Path, stage: str, key: Optional[str] = None) -> bool:
+        """Restore a stage's outputs into the project. False on a miss."""
+        project_dir = Path(project_dir)
+        key = key or self.fingerprint(project_dir, stage)
+        with self._locked():
+            entry = self.lookup(stage, key)
+            if entry is None:
+                return False
+            if not all(self._object_path(d).exists() for d in entry.files.values()):
+                return False
+
+            for rel, digest in entry.files.items():
+                target = project_dir / rel
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(self._object_path(digest), target)
+
+            entry.last_used = time.time()
+            self._write_entry(entry)
+        return True
+
+    def restore_all(self, project_dir: Path, stages: Iterable[str],
+                    keys: Optional[Dict[str, str]] = None) -> bool:
+        """Restore a chain of stages; True only if every stage hit."""
+        stages = list(stages)
+        keys = dict(keys) if keys else {}
+        for stage in stages:
+            self.fingerprint(project_dir, stage, keys)
+        if not all(self.lookup(stage, keys[stage]) for stage in stages):
+            return False
+        return all(self.restore(project_dir, stage, keys[stage]) for stage in stages)
+
+    # Eviction
+
+    def _all_entries(self) -> List[CacheEntry]:
+        entries = []
+        for path in self.entries.glob("*/*.json"):
+            try:
+                with open(path, 'r') as f:
+                    entries.append(CacheEntry(**json.load(f)))
+            except (OSError, ValueError, TypeError):
+                continue
+        return entries
+
+    def _object_sizes(self) -> Dict[str, int]:
+        return {p.name: p.stat().st_size for p in self.objects.glob("*/*") if p.suffix != '.tmp'}
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Drop least-recently-used entries until the store fits. Returns bytes freed."""
+        with self._locked():
+            return self._evict(self.max_bytes if max_bytes is None else max_bytes)
+
+    def _evict(self, limit: int) -> int:
+        objects = self._object_sizes()
+        total = sum(objects.values())
+        if total <= limit:
+            return 0
+
+        entries = sorted(self._all_entries(), key=lambda e: e.last_used)
+        refs: Dict[str, int] = {}
+        for entry in entries:
+            for digest in entry.files.values():
+                refs[digest] = refs.get(digest, 0) + 1
+
+        freed = 0
+        # Unreferenced objects first (interrupted stores); recent ones may
+        # still be recorded by a store that does not hold the lock
+        cutoff = time.time() - OBJECT_GRACE_SECONDS
+        for digest in [d for d in objects if d not in refs]:
+            path = self._object_path(digest)
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+            except FileNotFoundError:
+                objects.pop(digest)
+                continue
+            path.unlink(missing_ok=True)
+            freed += objects.pop(digest)
+
+        for entry in entries:
+            if total - freed <= limit:
+                break
+            self._entry_path(entry.stage, entry.key).unlink(missing_ok=True)
+            for digest in entry.files.values():
+                refs[digest] -= 1
+                if refs[digest] == 0 and digest in objects:
+                    self._object_path(digest).unlink(missing_ok=True)
+                    freed += objects.pop(digest)
+        return freed
+
+    def stats(self) -> Dict[str, object]:
+        entries = self._all_entries()
+        objects = self._object_sizes()
+        per_stage: Dict[str, int] = {}
+        for entry in entries:
+            per_stage[entry.stage] = per_stage.get(entry.stage, 0) + 1
+        return {
+            "root": str(self.root),
+            "entries": len(entries),
+            "per_stage": per_stage,
+            "objects": len(objects),
+            "bytes": sum(objects.values()),
+            "logical_bytes": sum(e.size for e in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+def main():
+    """Main entry point."""
+    args = sys.argv[1:]
+    stages = []
+    while '--stage' in args:
+        i = args.index('--stage')
+        stages.append(args[i + 1].upper())
+        del args[i:i + 2]
+    max_size = None
+    if '--max-size' in args:
+        i = args.index('--max-size')
+        max_size = parse_size(args[i + 1])
+        del args[i:i + 2]
+
+    if not args or args[0] not in ('key', 'store', 'restore', 'stats', 'evict'):
+        print("Usage: python build_cache.py key|store|restore <project_dir> [--stage NAME ...]")
+        print("   or: python build_cache.py stats | evict [--max-size 5G]")
+        sys.exit(1)
+
+    cache = BuildCache()
+    command = args[0]
+
+    if command == 'stats':
+        for name, value in cache.stats().items():
+            print(f"{name + ':':<16} {value}")
+        return
+    if command == 'evict':
+        freed = cache.evict(max_size)
+        print(f"Freed {freed:,} bytes")
+        return
+
+    if len(args) < 2 or not Path(args[1]).is_dir():
+        print("ERROR: project directory required")
+        sys.exit(1)
+    project_dir = Path(args[1])
+    stages = stages or list(STAGES)
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        print(f"ERROR: Unknown stage(s): {', '.join(unknown)} (known: {', '.join(STAGES)})")
+        sys.exit(1)
+
+    keys = cache.fingerprints(project_dir, stages)
+    if command == 'key':
+        for stage, key in keys.items():
+            print(f"{stage:<24} {key}")
+    elif command == 'store':
+        for stage in stages:
+            entry = cache.store(project_dir, stage, keys[stage])
+            if entry:
+                print(f"Stored {stage}: {len(entry.files)} file(s), {entry.size:,} bytes")
+            else:
+                print(f"Skipped {stage}: no outputs")
+    elif command == 'restore':
+        missed = []
+        for stage in stages:
+            if cache.restore(project_dir, stage, keys[stage]):
+                print(f"Restored {stage}")
+            else:
+                missed.append(stage)
+                print(f"Miss {stage}")
+        sys.exit(1 if missed else 0)
+
+
+if __name__ == '__main__':
+    main()
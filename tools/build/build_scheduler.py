@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Libero Build Scheduler
+
+Runs a queue of Libero batch jobs (TCL script + args + project) concurrently
+on one host instead of one after another as run_libero.sh does:
+
+- Bounded worker pool
+- Per-host caps on Libero licenses, CPUs and memory; a job only starts when
+  its declared demand fits (and, on Linux, when MemAvailable allows it)
+- stdout/stderr of every job captured to <log_dir>/<job>.log
+- As each stage (Synthesis, Place and Route, ...) finishes, the project's
+  Synplify / P&R logs are parsed with LogParser and a hook is called
+- With --cache, jobs whose every run_tool stage hits the stage build cache
+  (build_cache.py) are restored instead of run, and passing builds are stored
+
+Job file (JSON list):
+    [
+      {"name": "counter", "script": "tcl_scripts/build_design.tcl",
+       "project": "libero_projects/counter_demo", "cpus": 2, "memory_gb": 4},
+      {"name": "tmr", "script": "tcl_scripts/tmr/build_tmr_project.tcl",
+       "project": "libero_projects/tmr/miv_tmr_mpf300", "cpus": 8, "memory_gb": 24,
+       "timeout": 7200}
+    ]
+
+Usage:
+    python build_scheduler.py jobs.json [--workers N] [--licenses N] [--cpus N]
+                                        [--memory-gb N] [--log-dir DIR] [--libero EXE] [--cache]
+    python build_scheduler.py tcl_scripts/build_design.tcl ... [--project DIR]
+
+The Libero executable defaults to $LIBERO_EXE. For testing without Libero use
+the replay stub:
+    python build_scheduler.py jobs.json --libero "python3 tools/build/stub_libero.py"
+"""
+
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# LogParser lives next to BuildDoctor in tools/diagnostics
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "diagnostics"))
+from log_parser import LogParser, ParsedLog  # noqa: E402
+from build_cache import STAGES as CACHED_STAGES, BuildCache  # noqa: E402
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_LOG_DIR = REPO_ROOT / "build_logs"
+
+# Stage completion lines printed by tcl_scripts/build_design.tcl and by Libero itself
+STAGE_DONE_RE = re.compile(
+    r"(?:(?P<warn>WARNING: )?(?P<puts>Synthesis|Place and Route|Programming file)"
+    r" (?:completed|generated)(?P<rest>.*))"
+    r"|(?:The 'run_tool -name \{(?P<tool>\w+)\}' command (?P<status>succeeded|failed))"
+)
+STAGE_NAMES = {
+    "Synthesis": "SYNTHESIZE",
+    "Place and Route": "PLACEROUTE",
+    "Programming file": "GENERATEPROGRAMMINGFILE",
+}
+
+RUN_TOOL_RE = re.compile(r'^\s*run_tool\s+-name\s+\{?(\w+)\}?', re.MULTILINE)
+
+POLL_INTERVAL = 0.5
+
+
+@dataclass
+class ResourceLimits:
+    """Per-host capacity shared by all running jobs."""
+    licenses: int = 1
+    cpus: int = 1
+    memory_gb: float = 8.0
+
+    @classmethod
+    def from_host(cls) -> "ResourceLimits":
+        """Defaults: $LIBERO_LICENSES (1), all CPUs, physical memory."""
+        return cls(
+            licenses=int(os.environ.get("LIBERO_LICENSES", "1")),
+            cpus=os.cpu_count() or 1,
+            memory_gb=_total_memory_gb() or 8.0,
+        )
+
+
+@dataclass
+class BuildJob:
+    """One Libero batch run."""
+    name: str
+    script: str
+    args: List[str] = field(default_factory=list)
+    project: Optional[str] = None
+    mode: str = "SCRIPT"
+    licenses: int = 1
+    cpus: int = 1
+    memory_gb: float = 4.0
+    timeout: Optional[float] = None
+    priority: int = 0
+    env: Dict[str, str] = field(default_factory=dict)
+
+    def command(self, libero: List[str]) -> List[str]:
+        mode = "SCRIPT_ARGS" if self.args and self.mode == "SCRIPT" else self.mode
+        return libero + [f"{mode}:{self.script}"] + list(self.args)
+
+
+@dataclass
+class StageResult:
+    """A stage that finished while the job was running."""
+    name: str
+    ok: bool
+    finished: float
+    log: Optional[ParsedLog] = None
+
+
+@dataclass
+class BuildResult:
+    """Outcome of one job."""
+    job: BuildJob
+    status: str  # passed, cached, failed, timeout, rejected
+    returncode: Optional[int] = None
+    log_path: Optional[str] = None
+    started: float = 0.0
+    finished: float = 0.0
+    stages: List[StageResult] = field(default_factory=list)
+    error: str = ""
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started if self.started else 0.0
+
+    @property
+    def log(self) -> Optional[ParsedLog]:
+        """Parsed logs after the last stage."""
+        return self.stages[-1].log if self.stages else None
+
+
+StageHook = Callable[[BuildJob, StageResult], None]
+
+
+def _total_memory_gb() -> Optional[float]:
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 2**30
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def available_memory_gb() -> Optional[float]:
+    """MemAvailable from /proc/meminfo, or None where unsupported."""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 2**20
+    except OSError:
+        pass
+    return None
+
+
+def parse_stage(parser: LogParser, project: Path, stage: str) -> ParsedLog:
+    """Parse the logs a finished stage leaves in the project directory."""
+    if stage == "SYNTHESIZE":
+        parser.parse_synthesis_log(project / "synthesis" / "synplify.log")
+        for srr in sorted((project / "synthesis").glob("*.srr"))[:1]:
+            parser.parse_timing_report(srr)
+    elif stage == "PLACEROUTE":
+        designer_dir = project / "designer"
+        if designer_dir.is_dir():
+            for design_dir in sorted(d for d in designer_dir.iterdir() if d.is_dir()):
+                pr_log = design_dir / f"{design_dir.name}_layout_log.log"
+                if pr_log.exists():
+                    parser.parse_pr_log(pr_log)
+                    break
+    return parser.log
+
+
+class BuildScheduler:
+    """Bounded, resource-aware pool of Libero batch runs."""
+
+    def __init__(self, libero: Optional[List[str]] = None, limits: Optional[ResourceLimits] = None,
+                 workers: Optional[int] = None, log_dir: Path = DEFAULT_LOG_DIR,
+                 on_stage: Optional[StageHook] = None, check_memory: bool = True,
+                 cache: Optional[BuildCache] = None):
+        self.libero = libero or shlex.split(os.environ.get("LIBERO_EXE", "libero"))
+        self.limits = limits or ResourceLimits.from_host()
+        self.workers = workers or max(1, self.limits.licenses)
+        self.log_dir = Path(log_dir)
+        self.on_stage = on_stage
+        self.check_memory = check_memory
+        self.cache = cache
+        self.jobs: List[BuildJob] = []
+
+        self._in_use = ResourceLimits(licenses=0, cpus=0, memory_gb=0.0)
+        self._hook_lock = threading.Lock()
+
+    def submit(self, job: BuildJob):
+        self.jobs.append(job)
+
+    def _rejection(self, job: BuildJob) -> str:
+        """Reason a job can never run on this host, or ''."""
+        for name in ("licenses", "cpus", "memory_gb"):
+            if getattr(job, name) > getattr(self.limits, name):
+                return f"needs {name}={getattr(job, name)} but host cap is {getattr(self.limits, name)}"
+        return ""
+
+    def _fits(self, job: BuildJob) -> bool:
+        used, cap = self._in_use, self.limits
+        if (used.licenses + job.licenses > cap.licenses
+                or used.cpus + job.cpus > cap.cpus
+                or used.memory_gb + job.memory_gb > cap.memory_gb):
+            return False
+        if self.check_memory:
+            available = available_memory_gb()
+            if available is not None and available < job.memory_gb and used.memory_gb > 0:
+                # Other jobs are still growing; wait for one to finish
+                return False
+        return True
+
+    def _reserve(self, job: BuildJob, sign: int):
+        self._in_use.licenses += sign * job.licenses
+        self._in_use.cpus += sign * job.cpus
+        self._in_use.memory_gb += sign * job.memory_gb
+
+    def run(self) -> List[BuildResult]:
+        """Run every submitted job; returns results in submission order."""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        order = {id(job): i for i, job in enumerate(self.jobs)}
+        pending = sorted(self.jobs, key=lambda j: (-j.priority, order[id(j)]))
+        results: Dict[int, BuildResult] = {}
+
+        for job in list(pending):
+            reason = self._rejection(job)
+            if reason:
+                pending.remove(job)
+                results[id(job)] = BuildResult(job=job, status="rejected", error=reason)
+                print(f"[scheduler] {job.name}: rejected ({reason})")
+
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                # Start every pending job that fits, in priority order (backfilling smaller jobs)
+                for job in list(pending):
+                    if len(running) >= self.workers:
+                        break
+                    if self._fits(job):
+                        pending.remove(job)
+                        self._reserve(job, +1)
+                        print(f"[scheduler] {job.name}: started ({len(running) + 1} running)")
+                        running[pool.submit(self._run_job, job)] = job
+
+                if not running:
+                    time.sleep(POLL_INTERVAL)
+                    continue
+
+                done, _ = wait(running, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    self._reserve(job, -1)
+                    result = future.result()
+                    results[id(job)] = result
+                    print(f"[scheduler] {job.name}: {result.status} in {result.duration:.1f}s")
+
+        return [results[id(job)] for job in self.jobs]
+
+    def _run_job(self, job: BuildJob) -> BuildResult:
+        log_path = self.log_dir / f"{job.name}.log"
+        result = BuildResult(job=job, status="failed", log_path=str(log_path), started=time.time())
+        project = Path(job.project) if job.project else None
+        parser = LogParser()
+
+        stages = self._script_stages(job)
+        # Keys are taken before the run: the outputs are stored under the inputs that produced them
+        keys = self.cache.fingerprints(project, stages) if stages else {}
+        if stages and self._restore_cached(job, result, parser, project, stages, keys):
+            return result
+
+        env = dict(os.environ, **job.env)
+        if project:
+            env["TCL_MONSTER_PROJECT"] = str(project)
+
+        try:
+            with open(log_path, 'w', encoding='utf-8') as log:
+                proc = subprocess.Popen(
+                    job.command(self.libero), cwd=str(REPO_ROOT), env=env,
+                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                    text=True, encoding='utf-8', errors='replace',
+                )
+                timer = None
+                if job.timeout:
+                    timer = threading.Timer(job.timeout, proc.kill)
+                    timer.start()
+                try:
+                    for line in proc.stdout:
+                        log.write(line)
+                        stage = self._match_stage(line)
+                        if stage:
+                            log.flush()
+                            self._stage_finished(job, result, parser, project, *stage)
+                    proc.wait()
+                finally:
+                    if timer:
+                        timer.cancel()
+        except OSError as e:
+            result.error = str(e)
+            result.finished = time.time()
+            return result
+
+        result.returncode = proc.returncode
+        result.finished = time.time()
+        if job.timeout and result.duration >= job.timeout and proc.returncode != 0:
+            result.status = "timeout"
+        elif proc.returncode == 0 and all(s.ok for s in result.stages):
+            result.status = "passed"
+            if stages and self.cache:
+                for stage in stages:
+                    self.cache.store(project, stage, key=keys[stage], allow_empty=True)
+        return result
+
+    def _script_stages(self, job: BuildJob) -> List[str]:
+        """Cacheable run_tool stages of the job's script; [] if any stage is not cacheable."""
+        if not self.cache or not job.project:
+            return []
+        script = Path(job.script)
+        if not script.is_absolute():
+            script = REPO_ROOT / script
+        try:
+            tools = RUN_TOOL_RE.findall(script.read_text(encoding='utf-8', errors='ignore'))
+        except OSError:
+            return []
+        if not tools or any(t not in CACHED_STAGES for t in tools):
+            return []
+        return list(dict.fromkeys(tools))
+
+    def _restore_cached(self, job, result, parser, project, stages, keys) -> bool:
+        if not self.cache.restore_all(project, stages, keys):
+            return False
+        for stage in stages:
+            self._stage_finished(job, result, parser, project, stage, True)
+        result.status = "cached"
+        result.returncode = 0
+        result.finished = time.time()
+        with open(result.log_path, 'w', encoding='utf-8') as log:
+            log.write(f"Restored from build cache: {', '.join(stages)}\n")
+        return True
+
+    @staticmethod
+    def _match_stage(line: str):
+        match = STAGE_DONE_RE.search(line)
+        if not match:
+            return None
+        if match.group("tool"):
+            return match.group("tool"), match.group("status") == "succeeded"
+        ok = not match.group("warn") and "successfully" in (match.group("rest") or "")
+        return STAGE_NAMES[match.group("puts")], ok
+
+    def _stage_finished(self, job, result, parser, project, stage, ok):
+        # Libero prints both its own and the script's completion line; keep one
+        if result.stages and result.stages[-1].name == stage:
+            result.stages[-1].ok = result.stages[-1].ok and ok
+            return
+
+        stage_result = StageResult(name=stage, ok=ok, finished=time.time())
+        if project:
+            stage_result.log = parse_stage(parser, project, stage)
+        result.stages.append(stage_result)
+
+        if self.on_stage:
+            with self._hook_lock:
+                self.on_stage(job, stage_result)
+
+
+def print_stage(job: BuildJob, stage: StageResult):
+    """Default stage hook: one summary line per finished stage."""
+    line = f"[{job.name}] {stage.name} {'OK' if stage.ok else 'FAILED'}"
+    if stage.log is not None:
+        res = stage.log.resources
+        line += (f" | errors {len(stage.log.errors)}, warnings {len(stage.log.warnings)}"
+                 f", 4LUT {res.luts_used:,}, DFF {res.ffs_used:,}")
+    print(line)
+
+
+def load_jobs(path: Path) -> List[BuildJob]:
+    """Load a JSON job list."""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return [BuildJob(**entry) for entry in data]
+
+
+def print_results(results: List[BuildResult]):
+    print("\n" + "=" * 70)
+    print("BUILD SCHEDULER RESULTS")
+    print("=" * 70)
+    for r in results:
+        symbol = "✓" if r.status in ("passed", "cached") else "✗"
+        stages = ", ".join(f"{s.name}{'' if s.ok else '!'}" for s in r.stages) or "-"
+        print(f"  {symbol} {r.job.name:<24} {r.status:<9} {r.duration:>8.1f}s  {stages}")
+        if r.error:
+            print(f"      {r.error}")
+        elif r.status not in ("passed", "cached") and r.log_path:
+            print(f"      log: {r.log_path}")
+    passed = sum(r.status in ("passed", "cached") for r in results)
+    print(f"\n  {passed}/{len(results)} passed")
+    print("=" * 70)
+
+
+def main():
+    """Main entry point."""
+    args = sys.argv[1:]
+    use_cache = '--cache' in args
+    if use_cache:
+        args.remove('--cache')
+    options = {}
+    for name in ('--workers', '--licenses', '--cpus', '--memory-gb', '--log-dir', '--libero', '--project'):
+        if name in args:
+            i = args.index(name)
+            options[name] = args[i + 1]
+            del args[i:i + 2]
+
+    if not args:
+        print("Usage: python build_scheduler.py <jobs.json | script.tcl ...> [--workers N] [--licenses N]")
+        print("           [--cpus N] [--memory-gb N] [--log-dir DIR] [--libero EXE] [--project DIR] [--cache]")
+        sys.exit(1)
+
+    if len(args) == 1 and args[0].endswith('.json'):
+        jobs = load_jobs(Path(args[0]))
+    else:
+        jobs = [BuildJob(name=Path(s).stem, script=s, project=options.get('--project')) for s in args]
+
+    limits = ResourceLimits.from_host()
+    if '--licenses' in options:
+        limits.licenses = int(options['--licenses'])
+    if '--cpus' in options:
+        limits.cpus = int(options['--cpus'])
+    if '--memory-gb' in options:
+        limits.memory_gb = float(options['--memory-gb'])
+
+    scheduler = BuildScheduler(
+        libero=shlex.split(options['--libero']) if '--libero' in options else None,
+        limits=limits,
+        workers=int(options['--workers']) if '--workers' in options else None,
+        log_dir=Path(options.get('--log-dir', DEFAULT_LOG_DIR)),
+        on_stage=print_stage,
+        cache=BuildCache() if use_cache else None,
+    )
+    for job in jobs:
+        scheduler.submit(job)
+
+    results = scheduler.run()
+    print_results(results)
+    sys.exit(0 if all(r.status in ("passed", "cached") for r in results) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Design-Space Exploration Sweep
+
+Generates build variants (place seeds, P&R options such as TDPR/PDPR,
+clock targets), runs them in parallel through a pluggable runner and reports
+per-clock slack plus the Pareto front of Fmax vs LUT% vs runtime.
+
+Runners:
+- LiberoRunner  copies the project per variant, retargets create_clock
+                periods, writes a configure_tool/run_tool script and runs
+                Libero (or stub_libero.py via --libero)
+- StubRunner    deterministic synthetic results, no Libero needed
+
+Losing branches are stopped early: a variant is killed as soon as a
+Synplify slack estimate (mapper pass table, "Worst slack in design", or
+the parsed .srr once SYNTHESIZE finishes) drops below --stop-slack.
+Synthesis estimates are optimistic relative to P&R, so a variant that
+misses by that margin before P&R will not close after it.
+
+Usage:
+    python design_sweep.py <project_dir> [--seeds 1-4] [--param TDPR=true,false]
+                           [--clock clk_50mhz=50,75] [--workers N] [--stop-slack NS]
+                           [--stub] [--libero EXE] [--work-dir DIR] [--json]
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import random
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext, redirect_stdout
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from build_scheduler import DEFAULT_LOG_DIR, REPO_ROOT, STAGE_DONE_RE, parse_stage
+
+# LogParser lives next to BuildDoctor in tools/diagnostics
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "diagnostics"))
+from log_parser import ClockTiming, LogParser, ParsedLog  # noqa: E402
+
+
+DEFAULT_STOP_SLACK = -0.5  # ns
+
+# Synplify mapper pass table row:   1		0h:00m:02s		     3.68ns		  34 /        32
+SYN_PASS_RE = re.compile(r'^\s*\d+\s+\d+h:\d+m:\d+s\s+(-?[\d.]+)ns\s+\d+\s*/\s*\d+')
+WORST_SLACK_RE = re.compile(r'Worst slack in design:\s*(-?[\d.]+)')
+CREATE_CLOCK_RE = re.compile(r'^[ \t]*create_clock\b(?:\\\n|[^\n])*', re.MULTILINE)
+
+COPY_IGNORE = shutil.ignore_patterns("synwork", "syntmp", "simulation", "designer", "*.vm", "*.srr")
+
+
+@dataclass
+class SweepVariant:
+    """One point in the design space."""
+    name: str
+    seed: Optional[int] = None
+    params: Dict[str, str] = field(default_factory=dict)   # PLACEROUTE configure_tool params
+    clocks: Dict[str, float] = field(default_factory=dict)  # clock name -> target MHz
+
+    def describe(self) -> str:
+        parts = [f"seed={self.seed}"] if self.seed is not None else []
+        parts += [f"{k}={v}" for k, v in self.params.items()]
+        parts += [f"{k}@{v:g}MHz" for k, v in self.clocks.items()]
+        return " ".join(parts) or "baseline"
+
+
+@dataclass
+class VariantResult:
+    """Outcome of one variant."""
+    variant: SweepVariant
+    status: str = "failed"  # passed, stopped, failed
+    log: ParsedLog = field(default_factory=ParsedLog)
+    runtime: float = 0.0
+    reason: str = ""
+    pareto: bool = False
+
+    @property
+    def fmax(self) -> float:
+        return self.log.fmax_mhz
+
+    @property
+    def lut_percent(self) -> float:
+        return self.log.resources.lut_percent
+
+    @property
+    def worst_slack(self) -> Optional[float]:
+        if self.log.clock_timing:
+            return min(c.slack for c in self.log.clock_timing.values())
+        return self.log.worst_slack
+
+    @property
+    def met(self) -> bool:
+        slack = self.worst_slack
+        return slack is not None and slack >= 0
+
+
+def generate_variants(seeds: Iterable[Optional[int]] = (None,),
+                      params: Optional[Dict[str, List[str]]] = None,
+                      clocks: Optional[Dict[str, List[float]]] = None) -> List[SweepVariant]:
+    """Cartesian product of seeds x P&R option values x clock targets."""
+    params = params or {}
+    clocks = clocks or {}
+    axes = [list(seeds) or [None]] + [params[k] for k in params] + [clocks[k] for k in clocks]
+    variants = []
+    for i, point in enumerate(itertools.product(*axes)):
+        seed, rest = point[0], point[1:]
+        variants.append(SweepVariant(
+            name=f"v{i:03d}",
+            seed=seed,
+            params=dict(zip(params, rest[:len(params)])),
+            clocks=dict(zip(clocks, rest[len(params):])),
+        ))
+    return variants
+
+
+class LiveMonitor:
+    """Watches a variant's output and decides when it can no longer meet timing."""
+
+    def __init__(self, stop_slack: float = DEFAULT_STOP_SLACK):
+        self.stop_slack = stop_slack
+        self.reason = ""
+        self.stop = threading.Event()
+
+    def _check(self, slack: float, source: str):
+        if slack < self.stop_slack and not self.stop.is_set():
+            self.reason = f"{source} slack {slack:.3f} ns < {self.stop_slack:.3f} ns"
+            self.stop.set()
+
+    def feed(self, line: str) -> bool:
+        """Feed one output line; returns True once the variant should be stopped."""
+        match = SYN_PASS_RE.match(line) or WORST_SLACK_RE.search(line)
+        if match:
+            self._check(float(match.group(1)), "synthesis")
+        return self.stop.is_set()
+
+    def check_log(self, log: ParsedLog, stage: str) -> bool:
+        """Check parsed stage results; returns True once the variant should be stopped."""
+        for clock in log.clock_timing.values():
+            self._check(clock.slack, f"{stage} {clock.name}")
+        return self.stop.is_set()
+
+
+class Runner:
+    """Runs one variant; implementations must honour monitor.stop."""
+
+    def run(self, variant: SweepVariant, monitor: LiveMonitor) -> ParsedLog:
+        raise NotImplementedError
+
+
+def retarget_clocks(text: str, clocks: Dict[str, float]) -> str:
+    """Rewrite create_clock -period for the named clocks (MHz targets)."""
+    def replace(match):
+        statement = match.group(0)
+        for name, mhz in clocks.items():
+            if re.search(r'-name\s+\{?' + re.escape(name) + r'\}?(?=[\s\\])', statement):
+                period = f"{1000.0 / mhz:.3f}".rstrip('0').rstrip('.')
+                statement = re.sub(r'-period\s+[\d.]+', f"-period {period}", statement)
+                half = f"{500.0 / mhz:.3f}".rstrip('0').rstrip('.')
+                statement = re.sub(r'-waveform\s+\{\s*0\s+[\d.]+\s*\}', f"-waveform {{0 {half}}}", statement)
+        return statement
+    return CREATE_CLOCK_RE.sub(replace, text)
+
+
+class LiberoRunner(Runner):
+    """Builds each variant in its own copy of the project with Libero in batch mode."""
+
+    def __init__(self, project: Path, work_dir: Path, libero: Optional[List[str]] = None,
+                 timeout: Optional[float] = None):
+        self.project = Path(project).resolve()
+        self.work_dir = Path(work_dir)
+        self.libero = libero or shlex.split(os.environ.get("LIBERO_EXE", "libero"))
+        self.timeout = timeout
+
+    def prepare(self, variant: SweepVariant) -> Path:
+        """Copy the project sources and write the variant's build script."""
+        target = self.work_dir / variant.name
+        if target.exists():
+            shutil.rmtree(target)
+        shutil.copytree(self.project, target, ignore=COPY_IGNORE)
+
+        if variant.clocks:
+            for path in list(target.glob("constraint/**/*.sdc")) + list(target.glob("constraint/**/*.fdc")):
+                text = path.read_text(encoding='utf-8', errors='ignore')
+                path.write_text(retarget_clocks(text, variant.clocks), encoding='utf-8')
+
+        params = dict(variant.params)
+        if variant.seed is not None:
+            params.update(MULTI_PASS_LAYOUT="true", NUM_MULTI_PASSES="1", START_SEED_INDEX=str(variant.seed))
+
+        prjx = next(target.glob("*.prjx"), target / f"{self.project.name}.prjx")
+        lines = [
+            f"# Design sweep variant {variant.name}: {variant.describe()}",
+            f"open_project -file {{{prjx.as_posix()}}}",
+        ]
+        if params:
+            lines.append("configure_tool -name {PLACEROUTE} \\")
+            lines.append(" \\\n".join(f"    -params {{{k}:{v}}}" for k, v in params.items()))
+        lines += [
+            "run_tool -name {SYNTHESIZE}",
+            "run_tool -name {PLACEROUTE}",
+            "save_project",
+            "close_project",
+        ]
+        (target / "sweep_variant.tcl").write_text("\n".join(lines) + "\n", encoding='utf-8')
+        return target
+
+    def run(self, variant: SweepVariant, monitor: LiveMonitor) -> ParsedLog:
+        target = self.prepare(variant)
+        script = target / "sweep_variant.tcl"
+        parser = LogParser()
+        env = dict(os.environ, TCL_MONSTER_PROJECT=str(target))
+
+        with open(target / "sweep_variant.log", 'w', encoding='utf-8') as log:
+            proc = subprocess.Popen(
+                self.libero + [f"SCRIPT:{script}"], cwd=str(REPO_ROOT), env=env,
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                text=True, encoding='utf-8', errors='replace',
+            )
+            timer = threading.Timer(self.timeout, proc.kill) if self.timeout else None
+            if timer:
+                timer.start()
+            try:
+                for line in proc.stdout:
+                    log.write(line)
+                    stop = monitor.feed(line)
+                    done = STAGE_DONE_RE.search(line)
+                    if done and done.group("tool") and done.group("status") == "succeeded":
+                        stop = monitor.check_log(parse_stage(parser, target, done.group("tool")),
+                                                 done.group("tool"))
+                    if stop:
+                        proc.kill()
+                        break
+                proc.wait()
+            finally:
+                if timer:
+                    timer.cancel()
+
+        if proc.returncode != 0 and not monitor.stop.is_set():
+            raise RuntimeError(f"Libero exited with {proc.returncode} (see {target / 'sweep_variant.log'})")
+        return parser.log
+
+
+class StubRunner(Runner):
+    """Synthetic, seed-deterministic results for exercising the sweep without Libero."""
+
+    def __init__(self, base_mhz: float = 100.0, luts_total: int = 299544, base_luts: int = 30000,
+                 delay: float = 0.05):
+        self.base_mhz = base_mhz
+        self.luts_total = luts_total
+        self.base_luts = base_luts
+        self.delay = delay
+
+    def run(self, variant: SweepVariant, monitor: LiveMonitor) -> ParsedLog:
+        rng = random.Random(hashlib.sha256(variant.describe().encode()).hexdigest())
+        timing_driven = variant.params.get("TDPR", "true").lower() == "true"
+        power_driven = variant.params.get("PDPR", "false").lower() == "true"
+        achieved = self.base_mhz * rng.uniform(0.85, 1.15) * (1.08 if timing_driven else 1.0)
+        achieved *= 0.95 if power_driven else 1.0
+        clocks = variant.clocks or {"clk": self.base_mhz}
+
+        # Mapper passes converge towards the final estimate
+        for i in range(1, 4):
+            time.sleep(self.delay)
+            estimate = achieved * (0.9 + 0.1 * i / 3)
+            slack = min(1000.0 / mhz - 1000.0 / estimate for mhz in clocks.values())
+            if monitor.feed(f"   {i}\t\t0h:00m:0{i}s\t\t     {slack:.2f}ns\t\t  {self.base_luts} /  {self.base_luts}"):
+                return ParsedLog()
+
+        log = ParsedLog(timing_driven=timing_driven, power_driven=power_driven, has_timing_constraints=True)
+        for name, mhz in clocks.items():
+            log.clock_timing[name] = ClockTiming(
+                name=name, requested_mhz=mhz, estimated_mhz=round(achieved, 1),
+                requested_period=round(1000.0 / mhz, 3), estimated_period=round(1000.0 / achieved, 3),
+                slack=round(1000.0 / mhz - 1000.0 / achieved, 3),
+            )
+        log.worst_slack = min(c.slack for c in log.clock_timing.values())
+        if monitor.check_log(log, "SYNTHESIZE"):
+            return log
+
+        time.sleep(self.delay * rng.uniform(2, 6) * (1.5 if timing_driven else 1.0))
+        log.resources.luts_used = int(self.base_luts * rng.uniform(0.97, 1.05))
+        log.resources.luts_total = self.luts_total
+        log.metrics.placement_time = self.delay * 10
+        return log
+
+
+def pareto_front(results: List[VariantResult]) -> List[VariantResult]:
+    """Non-dominated passing variants: max Fmax, min LUT%, min runtime."""
+    candidates = [r for r in results if r.status == "passed" and r.fmax > 0]
+
+    def dominates(a: VariantResult, b: VariantResult) -> bool:
+        no_worse = a.fmax >= b.fmax and a.lut_percent <= b.lut_percent and a.runtime <= b.runtime
+        better = a.fmax > b.fmax or a.lut_percent < b.lut_percent or a.runtime < b.runtime
+        return no_worse and better
+
+    front = [r for r in candidates if not any(dominates(o, r) for o in candidates if o is not r)]
+    for r in results:
+        r.pareto = r in front
+    return sorted(front, key=lambda r: -r.fmax)
+
+
+class DesignSweep:
+    """Runs variants concurrently through a runner, stopping losing branches early."""
+
+    def __init__(self, runner: Runner, workers: int = 2, stop_slack: float = DEFAULT_STOP_SLACK):
+        self.runner = runner
+        self.workers = workers
+        self.stop_slack = stop_slack
+
+    def _run_variant(self, variant: SweepVariant) -> VariantResult:
+        result = VariantResult(variant=variant)
+        monitor = LiveMonitor(self.stop_slack)
+        start = time.time()
+        try:
+            result.log = self.runner.run(variant, monitor)
+            result.status = "stopped" if monitor.stop.is_set() else "passed"
+            result.reason = monitor.reason
+        except (OSError, RuntimeError) as e:
+            result.reason = str(e)
+        result.runtime = time.time() - start
+        return result
+
+    def run(self, variants: List[SweepVariant]) -> List[VariantResult]:
+        """Run every variant; returns results in variant order with Pareto flags set."""
+        results: Dict[str, VariantResult] = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._run_variant, v): v for v in variants}
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.variant.name] = result
+                print(f"[sweep] {result.variant.name} ({result.variant.describe()}): {result.status}"
+                      + (f" - {result.reason}" if result.reason else ""))
+        ordered = [results[v.name] for v in variants]
+        pareto_front(ordered)
+        return ordered
+
+
+def print_report(results: List[VariantResult]):
+    """Print the sweep table and the Pareto front."""
+    print("\n" + "=" * 70)
+    print("DESIGN SWEEP RESULTS")
+    print("=" * 70)
+    print(f"\n  {'Variant':<6} {'Status':<8} {'Fmax MHz':>9} {'Slack ns':>9} {'LUT %':>7} {'Time s':>8}  Options")
+    for r in results:
+        slack = f"{r.worst_slack:.3f}" if r.worst_slack is not None else "-"
+        fmax = f"{r.fmax:.1f}" if r.fmax else "-"
+        lut = f"{r.lut_percent:.2f}" if r.log.resources.luts_total else "-"
+        mark = "*" if r.pareto else " "
+        print(f"{mark} {r.variant.name:<6} {r.status:<8} {fmax:>9} {slack:>9} {lut:>7} {r.runtime:>8.1f}"
+              f"  {r.variant.describe()}")
+
+    clock_names = sorted({n for r in results for n in r.log.clock_timing})
+    if clock_names:
+        print("\nPER-CLOCK SLACK (ns):")
+        print(f"  {'Variant':<6} " + " ".join(f"{n:>14}" for n in clock_names))
+        for r in results:
+            cells = []
+            for n in clock_names:
+                clock = r.log.clock_timing.get(n)
+                cells.append(f"{clock.slack:>14.3f}" if clock else f"{'-':>14}")
+            print(f"  {r.variant.name:<6} " + " ".join(cells))
+
+    front = [r for r in results if r.pareto]
+    print(f"\nPARETO FRONT (Fmax vs LUT% vs runtime): {len(front)} variant(s)")
+    for r in sorted(front, key=lambda r: -r.fmax):
+        print(f"  * {r.variant.name}: {r.fmax:.1f} MHz, {r.lut_percent:.2f}% LUT, {r.runtime:.1f}s"
+              f"{'' if r.met else ' (timing not met)'}  [{r.variant.describe()}]")
+    stopped = sum(r.status == "stopped" for r in results)
+    if stopped:
+        print(f"\n  {stopped} variant(s) stopped early")
+    print("=" * 70)
+
+
+def results_to_json(results: List[VariantResult]) -> List[dict]:
+    return [{
+        "name": r.variant.name,
+        "seed": r.variant.seed,
+        "params": r.variant.params,
+        "clocks": r.variant.clocks,
+        "status": r.status,
+        "reason": r.reason,
+        "runtime": round(r.runtime, 3),
+        "fmax_mhz": r.fmax,
+        "lut_percent": r.lut_percent,
+        "worst_slack": r.worst_slack,
+        "clock_slack": {n: c.slack for n, c in r.log.clock_timing.items()},
+        "pareto": r.pareto,
+    } for r in results]
+
+
+def parse_seeds(text: str) -> List[int]:
+    """'1-4' or '1,3,7' -> list of seeds."""
+    seeds = []
+    for part in text.split(','):
+        if '-' in part:
+            lo, hi = part.split('-', 1)
+            seeds.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            seeds.append(int(part))
+    return seeds
+
+
+def main():
+    """Main entry point."""
+    args = sys.argv[1:]
+    flags = {f: f in args for f in ('--stub', '--json')}
+    for f, present in flags.items():
+        if present:
+            args.remove(f)
+    params: Dict[str, List[str]] = {}
+    clocks: Dict[str, List[float]] = {}
+    options = {}
+    i = 0
+    while i < len(args):
+        if args[i] in ('--param', '--clock') and i + 1 < len(args):
+            key, _, values = args[i + 1].partition('=')
+            if args[i] == '--param':
+                params[key] = values.split(',')
+            else:
+                clocks[key] = [float(v) for v in values.split(',')]
+            del args[i:i + 2]
+        elif args[i] in ('--seeds', '--workers', '--stop-slack', '--libero', '--work-dir', '--timeout'):
+            options[args[i]] = args[i + 1]
+            del args[i:i + 2]
+        else:
+            i += 1
+
+    if not args or not Path(args[0]).is_dir():
+        print("Usage: python design_sweep.py <project_dir> [--seeds 1-4] [--param TDPR=true,false]")
+        print("           [--clock clk_50mhz=50,75] [--workers N] [--stop-slack NS] [--stub]")
+        print("           [--libero EXE] [--work-dir DIR] [--timeout S] [--json]")
+        sys.exit(1)
+
+    project = Path(args[0])
+    seeds = parse_seeds(options['--seeds']) if '--seeds' in options else [None]
+    variants = generate_variants(seeds, params, clocks)
+
+    if flags['--stub']:
+        runner: Runner = StubRunner()
+    else:
+        runner = LiberoRunner(
+            project,
+            work_dir=Path(options.get('--work-dir', DEFAULT_LOG_DIR / "sweep" / project.resolve().name)),
+            libero=shlex.split(options['--libero']) if '--libero' in options else None,
+            timeout=float(options['--timeout']) if '--timeout' in options else None,
+        )
+    sweep = DesignSweep(
+        runner,
+        workers=int(options.get('--workers', 2)),
+        stop_slack=float(options.get('--stop-slack', DEFAULT_STOP_SLACK)),
+    )
+
+    # With --json, stdout carries only the JSON: progress and parser output go to stderr
+    with redirect_stdout(sys.stderr) if flags['--json'] else nullcontext():
+        print(f"Sweeping {len(variants)} variant(s) of {project}")
+        results = sweep.run(variants)
+
+    if flags['--json']:
+        print(json.dumps(results_to_json(results), indent=2))
+    else:
+        print_report(results)
+
+    sys.exit(0 if any(r.pareto for r in results) else 1)
+
+
+if __name__ == '__main__':
+    main()
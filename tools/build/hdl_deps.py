@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""
+Verilog Source Dependency Scanner
+
+The HDL in hdl/, hdl/tmr/, hdl/beaglev_fire/ and the vendored core sources
+is added to projects and simulations from hand-maintained file lists. This
+tool scans the sources instead: one regex pass per file (comments and
+strings stripped first) finds design unit declarations (module, interface,
+program, package, primitive), the modules they instantiate, the packages
+they reference (pkg::name, import pkg::*) and `include directives. From
+those it builds a file dependency DAG and a compile order with every file
+after the files defining what it uses.
+
+Parse results are cached by content hash in .hdl_deps_cache.json; a file
+whose mtime and size are unchanged is not even re-read. The cache also
+keeps a snapshot of the file hashes per set of roots, so `changed` can
+report which files were edited, added or removed since the last run and
+the minimal set of files (and the modules they define) that has to be
+recompiled or resimulated: the changed files plus everything that
+transitively instantiates, imports or includes them.
+
+The scan is deliberately conservative: every `ifdef branch is scanned,
+and references that no scanned file defines (PolarFire cells such as
+CLKINT or SLE, or sources outside the roots) are reported as external.
+
+Usage:
+    python hdl_deps.py order <root> [<root> ...] [--top MODULE] [--tcl]
+    python hdl_deps.py changed <root> [<root> ...] [--top MODULE] [--no-update] [--tcl]
+    python hdl_deps.py tree <root> [<root> ...] --top MODULE
+
+    Common options: --include DIR (`include search path), --exclude GLOB
+    (relative to its root), --cache PATH, --jobs N
+
+A root is a source file or a directory scanned recursively for .v, .sv,
+.vh and .svh files.
+"""
+
+import fnmatch
+import hashlib
+import heapq
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from build_cache import REPO_ROOT
+
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = REPO_ROOT / ".hdl_deps_cache.json"
+
+SOURCE_SUFFIXES = (".v", ".sv", ".vh", ".svh")
+HEADER_SUFFIXES = (".vh", ".svh")
+
+# Directories never descended into (tool scratch space, simulator runs, VCS)
+SKIP_DIRS = frozenset(("synwork", "syntmp", "simulation", ".git", "__pycache__"))
+
+# Comments, strings and `include directives, removed before scanning
+STRIP_RE = re.compile(r'//[^\n]*|/\*.*?\*/|`include\s*[<"]([^">\n]+)[">]|"(?:\\.|[^"\\\n])*"', re.DOTALL)
+
+IDENT = r'[A-Za-z_][\w$]*'
+
+# One pass over the stripped text; alternatives are tried in this order
+SCAN_RE = re.compile(rf'''
+      \b(?P<decl>module|macromodule|interface|program|package|primitive)\s+
+        (?:(?:automatic|static)\s+)?(?P<name>{IDENT})
+    | \b(?P<end>end(?:module|interface|program|package|primitive))\b
+    | (?<![`\w$.])(?P<pkg>{IDENT})\s*::
+    | (?<![`\w$.])(?P<type>{IDENT})(?:\s*\#\s*\(|\s+(?P<inst>{IDENT})\s*(?:\[[^\]]*\]\s*)?\()
+''', re.VERBOSE)
+
+# An instantiation is a statement: it follows one of these words, a ';' or
+# ')', or a "label :"
+STATEMENT_WORDS = frozenset(("begin", "end", "else", "generate", "endgenerate", "endcase", "default"))
+
+# Words that can precede "<ident> (" or "#(" without being a module type
+KEYWORDS = frozenset('''
+    always always_comb always_ff always_latch and assert assign assume automatic begin bind bit buf
+    bufif0 bufif1 byte case casex casez cell class clocking cmos config const constraint cover
+    deassign default defparam design disable do edge else end endcase endfunction endgenerate
+    endtask enum event export extends extern final for force foreach forever fork function generate
+    genvar highz0 highz1 if iff ifnone import incdir include initial inout input int integer
+    interface join join_any join_none large liblist library localparam logic longint macromodule
+    medium modport module nand negedge new nmos nor noshowcancelled not notif0 notif1 null or output
+    package packed parameter pmos posedge primitive program property pull0 pull1 pulldown pullup
+    pulsestyle_ondetect pulsestyle_onevent rand randc rcmos real realtime reg release repeat return
+    rnmos rpmos rtran rtranif0 rtranif1 scalared sequence shortint shortreal showcancelled signed
+    small specify specparam static string strong0 strong1 struct super supply0 supply1 table task
+    this time tran tranif0 tranif1 tri tri0 tri1 triand trior trireg type typedef union unique
+    unsigned use uwire var vectored virtual void wait wand weak0 weak1 while wire wor xnor xor
+    dist first_match inside intersect matches throughout with within
+'''.split())
+
+# Scope prefixes that are not user packages
+BUILTIN_SCOPES = frozenset(("std", "$unit", "$root", "local", "super", "this"))
+
+
+def scan_source(text: str) -> Dict:
+    """Design units, their references and the `includes of one source text.
+
+    Returns {"units": {name: [referenced names]}, "file_refs": [...],
+    "includes": [...]}; file_refs are references outside any unit (a
+    file-scope import pkg::*).
+    """
+    includes: List[str] = []
+
+    def strip(match):
+        if match.group(1) is not None:
+            includes.append(match.group(1))
+            return ' '
+        return '""' if match.group(0)[0] == '"' else ' '
+
+    stripped = STRIP_RE.sub(strip, text)
+
+    units: Dict[str, Set[str]] = {}
+    file_refs: Set[str] = set()
+    current: Optional[str] = None
+    for match in SCAN_RE.finditer(stripped):
+        name, end, pkg, type_ = match.group('name', 'end', 'pkg', 'type')
+        if name is not None:
+            current = name
+            units.setdefault(current, set())
+            continue
+        if end is not None:
+            current = None
+            continue
+        if pkg is not None:
+            if pkg in BUILTIN_SCOPES:
+                continue
+            ref = pkg
+        else:
+            if type_ in KEYWORDS or match.group('inst') in KEYWORDS \
+                    or not _statement_start(stripped, match.start()):
+                continue
+            ref = type_
+        (units[current] if current is not None else file_refs).add(ref)
+
+    return {
+        "units": {name: sorted(refs - {name}) for name, refs in units.items()},
+        "file_refs": sorted(file_refs),
+        "includes": includes,
+    }
+
+
+def _statement_start(text: str, pos: int) -> bool:
+    """Whether pos starts a statement (see STATEMENT_WORDS)."""
+    i = pos - 1
+    while i >= 0 and text[i].isspace():
+        i -= 1
+    if i < 0 or text[i] in ';):':
+        return True
+    end = i + 1
+    while i >= 0 and (text[i].isalnum() or text[i] in '_$'):
+        i -= 1
+    if text[i + 1:end] in STATEMENT_WORDS:
+        return True
+    while i >= 0 and text[i].isspace():
+        i -= 1
+    return i >= 0 and text[i] == ':'
+
+
+def _scan_job(path: str) -> Tuple[str, str, Optional[Dict]]:
+    """Hash and parse one file (runs in a worker process)."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return path, "", None
+    digest = hashlib.sha256(data).hexdigest()
+    return path, digest, scan_source(data.decode('utf-8', errors='replace'))
+
+
+@dataclass
+class SourceFile:
+    """One scanned source file."""
+    path: str                 # as found under its root
+    digest: str
+    units: Dict[str, List[str]]
+    file_refs: List[str]
+    includes: List[str]       # resolved paths of included files
+    root: int = 0             # index of the root it was found under
+
+    @property
+    def refs(self) -> Set[str]:
+        refs = set(self.file_refs)
+        for unit_refs in self.units.values():
+            refs.update(unit_refs)
+        return refs - set(self.units)
+
+
+@dataclass
+class ScanStats:
+    files: int = 0
+    parsed: int = 0      # content not in the cache
+    hashed: int = 0      # re-read, parse reused by content hash
+    reused: int = 0      # mtime/size unchanged
+    duplicates: Dict[str, List[str]] = field(default_factory=dict)
+    external: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class ChangeReport:
+    """Source changes since the last snapshot and what they invalidate."""
+    modified: List[str] = field(default_factory=list)
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    affected: List[str] = field(default_factory=list)     # compile order
+    units: List[str] = field(default_factory=list)        # defined in affected files
+    first_run: bool = False
+
+
+def find_sources(roots: Sequence[Path], exclude: Sequence[str] = ()) -> List[Tuple[int, str]]:
+    """(root index, path) of every source file under the roots."""
+    found: List[Tuple[int, str]] = []
+    seen: Set[str] = set()
+    for index, root in enumerate(roots):
+        if root.is_file():
+            candidates = [str(root)]
+        else:
+            candidates = []
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+                candidates.extend(os.path.join(dirpath, n) for n in sorted(filenames)
+                                  if n.endswith(SOURCE_SUFFIXES))
+        for path in candidates:
+            rel = os.path.relpath(path, root).replace(os.sep, '/') if root.is_dir() else Path(path).name
+            if any(fnmatch.fnmatchcase(rel, pattern) for pattern in exclude):
+                continue
+            key = os.path.realpath(path)
+            if key not in seen:
+                seen.add(key)
+                found.append((index, path))
+    return found
+
+
+class HDLDependencies:
+    """Dependency graph of the Verilog sources under a set of roots."""
+
+    def __init__(self, roots: Sequence, include_dirs: Sequence = (), exclude: Sequence[str] = (),
+                 cache_path: Optional[Path] = None, jobs: Optional[int] = None):
+        self.roots = [Path(r) for r in roots]
+        self.include_dirs = [Path(d) for d in include_dirs]
+        self.exclude = list(exclude)
+        self.cache_path = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+        self.jobs = jobs or os.cpu_count() or 1
+        self.files: Dict[str, SourceFile] = {}
+        self.definers: Dict[str, str] = {}            # unit -> path
+        self.deps: Dict[str, Set[str]] = {}           # path -> paths it depends on
+        self.headers: Set[str] = set()
+        self.stats = ScanStats()
+        self._cache = self._load_cache()
+
+    # -- cache -------------------------------------------------------------
+
+    def _load_cache(self) -> Dict:
+        empty = {"version": CACHE_VERSION, "stamps": {}, "parses": {}, "snapshots": {}}
+        if not self.cache_path.exists():
+            return empty
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Ignoring unreadable cache {self.cache_path}: {e}", file=sys.stderr)
+            return empty
+        return data if data.get('version') == CACHE_VERSION else empty
+
+    @property
+    def snapshot_key(self) -> str:
+        return "|".join(sorted(os.path.realpath(r) for r in self.roots))
+
+    def save(self, snapshot: bool = False):
+        """Write the cache; with snapshot, record the current hashes as the new baseline."""
+        cache = self._cache
+        if snapshot:
+            cache['snapshots'][self.snapshot_key] = {
+                os.path.realpath(p): f.digest for p, f in self.files.items()}
+        cache['stamps'] = {p: s for p, s in cache['stamps'].items() if os.path.exists(p)}
+        live = {stamp[2] for stamp in cache['stamps'].values()}
+        for files in cache['snapshots'].values():
+            live.update(files.values())
+        cache['parses'] = {d: p for d, p in cache['parses'].items() if d in live}
+        tmp = self.cache_path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(cache, f, separators=(',', ':'))
+        os.replace(tmp, self.cache_path)
+
+    # -- scanning ----------------------------------------------------------
+
+    def scan(self) -> ScanStats:
+        """Scan the roots (through the cache) and build the dependency graph."""
+        stats = self.stats = ScanStats()
+        stamps = self._cache['stamps']
+        parses = self._cache['parses']
+
+        sources = find_sources(self.roots, self.exclude)
+        todo = []
+        results: Dict[str, Tuple[str, Dict]] = {}
+        for _, path in sources:
+            key = os.path.realpath(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            cached = stamps.get(key)
+            if cached and cached[:2] == [st.st_mtime_ns, st.st_size] and cached[2] in parses:
+                results[path] = (cached[2], parses[cached[2]])
+                stats.reused += 1
+            else:
+                todo.append(path)
+            stamps[key] = [st.st_mtime_ns, st.st_size, cached[2] if cached else ""]
+
+        if self.jobs > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                scanned = list(pool.map(_scan_job, todo, chunksize=max(1, len(todo) // (self.jobs * 4))))
+        else:
+            scanned = [_scan_job(path) for path in todo]
+        for path, digest, parse in scanned:
+            if parse is None:
+                continue
+            if digest in parses:
+                stats.hashed += 1
+            else:
+                parses[digest] = parse
+                stats.parsed += 1
+            stamps[os.path.realpath(path)][2] = digest
+            results[path] = (digest, parses[digest])
+
+        self.files = {}
+        for index, path in sources:
+            if path in results:
+                digest, parse = results[path]
+                self.files[path] = SourceFile(path=path, digest=digest, units=parse['units'],
+                                              file_refs=parse['file_refs'],
+                                              includes=parse['includes'], root=index)
+        stats.files = len(self.files)
+        self._build_graph()
+        return stats
+
+    def _resolve_include(self, name: str, including: str, by_real: Dict[str, str]) -> Optional[str]:
+        for base in [Path(including).parent] + self.include_dirs + self.roots:
+            candidate = os.path.realpath(base / name)
+            if candidate in by_real:
+                return by_real[candidate]
+        # Fall back to a unique file of that name anywhere under the roots
+        matches = [p for p in self.files if Path(p).name == Path(name).name]
+        return matches[0] if len(matches) == 1 else None
+
+    def _build_graph(self):
+        self.definers = {}
+        self.stats.duplicates = {}
+        for path, source in self.files.items():
+            for unit in source.units:
+                if unit in self.definers:
+                    self.stats.duplicates.setdefault(unit, [self.definers[unit]]).append(path)
+                else:
+                    self.definers[unit] = path
+
+        self.headers = set()
+        self.deps = {}
+        external: Set[str] = set()
+        by_real = {os.path.realpath(p): p for p in self.files}
+        for path, source in self.files.items():
+            resolved = [r for r in (self._resolve_include(n, path, by_real) for n in source.includes) if r]
+            source.includes = resolved
+            self.headers.update(resolved)
+            deps = set(resolved)
+            for ref in source.refs:
+                definer = self.definers.get(ref)
+                if definer is None:
+                    external.add(ref)
+                elif definer != path:
+                    deps.add(definer)
+            self.deps[path] = deps
+        self.headers.update(p for p in self.files if p.endswith(HEADER_SUFFIXES))
+        self.stats.external = external
+
+    # -- queries -----------------------------------------------------------
+
+    def closure(self, top: str) -> Set[str]:
+        """Files needed to elaborate a top-level unit."""
+        if top not in self.definers:
+            raise KeyError(f"Unit not found: {top}")
+        needed: Set[str] = set()
+        pending = [self.definers[top]]
+        while pending:
+            path = pending.pop()
+            if path not in needed:
+                needed.add(path)
+                pending.extend(self.deps[path] - needed)
+        return needed
+
+    def compile_order(self, paths: Optional[Iterable[str]] = None) -> Tuple[List[str], List[str]]:
+        """Topological order (dependencies first) of the non-header files.
+
+        Returns (order, cyclic); files on a dependency cycle are appended to
+        the order in path order and also listed in cyclic.
+        """
+        selected = set(self.files if paths is None else paths)
+        rank = {p: i for i, p in enumerate(self.files)}
+        remaining = {p: {d for d in self._compile_deps(p) if d in selected} for p in selected}
+        users: Dict[str, List[str]] = {p: [] for p in selected}
+        for path, deps in remaining.items():
+            for dep in deps:
+                users[dep].append(path)
+
+        ready = [(rank[p], p) for p, deps in remaining.items() if not deps]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, path = heapq.heappop(ready)
+            order.append(path)
+            for user in users[path]:
+                remaining[user].discard(path)
+                if not remaining[user]:
+                    heapq.heappush(ready, (rank[user], user))
+        placed = set(order)
+        cyclic = sorted((p for p in selected if p not in placed), key=rank.get)
+        order.extend(cyclic)
+        return [p for p in order if p not in self.headers], [p for p in cyclic if p not in self.headers]
+
+    def _compile_deps(self, path: str) -> Set[str]:
+        """Dependencies of a file, looking through the headers it includes."""
+        deps: Set[str] = set()
+        seen = {path}
+        pending = list(self.deps[path])
+        while pending:
+            dep = pending.pop()
+            if dep in seen:
+                continue
+            seen.add(dep)
+            if dep in self.headers:
+                pending.extend(self.deps[dep])
+            else:
+                deps.add(dep)
+        return deps
+
+    def dependents(self, paths: Iterable[str]) -> Set[str]:
+        """The given files plus every file that transitively depends on them."""
+        users: Dict[str, Set[str]] = {p: set() for p in self.files}
+        for path, deps in self.deps.items():
+            for dep in deps:
+                users[dep].add(path)
+        result: Set[str] = set()
+        pending = [p for p in paths if p in self.files]
+        while pending:
+            path = pending.pop()
+            if path not in result:
+                result.add(path)
+                pending.extend(users[path] - result)
+        return result
+
+    def changes(self, top: Optional[str] = None) -> ChangeReport:
+        """Compare the scan with the snapshot of the previous run."""
+        report = ChangeReport()
+        previous = self._cache['snapshots'].get(self.snapshot_key)
+        if previous is None:
+            report.first_run = True
+            previous = {}
+        by_real = {os.path.realpath(p): p for p in self.files}
+        for real, path in by_real.items():
+            if real not in previous:
+                report.added.append(path)
+            elif previous[real] != self.files[path].digest:
+                report.modified.append(path)
+        report.removed = sorted(_display_path(r) for r in previous if r not in by_real)
+
+        seeds = set(report.added) | set(report.modified)
+        # Files that used what a removed file defined or included it
+        parses = self._cache['parses']
+        for real in (r for r in previous if r not in by_real):
+            gone = set(parses.get(previous[real], {}).get('units', {}))
+            for path, source in self.files.items():
+                included = parses[source.digest]['includes']
+                if source.refs & gone or any(Path(i).name == Path(real).name for i in included):
+                    seeds.add(path)
+        affected = self.dependents(seeds)
+        if top is not None:
+            affected &= self.closure(top)
+
+        report.affected, _ = self.compile_order(affected)
+        report.modified.sort()
+        report.added.sort()
+        report.units = sorted(u for p in report.affected for u in self.files[p].units)
+        return report
+
+    def tree(self, top: str, max_depth: int = 32) -> List[Tuple[int, str, str]]:
+        """(depth, unit, defining file or '') rows of the instantiation hierarchy."""
+        rows = []
+
+        def walk(unit: str, depth: int, stack: Tuple[str, ...]):
+            path = self.definers.get(unit, "")
+            rows.append((depth, unit, path))
+            if not path or unit in stack or depth >= max_depth:
+                return
+            for ref in self.files[path].units.get(unit, []):
+                walk(ref, depth + 1, stack + (unit,))
+
+        walk(top, 0, ())
+        return rows
+
+
+def _display_path(path: str) -> str:
+    """path relative to the working directory when it is below it."""
+    rel = os.path.relpath(path)
+    return path if rel.startswith('..') else rel
+
+
+def render_tcl(paths: Sequence[str], name: str = "hdl_files") -> str:
+    """A Tcl list in the style of the project creation scripts."""
+    lines = [f"set {name} [list \\"]
+    lines.extend(f'    "{Path(p).as_posix()}" \\' for p in paths)
+    lines.append("]")
+    return "\n".join(lines)
+
+
+def _print_scan_summary(deps: HDLDependencies):
+    stats = deps.stats
+    print(f"Scanned {stats.files} file(s): {stats.parsed} parsed, {stats.hashed} re-hashed, "
+          f"{stats.reused} unchanged; {len(deps.definers)} unit(s), "
+          f"{len(stats.external)} external reference(s)", file=sys.stderr)
+    for unit, paths in sorted(stats.duplicates.items()):
+        print(f"WARNING: {unit} defined in {len(paths)} files, using {paths[0]}", file=sys.stderr)
+
+
+def main():
+    args = sys.argv[1:]
+
+    def pop_option(name: str, default=None):
+        if name in args:
+            i = args.index(name)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        return default
+
+    def pop_all(name: str) -> List[str]:
+        values = []
+        while name in args:
+            values.append(pop_option(name))
+        return values
+
+    def pop_flag(name: str) -> bool:
+        if name in args:
+            args.remove(name)
+            return True
+        return False
+
+    top = pop_option('--top')
+    cache_path = pop_option('--cache')
+    jobs = pop_option('--jobs')
+    include_dirs = pop_all('--include')
+    exclude = pop_all('--exclude')
+    tcl = pop_flag('--tcl')
+    no_update = pop_flag('--no-update')
+
+    if len(args) < 2 or args[0] not in ('order', 'changed', 'tree'):
+        print("Usage: python hdl_deps.py order|changed|tree <root> [<root> ...] [--top MODULE]")
+        print("       [--tcl] [--no-update] [--include DIR] [--exclude GLOB] [--cache PATH] [--jobs N]")
+        sys.exit(1)
+    command, roots = args[0], args[1:]
+    missing = [r for r in roots if not Path(r).exists()]
+    if missing:
+        print(f"ERROR: Not found: {', '.join(missing)}")
+        sys.exit(1)
+    if command == 'tree' and not top:
+        print("ERROR: tree requires --top MODULE")
+        sys.exit(1)
+
+    deps = HDLDependencies(roots, include_dirs, exclude, cache_path, int(jobs) if jobs else None)
+    deps.scan()
+    _print_scan_summary(deps)
+    if top and top not in deps.definers:
+        print(f"ERROR: Unit not found: {top}")
+        sys.exit(1)
+
+    if command == 'order':
+        order, cyclic = deps.compile_order(deps.closure(top) if top else None)
+        print(render_tcl(order) if tcl else "\n".join(order))
+        for path in cyclic:
+            print(f"WARNING: {path} is on a dependency cycle", file=sys.stderr)
+        deps.save()
+
+    elif command == 'tree':
+        for depth, unit, path in deps.tree(top):
+            print(f"{'  ' * depth}{unit}  ({path or 'external'})")
+        deps.save()
+
+    elif command == 'changed':
+        report = deps.changes(top)
+        if tcl:
+            print(render_tcl(report.affected))
+        else:
+            print("=" * 70)
+            print("HDL CHANGES" + (f" (top: {top})" if top else ""))
+            print("=" * 70)
+            if report.first_run:
+                print("No previous snapshot for these roots: everything is affected")
+            else:
+                for label, paths in (("Modified", report.modified), ("Added", report.added),
+                                     ("Removed", report.removed)):
+                    for path in paths:
+                        print(f"  {label + ':':<10} {path}")
+                if not (report.modified or report.added or report.removed):
+                    print("  ✓ No source changes")
+            print()
+            print(f"Recompile ({len(report.affected)} of {len(deps.files) - len(deps.headers)} files):")
+            for path in report.affected:
+                print(f"  {path}")
+            if report.units:
+                print(f"Modules: {', '.join(report.units)}")
+        deps.save(snapshot=not no_update)
+
+
+if __name__ == '__main__':
+    main()
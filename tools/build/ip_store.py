@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Vendored IP Deduplicating Store
+
+Libero projects vendor identical copies of DirectCore/SgCore sources
+(component/Actel/DirectCore/CoreTimer/2.0.103/...), the MIV_RV32 sources
+and the bfmtovec.exe/.lin simulation tools. This tool hashes those files
+across project trees in parallel and replaces every duplicate with a link to
+one copy in a content-addressed store (objects/ab/abcdef...):
+
+    reflink   copy-on-write clone (btrfs, XFS); the project copy stays
+              independently editable
+    hard      hardlink; the store object is made read-only so an in-place
+              edit through one project cannot change the others
+    auto      reflink where the filesystem supports it, else hardlink
+              (with a warning, since that shares the object's inode)
+
+A manifest per project records which files are linked to which object, so
+the store can be verified (missing files, local edits, corrupt objects) and
+files restored from it or detached back into private copies before editing.
+A corrupt or missing object is rebuilt from any linked copy that still
+hashes to its digest; restore exits non-zero when none is left.
+
+Usage:
+    python ip_store.py dedup <root> [<root> ...] [--link auto|hard|reflink] [--all]
+                             [--min-size 1K] [--dry-run]
+    python ip_store.py verify [<root> ...]
+    python ip_store.py restore <root> [<root> ...] [--detach]
+    python ip_store.py stats
+    python ip_store.py gc
+
+A root is a Libero project directory or a tree containing several
+(located by their .prjx files).
+
+Environment:
+    TCL_MONSTER_IP_STORE    store location (default <repo>/.ip_store)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from build_cache import REPO_ROOT, file_digest, parse_size
+
+# Project discovery is shared with the helper scripts
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+from project_index import find_projects  # noqa: E402
+
+STORE_VERSION = 1
+DEFAULT_STORE_DIR = REPO_ROOT / ".ip_store"
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+DEFAULT_MIN_SIZE = 1024
+
+LINK_MODES = ("auto", "hard", "reflink")
+
+# Linux FICLONE ioctl: clone a whole file's extents (copy-on-write)
+FICLONE = 0x40049409
+
+# Vendored files deduplicated in each project (everything with --all)
+VENDORED_PATTERNS = (
+    "component/Actel/**/*",
+    "component/Microsemi/**/*",
+    "component/*.v",
+    "simulation/*.exe",
+    "simulation/*.lin",
+    "simulation/*.bfm",
+)
+
+
+@dataclass
+class DedupReport:
+    """Outcome of one dedup run."""
+    scanned: int = 0
+    stored: int = 0  # files that became a store object in place
+    linked: int = 0
+    already_linked: int = 0
+    bytes_saved: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class RestoreReport:
+    """Outcome of one restore run."""
+    restored: int = 0  # files relinked (or detached)
+    recovered: int = 0  # corrupt or missing objects rebuilt from a good project copy
+    unrecoverable: List[Tuple[Path, str]] = field(default_factory=list)
+
+
+def _reflink(src: Path, dst: Path):
+    """Copy-on-write clone of src at dst; OSError where unsupported."""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("reflinks are not supported on this platform")
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            dst.unlink()
+            raise
+
+
+class IPStore:
+    """Content-addressed store of vendored IP files, linked into projects."""
+
+    def __init__(self, root: Optional[Path] = None, link_mode: str = "auto",
+                 workers: int = DEFAULT_WORKERS):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"Unknown link mode: {link_mode} (known: {', '.join(LINK_MODES)})")
+        self.root = Path(root or os.environ.get("TCL_MONSTER_IP_STORE", DEFAULT_STORE_DIR))
+        self.link_mode = link_mode
+        self.workers = max(1, workers)
+        self._warned_hardlink = False
+        self.objects = self.root / "objects"
+        self.manifests = self.root / "manifests"
+
+    # Paths and manifests
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def _manifest_path(self, project: Path) -> Path:
+        key = hashlib.sha256(str(project.resolve()).encode()).hexdigest()[:16]
+        return self.manifests / f"{key}.json"
+
+    def load_manifest(self, project: Path) -> Dict[str, str]:
+        """relpath -> digest of the project's linked files."""
+        try:
+            with open(self._manifest_path(project), 'r') as f:
+                return json.load(f)["files"]
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def _write_manifest(self, project: Path, files: Dict[str, str]):
+        path = self._manifest_path(project)
+        if not files:
+            if path.exists():
+                path.unlink()
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({"version": STORE_VERSION, "project": str(project.resolve()),
+                       "files": dict(sorted(files.items()))}, f, indent=1)
+        os.replace(tmp, path)
+
+    def _all_manifests(self) -> List[Tuple[Path, Dict[str, str]]]:
+        manifests = []
+        for path in sorted(self.manifests.glob("*.json")):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                manifests.append((Path(data["project"]), data["files"]))
+            except (OSError, ValueError, KeyError):
+                continue
+        return manifests
+
+    def _manifests_for(self, roots: Optional[Iterable[Path]]) -> List[Tuple[Path, Dict[str, str]]]:
+        if not roots:
+            return self._all_manifests()
+        return [(p, self.load_manifest(p)) for p in find_projects(roots)]
+
+    # Hashing and linking
+
+    def hash_files(self, paths: Iterable[Path]) -> Dict[Path, str]:
+        """sha256 of each file, hashed in parallel (hashlib releases the GIL)."""
+        paths = list(paths)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return dict(zip(paths, pool.map(file_digest, paths)))
+
+    def _hardlink_fallback(self, path: Path, error: OSError):
+        """Warn (once) that auto mode is sharing inodes between store and projects."""
+        if self._warned_hardlink:
+            return
+        self._warned_hardlink = True
+        print(f"WARNING: reflink unsupported for {path} ({error.strerror or error}); "
+              f"falling back to hardlinks, so project files share the store object's inode",
+              file=sys.stderr)
+
+    def _link(self, obj: Path, target: Path) -> str:
+        """Replace target with a link to obj; returns the link kind used."""
+        tmp = target.with_name(f".{target.name}.iplink")
+        if tmp.exists():
+            tmp.unlink()
+        kind = "hard"
+        if self.link_mode in ("auto", "reflink"):
+            try:
+                _reflink(obj, tmp)
+                shutil.copymode(obj, tmp)
+                os.chmod(tmp, os.stat(tmp).st_mode | stat.S_IWUSR)
+                kind = "reflink"
+            except OSError as e:
+                if self.link_mode == "reflink":
+                    raise
+                self._hardlink_fallback(target, e)
+        if kind == "hard":
+            os.link(obj, tmp)
+        os.replace(tmp, target)
+        return kind
+
+    def _ingest(self, path: Path, digest: str) -> Path:
+        """Object for digest, created from path if the store lacks it."""
+        obj = self._object_path(digest)
+        executable = os.stat(path).st_mode & 0o111
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            tmp = obj.with_suffix('.tmp')
+            if tmp.exists():
+                tmp.unlink()
+            try:
+                if self.link_mode == "hard":
+                    os.link(path, tmp)
+                else:
+                    try:
+                        _reflink(path, tmp)
+                    except OSError as e:
+                        if self.link_mode == "reflink":
+                            raise
+                        self._hardlink_fallback(path, e)
+                        os.link(path, tmp)
+            except OSError:
+                shutil.copyfile(path, tmp)
+            os.replace(tmp, obj)
+        mode = stat.S_IMODE(os.stat(obj).st_mode)
+        wanted = 0o444 | (0o111 if executable or mode & 0o111 else 0)
+        if mode != wanted:
+            os.chmod(obj, wanted)
+        return obj
+
+    # Operations
+
+    def candidates(self, project: Path, all_files: bool = False,
+                   min_size: int = DEFAULT_MIN_SIZE) -> List[Path]:
+        """Files of a project eligible for deduplication."""
+        patterns = ("**/*",) if all_files else VENDORED_PATTERNS
+        files = set()
+        for pattern in patterns:
+            for p in project.glob(pattern):
+                if p.is_file() and not p.is_symlink() and p.stat().st_size >= min_size \
+                        and not p.name.endswith('.iplink'):
+                    files.add(p)
+        return sorted(files)
+
+    def dedup(self, roots: Iterable[Path], all_files: bool = False,
+              min_size: int = DEFAULT_MIN_SIZE, dry_run: bool = False) -> DedupReport:
+        """Move duplicated files into the store and link them back."""
+        report = DedupReport()
+        projects = find_projects(roots)
+        files = {p: project for project in projects for p in self.candidates(project, all_files, min_size)}
+        report.scanned = len(files)
+        digests = self.hash_files(files)
+
+        counts: Dict[str, int] = {}
+        for digest in digests.values():
+            counts[digest] = counts.get(digest, 0) + 1
+
+        manifests = {project: self.load_manifest(project) for project in projects}
+        planned = set()  # digests a dry run would have stored
+        for path, digest in digests.items():
+            obj = self._object_path(digest)
+            if counts[digest] < 2 and not obj.exists():
+                continue
+            project = files[path]
+            rel = path.relative_to(project).as_posix()
+            if obj.exists() and (os.path.samefile(obj, path) or manifests[project].get(rel) == digest):
+                report.already_linked += 1  # hardlinked, or reflinked by an earlier run
+                manifests[project][rel] = digest
+                continue
+            size = path.stat().st_size
+            if dry_run:
+                if obj.exists() or digest in planned:
+                    report.linked += 1
+                    report.bytes_saved += size
+                else:
+                    planned.add(digest)
+                    report.stored += 1
+                continue
+            try:
+                created = not obj.exists()
+                obj = self._ingest(path, digest)
+                if created:
+                    report.stored += 1
+                else:
+                    self._link(obj, path)
+                    report.linked += 1
+                    report.bytes_saved += size
+                manifests[project][rel] = digest
+            except OSError as e:
+                report.errors.append(f"{path}: {e}")
+
+        if not dry_run:
+            for project, manifest in manifests.items():
+                self._write_manifest(project, manifest)
+        return report
+
+    def verify(self, roots: Optional[Iterable[Path]] = None) -> List[Tuple[Path, str]]:
+        """Check linked files and their objects; returns (path, problem) pairs."""
+        problems: List[Tuple[Path, str]] = []
+        manifests = self._manifests_for(roots)
+        digests = {d for _, files in manifests for d in files.values()}
+        objects = {d: self._object_path(d) for d in digests if self._object_path(d).exists()}
+        hashed = self.hash_files(objects.values())
+        object_ok = {d: hashed[obj] == d for d, obj in objects.items()}
+
+        to_hash = []
+        for project, files in manifests:
+            for rel, digest in files.items():
+                path = project / rel
+                if digest not in objects:
+                    problems.append((path, "store object missing"))
+                elif not object_ok[digest]:
+                    problems.append((path, "store object corrupt"))
+                elif not path.exists():
+                    problems.append((path, "missing"))
+                elif not os.path.samefile(path, objects[digest]):
+                    to_hash.append((path, digest))
+        actual = self.hash_files(p for p, _ in to_hash)
+        problems.extend((path, "modified") for path, digest in to_hash if actual[path] != digest)
+        return problems
+
+    def _recover_object(self, digest: str, manifests: List[Tuple[Path, Dict[str, str]]]) -> bool:
+        """Rebuild a missing or corrupt object from a linked copy that still hashes to digest.
+
+        Hardlinked copies share the object's inode and are as damaged as it
+        is; a reflinked or not yet relinked copy may still be intact.
+        """
+        obj = self._object_path(digest)
+        for project, files in manifests:
+            for rel, linked in files.items():
+                path = project / rel
+                if linked != digest or not path.is_file() or obj.exists() and os.path.samefile(path, obj):
+                    continue
+                if file_digest(path) != digest:
+                    continue
+                obj.parent.mkdir(parents=True, exist_ok=True)
+                tmp = obj.with_suffix('.tmp')
+                if tmp.exists():
+                    tmp.unlink()
+                shutil.copyfile(path, tmp)
+                os.chmod(tmp, 0o444 | (os.stat(path).st_mode & 0o111))
+                os.replace(tmp, obj)
+                return True
+        return False
+
+    def restore(self, roots: Iterable[Path], detach: bool = False) -> RestoreReport:
+        """Relink missing or modified files from the store.
+
+        Missing or corrupt objects are first rebuilt from any project copy
+        that still hashes to their digest; files whose object cannot be
+        rebuilt are reported as unrecoverable and left alone. With
+        detach=True every linked file is instead replaced by a private,
+        writable copy and dropped from the manifest.
+        """
+        report = RestoreReport()
+        manifests = [(p, self.load_manifest(p)) for p in find_projects(roots)]
+        digests = {d for _, files in manifests for d in files.values()}
+        objects = {d: self._object_path(d) for d in digests if self._object_path(d).exists()}
+        hashed = self.hash_files(objects.values())
+        bad = {d for d in digests if d not in objects or hashed[objects[d]] != d}
+        # Files hardlinked to a corrupt object are corrupt with it
+        damaged_inodes = {(st.st_dev, st.st_ino) for st in (os.stat(objects[d]) for d in bad if d in objects)}
+        if bad:
+            local = {p for p, _ in manifests}
+            everywhere = manifests + [m for m in self._all_manifests() if m[0] not in local]
+            for digest in sorted(bad):
+                if self._recover_object(digest, everywhere):
+                    bad.discard(digest)
+                    report.recovered += 1
+
+        for project, files in manifests:
+            for rel, digest in list(files.items()):
+                path = project / rel
+                obj = self._object_path(digest)
+                if digest in bad:
+                    state = "corrupt" if obj.exists() else "missing"
+                    report.unrecoverable.append((path, f"store object {state}, no intact copy to rebuild it from"))
+                    continue
+                damaged = path.exists() and (os.stat(path).st_dev, os.stat(path).st_ino) in damaged_inodes
+                if detach:
+                    if not damaged and (not path.exists() or not os.path.samefile(path, obj)
+                                        and file_digest(path) != digest):
+                        continue  # edited or gone: already private
+                    tmp = path.with_name(f".{path.name}.iplink")
+                    shutil.copy2(obj, tmp)
+                    os.chmod(tmp, os.stat(tmp).st_mode | stat.S_IWUSR)
+                    os.replace(tmp, path)
+                    del files[rel]
+                    report.restored += 1
+                elif damaged or not path.exists() or not os.path.samefile(path, obj) \
+                        and file_digest(path) != digest:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    self._link(obj, path)
+                    report.restored += 1
+            self._write_manifest(project, files)
+        return report
+
+    def gc(self) -> int:
+        """Delete objects no manifest refers to. Returns bytes freed."""
+        referenced = {d for _, files in self._all_manifests() for d in files.values()}
+        freed = 0
+        for obj in self.objects.glob("*/*"):
+            if obj.name not in referenced:
+                freed += obj.stat().st_size
+                os.chmod(obj, stat.S_IWUSR | stat.S_IRUSR)
+                obj.unlink()
+        return freed
+
+    def stats(self) -> Dict[str, object]:
+        manifests = self._all_manifests()
+        sizes = {p.name: p.stat().st_size for p in self.objects.glob("*/*") if p.suffix != '.tmp'}
+        logical = sum(sizes.get(d, 0) for _, files in manifests for d in files.values())
+        return {
+            "root": str(self.root),
+            "projects": len(manifests),
+            "linked_files": sum(len(files) for _, files in manifests),
+            "objects": len(sizes),
+            "bytes": sum(sizes.values()),
+            "logical_bytes": logical,
+            "saved_bytes": logical - sum(sizes.values()),
+        }
+
+
+def main():
+    """Main entry point."""
+    args = sys.argv[1:]
+    link_mode = "auto"
+    if '--link' in args:
+        i = args.index('--link')
+        link_mode = args[i + 1]
+        del args[i:i + 2]
+    min_size = DEFAULT_MIN_SIZE
+    if '--min-size' in args:
+        i = args.index('--min-size')
+        min_size = parse_size(args[i + 1])
+        del args[i:i + 2]
+    flags = {a for a in args if a.startswith('--')}
+    args = [a for a in args if not a.startswith('--')]
+
+    if not args or args[0] not in ('dedup', 'verify', 'restore', 'stats', 'gc'):
+        print("Usage: python ip_store.py dedup <root> [<root> ...] [--link auto|hard|reflink] [--all] "
+              "[--min-size 1K] [--dry-run]")
+        print("   or: python ip_store.py verify [<root> ...]")
+        print("   or: python ip_store.py restore <root> [<root> ...] [--detach]")
+        print("   or: python ip_store.py stats | gc")
+        sys.exit(1)
+    if link_mode not in LINK_MODES:
+        print(f"ERROR: Unknown link mode: {link_mode} (known: {', '.join(LINK_MODES)})")
+        sys.exit(1)
+
+    store = IPStore(link_mode=link_mode)
+    command, roots = args[0], [Path(a) for a in args[1:]]
+    missing = [r for r in roots if not r.is_dir()]
+    if missing:
+        print(f"ERROR: Not a directory: {missing[0]}")
+        sys.exit(1)
+
+    if command == 'stats':
+        for name, value in store.stats().items():
+            print(f"{name + ':':<16} {value}")
+    elif command == 'gc':
+        print(f"Freed {store.gc():,} bytes")
+    elif command == 'verify':
+        problems = store.verify(roots)
+        for path, problem in problems:
+            print(f"  ✗ {path}: {problem}")
+        print(f"{len(problems)} problem(s)")
+        sys.exit(1 if problems else 0)
+    elif not roots:
+        print(f"ERROR: {command} requires at least one root directory")
+        sys.exit(1)
+    elif command == 'dedup':
+        report = store.dedup(roots, all_files='--all' in flags, min_size=min_size, dry_run='--dry-run' in flags)
+        prefix = "Would link" if '--dry-run' in flags else "Linked"
+        print(f"Scanned {report.scanned} file(s)")
+        print(f"{prefix} {report.linked} file(s) to {report.stored} new object(s), "
+              f"{report.already_linked} already linked, {report.bytes_saved:,} bytes saved")
+        for error in report.errors:
+            print(f"  ✗ {error}")
+        sys.exit(1 if report.errors else 0)
+    elif command == 'restore':
+        report = store.restore(roots, detach='--detach' in flags)
+        if report.recovered:
+            print(f"Rebuilt {report.recovered} store object(s) from intact project copies")
+        print(f"{'Detached' if '--detach' in flags else 'Restored'} {report.restored} file(s)")
+        for path, problem in report.unrecoverable:
+            print(f"  ✗ {path}: {problem}")
+        sys.exit(1 if report.unrecoverable else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Stub Libero executable for testing the build scheduler without Libero.
+
+Accepts the same command line as libero.exe ("SCRIPT:<tcl>" or
+"SCRIPT_ARGS:<tcl> args...") and replays a checked-in project's logs for
+every 'run_tool -name {...}' found in the script:
+
+- SYNTHESIZE  -> synthesis/synplify.log, synthesis/<design>.srr
+- PLACEROUTE  -> designer/<design>/<design>_layout_log.log
+
+The logs are copied into $TCL_MONSTER_PROJECT (set by build_scheduler.py)
+and the usual "The 'run_tool ...' command succeeded." lines are printed.
+
+Environment:
+    STUB_LIBERO_REPLAY   project to replay (default libero_projects/counter_demo)
+    STUB_LIBERO_DELAY    seconds per stage (default 0.1)
+    STUB_LIBERO_FAIL     tool name to fail, e.g. PLACEROUTE
+
+Usage:
+    python build_scheduler.py jobs.json --libero "python3 tools/build/stub_libero.py"
+"""
+
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_REPLAY = REPO_ROOT / "libero_projects" / "counter_demo"
+
+RUN_TOOL_RE = re.compile(r'^\s*run_tool\s+-name\s+\{?(\w+)\}?', re.MULTILINE)
+
+
+def stage_logs(replay: Path, tool: str):
+    """(source, path relative to the project) of the logs a tool writes."""
+    if tool == "SYNTHESIZE":
+        log = replay / "synthesis" / "synplify.log"
+        if log.exists():
+            yield log, log.relative_to(replay)
+        for srr in sorted((replay / "synthesis").glob("*.srr"))[:1]:
+            yield srr, srr.relative_to(replay)
+    elif tool == "PLACEROUTE":
+        for design_dir in sorted((replay / "designer").glob("*/")):
+            log = design_dir / f"{design_dir.name}_layout_log.log"
+            if log.exists():
+                yield log, log.relative_to(replay)
+                return
+
+
+def main():
+    if len(sys.argv) < 2 or ':' not in sys.argv[1]:
+        print("Usage: stub_libero.py SCRIPT:<tcl_script> [script_args...]")
+        sys.exit(1)
+
+    mode, script = sys.argv[1].split(':', 1)
+    replay = Path(os.environ.get("STUB_LIBERO_REPLAY", DEFAULT_REPLAY))
+    project = os.environ.get("TCL_MONSTER_PROJECT")
+    delay = float(os.environ.get("STUB_LIBERO_DELAY", "0.1"))
+    fail = os.environ.get("STUB_LIBERO_FAIL", "")
+
+    try:
+        with open(script, 'r', encoding='utf-8', errors='ignore') as f:
+            tools = RUN_TOOL_RE.findall(f.read())
+    except OSError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"Stub Libero replaying {replay} ({mode}:{script} {' '.join(sys.argv[2:])})", flush=True)
+
+    for tool in tools:
+        time.sleep(delay)
+        if tool == fail:
+            print(f"Error: The 'run_tool -name {{{tool}}}' command failed.", flush=True)
+            print("The Execute Script command failed.", flush=True)
+            sys.exit(1)
+
+        if project and Path(project).resolve() != replay.resolve():
+            for source, rel in stage_logs(replay, tool):
+                target = Path(project) / rel
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(source, target)
+
+        print(f"The 'run_tool -name {{{tool}}}' command succeeded.", flush=True)
+
+    print("The Execute Script command succeeded.", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+Serial Console Capture Service
+
+asyncio service that owns a board's serial console (BeagleV-Fire, MI-V UART)
+and replaces the queue-file polling loop of serial_smart.ps1:
+
+- Every byte read lands in a bounded in-memory ring buffer and in a
+  rotating, timestamped on-disk log
+- Pattern triggers (regexes compiled once when added) fire callbacks on
+  console lines, e.g. auto-login on "login:" / "Password:"
+- expect-style waits: block until a regex appears after a given offset
+- Local command-injection API: JSON lines over TCP on 127.0.0.1, so a
+  command round-trip costs the board's response time, not a poll interval
+- FakeBoard: a pty-backed fake console for exercising all of the above
+  without hardware
+
+Usage:
+    python serial_capture.py serve /dev/ttyUSB0 [--baud 115200] [--log serial.log]
+                                 [--listen 127.0.0.1:5760] [--login beagle:temppwd]
+                                 [--trigger REGEX ...] [--interactive]
+    python serial_capture.py serve --fake [...]      # pty fake board
+    python serial_capture.py send "uname -a" [--expect REGEX] [--timeout S]
+    python serial_capture.py tail [BYTES]
+
+Under WSL1, COMn is /dev/ttySn. Requires termios (Linux/macOS/WSL).
+
+API (one JSON object per line, one reply per request):
+    {"op": "command", "cmd": "uname -a", "timeout": 10}  -> {"ok": true, "output": "..."}
+    {"op": "send", "data": "\\x03"}                       -> {"ok": true, "offset": N}
+    {"op": "expect", "pattern": "login:", "since": N}    -> {"ok": true, "match": "...", "offset": N}
+    {"op": "tail", "bytes": 4096}                        -> {"ok": true, "text": "..."}
+"""
+
+import asyncio
+import json
+import os
+import re
+import socket
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Pattern, Union
+
+try:
+    import pty
+    import termios
+    import tty
+except ImportError:  # Windows without WSL
+    pty = termios = tty = None
+
+
+DEFAULT_BAUD = 115200
+DEFAULT_LISTEN = ("127.0.0.1", 5760)
+DEFAULT_PROMPT = r'[\w.-]+@[\w.-]+:[^\n]*[$#] $'
+DEFAULT_RING_SIZE = 1 << 20
+DEFAULT_LOG_MAX_BYTES = 10 * 2**20
+DEFAULT_LOG_BACKUPS = 5
+
+ANSI_RE = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]|\x1b[()][AB012]|\r')
+
+PatternLike = Union[str, Pattern]
+
+
+def compile_pattern(pattern: PatternLike) -> Pattern:
+    return pattern if isinstance(pattern, re.Pattern) else re.compile(pattern, re.MULTILINE)
+
+
+def clean_text(data: bytes) -> str:
+    """Decode console bytes and drop ANSI escapes and carriage returns."""
+    return ANSI_RE.sub('', data.decode('utf-8', errors='replace'))
+
+
+class RingBuffer:
+    """Fixed-size byte ring addressed by absolute stream offsets."""
+
+    def __init__(self, capacity: int = DEFAULT_RING_SIZE):
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self.total = 0  # bytes ever written
+
+    @property
+    def start(self) -> int:
+        """Oldest offset still held."""
+        return max(0, self.total - self.capacity)
+
+    def write(self, data: bytes):
+        n = len(data)
+        if n >= self.capacity:
+            self.total += n - self.capacity
+            data, n = data[-self.capacity:], self.capacity
+        pos = self.total % self.capacity
+        first = min(n, self.capacity - pos)
+        self._buf[pos:pos + first] = data[:first]
+        self._buf[:n - first] = data[first:]
+        self.total += n
+
+    def read_from(self, offset: int) -> bytes:
+        """Bytes from an absolute offset to the end (clipped to what is still held)."""
+        offset = max(offset, self.start)
+        n = self.total - offset
+        if n <= 0:
+            return b''
+        pos = offset % self.capacity
+        if pos + n <= self.capacity:
+            return bytes(self._buf[pos:pos + n])
+        return bytes(self._buf[pos:]) + bytes(self._buf[:n - (self.capacity - pos)])
+
+    def tail(self, n: int) -> bytes:
+        return self.read_from(self.total - n)
+
+
+class RotatingLog:
+    """Timestamped transcript rotated by size (serial.log, serial.log.1, ...)."""
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_LOG_MAX_BYTES,
+                 backups: int = DEFAULT_LOG_BACKUPS):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._at_line_start = True
+
+    @staticmethod
+    def _stamp() -> str:
+        now = time.time()
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now)) + f".{int(now % 1 * 1000):03d} "
+
+    def write(self, text: str):
+        """Write console text, prefixing each new line with a timestamp."""
+        out = []
+        for piece in text.splitlines(keepends=True):
+            if self._at_line_start:
+                out.append(self._stamp())
+            out.append(piece)
+            self._at_line_start = piece.endswith('\n')
+        self._file.write(''.join(out))
+        self._file.flush()
+        if self._file.tell() >= self.max_bytes:
+            self.rotate()
+
+    def note(self, text: str):
+        """Write a service annotation ([INJECT] ..., [TRIGGER] ...) on its own line."""
+        self.write(('' if self._at_line_start else '\n') + text + '\n')
+
+    def rotate(self):
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{i}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backups:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._at_line_start = True
+
+    def close(self):
+        self._file.close()
+
+
+@dataclass
+class Trigger:
+    """Callback fired when a console line matches."""
+    pattern: Pattern
+    callback: Callable[["SerialCapture", re.Match], None]
+    once: bool = False
+    fired_line: int = -1
+
+
+@dataclass
+class ExpectResult:
+    match: re.Match
+    text: str      # cleaned text from the wait's start offset through the match
+    offset: int    # stream offset at the time the match was seen
+
+
+@dataclass
+class _Waiter:
+    pattern: Pattern
+    since: int
+    future: asyncio.Future = field(repr=False)
+
+
+def open_serial(path: str, baud: int = DEFAULT_BAUD) -> int:
+    """Open a serial device (or pty) raw, non-blocking, at the given baud rate."""
+    if termios is None:
+        raise OSError("termios is not available on this platform (use WSL or Linux)")
+    fd = os.open(path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+    tty.setraw(fd, termios.TCSANOW)  # TCSAFLUSH would drop a pending login prompt
+    attrs = termios.tcgetattr(fd)
+    speed = getattr(termios, f"B{baud}", None)
+    if speed is None:
+        os.close(fd)
+        raise ValueError(f"Unsupported baud rate: {baud}")
+    attrs[2] |= termios.CLOCAL | termios.CREAD
+    attrs[4] = attrs[5] = speed
+    termios.tcsetattr(fd, termios.TCSANOW, attrs)
+    return fd
+
+
+class SerialCapture:
+    """Owns one serial console: capture, triggers, expect and command injection."""
+
+    def __init__(self, port: str, baud: int = DEFAULT_BAUD, log_path: Optional[Path] = None,
+                 ring_size: int = DEFAULT_RING_SIZE, prompt: PatternLike = DEFAULT_PROMPT,
+                 line_ending: str = "\n", echo: Optional[Callable[[str], None]] = None):
+        self.port = port
+        self.baud = baud
+        self.ring = RingBuffer(ring_size)
+        self.log = RotatingLog(log_path) if log_path else None
+        self.prompt = compile_pattern(prompt)
+        self.line_ending = line_ending
+        self.echo = echo
+        self.triggers: List[Trigger] = []
+        self.lines = 0  # completed console lines
+        self.closed = asyncio.Event()
+
+        self._fd: Optional[int] = None
+        self._line = ''
+        self._waiters: List[_Waiter] = []
+        self._command_lock = asyncio.Lock()
+
+    # Lifecycle
+
+    async def start(self):
+        self._fd = open_serial(self.port, self.baud)
+        asyncio.get_running_loop().add_reader(self._fd, self._on_readable)
+
+    def close(self):
+        if self._fd is not None:
+            asyncio.get_running_loop().remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        for waiter in self._waiters:
+            if not waiter.future.done():
+                waiter.future.set_exception(EOFError("serial port closed"))
+        self._waiters.clear()
+        if self.log:
+            self.log.close()
+        self.closed.set()
+
+    def _on_readable(self):
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return
+        except OSError:  # EIO: device unplugged / pty closed
+            data = b''
+        if not data:
+            self.close()
+            return
+        self.feed(data)
+
+    # Ingest
+
+    def feed(self, data: bytes):
+        """Process bytes read from the console."""
+        self.ring.write(data)
+        text = clean_text(data)
+        if self.log:
+            self.log.write(text)
+        if self.echo:
+            self.echo(text)
+        self._run_triggers(text)
+        self._wake_waiters()
+
+    def _run_triggers(self, text: str):
+        if not self.triggers:
+            return
+        *complete, self._line = (self._line + text).split('\n')
+        for line in complete:
+            self._fire(line)
+            self.lines += 1
+        if self._line:
+            # Prompts such as "login: " never end with a newline
+            self._fire(self._line)
+
+    def _fire(self, line: str):
+        for trigger in list(self.triggers):
+            if trigger.fired_line == self.lines:
+                continue
+            match = trigger.pattern.search(line)
+            if match:
+                trigger.fired_line = self.lines
+                if trigger.once:
+                    self.triggers.remove(trigger)
+                if self.log:
+                    self.log.note(f"[TRIGGER] {trigger.pattern.pattern}")
+                trigger.callback(self, match)
+
+    def _wake_waiters(self):
+        for waiter in list(self._waiters):
+            if waiter.future.done():
+                self._waiters.remove(waiter)
+                continue
+            text = clean_text(self.ring.read_from(waiter.since))
+            match = waiter.pattern.search(text)
+            if match:
+                waiter.future.set_result(ExpectResult(match, text[:match.end()], self.ring.total))
+                self._waiters.remove(waiter)
+
+    # API
+
+    def add_trigger(self, pattern: PatternLike, callback: Callable[["SerialCapture", re.Match], None],
+                    once: bool = False) -> Trigger:
+        trigger = Trigger(compile_pattern(pattern), callback, once)
+        self.triggers.append(trigger)
+        return trigger
+
+    def add_login(self, username: str, password: str):
+        """Answer login/password prompts automatically."""
+        self.add_trigger(r'login:\s*$', lambda cap, m: cap.write(username + cap.line_ending))
+        self.add_trigger(r'[Pp]assword:\s*$', lambda cap, m: cap.write(password + cap.line_ending))
+
+    def write(self, text: Union[str, bytes]) -> int:
+        """Write to the console now; returns the stream offset before the write."""
+        if self._fd is None:
+            raise EOFError("serial port closed")
+        data = text.encode('utf-8') if isinstance(text, str) else text
+        offset = self.ring.total
+        while data:
+            try:
+                data = data[os.write(self._fd, data):]
+            except BlockingIOError:
+                time.sleep(0.001)  # UART TX FIFO full; drains in microseconds
+        return offset
+
+    async def expect(self, pattern: PatternLike, timeout: float = 10.0,
+                     since: Optional[int] = None) -> ExpectResult:
+        """Wait for a pattern in console output after `since` (default: now)."""
+        waiter = _Waiter(compile_pattern(pattern), self.ring.total if since is None else since,
+                         asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self._wake_waiters()
+        try:
+            return await asyncio.wait_for(waiter.future, timeout)
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    async def command(self, cmd: str, expect: Optional[PatternLike] = None,
+                      timeout: float = 10.0) -> str:
+        """Send a command line and return its output (echo and prompt stripped)."""
+        async with self._command_lock:
+            if self.log:
+                self.log.note(f"[INJECT] {cmd}")
+            offset = self.write(cmd + self.line_ending)
+            result = await self.expect(expect or self.prompt, timeout, since=offset)
+        output = result.text[:result.match.start()]
+        lines = output.split('\n')
+        if lines and lines[0].strip() == cmd.strip():
+            lines = lines[1:]
+        return '\n'.join(lines).rstrip('\n')
+
+    # Command-injection server
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    reply = await self._dispatch(json.loads(line))
+                except asyncio.TimeoutError:
+                    reply = {"ok": False, "error": "timeout", "tail": clean_text(self.ring.tail(2048))}
+                except (ValueError, KeyError, re.error, EOFError) as e:
+                    reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                writer.write((json.dumps(reply) + "\n").encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request: Dict) -> Dict:
+        op = request.get("op", "command")
+        timeout = float(request.get("timeout", 10.0))
+        if op == "command":
+            output = await self.command(request["cmd"], request.get("expect"), timeout)
+            return {"ok": True, "output": output}
+        if op == "send":
+            return {"ok": True, "offset": self.write(request["data"])}
+        if op == "expect":
+            result = await self.expect(request["pattern"], timeout, request.get("since"))
+            return {"ok": True, "match": result.match.group(0), "text": result.text, "offset": result.offset}
+        if op == "tail":
+            return {"ok": True, "text": clean_text(self.ring.tail(int(request.get("bytes", 4096)))),
+                    "offset": self.ring.total}
+        if op == "offset":
+            return {"ok": True, "offset": self.ring.total}
+        raise ValueError(f"unknown op {op!r}")
+
+    async def serve(self, host: str = DEFAULT_LISTEN[0], port: int = DEFAULT_LISTEN[1]):
+        """Serve the JSON-lines API until the console closes."""
+        server = await asyncio.start_server(self._handle_client, host, port)
+        async with server:
+            await self.closed.wait()
+
+
+class FakeBoard:
+    """pty-backed fake console: login, echo, prompt and canned command replies."""
+
+    def __init__(self, responses: Optional[Dict[str, str]] = None, prompt: str = "beagle@BeagleV:~$ ",
+                 login: Optional[str] = None, password: Optional[str] = None, delay: float = 0.0):
+        if pty is None:
+            raise OSError("pty is not available on this platform")
+        self.responses = {
+            "uname -a": "Linux BeagleV 6.1.33-linux4microchip+fpga-2023.06 #1 SMP riscv64 GNU/Linux",
+            "ls /lib/firmware/mpfs_*": "/lib/firmware/mpfs_bitstream.spi\n/lib/firmware/mpfs_dtbo.spi",
+        }
+        self.responses.update(responses or {})
+        self.prompt = prompt
+        self.login = login
+        self.password = password
+        self.delay = delay
+        self.received: List[str] = []
+        self._state = "login" if login else "shell"
+        self._pending = b''
+        self.master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        self.path = os.ttyname(self._slave)
+
+    def start(self):
+        os.set_blocking(self.master, False)
+        asyncio.get_running_loop().add_reader(self.master, self._on_readable)
+        self._send("\r\nBeagleV login: " if self.login else "\r\n" + self.prompt)
+
+    def close(self):
+        asyncio.get_running_loop().remove_reader(self.master)
+        os.close(self.master)
+        os.close(self._slave)
+
+    def _send(self, text: str):
+        os.write(self.master, text.replace('\n', '\r\n').replace('\r\r\n', '\r\n').encode())
+
+    def _on_readable(self):
+        try:
+            self._pending += os.read(self.master, 4096)
+        except OSError:
+            return
+        while b'\n' in self._pending or b'\r' in self._pending:
+            line, _, self._pending = self._pending.replace(b'\r', b'\n').partition(b'\n')
+            self._line(line.decode('utf-8', errors='replace'))
+
+    def _line(self, line: str):
+        if self._state == "login":
+            self._send(line + "\nPassword: ")
+            self._state = "password" if line == self.login else "login-failed"
+            return
+        if self._state in ("password", "login-failed"):
+            if self._state == "password" and line == self.password:
+                self._state = "shell"
+                self._send("\nLast login: today\n" + self.prompt)
+            else:
+                self._state = "login"
+                self._send("\nLogin incorrect\nBeagleV login: ")
+            return
+
+        self.received.append(line)
+        reply = self.responses.get(line)
+        if reply is None and line:
+            reply = f"-bash: {line.split()[0]}: command not found"
+
+        def respond():
+            self._send(line + "\n" + (reply + "\n" if reply else "") + self.prompt)
+        if self.delay:
+            asyncio.get_running_loop().call_later(self.delay, respond)
+        else:
+            respond()
+
+
+def request(payload: Dict, address=DEFAULT_LISTEN, timeout: float = 30.0) -> Dict:
+    """Send one request to a running capture service."""
+    with socket.create_connection(address, timeout=timeout) as sock:
+        sock.sendall((json.dumps(payload) + "\n").encode())
+        data = b''
+        while not data.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data)
+
+
+def parse_address(text: str):
+    host, _, port = text.rpartition(':')
+    return host or DEFAULT_LISTEN[0], int(port)
+
+
+async def run_service(port: Optional[str], options: Dict, triggers: List[str], interactive: bool):
+    board = None
+    if options.get('--fake'):
+        board = FakeBoard(login="beagle", password="temppwd")
+        board.start()
+        port = board.path
+        print(f"Fake board on {port} (login beagle/temppwd)")
+
+    capture = SerialCapture(
+        port, baud=int(options.get('--baud', DEFAULT_BAUD)),
+        log_path=Path(options['--log']) if '--log' in options else None,
+        echo=(lambda text: (sys.stdout.write(text), sys.stdout.flush())) if interactive else None,
+    )
+    if '--login' in options:
+        user, _, password = options['--login'].partition(':')
+        capture.add_login(user, password)
+    for pattern in triggers:
+        capture.add_trigger(pattern, lambda cap, m: print(f"\n[TRIGGER] {m.group(0)}", flush=True))
+
+    await capture.start()
+    if interactive:
+        loop = asyncio.get_running_loop()
+        loop.add_reader(sys.stdin.fileno(),
+                        lambda: capture.write(sys.stdin.readline().rstrip('\n') + capture.line_ending))
+
+    host, tcp_port = parse_address(options.get('--listen', f"{DEFAULT_LISTEN[0]}:{DEFAULT_LISTEN[1]}"))
+    print(f"Capturing {port} @ {capture.baud}; API on {host}:{tcp_port}", flush=True)
+    try:
+        await capture.serve(host, tcp_port)
+    finally:
+        if board:
+            board.close()
+
+
+def main():
+    """Main entry point."""
+    args = sys.argv[1:]
+    flags = {f: f in args for f in ('--fake', '--interactive')}
+    for f, present in flags.items():
+        if present:
+            args.remove(f)
+    options: Dict = {'--fake': flags['--fake']}
+    triggers = []
+    i = 0
+    while i < len(args):
+        if args[i] == '--trigger' and i + 1 < len(args):
+            triggers.append(args[i + 1])
+            del args[i:i + 2]
+        elif args[i] in ('--baud', '--log', '--listen', '--login', '--expect', '--timeout') and i + 1 < len(args):
+            options[args[i]] = args[i + 1]
+            del args[i:i + 2]
+        else:
+            i += 1
+
+    if not args or args[0] not in ('serve', 'send', 'tail'):
+        print("Usage: python serial_capture.py serve <port> | --fake [--baud N] [--log FILE] [--listen HOST:PORT]")
+        print("                                [--login USER:PASS] [--trigger REGEX ...] [--interactive]")
+        print("   or: python serial_capture.py send <command> [--expect REGEX] [--timeout S]")
+        print("   or: python serial_capture.py tail [BYTES]")
+        sys.exit(1)
+
+    address = parse_address(options.get('--listen', f"{DEFAULT_LISTEN[0]}:{DEFAULT_LISTEN[1]}"))
+
+    if args[0] == 'serve':
+        if len(args) < 2 and not flags['--fake']:
+            print("ERROR: serial port required (or --fake)")
+            sys.exit(1)
+        try:
+            asyncio.run(run_service(args[1] if len(args) > 1 else None, options, triggers,
+                                    flags['--interactive']))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    try:
+        if args[0] == 'send':
+            timeout = float(options.get('--timeout', 10))
+            reply = request({"op": "command", "cmd": " ".join(args[1:]), "expect": options.get('--expect'),
+                             "timeout": timeout}, address, timeout + 5)
+            text = reply.get("output") if reply.get("ok") else reply.get("tail", "")
+        else:
+            reply = request({"op": "tail", "bytes": int(args[1]) if len(args) > 1 else 4096}, address)
+            text = reply.get("text", "")
+    except OSError as e:
+        print(f"ERROR: capture service not reachable on {address[0]}:{address[1]}: {e}")
+        sys.exit(2)
+
+    if text:
+        print(text)
+    if not reply.get("ok"):
+        print(f"ERROR: {reply.get('error')}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+UART Soak-Log Indexer
+
+Indexes days of TMR soak-test UART captures (serial_capture.py logs or raw
+captures) into a compact binary columnar store, so questions like "mismatch
+rate per lane per hour" are answered from pre-aggregated rollups instead of
+re-grepping gigabytes of text.
+
+Record format (firmware prints, one per line, after an optional timestamp):
+
+    2026-10-01 13:04:22.117 [TMR] MISMATCH voter=mem_rdata lane=B addr=0x80001234
+    2026-10-01 13:04:22.120 [TMR] FAULT lane=B count=17
+    [  812.004512] [TMR] STATUS 0x11000108
+    [TMR] SCRUB ...                       (no timestamp: inherits the previous record's)
+
+Event kind is the word after "[TMR] "; lane=, voter= and count= (or the
+STATUS register value) are picked from the key=value pairs. Leading
+timestamps are serial_capture.py's "YYYY-MM-DD HH:MM:SS.mmm " or a kernel
+style "[ seconds]" uptime (offset by --base-time).
+
+Store layout (<index_dir>/):
+    meta.json           kinds, voters, sources, hour origin
+    <column>.bin        time f64, kind u8, lane u8, voter u8, value u32, source u16, offset u64
+                        (rows sorted by time)
+    kind_<KIND>.bin     row ids per event kind (u32)
+    rollup_lane.bin     counts[hour][kind][lane]  (u32; lane 0 = none, 1..3 = A..C)
+    rollup_voter.bin    counts[hour][kind][voter] (u32)
+
+Rebuilding is incremental: each source is identified by a hash of its first
+SIGNATURE_BYTES bytes (so serial.log -> serial.log.1 rotation is recognised)
+and only bytes appended since the last run are parsed. A capture shorter
+than that (e.g. the fresh serial.log right after a rotation) is left for a
+later run, since a shorter prefix could match any file.
+
+Usage:
+    python uart_index.py build <index_dir> <capture> [...] [--base-time EPOCH]
+    python uart_index.py summary <index_dir>
+    python uart_index.py rate <index_dir> [--kind MISMATCH] [--by lane|voter]
+                              [--from TIME] [--to TIME] [--json]
+    python uart_index.py events <index_dir> [--kind K] [--lane A] [--voter V]
+                                [--from TIME] [--to TIME] [--limit N]
+"""
+
+import hashlib
+import json
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+INDEX_VERSION = 1
+CHUNK_SIZE = 16 * 2**20
+SIGNATURE_BYTES = 4096
+HOUR = 3600
+
+LANES = ("", "A", "B", "C")
+LANE_CODES = {b"A": 1, b"B": 2, b"C": 3, b"a": 1, b"b": 2, b"c": 3}
+
+COLUMNS = {
+    "time": 'd',
+    "kind": 'B',
+    "lane": 'B',
+    "voter": 'B',
+    "value": 'I',
+    "source": 'H',
+    "offset": 'Q',
+}
+
+# The literal "[TMR] " lets the regex engine skip non-record text at memchr speed
+RECORD_RE = re.compile(rb'\[TMR\] ([A-Z][A-Z_]*)([^\n]*)')
+KV_RE = re.compile(rb'(\w+)=(\S+)')
+HEX_RE = re.compile(rb'\b(0x[0-9A-Fa-f]+|\d+)\b')
+DATE_TS_RE = re.compile(rb'(\d{4})-(\d\d)-(\d\d)[ T](\d\d):(\d\d):(\d\d(?:\.\d+)?)')
+UPTIME_TS_RE = re.compile(rb'\[\s*(\d+\.\d+)\]')
+
+TIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d")
+
+
+@dataclass
+class Source:
+    """One capture file as seen by the index."""
+    path: str
+    signature: str
+    signature_len: int
+    indexed: int = 0   # bytes consumed (up to the last complete line)
+    records: int = 0
+
+
+@dataclass
+class IndexMeta:
+    version: int = INDEX_VERSION
+    kinds: List[str] = field(default_factory=list)
+    voters: List[str] = field(default_factory=list)
+    sources: List[Source] = field(default_factory=list)
+    rows: int = 0
+    hour0: float = 0.0
+    hours: int = 0
+    base_time: float = 0.0
+
+
+def _signature(path: Path, length: int) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read(length)).hexdigest()
+
+
+def parse_time(text: str) -> float:
+    """'2026-10-01 13:00' or epoch seconds -> epoch seconds."""
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    for fmt in TIME_FORMATS:
+        try:
+            return time.mktime(time.strptime(text, fmt))
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised time: {text}")
+
+
+def format_time(epoch: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(epoch))
+
+
+class _Codes:
+    """Dictionary encoder for kinds and voters (code 0 = none for voters)."""
+
+    def __init__(self, names: List[str], reserve_zero: bool):
+        self.names = list(names)
+        self.offset = 1 if reserve_zero else 0
+        self.codes = {n.encode(): i + self.offset for i, n in enumerate(self.names)}
+
+    def code(self, name: bytes) -> int:
+        code = self.codes.get(name)
+        if code is None:
+            if len(self.names) + self.offset > 255:
+                raise ValueError("more than 255 distinct values")
+            code = len(self.names) + self.offset
+            self.codes[name] = code
+            self.names.append(name.decode('ascii', errors='replace'))
+        return code
+
+
+class UARTIndex:
+    """Columnar store of TMR UART records with time, kind and rollup indexes."""
+
+    def __init__(self, index_dir: Path):
+        self.dir = Path(index_dir)
+        self.meta = IndexMeta()
+        self.columns: Dict[str, array] = {name: array(code) for name, code in COLUMNS.items()}
+        self._postings: Dict[str, array] = {}
+        self._rollups: Dict[str, array] = {}
+        if (self.dir / "meta.json").exists():
+            self._load_meta()
+
+    # Persistence
+
+    def _load_meta(self):
+        with open(self.dir / "meta.json", 'r') as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            return
+        data["sources"] = [Source(**s) for s in data["sources"]]
+        self.meta = IndexMeta(**data)
+
+    def _load_array(self, name: str, typecode: str) -> array:
+        values = array(typecode)
+        path = self.dir / f"{name}.bin"
+        if path.exists():
+            with open(path, 'rb') as f:
+                values.frombytes(f.read())
+        return values
+
+    def column(self, name: str) -> array:
+        """Load one column on first use (queries touch only what they need)."""
+        if not len(self.columns[name]) and self.meta.rows:
+            self.columns[name] = self._load_array(name, COLUMNS[name])
+        return self.columns[name]
+
+    def postings(self, kind: str) -> array:
+        if kind not in self._postings:
+            self._postings[kind] = self._load_array(f"kind_{kind}", 'I')
+        return self._postings[kind]
+
+    def rollup(self, by: str) -> array:
+        if by not in self._rollups:
+            self._rollups[by] = self._load_array(f"rollup_{by}", 'I')
+        return self._rollups[by]
+
+    def _save(self):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        for name in COLUMNS:
+            with open(self.dir / f"{name}.bin", 'wb') as f:
+                self.columns[name].tofile(f)
+        for old in self.dir.glob("kind_*.bin"):
+            old.unlink()
+        for kind, rows in self._postings.items():
+            with open(self.dir / f"kind_{kind}.bin", 'wb') as f:
+                rows.tofile(f)
+        for by, counts in self._rollups.items():
+            with open(self.dir / f"rollup_{by}.bin", 'wb') as f:
+                counts.tofile(f)
+        meta = dict(self.meta.__dict__, sources=[s.__dict__ for s in self.meta.sources])
+        with open(self.dir / "meta.json", 'w') as f:
+            json.dump(meta, f, indent=1)
+
+    # Build
+
+    def build(self, paths: List[Path], base_time: float = 0.0) -> int:
+        """Index new bytes of the given captures; returns the number of new records."""
+        for name in COLUMNS:
+            self.column(name)
+        self.meta.base_time = base_time or self.meta.base_time
+        kinds = _Codes(self.meta.kinds, reserve_zero=False)
+        voters = _Codes(self.meta.voters, reserve_zero=True)
+        old_rows = self.meta.rows
+
+        for path in paths:
+            size = path.stat().st_size
+            if size < SIGNATURE_BYTES:
+                print(f"Skipping {path}: {size} bytes, indexed once it reaches {SIGNATURE_BYTES}",
+                      file=sys.stderr)
+                continue
+            signature = _signature(path, SIGNATURE_BYTES)
+            source = next((known for known in self.meta.sources
+                           if known.signature_len == SIGNATURE_BYTES and known.signature == signature), None)
+            if source is None:
+                source = Source(path=str(path), signature=signature, signature_len=SIGNATURE_BYTES)
+                self.meta.sources.append(source)
+            source.path = str(path)
+            if source.indexed >= size:
+                continue
+            source_id = self.meta.sources.index(source)
+            source.records += self._scan(path, source, source_id, kinds, voters)
+
+        self.meta.kinds = kinds.names
+        self.meta.voters = voters.names
+        new_rows = len(self.columns["time"]) - old_rows
+        self.meta.rows = len(self.columns["time"])
+        self._finish(old_rows)
+        self._save()
+        return new_rows
+
+    def _scan(self, path: Path, source: Source, source_id: int, kinds: _Codes, voters: _Codes) -> int:
+        cols = self.columns
+        t_col, k_col, l_col, v_col = cols["time"], cols["kind"], cols["lane"], cols["voter"]
+        val_col, s_col, o_col = cols["value"], cols["source"], cols["offset"]
+        day_cache: Dict[bytes, float] = {}
+        base = self.meta.base_time
+        last_time = t_col[-1] if len(t_col) else base
+        count = 0
+
+        with open(path, 'rb') as f:
+            f.seek(source.indexed)
+            position = source.indexed
+            pending = b''
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                data = pending + chunk
+                end = data.rfind(b'\n') + 1
+                data, pending = data[:end], data[end:]
+                for m in RECORD_RE.finditer(data):
+                    line_start = data.rfind(b'\n', 0, m.start()) + 1
+                    prefix = data[line_start:m.start()]
+                    if prefix:
+                        ts = DATE_TS_RE.match(prefix)
+                        if ts:
+                            day = prefix[:10]
+                            midnight = day_cache.get(day)
+                            if midnight is None:
+                                y, mo, d = int(ts.group(1)), int(ts.group(2)), int(ts.group(3))
+                                midnight = day_cache[day] = time.mktime((y, mo, d, 0, 0, 0, 0, 0, -1))
+                            last_time = (midnight + int(ts.group(4)) * 3600 + int(ts.group(5)) * 60
+                                         + float(ts.group(6)))
+                        else:
+                            up = UPTIME_TS_RE.search(prefix)
+                            if up:
+                                last_time = base + float(up.group(1))
+
+                    rest = m.group(2)
+                    lane = voter = value = 0
+                    for key, val in KV_RE.findall(rest):
+                        if key == b'lane':
+                            lane = LANE_CODES.get(val[:1], 0)
+                        elif key == b'voter':
+                            voter = voters.code(val)
+                        elif key in (b'count', b'value', b'status'):
+                            try:
+                                value = int(val, 0) & 0xFFFFFFFF
+                            except ValueError:
+                                pass  # count=n/a and the like
+                    if not value and b'=' not in rest:
+                        number = HEX_RE.search(rest)
+                        if number:
+                            text = number.group(1)
+                            value = int(text, 16 if text[:2] in (b'0x', b'0X') else 10) & 0xFFFFFFFF
+
+                    t_col.append(last_time)
+                    k_col.append(kinds.code(m.group(1)))
+                    l_col.append(lane)
+                    v_col.append(voter)
+                    val_col.append(value)
+                    s_col.append(source_id)
+                    o_col.append(position + line_start)
+                    count += 1
+                position += len(data)
+            source.indexed = position
+        return count
+
+    def _finish(self, old_rows: int):
+        """Keep rows time-sorted and rebuild postings and rollups."""
+        times = self.columns["time"]
+        n = len(times)
+        new = times[old_rows:]
+        in_order = all(new[i] <= new[i + 1] for i in range(len(new) - 1))
+        if not in_order or (old_rows and len(new) and new[0] < times[old_rows - 1]):
+            order = sorted(range(n), key=times.__getitem__)
+            for name, typecode in COLUMNS.items():
+                col = self.columns[name]
+                self.columns[name] = array(typecode, map(col.__getitem__, order))
+            times = self.columns["time"]
+
+        kinds = self.columns["kind"]
+        postings = {k: array('I') for k in self.meta.kinds}
+        for row, code in enumerate(kinds):
+            postings[self.meta.kinds[code]].append(row)
+        self._postings = postings
+
+        if not n:
+            self.meta.hour0, self.meta.hours = 0.0, 0
+            self._rollups = {}
+            return
+        hour0 = times[0] - times[0] % HOUR
+        hours = int((times[-1] - hour0) // HOUR) + 1
+        n_kinds, n_voters = len(self.meta.kinds), len(self.meta.voters) + 1
+        lane_rollup = array('I', bytes(4 * hours * n_kinds * len(LANES)))
+        voter_rollup = array('I', bytes(4 * hours * n_kinds * n_voters))
+        lanes, voters = self.columns["lane"], self.columns["voter"]
+        for row in range(n):
+            hk = int((times[row] - hour0) // HOUR) * n_kinds + kinds[row]
+            lane_rollup[hk * len(LANES) + lanes[row]] += 1
+            voter_rollup[hk * n_voters + voters[row]] += 1
+        self._rollups = {"lane": lane_rollup, "voter": voter_rollup}
+        self.meta.hour0, self.meta.hours = hour0, hours
+
+    # Queries
+
+    def kind_code(self, kind: str) -> int:
+        try:
+            return self.meta.kinds.index(kind.upper())
+        except ValueError:
+            raise KeyError(f"no {kind} records (kinds: {', '.join(self.meta.kinds) or 'none'})")
+
+    def labels(self, by: str) -> List[str]:
+        return list(LANES[1:]) if by == "lane" else list(self.meta.voters)
+
+    def rate(self, kind: str = "MISMATCH", by: str = "lane", start: Optional[float] = None,
+             end: Optional[float] = None) -> List[Tuple[float, Dict[str, int]]]:
+        """Per-hour event counts of one kind, split by lane or voter."""
+        code = self.kind_code(kind)
+        counts = self.rollup(by)
+        width = len(LANES) if by == "lane" else len(self.meta.voters) + 1
+        names = ("",) + tuple(self.labels(by))
+        n_kinds = len(self.meta.kinds)
+        first = 0 if start is None else max(0, int((start - self.meta.hour0) // HOUR))
+        last = self.meta.hours if end is None else min(self.meta.hours, int((end - self.meta.hour0) // HOUR) + 1)
+
+        table = []
+        for hour in range(first, last):
+            base = (hour * n_kinds + code) * width
+            row = {names[i] or "-": counts[base + i] for i in range(width) if counts[base + i]}
+            table.append((self.meta.hour0 + hour * HOUR, row))
+        return table
+
+    def select(self, kind: Optional[str] = None, lane: Optional[str] = None, voter: Optional[str] = None,
+               start: Optional[float] = None, end: Optional[float] = None) -> List[int]:
+        """Row ids matching the filters, in time order."""
+        times = self.column("time")
+        lo = 0 if start is None else bisect_left(times, start)
+        hi = len(times) if end is None else bisect_left(times, end)
+        if kind:
+            rows = self.postings(self.meta.kinds[self.kind_code(kind)])
+            rows = rows[bisect_left(rows, lo):bisect_left(rows, hi)]
+        else:
+            rows = range(lo, hi)
+        if lane:
+            lanes, want = self.column("lane"), LANES.index(lane.upper())
+            rows = [r for r in rows if lanes[r] == want]
+        if voter:
+            voters = self.column("voter")
+            want = self.meta.voters.index(voter) + 1 if voter in self.meta.voters else -1
+            rows = [r for r in rows if voters[r] == want]
+        return list(rows)
+
+    def line(self, row: int) -> str:
+        """Original capture line of a record."""
+        source = self.meta.sources[self.column("source")[row]]
+        with open(source.path, 'rb') as f:
+            f.seek(self.column("offset")[row])
+            return f.readline().decode('utf-8', errors='replace').rstrip('\r\n')
+
+
+def decode_status(value: int) -> Dict[str, int]:
+    """TMR fault status register (docs/tmr/miv_tmr_architecture.md 6.2)."""
+    return {
+        "count_a": (value >> 24) & 0xFF,
+        "count_b": (value >> 16) & 0xFF,
+        "count_c": (value >> 8) & 0xFF,
+        "faulty_c": (value >> 5) & 1,
+        "faulty_b": (value >> 4) & 1,
+        "faulty_a": (value >> 3) & 1,
+        "disagreement": (value >> 2) & 1,
+        "healthy": (value >> 1) & 1,
+        "active": value & 1,
+    }
+
+
+def print_summary(index: UARTIndex):
+    meta = index.meta
+    print("\n" + "=" * 70)
+    print("UART SOAK INDEX")
+    print("=" * 70)
+    print(f"\n{'Records:':<20} {meta.rows:,}")
+    if meta.rows:
+        times = index.column("time")
+        print(f"{'Span:':<20} {format_time(times[0])} .. {format_time(times[-1])} ({meta.hours} h)")
+    for source in meta.sources:
+        print(f"{'Source:':<20} {source.path} ({source.records:,} records, {source.indexed:,} bytes)")
+
+    if meta.kinds:
+        print("\nEVENTS:")
+        lanes = index.column("lane")
+        for kind in meta.kinds:
+            rows = index.postings(kind)
+            per_lane = [0] * len(LANES)
+            for r in rows:
+                per_lane[lanes[r]] += 1
+            split = ", ".join(f"{LANES[i]} {c:,}" for i, c in enumerate(per_lane) if i and c)
+            print(f"  {kind:<12} {len(rows):>10,}" + (f"  ({split})" if split else ""))
+
+    if "STATUS" in meta.kinds and len(index.postings("STATUS")):
+        last = index.postings("STATUS")[-1]
+        status = decode_status(index.column("value")[last])
+        print(f"\nLAST STATUS ({format_time(index.column('time')[last])}):")
+        print(f"  Fault counts A/B/C: {status['count_a']}/{status['count_b']}/{status['count_c']}"
+              f"  faulty: {''.join(l for l in 'abc' if status['faulty_' + l]).upper() or 'none'}"
+              f"  healthy: {'yes' if status['healthy'] else 'no'}")
+    print("=" * 70)
+
+
+def print_rate(index: UARTIndex, table, kind: str, by: str):
+    labels = index.labels(by)
+    if any("-" in row for _, row in table):
+        labels.append("-")
+    print(f"\n{kind} per hour by {by}:")
+    print(f"  {'Hour':<17} " + " ".join(f"{l:>10}" for l in labels) + f" {'Total':>10}")
+    totals = [0] * len(labels)
+    for hour, row in table:
+        cells = [row.get(l, 0) for l in labels]
+        totals = [a + b for a, b in zip(totals, cells)]
+        print(f"  {format_time(hour):<17} " + " ".join(f"{c:>10,}" for c in cells) + f" {sum(cells):>10,}")
+    if table:
+        hours = len(table)
+        print(f"  {'Mean/hour':<17} " + " ".join(f"{t / hours:>10.1f}" for t in totals)
+              + f" {sum(totals) / hours:>10.1f}")
+
+
+def main():
+    """Main entry point."""
+    args = sys.argv[1:]
+    as_json = '--json' in args
+    if as_json:
+        args.remove('--json')
+    options = {}
+    for name in ('--kind', '--by', '--from', '--to', '--lane', '--voter', '--limit', '--base-time'):
+        if name in args:
+            i = args.index(name)
+            options[name] = args[i + 1]
+            del args[i:i + 2]
+
+    if len(args) < 2 or args[0] not in ('build', 'summary', 'rate', 'events'):
+        print("Usage: python uart_index.py build <index_dir> <capture> [...] [--base-time EPOCH]")
+        print("   or: python uart_index.py summary <index_dir>")
+        print("   or: python uart_index.py rate <index_dir> [--kind MISMATCH] [--by lane|voter] [--from T] [--to T]")
+        print("   or: python uart_index.py events <index_dir> [--kind K] [--lane A] [--voter V] [--limit N]")
+        sys.exit(1)
+
+    command, index = args[0], UARTIndex(Path(args[1]))
+    start = parse_time(options['--from']) if '--from' in options else None
+    end = parse_time(options['--to']) if '--to' in options else None
+
+    if command == 'build':
+        paths = [Path(p) for p in args[2:]]
+        missing = [p for p in paths if not p.is_file()]
+        if not paths or missing:
+            print(f"ERROR: capture file(s) not found: {', '.join(map(str, missing)) or 'none given'}")
+            sys.exit(1)
+        t = time.perf_counter()
+        added = index.build(paths, parse_time(options['--base-time']) if '--base-time' in options else 0.0)
+        print(f"Indexed {added:,} new record(s) in {time.perf_counter() - t:.2f}s "
+              f"({index.meta.rows:,} total)")
+        return
+
+    if not index.meta.rows and command != 'summary':
+        print(f"ERROR: no index at {args[1]} (run build first)")
+        sys.exit(1)
+
+    try:
+        if command == 'summary':
+            print_summary(index)
+        elif command == 'rate':
+            kind, by = options.get('--kind', 'MISMATCH').upper(), options.get('--by', 'lane')
+            if by not in ('lane', 'voter'):
+                print("ERROR: --by must be lane or voter")
+                sys.exit(1)
+            table = index.rate(kind, by, start, end)
+            if as_json:
+                print(json.dumps([{"hour": format_time(h), "counts": row} for h, row in table], indent=2))
+            else:
+                print_rate(index, table, kind, by)
+        else:
+            rows = index.select(options.get('--kind'), options.get('--lane'), options.get('--voter'), start, end)
+            limit = int(options.get('--limit', 50))
+            for row in rows[:limit]:
+                print(index.line(row))
+            if len(rows) > limit:
+                print(f"... {len(rows) - limit:,} more (use --limit)")
+    except KeyError as e:
+        print(f"ERROR: {e.args[0]}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
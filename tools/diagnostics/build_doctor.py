@@ -8,15 +8,29 @@ for common issues, optimizations, and best practices.
 Usage:
     python build_doctor.py <project_dir>
     python build_doctor.py <project_dir> --verbose
+    python build_doctor.py <project_dir> --tmr       # also check *_A/_B/_C replica symmetry
 """
 
 import sys
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 # Import log parser
-from log_parser import LogParser, ParsedLog, LogLevel
+from log_parser import LogParser, ParsedLog, LogLevel, LogMessage
+from constraint_analyzer import ConstraintAnalyzer, ConstraintReport
+from netlist_stats import NetlistScanner, NetlistStats, find_netlist
+from tmr_symmetry import TMRAnalyzer, TMRReport
+from known_issues import KnownIssueMatcher, SignatureHit, is_noise
+
+# Share of the design's logic above which a top-level instance is a hot-spot
+HOTSPOT_SHARE = 0.25
+
+# Critical paths with at least this many logic levels are pipelining candidates
+DEEP_LOGIC_LEVELS = 8
+
+# Positive slack below this share of the clock period leaves little P&R margin
+TIGHT_SLACK_SHARE = 0.05
 
 
 @dataclass
@@ -35,20 +49,53 @@ class BuildDoctor:
 
     def __init__(self):
         self.recommendations: List[Recommendation] = []
-
-    def analyze(self, log: ParsedLog) -> List[Recommendation]:
-        """Analyze parsed log and generate recommendations."""
+        # log.warnings split by analyze(): known-harmless noise is not counted
+        self.warnings: List[LogMessage] = []
+        self.noise_warnings: List[LogMessage] = []
+        self.matcher = KnownIssueMatcher()
+
+    def analyze(self, log: ParsedLog,
+                constraints: Optional[ConstraintReport] = None,
+                netlist: Optional[NetlistStats] = None,
+                tmr: Optional[TMRReport] = None,
+                known: Optional[Dict[str, SignatureHit]] = None) -> List[Recommendation]:
+        """Analyze parsed log and generate recommendations.
+
+        If a ConstraintReport is given, its SDC/PDC vs pin report findings
+        are added as well. If NetlistStats are given, per-instance resource
+        hot-spots are reported from the synthesized netlist. A TMRReport
+        adds replica asymmetries between *_A/_B/_C lanes. Known-issue
+        signature hits (see known_issues.py) map directly to recommendations.
+        """
         self.recommendations = []
+        self.warnings, self.noise_warnings = self.split_warnings(log)
 
         # Run all analysis checks
         self._check_timing_driven(log)
         self._check_timing_constraints(log)
+        self._check_timing_slack(log)
+        if constraints is not None:
+            self._check_constraint_set(constraints)
+        if netlist is not None:
+            self._check_netlist_hotspots(log, netlist)
+        if tmr is not None:
+            self._check_tmr_symmetry(tmr)
+        if known:
+            self._check_known_issues(known)
         self._check_resource_usage(log)
         self._check_errors_warnings(log)
         self._check_optimization_opportunities(log)
 
         return self.recommendations
 
+    def split_warnings(self, log: ParsedLog) -> Tuple[List[LogMessage], List[LogMessage]]:
+        """(actionable, noise) warnings; noise matches an "Ignore" known-issue signature."""
+        actionable, noise = [], []
+        for msg in log.warnings:
+            harmless = any(is_noise(s) for s in self.matcher.match_line(msg.message))
+            (noise if harmless else actionable).append(msg)
+        return actionable, noise
+
     def _check_timing_driven(self, log: ParsedLog):
         """Check if timing-driven P&R is enabled."""
         if not log.timing_driven and log.resources.luts_used > 0:
@@ -73,6 +120,153 @@ class BuildDoctor:
                 reference="Use: create_clock -period <ns> [get_ports CLK]"
             ))
 
+    def _check_timing_slack(self, log: ParsedLog):
+        """Report clocks and critical paths that miss (or barely meet) timing."""
+        for clock in log.clock_timing.values():
+            paths = [p for p in log.critical_paths if p.clock == clock.name]
+            worst = paths[0] if paths else None
+            where = f"; worst path {worst.start} -> {worst.end} ({worst.logic_levels} logic levels)" if worst else ""
+            if not clock.met:
+                deep = worst is not None and worst.logic_levels >= DEEP_LOGIC_LEVELS
+                self.recommendations.append(Recommendation(
+                    severity="ERROR",
+                    category="Timing",
+                    issue=f"Clock {clock.name} misses timing by {-clock.slack:.3f} ns "
+                          f"(estimated {clock.estimated_mhz:.1f} MHz, requested {clock.requested_mhz:.1f} MHz){where}",
+                    impact="Design will not run reliably at the requested frequency",
+                    fix="Pipeline the critical path (register between logic stages)" if deep else
+                        "Reduce fanout/routing on the critical path or lower the requested frequency",
+                    reference="Synthesis estimate; confirm with the P&R timing report"
+                ))
+            elif clock.requested_period and clock.slack < TIGHT_SLACK_SHARE * clock.requested_period:
+                self.recommendations.append(Recommendation(
+                    severity="WARNING",
+                    category="Timing",
+                    issue=f"Clock {clock.name} meets timing with only {clock.slack:.3f} ns slack "
+                          f"({clock.slack / clock.requested_period:.1%} of the period){where}",
+                    impact="P&R routing delay may push the design past the constraint",
+                    fix="Enable timing-driven P&R and consider pipelining the critical path",
+                    reference="Synthesis slack is an estimate before placement"
+                ))
+
+    def _check_constraint_set(self, report: ConstraintReport):
+        """Turn constraint analyzer findings into recommendations."""
+        fixes = {
+            "no_clocks": ("Timing", "No clock can be analyzed",
+                          "Add create_clock for every clock input in an SDC file"),
+            "unconstrained_clock": ("Timing", "Paths on this clock are not timed",
+                                    "Add create_clock for the port"),
+            "dangling_clock": ("Timing", "Clock constraint is ignored",
+                               "Fix the get_ports target or remove the stale constraint"),
+            "unknown_port": ("Configuration", "I/O constraint is ignored",
+                             "Rename the port in the PDC to match the top-level HDL"),
+            "pin_mismatch": ("Configuration", "Placed pinout does not match the board",
+                             "Re-run P&R with the PDC attached, or fix -pin_name"),
+            "pin_conflict": ("Configuration", "Two ports cannot share a pin",
+                             "Assign a unique -pin_name to each port"),
+            "io_std_mismatch": ("Configuration", "I/O electrical levels differ from the constraint",
+                                "Make -io_std match the bank voltage and re-run P&R"),
+            "bank_conflict": ("Configuration", "Bank VDDI cannot supply every I/O standard used",
+                              "Move the ports to a compatible bank or change -io_std"),
+            "unconstrained_io": ("Configuration", "Pin location may change between builds",
+                                 "Lock the port with set_io -pin_name ... -fixed true"),
+        }
+
+        for finding in report.findings:
+            if finding.kind not in fixes:
+                continue
+            category, impact, fix = fixes[finding.kind]
+            reference = f"{finding.file}:{finding.line}" if finding.file else ""
+            self.recommendations.append(Recommendation(
+                severity=finding.severity,
+                category=category,
+                issue=finding.message,
+                impact=impact,
+                fix=fix,
+                reference=reference
+            ))
+
+    def _check_netlist_hotspots(self, log: ParsedLog, netlist: NetlistStats):
+        """Report resource hot-spots from the synthesized netlist (pre-P&R)."""
+        totals = netlist.groups()
+        logic = totals["CFG"] + totals["ARI1"]
+        if not logic:
+            return
+
+        if log.resources.luts_used == 0:
+            self.recommendations.append(Recommendation(
+                severity="INFO",
+                category="Resource",
+                issue=f"No P&R results yet; netlist has {logic:,} 4LUT, {totals['SLE']:,} SLE, "
+                      f"{totals['RAM1K20']:,} RAM1K20, {totals['MACC_PA']:,} MACC_PA",
+                impact="Final utilization is unknown until P&R completes; counts are from synthesis",
+                fix="Run Place & Route for final resource usage",
+                reference=netlist.file
+            ))
+
+        tally = netlist.instance_tally(depth=1)
+        if len(tally) < 2:
+            return
+        for path, counts in sorted(tally.items()):
+            grouped = netlist.groups(counts)
+            share = (grouped["CFG"] + grouped["ARI1"]) / logic
+            if share >= HOTSPOT_SHARE:
+                self.recommendations.append(Recommendation(
+                    severity="INFO",
+                    category="Resource",
+                    issue=f"Instance {path} holds {share:.0%} of the design logic "
+                          f"({grouped['CFG'] + grouped['ARI1']:,} 4LUT, {grouped['SLE']:,} SLE)",
+                    impact="Congestion and timing pressure concentrate in this block",
+                    fix="Review the block's configuration (e.g. disable unused MI-V extensions)",
+                    reference=f"python tools/diagnostics/netlist_stats.py {netlist.file} --depth 2"
+                ))
+
+    def _check_tmr_symmetry(self, report: TMRReport):
+        """Flag TMR replicas that did not come out of synthesis identical."""
+        if not report.replica_groups and not report.slack:
+            self.recommendations.append(Recommendation(
+                severity="WARNING",
+                category="TMR",
+                issue="TMR mode requested but no *_A/_B/_C replicas were found",
+                impact="Replica symmetry could not be verified",
+                fix="Check that synthesis has run and the replicas keep their lane suffixes",
+                reference="tcl_scripts/tmr/create_miv_tmr_cores.tcl"
+            ))
+            return
+
+        for finding in report.findings:
+            if finding.source == "slack":
+                impact = "Replicas may not fail identically under timing stress; voters mask the slow lane"
+                fix = "Floorplan the replicas symmetrically or constrain them to equivalent regions"
+            elif finding.metric == "lanes":
+                impact = "Design is no longer triple-redundant"
+                fix = "Add syn_preserve / syn_keep on the replica instances (see constraint/tmr/*.fdc)"
+            else:
+                impact = "Replica logic differs; a fault may not be masked the same way in every lane"
+                fix = "Check for constant-propagation or sharing across lanes; preserve replica boundaries"
+            self.recommendations.append(Recommendation(
+                severity=finding.severity,
+                category="TMR",
+                issue=finding.message,
+                impact=impact,
+                fix=fix,
+                reference=f"python tools/diagnostics/tmr_symmetry.py {report.project_dir}"
+            ))
+
+    def _check_known_issues(self, hits: Dict[str, SignatureHit]):
+        """Turn known-issue signature hits into recommendations."""
+        for hit in hits.values():
+            s = hit.signature
+            where = f"{hit.source}:{hit.line}"
+            self.recommendations.append(Recommendation(
+                severity=s.severity,
+                category=s.category,
+                issue=f"{s.issue} ({hit.count}x)" if hit.count > 1 else s.issue,
+                impact=s.impact,
+                fix=s.fix,
+                reference=f"{where} - {s.reference}" if s.reference else where
+            ))
+
     def _check_resource_usage(self, log: ParsedLog):
         """Check resource utilization and flag issues."""
         lut_pct = log.resources.lut_percent
@@ -125,12 +319,12 @@ class BuildDoctor:
                     reference=""
                 ))
 
-        # Too many warnings
-        if len(log.warnings) > 10:
+        # Too many warnings (known-harmless noise is reported by its signature instead)
+        if len(self.warnings) > 10:
             self.recommendations.append(Recommendation(
                 severity="WARNING",
                 category="Build",
-                issue=f"Large number of warnings ({len(log.warnings)})",
+                issue=f"Large number of warnings ({len(self.warnings)})",
                 impact="May indicate design issues. Important warnings can be buried.",
                 fix="Review and address warnings. Use proper coding styles to reduce noise.",
                 reference="Clean builds have <5 warnings typically"
@@ -169,7 +363,7 @@ class BuildDoctor:
         # Build status
         if log.has_errors:
             status = "❌ FAILED"
-        elif log.warnings:
+        elif self.warnings:
             status = "⚠️  PASSED WITH WARNINGS"
         else:
             status = "✅ PASSED"
@@ -179,7 +373,8 @@ class BuildDoctor:
         # Quick stats
         print(f"\nQuick Stats:")
         print(f"  Errors:   {len(log.errors)}")
-        print(f"  Warnings: {len(log.warnings)}")
+        noise = f" (+{len(self.noise_warnings)} known noise)" if self.noise_warnings else ""
+        print(f"  Warnings: {len(self.warnings)}{noise}")
         print(f"  LUTs:     {log.resources.luts_used:,} / {log.resources.luts_total:,} ({log.resources.lut_percent:.2f}%)")
         print(f"  FFs:      {log.resources.ffs_used:,} / {log.resources.ffs_total:,} ({log.resources.ff_percent:.2f}%)")
 
@@ -230,26 +425,46 @@ class BuildDoctor:
             print(f"     Reference: {rec.reference}")
 
 
+def diagnose_project(project_dir: Path, tmr_mode: bool = False) -> Tuple[ParsedLog, BuildDoctor]:
+    """Parse a project's logs and run every check on them."""
+    # Parse logs
+    parser = LogParser()
+    log = parser.parse_project(project_dir)
+
+    # Cross-check constraint files against the pin report
+    constraints = ConstraintAnalyzer().analyze_project(project_dir)
+
+    # Synthesized netlist statistics (available before P&R finishes)
+    netlist_path = find_netlist(project_dir)
+    netlist = NetlistScanner().scan(netlist_path) if netlist_path else None
+
+    # TMR replica symmetry (A/B/C lanes)
+    tmr = TMRAnalyzer().analyze_project(project_dir, netlist) if tmr_mode else None
+
+    # Known failure modes and noise recognized by signature
+    known = KnownIssueMatcher().scan_project(project_dir)
+
+    # Analyze
+    doctor = BuildDoctor()
+    doctor.analyze(log, constraints, netlist, tmr, known)
+    return log, doctor
+
+
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
-        print("Usage: python build_doctor.py <project_dir> [--verbose]")
+        print("Usage: python build_doctor.py <project_dir> [--verbose] [--tmr]")
         sys.exit(1)
 
     project_dir = Path(sys.argv[1])
     verbose = '--verbose' in sys.argv or '-v' in sys.argv
+    tmr_mode = '--tmr' in sys.argv
 
     if not project_dir.exists():
         print(f"ERROR: Project directory not found: {project_dir}")
         sys.exit(1)
 
-    # Parse logs
-    parser = LogParser()
-    log = parser.parse_project(project_dir)
-
-    # Analyze
-    doctor = BuildDoctor()
-    doctor.analyze(log)
+    log, doctor = diagnose_project(project_dir, tmr_mode)
 
     # Print report
     doctor.print_report(log, verbose=verbose)
@@ -257,7 +472,7 @@ def main():
     # Exit code: 0 if no critical issues, 1 if errors, 2 if warnings
     if log.has_errors or any(r.severity == "ERROR" for r in doctor.recommendations):
         sys.exit(1)
-    elif log.warnings or any(r.severity == "WARNING" for r in doctor.recommendations):
+    elif doctor.warnings or any(r.severity == "WARNING" for r in doctor.recommendations):
         sys.exit(2)
     else:
         sys.exit(0)
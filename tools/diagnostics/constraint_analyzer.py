@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Constraint Set Analyzer
+
+Cross-checks a Libero project's constraint files against the pin report
+produced by Place & Route:
+
+- constraint/**/*.sdc, *.pdc, *.fdc  (create_clock, create_generated_clock, set_io)
+- designer/<design>/<design>_pinrpt_*.csv
+
+and reports:
+- Clock input ports without a create_clock
+- Clocks defined on ports that do not exist in the pin report
+- set_io pin / I/O standard mismatches against the placed design
+- User I/Os that P&R placed without a set_io
+- Bank conflicts (mixed VDDI voltages, standards the bank rail cannot supply)
+
+Both sides are indexed by port and by pin, so each check is a dict lookup.
+The pin report is loaded through pin_report.PinTable.
+
+Usage:
+    python constraint_analyzer.py <project_dir> [<project_dir> ...]
+    python constraint_analyzer.py <project_dir> --json
+"""
+
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pin_report import PinTable, load_pin_table
+
+# The shared project-tree index lives with the helper scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "scripts"))
+from project_index import project_index  # noqa: E402
+
+
+CONSTRAINT_PATTERNS = ("*.sdc", "*.pdc", "*.fdc")
+
+# Input ports that are treated as clocks when they have no create_clock
+CLOCK_PORT_RE = re.compile(r'clk|clock|osc|refclk', re.IGNORECASE)
+
+# One option word: {braced}, [bracketed], "quoted" or bare
+WORD_RE = re.compile(r'\{[^}]*\}|\[[^\]]*\]|"[^"]*"|\S+')
+GET_PORTS_RE = re.compile(r'\[\s*get_ports\s+(\{[^}]*\}|\S+?)\s*\]')
+
+
+@dataclass
+class ClockConstraint:
+    """A create_clock / create_generated_clock definition."""
+    name: str
+    ports: List[str]
+    period: Optional[float]
+    file: str
+    line: int
+    generated: bool = False
+
+
+@dataclass
+class IOConstraint:
+    """A set_io assignment."""
+    port: str
+    pin: Optional[str]
+    io_std: Optional[str]
+    fixed: bool
+    file: str
+    line: int
+
+
+@dataclass
+class ConstraintSet:
+    """All timing and I/O constraints of a project."""
+    clocks: List[ClockConstraint] = field(default_factory=list)
+    ios: List[IOConstraint] = field(default_factory=list)
+    files: List[str] = field(default_factory=list)
+
+    @property
+    def clock_ports(self) -> Dict[str, ClockConstraint]:
+        return {port: clk for clk in self.clocks for port in clk.ports}
+
+    @property
+    def ios_by_port(self) -> Dict[str, IOConstraint]:
+        return {io.port: io for io in self.ios}
+
+    @property
+    def ios_by_pin(self) -> Dict[str, IOConstraint]:
+        return {io.pin: io for io in self.ios if io.pin}
+
+
+@dataclass
+class ConstraintFinding:
+    """One analyzer result."""
+    severity: str  # INFO, WARNING, ERROR
+    kind: str      # unconstrained_clock, dangling_clock, pin_mismatch, ...
+    message: str
+    port: Optional[str] = None
+    pin: Optional[str] = None
+    file: Optional[str] = None
+    line: Optional[int] = None
+
+
+@dataclass
+class ConstraintReport:
+    """Analyzer output for one project."""
+    project_dir: str
+    design: Optional[str]
+    constraints: ConstraintSet
+    pin_report: Optional[PinTable]
+    findings: List[ConstraintFinding] = field(default_factory=list)
+
+    @property
+    def errors(self) -> List[ConstraintFinding]:
+        return [f for f in self.findings if f.severity == "ERROR"]
+
+    @property
+    def warnings(self) -> List[ConstraintFinding]:
+        return [f for f in self.findings if f.severity == "WARNING"]
+
+
+def _unbrace(word: str) -> str:
+    if len(word) >= 2 and word[0] in '{"' and word[-1] in '}"':
+        return word[1:-1].strip()
+    return word
+
+
+def _iter_statements(text: str):
+    """Yield (line_number, statement) with backslash continuations joined."""
+    buffer = []
+    start = 0
+    for number, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not buffer:
+            if not line or line.startswith('#'):
+                continue
+            start = number
+        if line.endswith('\\'):
+            buffer.append(line[:-1])
+            continue
+        buffer.append(line)
+        yield start, ' '.join(buffer)
+        buffer = []
+    if buffer:
+        yield start, ' '.join(buffer)
+
+
+def _options(words: List[str]) -> Dict[str, str]:
+    """Map -option to its value; flags without a value map to ''."""
+    options = {}
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if word.startswith('-') and len(word) > 1 and not word[1].isdigit():
+            if i + 1 < len(words) and not words[i + 1].startswith('-'):
+                options[word] = _unbrace(words[i + 1])
+                i += 2
+                continue
+            options[word] = ''
+        i += 1
+    return options
+
+
+def parse_constraint_text(text: str, file: str, constraints: ConstraintSet):
+    """Add the clocks and set_io assignments found in text to constraints."""
+    for line, statement in _iter_statements(text):
+        command = statement.split(None, 1)[0]
+
+        if command in ("create_clock", "create_generated_clock"):
+            words = WORD_RE.findall(statement)[1:]
+            options = _options([w for w in words if not w.startswith('[')])
+            ports = []
+            for target in GET_PORTS_RE.findall(statement):
+                ports.extend(_unbrace(target).split())
+            try:
+                period = float(options["-period"]) if "-period" in options else None
+            except ValueError:
+                period = None
+            constraints.clocks.append(ClockConstraint(
+                name=options.get("-name") or (ports[0] if ports else ""),
+                ports=ports,
+                period=period,
+                file=file,
+                line=line,
+                generated=command == "create_generated_clock",
+            ))
+
+        elif command == "set_io":
+            options = _options(WORD_RE.findall(statement)[1:])
+            port = options.get("-port_name")
+            if not port:
+                continue
+            constraints.ios.append(IOConstraint(
+                port=port,
+                pin=options.get("-pin_name") or None,
+                io_std=options.get("-io_std") or options.get("-iostd") or None,
+                fixed=options.get("-fixed", "true").lower() in ("true", "1", ""),
+                file=file,
+                line=line,
+            ))
+
+
+def find_constraint_files(project_dir: Path) -> List[Path]:
+    """Find every SDC/PDC/FDC file under the project's constraint directory."""
+    if not (project_dir / "constraint").is_dir():
+        return []
+    index = project_index(project_dir)
+    files = set()
+    for pattern in CONSTRAINT_PATTERNS:
+        files.update(index.glob(f"constraint/**/{pattern}"))
+    return sorted(files)
+
+
+def load_constraints(project_dir: Path) -> ConstraintSet:
+    """Parse all constraint files of a project."""
+    constraints = ConstraintSet()
+    for path in find_constraint_files(project_dir):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                text = f.read()
+        except OSError as e:
+            print(f"  WARNING: Cannot read {path}: {e}", file=sys.stderr)
+            continue
+        rel = str(path.relative_to(project_dir))
+        constraints.files.append(rel)
+        parse_constraint_text(text, rel, constraints)
+    return constraints
+
+
+def find_pin_report(project_dir: Path) -> Optional[Path]:
+    """Find designer/<design>/<design>_pinrpt_*.csv (boardlayout preferred)."""
+    if not (project_dir / "designer").is_dir():
+        return None
+    candidates = project_index(project_dir).glob("designer/*/*_pinrpt_*.csv")
+    for path in candidates:
+        if path.name == f"{path.parent.name}_pinrpt_boardlayout.csv":
+            return path
+    return candidates[0] if candidates else None
+
+
+class ConstraintAnalyzer:
+    """Cross-check a constraint set against a pin report."""
+
+    def analyze_project(self, project_dir: Path) -> ConstraintReport:
+        """Load constraints and pin report for a project and run all checks."""
+        project_dir = Path(project_dir)
+        constraints = load_constraints(project_dir)
+
+        pin_report = None
+        design = None
+        pin_path = find_pin_report(project_dir)
+        if pin_path:
+            design = pin_path.parent.name
+            try:
+                pin_report = load_pin_table(pin_path)
+            except (OSError, ValueError) as e:
+                print(f"  WARNING: Cannot load pin report {pin_path}: {e}", file=sys.stderr)
+
+        return self.analyze(constraints, pin_report, str(project_dir), design)
+
+    def analyze(self, constraints: ConstraintSet, pin_report: Optional[PinTable],
+                project_dir: str = "", design: Optional[str] = None) -> ConstraintReport:
+        """Run all checks on already-loaded data."""
+        report = ConstraintReport(project_dir=project_dir, design=design,
+                                  constraints=constraints, pin_report=pin_report)
+        findings = report.findings
+
+        if not constraints.clocks:
+            findings.append(ConstraintFinding(
+                severity="WARNING", kind="no_clocks",
+                message="No create_clock found in any constraint file"))
+
+        if pin_report is None:
+            findings.append(ConstraintFinding(
+                severity="INFO", kind="no_pin_report",
+                message="No pin report found; run Place & Route to cross-check I/O constraints"))
+            return report
+
+        placed = pin_report.user_ios()
+        self._check_clocks(constraints, placed, findings)
+        self._check_io_assignments(constraints, placed, pin_report, findings)
+        self._check_unconstrained_ios(constraints, placed, findings)
+        self._check_banks(pin_report, findings)
+        return report
+
+    def _check_clocks(self, constraints, placed, findings):
+        clock_ports = constraints.clock_ports
+
+        for clk in constraints.clocks:
+            for port in clk.ports:
+                if port not in placed:
+                    findings.append(ConstraintFinding(
+                        severity="WARNING", kind="dangling_clock",
+                        message=f"Clock '{clk.name}' targets port '{port}', which is not in the pin report",
+                        port=port, file=clk.file, line=clk.line))
+
+        for port, row in placed.items():
+            if row.direction != "Input" or port in clock_ports:
+                continue
+            if CLOCK_PORT_RE.search(port) or "CLKIN" in row.function:
+                io = constraints.ios_by_port.get(port)
+                findings.append(ConstraintFinding(
+                    severity="WARNING", kind="unconstrained_clock",
+                    message=f"Clock input '{port}' on {row.pin} has no create_clock",
+                    port=port, pin=row.pin,
+                    file=io.file if io else None, line=io.line if io else None))
+
+    def _check_io_assignments(self, constraints, placed_ios, pin_report, findings):
+        for io in constraints.ios:
+            placed = placed_ios.get(io.port)
+
+            if placed is None:
+                findings.append(ConstraintFinding(
+                    severity="WARNING", kind="unknown_port",
+                    message=f"set_io port '{io.port}' is not in the pin report",
+                    port=io.port, pin=io.pin, file=io.file, line=io.line))
+                continue
+
+            if io.pin and placed.pin != io.pin:
+                occupant = pin_report.find("Pin", io.pin)
+                other = f" (pin holds '{occupant.port}')" if occupant and occupant.port else ""
+                findings.append(ConstraintFinding(
+                    severity="ERROR", kind="pin_mismatch",
+                    message=f"Port '{io.port}' constrained to {io.pin} but placed on {placed.pin}{other}",
+                    port=io.port, pin=io.pin, file=io.file, line=io.line))
+
+            if io.io_std and placed.io_std and io.io_std.upper() != placed.io_std.upper():
+                findings.append(ConstraintFinding(
+                    severity="ERROR", kind="io_std_mismatch",
+                    message=f"Port '{io.port}' constrained to {io.io_std} but placed as {placed.io_std}",
+                    port=io.port, pin=placed.pin, file=io.file, line=io.line))
+
+        seen: Dict[str, IOConstraint] = {}
+        for io in constraints.ios:
+            if not io.pin:
+                continue
+            first = seen.setdefault(io.pin, io)
+            if first is not io and first.port != io.port:
+                findings.append(ConstraintFinding(
+                    severity="ERROR", kind="pin_conflict",
+                    message=f"Pin {io.pin} assigned to both '{first.port}' and '{io.port}'",
+                    port=io.port, pin=io.pin, file=io.file, line=io.line))
+
+    def _check_unconstrained_ios(self, constraints, placed, findings):
+        constrained = constraints.ios_by_port
+        for port, row in placed.items():
+            if port not in constrained:
+                findings.append(ConstraintFinding(
+                    severity="INFO", kind="unconstrained_io",
+                    message=f"Port '{port}' placed on {row.pin} by P&R without a set_io",
+                    port=port, pin=row.pin))
+
+    def _check_banks(self, pin_report, findings):
+        for bank, summary in sorted(pin_report.bank_summary().items()):
+            for conflict in summary.conflicts:
+                findings.append(ConstraintFinding(
+                    severity="ERROR", kind="bank_conflict", message=conflict))
+
+
+def print_report(report: ConstraintReport, verbose: bool = False):
+    """Print a human-readable summary for one project."""
+    constraints = report.constraints
+    print(f"\n{report.project_dir}" + (f" [{report.design}]" if report.design else ""))
+    print(f"  Constraint files: {len(constraints.files)}")
+    print(f"  Clocks:           {len(constraints.clocks)}")
+    print(f"  set_io:           {len(constraints.ios)}")
+    if report.pin_report:
+        print(f"  Placed user I/O:  {len(report.pin_report.index('Port'))}")
+
+    symbol = {"ERROR": "✗", "WARNING": "⚠", "INFO": "•"}
+    shown = [f for f in report.findings if verbose or f.severity != "INFO"]
+    for finding in shown:
+        where = f" ({finding.file}:{finding.line})" if finding.file else ""
+        print(f"  {symbol[finding.severity]} [{finding.kind}] {finding.message}{where}")
+
+    hidden = len(report.findings) - len(shown)
+    if hidden:
+        print(f"  {hidden} informational finding(s) hidden (use --verbose)")
+    if not report.findings:
+        print("  ✓ Constraints match the placed design")
+
+
+def main():
+    """Main entry point."""
+    args = [a for a in sys.argv[1:] if not a.startswith('-')]
+    as_json = '--json' in sys.argv
+    verbose = '--verbose' in sys.argv or '-v' in sys.argv
+
+    if not args:
+        print("Usage: python constraint_analyzer.py <project_dir> [<project_dir> ...] [--json] [--verbose]")
+        sys.exit(1)
+
+    analyzer = ConstraintAnalyzer()
+    reports = []
+    for arg in args:
+        project_dir = Path(arg)
+        if not project_dir.exists():
+            print(f"ERROR: Project directory not found: {project_dir}")
+            sys.exit(1)
+        reports.append(analyzer.analyze_project(project_dir))
+
+    if as_json:
+        print(json.dumps([{
+            "project_dir": r.project_dir,
+            "design": r.design,
+            "constraint_files": r.constraints.files,
+            "clocks": [asdict(c) for c in r.constraints.clocks],
+            "findings": [asdict(f) for f in r.findings],
+        } for r in reports], indent=2))
+    else:
+        for report in reports:
+            print_report(report, verbose=verbose)
+
+    if any(r.errors for r in reports):
+        sys.exit(1)
+    elif any(r.warnings for r in reports):
+        sys.exit(2)
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Known-Issue Signature Matcher
+
+Recognizes known failure modes and noise in Libero/Synplify logs (the
+duplicate-address memory map DRC from docs/KNOWN_ISSUES.md, TBBmalloc
+messages in layout logs, syn_black_box pragma warnings, ...) and maps each
+to a BuildDoctor recommendation.
+
+Signatures are literal strings or regular expressions; a regex signature
+names one or more anchor literals that every match contains. Literals and
+anchors are folded into one prefix-trie regex that finds candidate lines in
+a single pass over each file, whatever the number of signatures. Only those
+lines are classified, and only the regexes whose anchors occurred are run.
+
+Usage:
+    python known_issues.py <project_dir>
+    python known_issues.py <log_file> [<log_file> ...]
+    python known_issues.py --list
+"""
+
+import re
+import string
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import log_archive
+
+# Bytes read per chunk when scanning a file (chunks end on line boundaries)
+CHUNK_SIZE = 1 << 22
+
+# Lowercases ASCII only, so offsets in the lowered copy match the original text
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Files scanned in a Libero project directory
+PROJECT_PATTERNS = (
+    "synthesis/*.log",
+    "synthesis/*.srr",
+    "designer/*/*.log",
+    "designer/*/*memory_map*.json",
+)
+
+
+@dataclass(frozen=True)
+class Signature:
+    """A known log pattern and the recommendation it maps to."""
+    name: str
+    pattern: str
+    regex: bool = False
+    anchors: Tuple[str, ...] = ()  # regex only: one of these appears (any case) in every match
+    severity: str = "INFO"  # INFO, WARNING, ERROR
+    category: str = "Build"
+    issue: str = ""
+    impact: str = ""
+    fix: str = ""
+    reference: str = ""
+
+
+@dataclass
+class SignatureHit:
+    """Occurrences of one signature across the scanned logs."""
+    signature: Signature
+    count: int = 0
+    source: str = ""
+    line: int = 0
+    text: str = ""
+
+
+SIGNATURES: Tuple[Signature, ...] = (
+    Signature(
+        name="memory_map_address_conflict",
+        pattern="cannot be accessed by Initiator address space",
+        severity="ERROR",
+        category="Configuration",
+        issue="Memory map DRC: peripheral address space not reachable by the initiator",
+        impact="Exported peripherals share a base address; hw_platform.h and firmware will be wrong",
+        fix="Assign unique, non-overlapping base addresses in the SmartDesign Address Editor and re-export",
+        reference="docs/KNOWN_ISSUES.md (miv_rv32_demo memory map DRC errors)",
+    ),
+    Signature(
+        name="tbbmalloc_notice",
+        pattern="TBBmalloc: skip allocation functions replacement",
+        category="Build",
+        issue="TBBmalloc allocator notices in the P&R log",
+        impact="None - Windows runtime message from the Intel TBB allocator, not a design problem",
+        fix="Ignore; filter these lines when reading layout logs",
+    ),
+    Signature(
+        name="syn_black_box_pragma",
+        pattern="User defined pragma syn_black_box detected",
+        category="Build",
+        issue="syn_black_box pragma warnings (CG100) from polarfire_syn_comps.v",
+        impact="None - Libero's generated primitive library declares its cells as black boxes",
+        fix="Ignore; expected for every PolarFire project",
+    ),
+    Signature(
+        name="inferred_clock",
+        pattern=r"@W: MT530 .*[Ff]ound inferred clock",
+        regex=True,
+        anchors=("MT530",),
+        severity="WARNING",
+        category="Timing",
+        issue="Synthesis inferred a clock that has no create_clock constraint",
+        impact="Paths on the inferred clock are timed against a default frequency, not the real one",
+        fix="Add create_clock (or create_generated_clock) for the clock in the SDC/FDC",
+        reference="python tools/diagnostics/constraint_analyzer.py <project_dir>",
+    ),
+    Signature(
+        name="tmr_replica_merged",
+        pattern=r"@[WN]: BN132 .*_[ABC]\b",
+        regex=True,
+        anchors=("BN132",),
+        severity="ERROR",
+        category="TMR",
+        issue="Synthesis merged equivalent registers across TMR replicas (BN132)",
+        impact="Lanes share logic, so a single upset can defeat the voter",
+        fix="Add syn_preserve / syn_keep on the replica instances (see constraint/tmr/*.fdc)",
+        reference="python tools/diagnostics/tmr_symmetry.py <project_dir>",
+    ),
+    Signature(
+        name="undriven_output",
+        pattern=r"@W: CL318 ",
+        regex=True,
+        anchors=("CL318",),
+        severity="WARNING",
+        category="Build",
+        issue="Output or port bits have no driver (CL318)",
+        impact="Undriven bits are tied off by synthesis and may not behave as intended",
+        fix="Drive or remove the listed bits in the HDL",
+    ),
+    Signature(
+        name="latch_inferred",
+        pattern=r"@W: CL207 |Latch generated from always block",
+        regex=True,
+        anchors=("CL207", "Latch generated"),
+        severity="WARNING",
+        category="Build",
+        issue="Synthesis inferred a latch",
+        impact="Latches are hard to time and usually indicate an incomplete if/case",
+        fix="Assign the signal in every branch or add a default assignment",
+    ),
+    Signature(
+        name="license_checkout",
+        pattern=r"(?i:failed to (?:obtain|check ?out) (?:a |the )?licen[cs]e|licen[cs]e checkout failed)",
+        regex=True,
+        anchors=("licen",),
+        severity="ERROR",
+        category="Build",
+        issue="Tool license could not be checked out",
+        impact="Synthesis or P&R did not run",
+        fix="Check LM_LICENSE_FILE / the license server, then re-run the build",
+    ),
+    Signature(
+        name="routing_failed",
+        pattern=r"(?i:\b(?:unable to route|routing failed|router failed)\b)",
+        regex=True,
+        anchors=("rout",),
+        severity="ERROR",
+        category="Resource",
+        issue="Place & Route could not route the design",
+        impact="No programming file can be generated",
+        fix="Reduce congestion (lower utilization, floorplan, or enable multi-pass layout)",
+        reference="python tools/build/design_sweep.py <project_dir> --seeds 1-8",
+    ),
+)
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Regex matching any of the literal words, factored into a prefix trie."""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        if '' in node:
+            return f"(?:{'|'.join(branches)})?"
+        if len(branches) == 1:
+            return branches[0]
+        return f"(?:{'|'.join(branches)})"
+
+    return build(trie)
+
+
+def is_noise(signature: Signature) -> bool:
+    """True for signatures of harmless tool output (INFO, fix "Ignore; ...")."""
+    return signature.severity == "INFO" and signature.fix.startswith("Ignore")
+
+
+class KnownIssueMatcher:
+    """Match log lines against the signature database in one pass per file.
+
+    Literal patterns and regex anchors form one prefix-trie regex that runs
+    over an ASCII-lowercased copy of each chunk; only the lines it hits are
+    classified. Regex signatures without anchors are scanned separately (slower).
+    """
+
+    def __init__(self, signatures: Sequence[Signature] = SIGNATURES):
+        self.signatures = list(signatures)
+        self.regexes = [(s, re.compile(s.pattern)) for s in self.signatures if s.regex]
+        self.unanchored = [(s, r) for s, r in self.regexes if not s.anchors]
+
+        # Lowercased word -> literal signatures and anchored regexes it selects
+        self.words: Dict[str, List[Tuple[Signature, Optional[re.Pattern]]]] = {}
+        for s in self.signatures:
+            if not s.regex:
+                self.words.setdefault(s.pattern.translate(ASCII_LOWER), []).append((s, None))
+        for s, regex in self.regexes:
+            for anchor in s.anchors:
+                self.words.setdefault(anchor.translate(ASCII_LOWER), []).append((s, regex))
+
+        trie = trie_pattern(self.words)
+        self.prefilter = re.compile(trie) if self.words else None
+        # Lookahead finds the longest word starting at every offset, not just leftmost matches
+        self.every_offset = re.compile(f"(?=({trie}))") if self.words else None
+        self.hits: Dict[str, SignatureHit] = {}
+
+    def match_line(self, line: str) -> List[Signature]:
+        """All signatures matching one line."""
+        candidates = list(self.unanchored)
+        if self.every_offset is not None:
+            found = set()
+            for m in self.every_offset.finditer(line.translate(ASCII_LOWER)):
+                longest = m.group(1)
+                found.update(longest[:n] for n in range(1, len(longest) + 1) if longest[:n] in self.words)
+            for word in found:
+                candidates += self.words[word]
+
+        matched, seen = [], set()
+        for s, regex in candidates:
+            if s.name in seen:
+                continue
+            if (regex.search(line) if regex is not None else s.pattern in line):
+                seen.add(s.name)
+                matched.append(s)
+        return matched
+
+    def _candidates(self, text: str) -> Iterable[Tuple[int, int]]:
+        """(start, end) of every line a signature may match, in order."""
+        scans = []
+        if self.prefilter is not None:
+            scans.append((self.prefilter, text.translate(ASCII_LOWER)))
+        scans += [(r, text) for _, r in self.unanchored]
+        starts: Set[int] = set()
+        for regex, haystack in scans:
+            position = 0
+            while True:
+                m = regex.search(haystack, position)
+                if m is None:
+                    break
+                start = text.rfind('\n', 0, m.start()) + 1
+                end = text.find('\n', m.end())
+                end = len(text) if end < 0 else end
+                if len(scans) == 1:
+                    yield start, end
+                else:
+                    starts.add(start)
+                position = end + 1
+        for start in sorted(starts):
+            end = text.find('\n', start)
+            yield start, len(text) if end < 0 else end
+
+    def scan_text(self, text: str, source: str = "", first_line: int = 1):
+        """Scan a block of text, recording hits."""
+        number, counted = first_line, 0
+        for start, end in self._candidates(text):
+            line = text[start:end].rstrip('\r')
+            signatures = self.match_line(line)
+            if not signatures:
+                continue
+            number += text.count('\n', counted, start)
+            counted = start
+            for signature in signatures:
+                hit = self.hits.get(signature.name)
+                if hit is None:
+                    hit = self.hits[signature.name] = SignatureHit(signature, 0, source, number, line.strip())
+                hit.count += 1
+
+    def scan_file(self, path: Path):
+        """Scan a log file, on disk or archived, in line-aligned chunks (bounded memory)."""
+        line_no = 1
+        block, size = [], 0
+        with log_archive.open_lines(path) as lines:
+            for line in lines:
+                block.append(line)
+                size += len(line)
+                if size >= CHUNK_SIZE:
+                    text = ''.join(block)
+                    self.scan_text(text, str(path), line_no)
+                    line_no += text.count('\n')
+                    block, size = [], 0
+        if block:
+            self.scan_text(''.join(block), str(path), line_no)
+
+    def scan_project(self, project_dir: Path) -> Dict[str, SignatureHit]:
+        """Scan the synthesis/P&R logs and memory map exports of a project.
+
+        Logs packed into the project's build_logs.lgz are read from the
+        archive; project_dir may also be an archive file.
+        """
+        for pattern in PROJECT_PATTERNS:
+            for path in project_logs(project_dir, pattern):
+                self.scan_file(path)
+        return self.hits
+
+
+def project_logs(project_dir: Path, pattern: str) -> List[Path]:
+    """Files matching a "dir/*/name" pattern, on disk or archived."""
+    parent, name = pattern.rsplit('/', 1)
+    dirs = [project_dir]
+    for part in parent.split('/'):
+        if part == '*':
+            dirs = [sub for d in dirs for sub in log_archive.subdirs(d)]
+        else:
+            dirs = [d / part for d in dirs]
+    return [path for d in dirs for path in log_archive.glob(d, name)]
+
+
+def print_hits(hits: Dict[str, SignatureHit]):
+    """Print matched signatures, most severe first."""
+    print("\n" + "=" * 70)
+    print("KNOWN ISSUE SIGNATURES")
+    print("=" * 70)
+    if not hits:
+        print("\nNo known issue signatures found.")
+    order = {"ERROR": 0, "WARNING": 1, "INFO": 2}
+    for hit in sorted(hits.values(), key=lambda h: (order.get(h.signature.severity, 3), h.signature.name)):
+        s = hit.signature
+        print(f"\n  [{s.severity}] {s.name} x{hit.count}")
+        print(f"     {s.issue}")
+        print(f"     First: {hit.source}:{hit.line}")
+        print(f"     {hit.text[:100]}")
+    print("\n" + "=" * 70)
+
+
+def main():
+    """Main entry point."""
+    if len(sys.argv) < 2:
+        print("Usage: python known_issues.py <project_dir>")
+        print("   or: python known_issues.py <log_file> [<log_file> ...]")
+        print("   or: python known_issues.py --list")
+        sys.exit(1)
+
+    if sys.argv[1] == '--list':
+        for s in SIGNATURES:
+            kind = "regex" if s.regex else "literal"
+            print(f"  {s.severity:<8} {s.name:<30} {kind:<8} {s.pattern}")
+        return
+
+    matcher = KnownIssueMatcher()
+    for arg in sys.argv[1:]:
+        path = Path(arg)
+        if path.is_dir() or path.suffix == log_archive.ARCHIVE_SUFFIX:
+            matcher.scan_project(path)
+        elif log_archive.exists(path):
+            matcher.scan_file(path)
+        else:
+            print(f"ERROR: Not found: {path}")
+            sys.exit(1)
+
+    print_hits(matcher.hits)
+    sys.exit(1 if any(h.signature.severity == "ERROR" for h in matcher.hits.values()) else 0)
+
+
+if __name__ == '__main__':
+    main()
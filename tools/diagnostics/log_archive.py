@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Seekable Build Log Archive
+
+Packs the bulky logs of a Libero project (synthesis/synlog, synthesis/syntmp,
+Synplify logs and reports, designer logs and reports) into one
+block-compressed archive, by default <project>/build_logs.lgz.
+
+Each file is cut into line-aligned blocks of about 1 MiB. Every block is an
+independent gzip member, and an index at the end of the archive records the
+offset and sizes of each block. A single log can therefore be read without
+decompressing the rest of the archive, and its blocks are decompressed in
+parallel (zlib releases the GIL while inflating).
+
+Layout:
+    b'LGZA' + version (u32 LE)
+    gzip member, gzip member, ...       blocks of every file, in order
+    index                               zlib-compressed JSON
+    index offset (u64 LE), index length (u64 LE), b'LGZA'
+
+LogParser reads archived logs transparently: a path such as
+<project>/synthesis/synplify.log that no longer exists on disk is looked up
+in <project>/build_logs.lgz, and an archive file itself can be used in
+place of a project directory.
+
+Usage:
+    python log_archive.py pack <project_dir> [--out <archive>] [--remove] [--block-size 1M]
+    python log_archive.py list <archive|project_dir>
+    python log_archive.py cat <archive|project_dir> <member>
+    python log_archive.py unpack <archive|project_dir> <dest_dir>
+    python log_archive.py verify <archive|project_dir>
+"""
+
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import struct
+import sys
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+ARCHIVE_VERSION = 1
+ARCHIVE_MAGIC = b'LGZA'
+ARCHIVE_NAME = "build_logs.lgz"
+ARCHIVE_SUFFIX = ".lgz"
+
+HEADER = struct.Struct('<4sI')
+FOOTER = struct.Struct('<QQ4s')
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+DEFAULT_LEVEL = 6
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+GZIP_WBITS = 31  # zlib wbits selecting a gzip wrapper (header + CRC32 per block)
+
+# Files packed from a Libero project directory
+PACK_PATTERNS = (
+    "synthesis/*.log",
+    "synthesis/*.srr",
+    "synthesis/*.rpt",
+    "synthesis/synlog/**/*",
+    "synthesis/syntmp/**/*",
+    "designer/*/*.log",
+    "designer/*/*.rpt",
+    "designer/*/*_Report.txt",
+)
+
+
+class ArchiveError(Exception):
+    """Raised for a missing, truncated or corrupt archive."""
+
+
+@dataclass
+class Block:
+    """One independently compressed, line-aligned slice of a member."""
+    offset: int
+    compressed: int
+    size: int
+
+
+@dataclass
+class Member:
+    """A file stored in the archive."""
+    name: str  # POSIX path relative to the project directory
+    size: int = 0
+    mtime: float = 0.0
+    blocks: List[Block] = field(default_factory=list)
+
+    @property
+    def compressed(self) -> int:
+        return sum(b.compressed for b in self.blocks)
+
+
+def _decode(data: bytes) -> str:
+    """Decode like open(..., 'r', errors='ignore') does, with universal newlines."""
+    return data.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+
+class LogArchive:
+    """Random-access reader for a block-compressed log archive."""
+
+    def __init__(self, path: Path, workers: int = DEFAULT_WORKERS):
+        self.path = Path(path)
+        self.workers = max(1, workers)
+        self.members: Dict[str, Member] = {}
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.path, 'rb') as f:
+                magic, version = HEADER.unpack(f.read(HEADER.size))
+                f.seek(-FOOTER.size, os.SEEK_END)
+                offset, length, trailer = FOOTER.unpack(f.read(FOOTER.size))
+                if magic != ARCHIVE_MAGIC or trailer != ARCHIVE_MAGIC:
+                    raise ArchiveError(f"{self.path}: not a log archive")
+                if version > ARCHIVE_VERSION:
+                    raise ArchiveError(f"{self.path}: unsupported archive version {version}")
+                f.seek(offset)
+                index = json.loads(zlib.decompress(f.read(length)))
+        except (OSError, struct.error, zlib.error, ValueError) as e:
+            raise ArchiveError(f"{self.path}: cannot read index ({e})") from e
+
+        for name, size, mtime, blocks in index["members"]:
+            self.members[name] = Member(name, size, mtime, [Block(*b) for b in blocks])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.members
+
+    def names(self, pattern: str = "*") -> List[str]:
+        """Member names matching a glob pattern ('*' also matches '/')."""
+        return sorted(n for n in self.members if fnmatch.fnmatchcase(n, pattern))
+
+    def read_block(self, name: str, index: int) -> bytes:
+        """Decompress one block of a member."""
+        block = self.members[name].blocks[index]
+        with open(self.path, 'rb') as f:
+            f.seek(block.offset)
+            data = f.read(block.compressed)
+        try:
+            return zlib.decompress(data, GZIP_WBITS)
+        except zlib.error as e:
+            raise ArchiveError(f"{self.path}: {name} block {index} is corrupt ({e})") from e
+
+    def iter_blocks(self, name: str) -> Iterator[bytes]:
+        """Decompressed blocks of a member, in order, read ahead in parallel."""
+        count = len(self.members[name].blocks)
+        if count <= 1 or self.workers == 1:
+            for i in range(count):
+                yield self.read_block(name, i)
+            return
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            for i in range(count):
+                pending.append(pool.submit(self.read_block, name, i))
+                if len(pending) > 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def read_bytes(self, name: str) -> bytes:
+        return b''.join(self.iter_blocks(name))
+
+    def read_text(self, name: str) -> str:
+        return _decode(self.read_bytes(name))
+
+    def iter_lines(self, name: str) -> Iterator[str]:
+        """Stream the lines of a member without holding it all in memory."""
+        carry = b''
+        for block in self.iter_blocks(name):
+            data = carry + block
+            cut = data.rfind(b'\n') + 1
+            carry = data[cut:]
+            if cut:
+                yield from io.StringIO(_decode(data[:cut]))
+        if carry:
+            yield _decode(carry)
+
+    def verify(self) -> List[str]:
+        """Decompress every block and check sizes; returns the problems found."""
+        problems = []
+        for member in self.members.values():
+            try:
+                size = sum(len(block) for block in self.iter_blocks(member.name))
+            except ArchiveError as e:
+                problems.append(str(e))
+                continue
+            if size != member.size:
+                problems.append(f"{member.name}: {size} bytes, index says {member.size}")
+        return problems
+
+
+# Archives opened through the path helpers below, keyed by (path, mtime, size)
+_OPEN_ARCHIVES: Dict[Tuple[str, float, int], LogArchive] = {}
+
+
+def open_archive(path: Path) -> LogArchive:
+    """Open an archive, reusing the parsed index while the file is unchanged."""
+    st = path.stat()
+    key = (str(path.resolve()), st.st_mtime, st.st_size)
+    if key not in _OPEN_ARCHIVES:
+        _OPEN_ARCHIVES[key] = LogArchive(path)
+    return _OPEN_ARCHIVES[key]
+
+
+def archive_for(path: Path) -> Optional[Tuple[LogArchive, str]]:
+    """The archive that would hold path, and the member name it would have.
+
+    Walks up from path to the nearest directory holding build_logs.lgz, or
+    to an .lgz file used in place of a project directory.
+    """
+    for root in Path(path).parents:
+        if root.suffix == ARCHIVE_SUFFIX and root.is_file():
+            archive = root
+        elif (root / ARCHIVE_NAME).is_file():
+            archive = root / ARCHIVE_NAME
+        else:
+            continue
+        try:
+            return open_archive(archive), Path(path).relative_to(root).as_posix()
+        except ArchiveError:
+            return None
+    return None
+
+
+def exists(path: Path) -> bool:
+    """True if path is on disk or archived."""
+    if path.exists():
+        return True
+    located = archive_for(path)
+    return located is not None and located[1] in located[0]
+
+
+def read_text(path: Path) -> str:
+    """Contents of a log on disk or in its project archive."""
+    if path.exists():
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+    located = archive_for(path)
+    if located is None or located[1] not in located[0]:
+        raise FileNotFoundError(str(path))
+    archive, name = located
+    return archive.read_text(name)
+
+
+@contextlib.contextmanager
+def open_lines(path: Path) -> Iterator[Iterable[str]]:
+    """Line iterator over a log on disk or in its project archive."""
+    if path.exists():
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            yield f
+        return
+    located = archive_for(path)
+    if located is None or located[1] not in located[0]:
+        raise FileNotFoundError(str(path))
+    archive, name = located
+    lines = archive.iter_lines(name)
+    try:
+        yield lines
+    finally:
+        lines.close()
+
+
+def _archived_entries(directory: Path, pattern: str) -> List[str]:
+    """Archived paths below directory matching pattern, relative to directory."""
+    located = archive_for(directory / "_")
+    if located is None:
+        return []
+    archive, name = located
+    prefix = name[:-1]
+    return [n[len(prefix):] for n in archive.names(prefix + pattern)]
+
+
+def glob(directory: Path, pattern: str) -> List[Path]:
+    """Files directly in directory matching pattern, on disk or archived."""
+    found = set(directory.glob(pattern)) if directory.is_dir() else set()
+    found.update(directory / rel for rel in _archived_entries(directory, pattern) if '/' not in rel)
+    return sorted(found)
+
+
+def subdirs(directory: Path) -> List[Path]:
+    """Subdirectories of directory, on disk or implied by archived members."""
+    found = {d for d in directory.iterdir() if d.is_dir()} if directory.is_dir() else set()
+    found.update(directory / rel.split('/', 1)[0] for rel in _archived_entries(directory, "*/*"))
+    return sorted(found)
+
+
+def project_files(project_dir: Path, patterns: Iterable[str] = PACK_PATTERNS) -> List[Path]:
+    """Files of a project directory that are packed into its archive."""
+    files = set()
+    for pattern in patterns:
+        files.update(p for p in project_dir.glob(pattern) if p.is_file())
+    return sorted(files)
+
+
+def _write_member(out, source, name: str, size: int, mtime: float,
+                  block_size: int, level: int) -> Member:
+    """Compress a file into gzip blocks that end on line boundaries where possible."""
+    member = Member(name, size, mtime)
+
+    def emit(block: bytes):
+        compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+        packed = compressor.compress(block) + compressor.flush()
+        member.blocks.append(Block(out.tell(), len(packed), len(block)))
+        out.write(packed)
+
+    data = b''
+    while True:
+        chunk = source.read(block_size)
+        if not chunk:
+            break
+        data += chunk
+        while len(data) >= block_size:
+            cut = data.rfind(b'\n', 0, block_size) + 1 or block_size
+            emit(data[:cut])
+            data = data[cut:]
+    if data:
+        emit(data)
+    return member
+
+
+def pack_project(project_dir: Path, out: Optional[Path] = None, block_size: int = DEFAULT_BLOCK_SIZE,
+                 level: int = DEFAULT_LEVEL, remove: bool = False) -> LogArchive:
+    """Pack a project's logs, merging with an existing archive.
+
+    Members already in the archive whose file is unchanged (same size and
+    mtime) or gone from disk are copied as compressed blocks, not re-packed.
+    With remove=True the packed files are deleted once the archive is written.
+    """
+    out = Path(out) if out else project_dir / ARCHIVE_NAME
+    previous = LogArchive(out) if out.is_file() else None
+    files = {p.relative_to(project_dir).as_posix(): p for p in project_files(project_dir)}
+
+    tmp = out.with_name(out.name + ".tmp")
+    members: List[Member] = []
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION))
+        for name in sorted(set(files) | set(previous.members if previous else ())):
+            old = previous.members.get(name) if previous else None
+            path = files.get(name)
+            st = path.stat() if path else None
+            if old and (st is None or (st.st_size == old.size and st.st_mtime == old.mtime)):
+                copied = Member(name, old.size, old.mtime)
+                with open(previous.path, 'rb') as src:
+                    for b in old.blocks:
+                        src.seek(b.offset)
+                        copied.blocks.append(Block(f.tell(), b.compressed, b.size))
+                        f.write(src.read(b.compressed))
+                members.append(copied)
+            else:
+                with open(path, 'rb') as src:
+                    members.append(_write_member(f, src, name, st.st_size, st.st_mtime, block_size, level))
+
+        index = zlib.compress(json.dumps({
+            "version": ARCHIVE_VERSION,
+            "members": [[m.name, m.size, m.mtime, [[b.offset, b.compressed, b.size] for b in m.blocks]]
+                        for m in members],
+        }).encode())
+        offset = f.tell()
+        f.write(index)
+        f.write(FOOTER.pack(offset, len(index), ARCHIVE_MAGIC))
+    os.replace(tmp, out)
+
+    archive = LogArchive(out)
+    if remove:
+        for name, path in files.items():
+            if archive.members[name].size == path.stat().st_size:
+                path.unlink()
+    return archive
+
+
+def unpack(archive: LogArchive, dest: Path, pattern: str = "*") -> int:
+    """Extract members into dest, restoring their mtimes; returns the count."""
+    names = archive.names(pattern)
+    for name in names:
+        target = dest / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, 'wb') as f:
+            for block in archive.iter_blocks(name):
+                f.write(block)
+        member = archive.members[name]
+        os.utime(target, (member.mtime, member.mtime))
+    return len(names)
+
+
+def resolve_archive(path: Path) -> Path:
+    """Archive file for a CLI argument (an archive or a project directory)."""
+    return path / ARCHIVE_NAME if path.is_dir() else path
+
+
+def print_members(archive: LogArchive):
+    """Print archive contents and compression ratio."""
+    print("\n" + "=" * 70)
+    print(f"LOG ARCHIVE: {archive.path}")
+    print("=" * 70)
+    print(f"\n{'Member':<48} {'Size':>10} {'Packed':>10} {'Blocks':>6}")
+    print("-" * 77)
+    for name in archive.names():
+        m = archive.members[name]
+        print(f"{name:<48} {m.size:>10} {m.compressed:>10} {len(m.blocks):>6}")
+    total = sum(m.size for m in archive.members.values())
+    packed = sum(m.compressed for m in archive.members.values())
+    print("-" * 77)
+    print(f"{len(archive.members)} files, {total} bytes -> {packed} bytes "
+          f"({packed / total * 100 if total else 0:.1f}%)")
+    print("=" * 70)
+
+
+def _parse_block_size(text: str) -> int:
+    units = {'K': 1 << 10, 'M': 1 << 20}
+    scale = units.get(text[-1:].upper(), 1)
+    return int(text[:-1] if scale > 1 else text) * scale
+
+
+def main():
+    """Main entry point."""
+    if len(sys.argv) < 3:
+        print("Usage: python log_archive.py pack <project_dir> [--out <archive>] [--remove] [--block-size 1M]")
+        print("   or: python log_archive.py list <archive|project_dir>")
+        print("   or: python log_archive.py cat <archive|project_dir> <member>")
+        print("   or: python log_archive.py unpack <archive|project_dir> <dest_dir>")
+        print("   or: python log_archive.py verify <archive|project_dir>")
+        sys.exit(1)
+
+    command, target = sys.argv[1], Path(sys.argv[2])
+    args = sys.argv[3:]
+
+    try:
+        if command == 'pack':
+            if not target.is_dir():
+                print(f"ERROR: Project directory not found: {target}")
+                sys.exit(1)
+            out = Path(args[args.index('--out') + 1]) if '--out' in args else None
+            block_size = _parse_block_size(args[args.index('--block-size') + 1]) if '--block-size' in args \
+                else DEFAULT_BLOCK_SIZE
+            archive = pack_project(target, out, block_size=block_size, remove='--remove' in args)
+            print_members(archive)
+            return
+
+        archive = LogArchive(resolve_archive(target))
+        if command == 'list':
+            print_members(archive)
+        elif command == 'cat':
+            if not args or args[0] not in archive:
+                print(f"ERROR: Not in archive: {args[0] if args else '(no member given)'}")
+                sys.exit(1)
+            for block in archive.iter_blocks(args[0]):
+                sys.stdout.buffer.write(block)
+        elif command == 'unpack':
+            if not args:
+                print("ERROR: unpack requires a destination directory")
+                sys.exit(1)
+            print(f"Extracted {unpack(archive, Path(args[0]))} files to {args[0]}")
+        elif command == 'verify':
+            problems = archive.verify()
+            for problem in problems:
+                print(f"  ✗ {problem}")
+            print(f"{len(archive.members)} files checked, {len(problems)} problems")
+            sys.exit(1 if problems else 0)
+        else:
+            print(f"ERROR: Unknown command: {command}")
+            sys.exit(1)
+    except ArchiveError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,16 +10,53 @@ Parses Synplify Pro synthesis logs and Libero Place & Route logs to extract:
 
 Usage:
     python log_parser.py <log_file>
+    python log_parser.py <design>.srr
     python log_parser.py --project <project_dir>
+    python log_parser.py --project <archive>.lgz   # logs packed by log_archive.py
+    python log_parser.py fingerprint <log|project_dir> <out.json>
+    python log_parser.py diff <old> <new>      # logs, project dirs or fingerprint .json
 """
 
+import hashlib
+import heapq
+import itertools
+import json
 import re
 import sys
+from collections import Counter
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from enum import Enum
 
+import log_archive
+
+# The shared project-tree index lives with the helper scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "scripts"))
+from project_index import project_index  # noqa: E402
+
+# Worst paths kept from a Synplify timing report (memory stays bounded on huge reports)
+DEFAULT_TOP_PATHS = 20
+
+TIMING_REPORT_START = '##### START OF TIMING REPORT'
+TIMING_REPORT_END = '##### END OF TIMING REPORT'
+PATH_HEADER_RE = re.compile(r'Path information for path number (\d+)')
+PATH_FIELD_RE = re.compile(r'^\s*[-+=]?\s*([A-Za-z][^:]*?)\s*:\s*(\S.*?)\s*$')
+CLOCKED_BY_RE = re.compile(r'The (start|end)\s+point is clocked by\s+(\S+)')
+CLOCK_ROW_RE = re.compile(r'(\S+)\s+([\d.]+) MHz\s+([\d.]+) MHz\s+([\d.]+)\s+([\d.]+)\s+(-?[\d.]+)')
+SYNPLIFY_MESSAGE_RE = re.compile(r'^@([EW]):(.*)', re.MULTILINE)
+
+# Message normalization for cross-build fingerprints: file paths, line/column
+# spans and bus/instance indices change between builds without the warning changing
+FINGERPRINT_VERSION = 1
+NORMALIZE_RULES = (  # (pattern, replacement, substrings that must be present for the rule to apply)
+    (re.compile(r'"[^"\\/]*[\\/][^"]*"'), '"<path>"', ('"',)),
+    (re.compile(r'(?:[A-Za-z]:)?[\w.\-\\/]*[\\/][\w\-]+\.[A-Za-z]\w{0,5}\b'), '<path>', ('/', '\\')),
+    (re.compile(r':\d+(?::\d+)*(?=[|\s,)]|$)'), ':<loc>', (':',)),
+    (re.compile(r'\b([Ll]ine|[Cc]ol(?:umn)?)\s+\d+'), r'\1 <n>', ('ine ', 'ol ', 'olumn ')),
+    (re.compile(r'\[\d+(?::\d+)?\]'), '[<i>]', ('[',)),
+)
+
 
 class LogLevel(Enum):
     """Log message severity levels."""
@@ -37,6 +74,7 @@ class LogMessage:
     file: Optional[str] = None
     line: Optional[int] = None
     context: str = ""
+    stage: str = ""  # synthesis, place_route
 
 
 @dataclass
@@ -75,6 +113,35 @@ class BuildMetrics:
     total_time: float = 0.0
 
 
+@dataclass
+class ClockTiming:
+    """Per-clock timing from the Synplify Performance Summary."""
+    name: str
+    requested_mhz: float = 0.0
+    estimated_mhz: float = 0.0
+    requested_period: float = 0.0
+    estimated_period: float = 0.0
+    slack: float = 0.0
+
+    @property
+    def met(self) -> bool:
+        return self.slack >= 0
+
+
+@dataclass
+class TimingPath:
+    """One path from the Synplify "Worst Path Information" listing."""
+    start: str = ""
+    end: str = ""
+    clock: str = ""
+    end_clock: str = ""
+    slack: Optional[float] = None
+    logic_levels: int = 0
+    required_time: float = 0.0
+    propagation_time: float = 0.0
+    number: int = 0
+
+
 @dataclass
 class ParsedLog:
     """Complete parsed log data."""
@@ -84,6 +151,14 @@ class ParsedLog:
     timing_driven: bool = False
     power_driven: bool = False
     has_timing_constraints: bool = False
+    clock_timing: Dict[str, ClockTiming] = field(default_factory=dict)
+    worst_slack: Optional[float] = None
+    critical_paths: List[TimingPath] = field(default_factory=list)  # worst slack first
+
+    @property
+    def fmax_mhz(self) -> float:
+        """Lowest estimated clock frequency (0.0 without timing data)."""
+        return min((c.estimated_mhz for c in self.clock_timing.values()), default=0.0)
 
     @property
     def errors(self) -> List[LogMessage]:
@@ -98,22 +173,115 @@ class ParsedLog:
         return len(self.errors) > 0
 
 
+@dataclass
+class Fingerprint:
+    """Normalized message shared by all its occurrences in a build."""
+    level: str
+    text: str
+    count: int = 0
+
+
+@dataclass
+class MessageDelta:
+    """Change in the occurrence count of one fingerprint between builds."""
+    fingerprint: str
+    level: str
+    text: str
+    old: int
+    new: int
+
+    @property
+    def delta(self) -> int:
+        return self.new - self.old
+
+
+def normalize_message(message: str) -> str:
+    """Strip build-specific detail (paths, line/column spans, indices) from a message."""
+    for pattern, replacement, triggers in NORMALIZE_RULES:
+        if any(t in message for t in triggers):
+            message = pattern.sub(replacement, message)
+    return message
+
+
+def fingerprint_messages(messages: Iterable[LogMessage]) -> Dict[str, Fingerprint]:
+    """Group messages by normalized text; keys are short content hashes."""
+    # Synplify heads (CG100 :"<file>":21:13:21:25) differ per message but only
+    # the code survives normalization, while bodies repeat. Count on
+    # (level, code, body) with plain string operations first; only distinct
+    # bodies are then normalized and only distinct results hashed.
+    raw: Dict[Tuple[str, str, bool, str], int] = {}
+    for m in messages:
+        head, sep, body = m.message.partition('|')
+        code, quote, location = head.partition(' :"')
+        path, _, loc = location.rpartition('"')
+        if (sep and quote and ' ' not in code and ('/' in path or '\\' in path)
+                and (not loc or (loc[0] == ':' and loc[1:].replace(':', '').isdigit() and '::' not in loc
+                                 and loc[-1] != ':'))):
+            key = (m.level.value, code, bool(loc), body)
+        else:
+            key = (m.level.value, '', False, m.message)
+        raw[key] = raw.get(key, 0) + 1
+
+    counts: Counter = Counter()
+    for (level, code, has_loc, body), count in raw.items():
+        prefix = f'{code} :"<path>"{":<loc>" if has_loc else ""}|' if code else ''
+        counts[level, prefix + normalize_message(body)] += count
+
+    table = {}
+    for (level, text), count in counts.items():
+        key = hashlib.blake2b(f"{level}|{text}".encode(), digest_size=8).hexdigest()
+        table[key] = Fingerprint(level, text, count)
+    return table
+
+
+def save_fingerprints(table: Dict[str, Fingerprint], path: Path, source: str = ""):
+    """Store fingerprints so later builds can diff without re-parsing this one."""
+    data = {
+        "version": FINGERPRINT_VERSION,
+        "source": source,
+        "fingerprints": {k: [f.level, f.count, f.text] for k, f in table.items()},
+    }
+    path.write_text(json.dumps(data, indent=1))
+
+
+def load_fingerprints(path: Path) -> Dict[str, Fingerprint]:
+    """Load fingerprints written by save_fingerprints()."""
+    data = json.loads(path.read_text())
+    if data.get("version") != FINGERPRINT_VERSION:
+        raise ValueError(f"{path}: unsupported fingerprint version {data.get('version')}")
+    return {k: Fingerprint(level, text, count) for k, (level, count, text) in data["fingerprints"].items()}
+
+
+def diff_fingerprints(old: Dict[str, Fingerprint], new: Dict[str, Fingerprint]) -> List[MessageDelta]:
+    """Multiset difference of two builds, largest increase first."""
+    deltas = []
+    for key in old.keys() | new.keys():
+        before, after = old.get(key), new.get(key)
+        if before is not None and after is not None and before.count == after.count:
+            continue
+        ref = after or before
+        deltas.append(MessageDelta(key, ref.level, ref.text,
+                                   before.count if before else 0, after.count if after else 0))
+    deltas.sort(key=lambda d: (-d.delta, d.level, d.text))
+    return deltas
+
+
 class LogParser:
     """Parse Libero build logs."""
 
-    def __init__(self):
+    def __init__(self, top_paths: int = DEFAULT_TOP_PATHS):
         self.log = ParsedLog()
+        self.top_paths = top_paths
 
     def parse_synthesis_log(self, log_path: Path) -> ParsedLog:
         """Parse Synplify Pro synthesis log."""
         print(f"Parsing synthesis log: {log_path}")
 
-        if not log_path.exists():
+        if not log_archive.exists(log_path):
             print(f"  WARNING: Log file not found: {log_path}")
             return self.log
 
-        with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        content = log_archive.read_text(log_path)
 
         # Extract warnings and errors
         self._extract_synplify_messages(content)
@@ -123,16 +291,37 @@ class LogParser:
 
         return self.log
 
+    def parse_timing_report(self, srr_path: Path, messages: bool = False) -> ParsedLog:
+        """Parse the timing report section of a Synplify .srr file.
+
+        The file is streamed line by line and only the top_paths worst paths
+        are kept, so memory stays bounded on large MI-V/TMR reports. With
+        messages=True the report's @W/@E lines are collected in the same
+        pass and merged into the messages already parsed.
+        """
+        print(f"Parsing timing report: {srr_path}")
+
+        if not log_archive.exists(srr_path):
+            print(f"  WARNING: Report file not found: {srr_path}")
+            return self.log
+
+        found: Optional[List[LogMessage]] = [] if messages else None
+        with log_archive.open_lines(srr_path) as lines:
+            self._stream_timing_report(lines, found)
+        if found:
+            self._merge_report_messages(found)
+
+        return self.log
+
     def parse_pr_log(self, log_path: Path) -> ParsedLog:
         """Parse Place & Route log."""
         print(f"Parsing P&R log: {log_path}")
 
-        if not log_path.exists():
+        if not log_archive.exists(log_path):
             print(f"  WARNING: Log file not found: {log_path}")
             return self.log
 
-        with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        content = log_archive.read_text(log_path)
 
         # Extract configuration
         self._extract_pr_config(content)
@@ -149,42 +338,64 @@ class LogParser:
         return self.log
 
     def parse_project(self, project_dir: Path) -> ParsedLog:
-        """Parse all logs from a Libero project directory."""
+        """Parse all logs from a Libero project directory.
+
+        Logs packed into the project's build_logs.lgz are read from the
+        archive; project_dir may also be an archive file.
+        """
         print(f"Parsing project: {project_dir}")
 
         # Synthesis logs
         syn_log = project_dir / "synthesis" / "synplify.log"
-        if syn_log.exists():
+        if log_archive.exists(syn_log):
             self.parse_synthesis_log(syn_log)
 
-        # P&R logs (find designer subdirectory)
-        designer_dir = project_dir / "designer"
-        if designer_dir.exists():
-            # Find the design directory (e.g., designer/counter/)
-            design_dirs = [d for d in designer_dir.iterdir() if d.is_dir()]
-            if design_dirs:
-                design_dir = design_dirs[0]
-                pr_log = design_dir / f"{design_dir.name}_layout_log.log"
-                if pr_log.exists():
-                    self.parse_pr_log(pr_log)
+        # Synplify report: per-clock timing and its @W/@E messages
+        # (synplify.log may be missing or carry only some of them)
+        srr_files = log_archive.glob(project_dir / "synthesis", "*.srr")
+        if srr_files:
+            self.parse_timing_report(srr_files[0], messages=True)
+
+        # P&R logs: the design directory (e.g., designer/counter/), preferring
+        # the .prjx root design over whichever directory happens to list first
+        if project_dir.is_dir():
+            design_dirs = project_index(project_dir).design_dirs()
+        else:
+            design_dirs = log_archive.subdirs(project_dir / "designer")
+        if design_dirs:
+            design_dir = design_dirs[0]
+            pr_log = design_dir / f"{design_dir.name}_layout_log.log"
+            if log_archive.exists(pr_log):
+                self.parse_pr_log(pr_log)
 
         return self.log
 
+    def _merge_report_messages(self, found: List[LogMessage]):
+        """Add the .srr's Synplify messages not already taken from synplify.log.
+
+        Deduplication is by count: a message seen n times in synplify.log
+        only adds its occurrences beyond n from the report.
+        """
+        seen = Counter((m.level, m.message) for m in self.log.messages if m.stage == "synthesis")
+        for msg in found:
+            key = (msg.level, msg.message)
+            if seen[key]:
+                seen[key] -= 1
+            else:
+                self.log.messages.append(msg)
+
+    @staticmethod
+    def _synplify_message(kind: str, text: str) -> LogMessage:
+        """LogMessage for a Synplify '@E:'/'@W:' line (kind 'E'/'W', text after the colon)."""
+        level = LogLevel.ERROR if kind == 'E' else LogLevel.WARNING
+        return LogMessage(level=level, message=text.strip(), stage="synthesis")
+
     def _extract_synplify_messages(self, content: str):
         """Extract warnings and errors from Synplify log."""
-        for line in content.split('\n'):
-            # Synplify errors: @E: message
-            if re.match(r'@E:', line):
-                self.log.messages.append(LogMessage(
-                    level=LogLevel.ERROR,
-                    message=line.replace('@E:', '').strip()
-                ))
-            # Synplify warnings: @W: message
-            elif re.match(r'@W:', line):
-                self.log.messages.append(LogMessage(
-                    level=LogLevel.WARNING,
-                    message=line.replace('@W:', '').strip()
-                ))
+        # Synplify errors/warnings: @E: message / @W: message
+        self.log.messages.extend(
+            self._synplify_message(kind, text) for kind, text in SYNPLIFY_MESSAGE_RE.findall(content)
+        )
 
     def _extract_synthesis_timing(self, content: str):
         """Extract synthesis timing from log."""
@@ -194,6 +405,144 @@ class LogParser:
             hours, minutes, seconds = map(int, match.groups())
             self.log.metrics.synthesis_time = hours * 3600 + minutes * 60 + seconds
 
+    def _stream_timing_report(self, lines: Iterable[str], messages: Optional[List[LogMessage]] = None):
+        """Extract worst slack, per-clock summary and worst paths from .srr lines.
+
+        When a messages list is given, Synplify @W/@E lines are appended to it.
+        """
+        # Worst slack in design: 5.244
+        #
+        # Starting Clock     Frequency     Frequency     Period        Period        Slack     Type ...
+        # ----------------------------------------------------------------------------------------
+        # clk_50mhz          50.0 MHz      67.8 MHz      20.000        14.756        5.244     declared ...
+        # ========================================================================================
+        # ...
+        # Detailed Report for Clock: clk_50mhz
+        # ...
+        # Path information for path number 1:
+        #     = Required time:                         9.800
+        #     - Propagation time:                      4.556
+        #     = Slack (critical) :                     5.244
+        #     Number of logic level(s):                1
+        #     Starting point:                          led_reg[0] / Q
+        #     Ending point:                            leds[7:0] / leds[0]
+        #     The start point is clocked by            clk_50mhz [rising] ...
+        heap: List[tuple] = []  # (-slack, -order, path); root is the best path kept
+        order = itertools.count()
+        in_report = False
+        summary = rows = False
+        run_time_seen = False
+        clock = ""
+        path: Optional[TimingPath] = None
+
+        def keep(candidate: Optional[TimingPath]):
+            if candidate is None or candidate.slack is None or self.top_paths <= 0:
+                return
+            item = (-candidate.slack, -next(order), candidate)  # ties keep the earlier path
+            if len(heap) < self.top_paths:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+        for line in lines:
+            if messages is not None and line.startswith('@'):
+                match = SYNPLIFY_MESSAGE_RE.match(line)
+                if match:
+                    messages.append(self._synplify_message(*match.groups()))
+                    continue
+            if not in_report:
+                if line.startswith(TIMING_REPORT_START):
+                    in_report = True
+                elif not run_time_seen and 'Run Time:' in line:
+                    run_time_seen = True
+                    self._extract_synthesis_timing(line)
+                continue
+            if line.startswith(TIMING_REPORT_END):
+                in_report = False
+                keep(path)
+                path = None
+                continue
+
+            if path is not None and ':' not in line and 'clocked by' not in line:
+                continue  # path detail table rows
+            stripped = line.strip()
+            if summary:
+                if line.startswith('---'):
+                    rows = True
+                elif rows and (line.startswith('===') or not stripped):
+                    summary = rows = False
+                elif rows:
+                    self._add_clock_row(line)
+                continue
+            if stripped.startswith('Performance Summary'):
+                summary, rows = True, False
+            elif stripped.startswith('Worst slack in design:'):
+                value = stripped.split(':', 1)[1].strip()
+                try:
+                    self.log.worst_slack = float(value)
+                except ValueError:
+                    pass
+            elif stripped.startswith('Detailed Report for Clock:'):
+                keep(path)
+                path = None
+                clock = stripped.split(':', 1)[1].strip()
+            else:
+                header = 'path number' in stripped and PATH_HEADER_RE.match(stripped)
+                if header:
+                    keep(path)
+                    path = TimingPath(clock=clock, end_clock=clock, number=int(header.group(1)))
+                elif path is not None:
+                    self._add_path_field(path, line)
+        keep(path)
+
+        paths = self.log.critical_paths + [item[2] for item in heap]
+        paths.sort(key=lambda p: p.slack)
+        self.log.critical_paths = paths[:self.top_paths]
+
+    def _add_clock_row(self, line: str):
+        """Add one Performance Summary row to clock_timing."""
+        row = CLOCK_ROW_RE.match(line)
+        if row:
+            name = row.group(1)
+            self.log.clock_timing[name] = ClockTiming(
+                name=name,
+                requested_mhz=float(row.group(2)),
+                estimated_mhz=float(row.group(3)),
+                requested_period=float(row.group(4)),
+                estimated_period=float(row.group(5)),
+                slack=float(row.group(6)),
+            )
+
+    @staticmethod
+    def _add_path_field(path: TimingPath, line: str):
+        """Fill a TimingPath from one line of its "Path information" block."""
+        clocked = 'clocked by' in line and CLOCKED_BY_RE.search(line)
+        if clocked:
+            if clocked.group(1) == 'start':
+                path.clock = clocked.group(2)
+            else:
+                path.end_clock = clocked.group(2)
+            return
+        match = PATH_FIELD_RE.match(line)
+        if not match:
+            return
+        key, value = match.groups()
+        try:
+            if key.startswith('Slack'):
+                path.slack = float(value.split()[0])
+            elif key == 'Required time':
+                path.required_time = float(value.split()[0])
+            elif key == 'Propagation time':
+                path.propagation_time = float(value.split()[0])
+            elif key.startswith('Number of logic level'):
+                path.logic_levels = int(value.split()[0])
+            elif key == 'Starting point':
+                path.start = value
+            elif key == 'Ending point':
+                path.end = value
+        except ValueError:
+            pass
+
     def _extract_pr_config(self, content: str):
         """Extract P&R configuration settings."""
         # Check if timing-driven
@@ -271,21 +620,24 @@ class LogParser:
                 msg = line.split(':', 1)[1].strip()
                 self.log.messages.append(LogMessage(
                     level=LogLevel.INFO,
-                    message=msg
+                    message=msg,
+                    stage="place_route"
                 ))
             # WARNING messages
             elif re.match(r'WARNING:', line, re.IGNORECASE):
                 msg = line.split(':', 1)[1].strip()
                 self.log.messages.append(LogMessage(
                     level=LogLevel.WARNING,
-                    message=msg
+                    message=msg,
+                    stage="place_route"
                 ))
             # ERROR messages
             elif re.match(r'ERROR:', line, re.IGNORECASE):
                 msg = line.split(':', 1)[1].strip()
                 self.log.messages.append(LogMessage(
                     level=LogLevel.ERROR,
-                    message=msg
+                    message=msg,
+                    stage="place_route"
                 ))
 
 
@@ -317,6 +669,19 @@ def print_summary(log: ParsedLog):
     print(f"  DFF:   {log.resources.ffs_used:,} / {log.resources.ffs_total:,} ({log.resources.ff_percent:.2f}%)")
     print(f"  I/O:   {log.resources.io_used:,} / {log.resources.io_total:,} ({log.resources.io_percent:.2f}%)")
 
+    # Timing
+    if log.clock_timing:
+        print("\nTIMING (synthesis estimate):")
+        for clock in log.clock_timing.values():
+            print(f"  {'✓' if clock.met else '✗'} {clock.name:<20} {clock.estimated_mhz:>8.1f} MHz"
+                  f" (requested {clock.requested_mhz:.1f} MHz, slack {clock.slack:.3f} ns)")
+
+    if log.critical_paths:
+        print(f"\nCRITICAL PATHS (worst {min(5, len(log.critical_paths))} of {len(log.critical_paths)}):")
+        for path in log.critical_paths[:5]:
+            print(f"  {path.slack:>8.3f} ns  {path.clock:<12} {path.logic_levels:>3} lvl  "
+                  f"{path.start} -> {path.end}")
+
     # Configuration
     print("\nCONFIGURATION:")
     print(f"  Timing-driven P&R: {'✓ ON' if log.timing_driven else '✗ OFF'}")
@@ -326,32 +691,81 @@ def print_summary(log: ParsedLog):
     print("\n" + "=" * 70)
 
 
+def load_log(path: Path) -> ParsedLog:
+    """Parse a project directory or a single log, picking the parser by file name."""
+    parser = LogParser()
+    if path.is_dir() or path.suffix == log_archive.ARCHIVE_SUFFIX:
+        return parser.parse_project(path)
+    if 'synplify' in path.name:
+        return parser.parse_synthesis_log(path)
+    if path.suffix == '.srr':
+        return parser.parse_timing_report(path, messages=True)
+    if 'layout' in path.name:
+        return parser.parse_pr_log(path)
+    print(f"Unknown log type: {path.name}")
+    print("Trying generic parsing...")
+    return parser.parse_pr_log(path)
+
+
+def load_fingerprint_source(path: Path) -> Dict[str, Fingerprint]:
+    """Fingerprints from a stored .json table, a log file or a project directory."""
+    if path.suffix == '.json':
+        return load_fingerprints(path)
+    return fingerprint_messages(load_log(path).messages)
+
+
+def print_diff(deltas: List[MessageDelta], limit: int = 50):
+    """Print new and resolved messages between two builds."""
+    added = [d for d in deltas if d.delta > 0]
+    removed = sorted((d for d in deltas if d.delta < 0), key=lambda d: d.delta)
+    print("\n" + "=" * 70)
+    print("BUILD MESSAGE DIFF")
+    print("=" * 70)
+    print(f"\n{'New/increased:':<20} {len(added)} ({sum(d.delta for d in added):+d} messages)")
+    print(f"{'Resolved/reduced:':<20} {len(removed)} ({sum(d.delta for d in removed):+d} messages)")
+    for title, group in (("NEW", added), ("RESOLVED", removed)):
+        if not group:
+            continue
+        print(f"\n{title}:")
+        for d in group[:limit]:
+            print(f"  {d.delta:+6d}  {d.level:<8} {d.text[:100]}")
+        if len(group) > limit:
+            print(f"  ... and {len(group) - limit} more")
+    print("\n" + "=" * 70)
+
+
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
         print("Usage: python log_parser.py <log_file>")
         print("   or: python log_parser.py --project <project_dir>")
+        print("   or: python log_parser.py fingerprint <log|project_dir> <out.json>")
+        print("   or: python log_parser.py diff <old> <new>")
         sys.exit(1)
 
-    parser = LogParser()
+    if sys.argv[1] in ('fingerprint', 'diff'):
+        if len(sys.argv) < 4:
+            print(f"ERROR: {sys.argv[1]} requires two paths")
+            sys.exit(1)
+        first, second = Path(sys.argv[2]), Path(sys.argv[3])
+        if sys.argv[1] == 'fingerprint':
+            table = fingerprint_messages(load_log(first).messages)
+            save_fingerprints(table, second, str(first))
+            print(f"Wrote {len(table)} fingerprints ({sum(f.count for f in table.values())} messages) to {second}")
+            sys.exit(0)
+        deltas = diff_fingerprints(load_fingerprint_source(first), load_fingerprint_source(second))
+        print_diff(deltas)
+        # Exit code: 1 if new errors, 2 if new warnings, 0 otherwise
+        new_levels = {d.level for d in deltas if d.delta > 0}
+        sys.exit(1 if LogLevel.ERROR.value in new_levels else 2 if LogLevel.WARNING.value in new_levels else 0)
 
     if sys.argv[1] == '--project':
         if len(sys.argv) < 3:
             print("ERROR: --project requires project directory")
             sys.exit(1)
-        project_dir = Path(sys.argv[2])
-        log = parser.parse_project(project_dir)
+        log = load_log(Path(sys.argv[2]))
     else:
-        log_path = Path(sys.argv[1])
-
-        if 'synplify' in log_path.name:
-            log = parser.parse_synthesis_log(log_path)
-        elif 'layout' in log_path.name:
-            log = parser.parse_pr_log(log_path)
-        else:
-            print(f"Unknown log type: {log_path.name}")
-            print("Trying generic parsing...")
-            log = parser.parse_pr_log(log_path)
+        log = load_log(Path(sys.argv[1]))
 
     print_summary(log)
 
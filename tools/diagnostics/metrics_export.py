@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Build Metrics Exporter (OpenMetrics / Prometheus)
+
+Turns what log_parser.py and build_doctor.py compute for a Libero project
+(resource utilization, stage run times, per-clock timing, message counts,
+recommendation counts) into OpenMetrics or Prometheus text exposition
+format, labelled with project, design, stage and Libero tool version.
+
+Two kinds of series are exported:
+    libero_*                gauges describing the latest build of each project
+    libero_build*_total     counters aggregated over every build seen (builds,
+                            messages, recommendations, stage seconds), kept in
+                            a state file so they survive restarts
+
+A build is identified by the names, mtimes and sizes of its logs, so a
+project is only re-parsed when a new build has written them, and each build
+is counted once however often it is exported or scraped.
+
+Output goes to stdout, to a node_exporter textfile-collector file (written
+atomically), or to a local HTTP scrape endpoint that re-checks the projects
+in the background and serves the pre-rendered text.
+
+Usage:
+    python metrics_export.py <project_dir> [<project_dir> ...] [--openmetrics]
+    python metrics_export.py <project_dir> ... --textfile <dir|file.prom>
+    python metrics_export.py serve <project_dir> ... [--port 9464] [--bind 127.0.0.1]
+                                                     [--interval 60]
+
+    Options: --state PATH (counter state), --no-doctor (log metrics only)
+
+A project argument may also be a tree containing several projects (located
+by their .prjx files).
+
+Environment:
+    TCL_MONSTER_METRICS_STATE   counter state file (default <repo>/.metrics_state.json)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from build_doctor import Recommendation, diagnose_project
+from log_parser import LogParser, ParsedLog
+
+# The shared project-tree index lives with the helper scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "scripts"))
+from project_index import find_projects, project_index  # noqa: E402
+
+STATE_VERSION = 1
+DEFAULT_STATE_PATH = Path(__file__).resolve().parent.parent.parent / ".metrics_state.json"
+TEXTFILE_NAME = "tcl_monster_builds.prom"
+DEFAULT_PORT = 9464
+DEFAULT_INTERVAL = 60
+
+# Build ids remembered for counting each build once (oldest forgotten first)
+MAX_SEEN_BUILDS = 10000
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LIBERO_RELEASE_RE = re.compile(r'^Libero (?:Release|Version)\s*:\s*(\S+)', re.MULTILINE)
+
+# Logs whose names, mtimes and sizes identify a build
+BUILD_LOG_KINDS = ("synthesis_log", "synthesis_report", "layout_log", "log_archive")
+
+# name -> (type, help); counter names omit the _total suffix
+METRICS: Dict[str, Tuple[str, str]] = {
+    "libero_build_info": ("gauge", "Latest build of the project (value is always 1)"),
+    "libero_build_timestamp_seconds": ("gauge", "Modification time of the newest build log"),
+    "libero_stage_duration_seconds": ("gauge", "Tool run time of the latest build per stage"),
+    "libero_resource_used": ("gauge", "Fabric resources used after place and route"),
+    "libero_resource_available": ("gauge", "Fabric resources available on the device"),
+    "libero_resource_utilization_ratio": ("gauge", "Used over available fabric resources"),
+    "libero_clock_requested_hertz": ("gauge", "Requested clock frequency"),
+    "libero_clock_estimated_hertz": ("gauge", "Synthesis estimate of the achievable clock frequency"),
+    "libero_clock_slack_seconds": ("gauge", "Synthesis estimate of the clock slack"),
+    "libero_worst_slack_seconds": ("gauge", "Worst slack of the synthesis timing report"),
+    "libero_timing_constraints_present": ("gauge", "Whether timing constraints were found (1/0)"),
+    "libero_pr_option_enabled": ("gauge", "Place and route options of the latest build (1/0)"),
+    "libero_messages": ("gauge", "Log messages of the latest build"),
+    "libero_recommendations": ("gauge", "Build doctor recommendations for the latest build"),
+    "libero_builds": ("counter", "Builds exported"),
+    "libero_build_messages": ("counter", "Log messages over all exported builds"),
+    "libero_build_recommendations": ("counter", "Build doctor recommendations over all exported builds"),
+    "libero_build_stage_seconds": ("counter", "Tool run time over all exported builds"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass
+class MetricFamily:
+    """One metric and its samples, keyed by sorted label pairs."""
+    name: str
+    type: str  # gauge, counter
+    help: str
+    samples: Dict[Labels, float] = field(default_factory=dict)
+
+
+class MetricsRegistry:
+    """Metric families in declaration order, rendered as exposition text."""
+
+    def __init__(self):
+        self.families: Dict[str, MetricFamily] = {}
+
+    def _family(self, name: str) -> MetricFamily:
+        family = self.families.get(name)
+        if family is None:
+            type_, help_ = METRICS[name]
+            family = self.families[name] = MetricFamily(name, type_, help_)
+        return family
+
+    def set(self, name: str, value: float, labels: Dict[str, str]):
+        self._family(name).samples[_label_key(labels)] = float(value)
+
+    def inc(self, name: str, value: float, labels: Dict[str, str]):
+        samples = self._family(name).samples
+        key = _label_key(labels)
+        samples[key] = samples.get(key, 0.0) + value
+
+    def render(self, openmetrics: bool = True) -> str:
+        """OpenMetrics 1.0 text, or Prometheus 0.0.4 text for the textfile collector."""
+        lines = []
+        for name in sorted(self.families, key=list(METRICS).index):
+            family = self.families[name]
+            if not family.samples:
+                continue
+            sample_name = f"{name}_total" if family.type == "counter" else name
+            lines.append(f"# HELP {name if openmetrics else sample_name} {family.help}")
+            lines.append(f"# TYPE {name if openmetrics else sample_name} {family.type}")
+            for labels, value in sorted(family.samples.items()):
+                rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{sample_name}{{{rendered}}} {_format_value(value)}"
+                             if rendered else f"{sample_name} {_format_value(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _label_key(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_value(value: float) -> str:
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+@dataclass
+class BuildSnapshot:
+    """Parsed results of one project's latest build."""
+    project_dir: Path
+    labels: Dict[str, str]   # project, design, tool_version
+    build_id: str
+    built_at: float
+    log: ParsedLog
+    recommendations: List[Recommendation] = field(default_factory=list)
+
+
+def libero_release(project_dir: Path) -> str:
+    """Libero release from libero_setup_info.txt ('' if unknown)."""
+    try:
+        text = (project_dir / "libero_setup_info.txt").read_text(encoding='utf-8', errors='ignore')
+    except OSError:
+        return ""
+    match = LIBERO_RELEASE_RE.search(text)
+    return match.group(1) if match else ""
+
+
+def build_signature(project_dir: Path, refresh: bool = False) -> Optional[Tuple[str, float]]:
+    """(build id, newest log mtime) of a project, None if it has no build logs."""
+    index = project_index(project_dir, refresh=refresh)
+    stamps = []
+    for kind in BUILD_LOG_KINDS:
+        for path in index.files(kind):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            stamps.append((path.relative_to(project_dir).as_posix(), st.st_mtime_ns, st.st_size))
+    if not stamps:
+        return None
+    digest = hashlib.sha256(f"{project_dir.resolve()}\n{sorted(stamps)}".encode()).hexdigest()[:24]
+    return digest, max(s[1] for s in stamps) / 1e9
+
+
+def collect_build(project_dir: Path, signature: Tuple[str, float], doctor: bool = True) -> BuildSnapshot:
+    """Parse a project's logs (and run the build doctor) for export."""
+    # The parsers report progress on stdout, which may be carrying the metrics
+    with redirect_stdout(sys.stderr):
+        if doctor:
+            log, build_doctor = diagnose_project(project_dir)
+            recommendations = build_doctor.recommendations
+        else:
+            log, recommendations = LogParser().parse_project(project_dir), []
+
+    index = project_index(project_dir)
+    design_dirs = index.design_dirs()
+    design = index.root_design or (design_dirs[0].name if design_dirs else "")
+    labels = {"project": project_dir.name, "design": design, "tool_version": libero_release(project_dir)}
+    return BuildSnapshot(project_dir=project_dir, labels=labels, build_id=signature[0],
+                         built_at=signature[1], log=log, recommendations=recommendations)
+
+
+def stage_durations(log: ParsedLog) -> Dict[str, float]:
+    metrics = log.metrics
+    durations = {"synthesis": metrics.synthesis_time,
+                 "place_route": metrics.placement_time + metrics.routing_time}
+    return {stage: seconds for stage, seconds in durations.items() if seconds}
+
+
+def add_snapshot_metrics(registry: MetricsRegistry, snapshot: BuildSnapshot):
+    """Gauges describing one project's latest build."""
+    log = snapshot.log
+    base = snapshot.labels
+    registry.set("libero_build_info", 1, dict(base, build_id=snapshot.build_id))
+    registry.set("libero_build_timestamp_seconds", snapshot.built_at, base)
+
+    for stage, seconds in stage_durations(log).items():
+        registry.set("libero_stage_duration_seconds", seconds, dict(base, stage=stage))
+
+    res = log.resources
+    pr = dict(base, stage="place_route")
+    for resource, used, total in (("lut", res.luts_used, res.luts_total), ("ff", res.ffs_used, res.ffs_total),
+                                  ("io", res.io_used, res.io_total),
+                                  ("ram", res.ram_blocks_used, res.ram_blocks_total),
+                                  ("math", res.math_blocks_used, res.math_blocks_total)):
+        if not total:
+            continue
+        labels = dict(pr, resource=resource)
+        registry.set("libero_resource_used", used, labels)
+        registry.set("libero_resource_available", total, labels)
+        registry.set("libero_resource_utilization_ratio", used / total, labels)
+
+    syn = dict(base, stage="synthesis")
+    for clock in log.clock_timing.values():
+        labels = dict(syn, clock=clock.name)
+        registry.set("libero_clock_requested_hertz", clock.requested_mhz * 1e6, labels)
+        registry.set("libero_clock_estimated_hertz", clock.estimated_mhz * 1e6, labels)
+        registry.set("libero_clock_slack_seconds", clock.slack * 1e-9, labels)
+    if log.worst_slack is not None:
+        registry.set("libero_worst_slack_seconds", log.worst_slack * 1e-9, syn)
+    registry.set("libero_timing_constraints_present", int(log.has_timing_constraints), base)
+    registry.set("libero_pr_option_enabled", int(log.timing_driven), dict(pr, option="timing_driven"))
+    registry.set("libero_pr_option_enabled", int(log.power_driven), dict(pr, option="power_driven"))
+
+    for (stage, level), count in message_counts(log).items():
+        registry.set("libero_messages", count, dict(base, stage=stage, level=level))
+    for (severity, category), count in recommendation_counts(snapshot.recommendations).items():
+        registry.set("libero_recommendations", count, dict(base, severity=severity, category=category))
+
+
+def message_counts(log: ParsedLog) -> Dict[Tuple[str, str], int]:
+    counts: Dict[Tuple[str, str], int] = {}
+    for message in log.messages:
+        key = (message.stage or "unknown", message.level.value.lower())
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def recommendation_counts(recommendations: Iterable[Recommendation]) -> Dict[Tuple[str, str], int]:
+    counts: Dict[Tuple[str, str], int] = {}
+    for rec in recommendations:
+        key = (rec.severity.lower(), rec.category.lower())
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+class MetricsState:
+    """Counters aggregated over builds, persisted between runs."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or os.environ.get("TCL_MONSTER_METRICS_STATE") or DEFAULT_STATE_PATH)
+        self.counters = MetricsRegistry()
+        self.seen: Dict[str, float] = {}   # build id -> time first counted
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Ignoring unreadable metrics state {self.path}: {e}", file=sys.stderr)
+            return
+        if data.get('version') != STATE_VERSION:
+            return
+        for name, labels, value in data.get('counters', []):
+            if name in METRICS:
+                self.counters.inc(name, value, labels)
+        self.seen = data.get('seen', {})
+
+    def save(self):
+        counters = [[name, dict(labels), value]
+                    for name, family in self.counters.families.items()
+                    for labels, value in family.samples.items()]
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'version': STATE_VERSION, 'counters': counters, 'seen': self.seen}, f,
+                      separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+    def record(self, snapshot: BuildSnapshot) -> bool:
+        """Count a build unless it was counted before. Returns whether it was new."""
+        if snapshot.build_id in self.seen:
+            return False
+        self.seen[snapshot.build_id] = time.time()
+        if len(self.seen) > MAX_SEEN_BUILDS:
+            for build_id in sorted(self.seen, key=self.seen.get)[:len(self.seen) - MAX_SEEN_BUILDS]:
+                del self.seen[build_id]
+
+        log = snapshot.log
+        base = snapshot.labels
+        result = "failed" if log.has_errors else "ok"
+        self.counters.inc("libero_builds", 1, dict(base, result=result))
+        for (stage, level), count in message_counts(log).items():
+            self.counters.inc("libero_build_messages", count, dict(base, stage=stage, level=level))
+        for (severity, _), count in recommendation_counts(snapshot.recommendations).items():
+            self.counters.inc("libero_build_recommendations", count, dict(base, severity=severity))
+        for stage, seconds in stage_durations(log).items():
+            self.counters.inc("libero_build_stage_seconds", seconds, dict(base, stage=stage))
+        return True
+
+
+class MetricsExporter:
+    """Latest-build gauges and aggregated counters for a set of projects."""
+
+    def __init__(self, projects: List[Path], state: MetricsState, doctor: bool = True):
+        self.projects = projects
+        self.state = state
+        self.doctor = doctor
+        self.snapshots: Dict[Path, BuildSnapshot] = {}
+        # Rendered text per format, replaced as a whole so scrapes never see a partial update
+        self.rendered: Dict[bool, str] = {True: "# EOF\n", False: ""}
+
+    def refresh(self, rescan: bool = False) -> int:
+        """Re-parse projects with a new build. Returns the number of new builds."""
+        new_builds = 0
+        for project_dir in self.projects:
+            signature = build_signature(project_dir, refresh=rescan)
+            if signature is None:
+                self.snapshots.pop(project_dir, None)
+                continue
+            current = self.snapshots.get(project_dir)
+            if current is not None and current.build_id == signature[0]:
+                continue
+            try:
+                snapshot = collect_build(project_dir, signature, self.doctor)
+            except Exception as e:  # one broken project must not stop the exporter
+                print(f"WARNING: {project_dir}: {e}", file=sys.stderr)
+                continue
+            self.snapshots[project_dir] = snapshot
+            if self.state.record(snapshot):
+                new_builds += 1
+
+        if new_builds:
+            try:
+                self.state.save()
+            except OSError as e:
+                print(f"WARNING: Could not save metrics state: {e}", file=sys.stderr)
+        registry = self.registry()
+        self.rendered = {True: registry.render(openmetrics=True), False: registry.render(openmetrics=False)}
+        return new_builds
+
+    def registry(self) -> MetricsRegistry:
+        registry = MetricsRegistry()
+        for project_dir in sorted(self.snapshots):
+            add_snapshot_metrics(registry, self.snapshots[project_dir])
+        for name, family in self.state.counters.families.items():
+            registry.families[name] = family
+        return registry
+
+
+def write_textfile(text: str, target: Path) -> Path:
+    """Write a textfile-collector file atomically (node_exporter reads *.prom)."""
+    path = target / TEXTFILE_NAME if target.is_dir() else target
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, 'w') as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return path
+
+
+def serve(exporter: MetricsExporter, bind: str, port: int, interval: float):
+    """Serve /metrics, re-checking the projects every interval seconds."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+            body = exporter.rendered[openmetrics].encode()
+            self.send_response(200)
+            self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scraped every few seconds; not worth a line each
+
+    def refresh_loop():
+        while True:
+            time.sleep(interval)
+            new_builds = exporter.refresh(rescan=True)
+            if new_builds:
+                print(f"Exported {new_builds} new build(s)", file=sys.stderr)
+
+    threading.Thread(target=refresh_loop, daemon=True).start()
+    server = ThreadingHTTPServer((bind, port), Handler)
+    print(f"Serving metrics for {len(exporter.projects)} project(s) on http://{bind}:{port}/metrics",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    args = sys.argv[1:]
+
+    def pop_option(name: str, default=None):
+        if name in args:
+            i = args.index(name)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        return default
+
+    def pop_flag(name: str) -> bool:
+        if name in args:
+            args.remove(name)
+            return True
+        return False
+
+    textfile = pop_option('--textfile')
+    state_path = pop_option('--state')
+    port = int(pop_option('--port', DEFAULT_PORT))
+    bind = pop_option('--bind', '127.0.0.1')
+    interval = float(pop_option('--interval', DEFAULT_INTERVAL))
+    openmetrics = pop_flag('--openmetrics')
+    doctor = not pop_flag('--no-doctor')
+    serving = bool(args) and args[0] == 'serve'
+    if serving:
+        args = args[1:]
+
+    if not args:
+        print("Usage: python metrics_export.py <project_dir> [...] [--openmetrics] [--textfile <dir|file>]")
+        print("   or: python metrics_export.py serve <project_dir> [...] [--port 9464] [--bind 127.0.0.1]"
+              " [--interval 60]")
+        print("       [--state PATH] [--no-doctor]")
+        sys.exit(1)
+    missing = [a for a in args if not Path(a).is_dir()]
+    if missing:
+        print(f"ERROR: Project directory not found: {', '.join(missing)}")
+        sys.exit(1)
+    projects = find_projects(Path(a) for a in args)
+    if not projects:
+        print("ERROR: No Libero projects (.prjx) found")
+        sys.exit(1)
+
+    exporter = MetricsExporter(projects, MetricsState(Path(state_path) if state_path else None), doctor)
+    new_builds = exporter.refresh()
+    if serving:
+        serve(exporter, bind, port, interval)
+    elif textfile:
+        path = write_textfile(exporter.rendered[openmetrics], Path(textfile))
+        print(f"Wrote {path} ({len(exporter.snapshots)} project(s), {new_builds} new build(s))", file=sys.stderr)
+    else:
+        sys.stdout.write(exporter.rendered[openmetrics])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Synplify Netlist Statistics
+
+Streams a post-synthesis Verilog netlist (synthesis/<design>.vm) and reports:
+- Primitive instance counts (SLE, CFG1-4, ARI1, RAM1K20, RAM64X12, MACC_PA, ...)
+- A per-module hierarchy tally (direct cells and rolled-up totals per instance)
+- A fanout histogram and the highest-fanout nets
+
+The netlist is read line by line and parsed one statement at a time, so a
+multi-hundred-MB triplicated MI-V netlist never has to fit in memory. Only
+per-module cell counters and the net load counters of the module currently
+being read are kept.
+
+Usage:
+    python netlist_stats.py <netlist.vm>
+    python netlist_stats.py <project_dir>            # finds synthesis/*.vm
+    python netlist_stats.py <netlist.vm> --depth 2 --json
+"""
+
+import heapq
+import json
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Resource groups reported by the Synplify hier_area report
+PRIMITIVE_GROUPS = {
+    "SLE": "SLE",
+    "CFG1": "CFG", "CFG2": "CFG", "CFG3": "CFG", "CFG4": "CFG",
+    "ARI1": "ARI1",
+    "RAM1K20": "RAM1K20",
+    "RAM64X12": "RAM64X12",
+    "MACC_PA": "MACC_PA",
+    "CLKINT": "GLOBAL", "RGB": "GLOBAL", "GB": "GLOBAL", "ICB_CLKINT": "GLOBAL",
+    "INBUF": "IO", "OUTBUF": "IO", "BIBUF": "IO", "TRIBUFF": "IO",
+    "INBUF_DIFF": "IO", "OUTBUF_DIFF": "IO", "BIBUF_DIFF": "IO",
+}
+
+# Cells that are not resources
+CONSTANT_CELLS = ("VCC", "GND")
+
+# Output pins of the PolarFire primitives; every other pin is a load
+OUTPUT_PINS = frozenset((
+    "Y", "Q", "S", "FCO", "P", "CDOUT", "OVFL_CARRYOUT",
+    "A_DOUT", "B_DOUT", "R_DATA", "ACCESS_BUSY", "DB_DETECT", "SB_CORRECT",
+))
+
+DECLARATIONS = frozenset((
+    "wire", "reg", "tri", "supply0", "supply1", "parameter", "localparam",
+    "defparam", "integer", "genvar",
+))
+DIRECTIONS = frozenset(("input", "output", "inout"))
+
+CONSTANT_NETS = frozenset(("VCC", "GND"))
+
+INSTANCE_RE = re.compile(r'^(\\\S+|[A-Za-z_][\w$]*)\s*(?:#\s*\(.*?\)\s*)?(\\\S+\s|[A-Za-z_][\w$]*)\s*\((.*)\)\s*$',
+                         re.DOTALL)
+PIN_RE = re.compile(r'\.(\w+)\s*\(\s*(.*?)\s*\)\s*(?:,|$)', re.DOTALL)
+NET_RE = re.compile(r'\\\S+\s?|[A-Za-z_][\w$.]*(?:\s*\[[^\]]*\])?')
+MODULE_RE = re.compile(r'^module\s+(\\\S+|[\w$]+)')
+
+TOP_NETS = 10
+
+
+def fanout_bucket(fanout: int) -> str:
+    """Power-of-two histogram bucket label: 1, 2, 3-4, 5-8, 9-16, ..."""
+    if fanout <= 2:
+        return str(fanout)
+    high = 1 << (fanout - 1).bit_length()
+    return f"{high // 2 + 1}-{high}"
+
+
+def _bucket_order(label: str) -> int:
+    return int(label.split('-')[-1])
+
+
+@dataclass
+class ModuleStats:
+    """Cells and child instances of one module definition."""
+    name: str
+    cells: Counter = field(default_factory=Counter)
+    instances: List[Tuple[str, str]] = field(default_factory=list)  # (instance, module)
+    ports: Dict[str, str] = field(default_factory=dict)             # port -> direction
+    nets: int = 0
+
+
+@dataclass
+class NetlistStats:
+    """Result of one netlist scan."""
+    file: str
+    modules: Dict[str, ModuleStats] = field(default_factory=dict)
+    top: Optional[str] = None
+    fanout_histogram: Counter = field(default_factory=Counter)
+    top_nets: List[Tuple[int, str, str]] = field(default_factory=list)  # (fanout, module, net)
+    lines: int = 0
+    _totals: Dict[str, Counter] = field(default_factory=dict, repr=False)
+
+    def totals(self, module: Optional[str] = None) -> Counter:
+        """Primitive counts of a module including everything below it."""
+        module = module or self.top
+        if module in self._totals:
+            return self._totals[module]
+
+        stats = self.modules.get(module)
+        if stats is None:
+            return Counter()
+
+        # Iterative post-order so deep hierarchies do not hit the recursion limit
+        stack = [(module, False)]
+        while stack:
+            name, expanded = stack.pop()
+            if name in self._totals:
+                continue
+            mod = self.modules[name]
+            children = [t for _, t in mod.instances if t in self.modules and t not in self._totals]
+            if not expanded and children:
+                stack.append((name, True))
+                stack.extend((c, False) for c in children)
+                continue
+            total = Counter(mod.cells)
+            for _, child in mod.instances:
+                total.update(self._totals.get(child, ()))
+            self._totals[name] = total
+        return self._totals[module]
+
+    @property
+    def primitives(self) -> Counter:
+        """Flattened primitive counts for the whole design."""
+        return self.totals()
+
+    def groups(self, counts: Optional[Counter] = None) -> Counter:
+        """Collapse cell types into the hier_area report columns."""
+        grouped = Counter()
+        for cell, n in (self.primitives if counts is None else counts).items():
+            if cell in CONSTANT_CELLS:
+                continue
+            grouped[PRIMITIVE_GROUPS.get(cell, cell)] += n
+        return grouped
+
+    def instance_tally(self, depth: int = 1) -> Dict[str, Counter]:
+        """Rolled-up primitive counts per hierarchical instance path down to depth."""
+        tally = {}
+        if not self.top:
+            return tally
+        frontier = [("", self.top)]
+        for _ in range(depth):
+            next_frontier = []
+            for path, module in frontier:
+                for inst, child in self.modules[module].instances:
+                    if child not in self.modules:
+                        continue
+                    inst_path = f"{path}/{inst}" if path else inst
+                    tally[inst_path] = self.totals(child)
+                    next_frontier.append((inst_path, child))
+            frontier = next_frontier
+        return tally
+
+
+def iter_statements(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Yield (line, statement) from Verilog source with comments removed.
+
+    Statements end at ';'. 'endmodule' is yielded as its own statement.
+    """
+    in_comment = False
+    buffer: List[str] = []
+    start = 0
+
+    for number, line in enumerate(lines, 1):
+        # Strip /* */ (possibly multi-line) and // comments
+        if in_comment or '/*' in line:
+            out = []
+            pos = 0
+            while pos < len(line):
+                if in_comment:
+                    end = line.find('*/', pos)
+                    if end < 0:
+                        pos = len(line)
+                        break
+                    in_comment = False
+                    pos = end + 2
+                else:
+                    begin = line.find('/*', pos)
+                    if begin < 0:
+                        out.append(line[pos:])
+                        break
+                    out.append(line[pos:begin])
+                    in_comment = True
+                    pos = begin + 2
+            line = ''.join(out)
+        if '//' in line:
+            line = line.split('//', 1)[0]
+
+        text = line.strip()
+        if not text or text[0] == '`':
+            continue
+
+        if not buffer and text.startswith('endmodule'):
+            yield number, 'endmodule'
+            continue
+
+        while text:
+            if not buffer:
+                start = number
+            semi = text.find(';')
+            if semi < 0:
+                buffer.append(text)
+                break
+            buffer.append(text[:semi])
+            yield start, ' '.join(buffer).strip()
+            buffer = []
+            text = text[semi + 1:].strip()
+            if text.startswith('endmodule'):
+                yield number, 'endmodule'
+                text = text[len('endmodule'):].strip()
+
+
+def _nets(expr: str) -> List[str]:
+    """Net references in a connection expression (constants dropped)."""
+    expr = expr.strip()
+    if not expr:
+        return []
+    if expr[0] == '{':
+        expr = expr.strip('{}')
+    return [n.strip() for n in NET_RE.findall(expr)
+            if n.strip() not in CONSTANT_NETS and "'" not in n]
+
+
+class NetlistScanner:
+    """Single-pass streaming scanner for Synplify .vm netlists."""
+
+    def __init__(self, top_nets: int = TOP_NETS):
+        self.top_nets = top_nets
+
+    def scan(self, path: Path) -> NetlistStats:
+        path = Path(path)
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return self.scan_lines(f, str(path))
+
+    def scan_lines(self, lines: Iterable[str], file: str = "") -> NetlistStats:
+        stats = NetlistStats(file=file)
+        module: Optional[ModuleStats] = None
+        loads: Counter = Counter()
+        counted = 0
+
+        def count_lines(source):
+            nonlocal counted
+            for line in source:
+                counted += 1
+                yield line
+
+        for _, statement in iter_statements(count_lines(lines)):
+            if statement == 'endmodule':
+                if module is not None:
+                    self._close_module(stats, module, loads)
+                    stats.top = module.name
+                module = None
+                loads = Counter()
+                continue
+
+            keyword = statement.split(None, 1)[0]
+
+            if keyword == 'module':
+                match = MODULE_RE.match(statement)
+                module = ModuleStats(name=match.group(1).strip() if match else f"module_{len(stats.modules)}")
+                stats.modules[module.name] = module
+                continue
+
+            if module is None:
+                continue
+
+            if keyword in DIRECTIONS:
+                decl = statement[len(keyword):]
+                decl = re.sub(r'\[[^\]]*\]|\b(wire|reg|signed)\b', ' ', decl)
+                for name in decl.split(','):
+                    if name.strip():
+                        module.ports[name.strip()] = keyword
+                continue
+
+            if keyword in DECLARATIONS:
+                continue
+
+            if keyword == 'assign':
+                _, _, rhs = statement.partition('=')
+                loads.update(_nets(rhs))
+                continue
+
+            match = INSTANCE_RE.match(statement)
+            if not match:
+                continue
+            cell, inst, connections = match.groups()
+            cell, inst = cell.strip(), inst.strip()
+
+            child = stats.modules.get(cell)
+            if child is not None:
+                module.instances.append((inst, cell))
+            else:
+                module.cells[cell] += 1
+
+            for pin, expr in PIN_RE.findall(connections):
+                if child is not None:
+                    if child.ports.get(pin, 'input') != 'input':
+                        continue
+                elif pin in OUTPUT_PINS:
+                    continue
+                loads.update(_nets(expr))
+
+        if module is not None:
+            self._close_module(stats, module, loads)
+            stats.top = module.name
+
+        # Top module = defined but never instantiated (Synplify writes it last)
+        instantiated = {t for m in stats.modules.values() for _, t in m.instances}
+        roots = [name for name in stats.modules if name not in instantiated]
+        if roots:
+            stats.top = roots[-1]
+
+        stats.top_nets.sort(reverse=True)
+        stats.lines = counted
+        return stats
+
+    def _close_module(self, stats: NetlistStats, module: ModuleStats, loads: Counter):
+        """Fold the module's net loads into the histogram and drop them."""
+        module.nets = len(loads)
+        histogram = stats.fanout_histogram
+        heap = stats.top_nets
+        for net, fanout in loads.items():
+            histogram[fanout_bucket(fanout)] += 1
+            item = (fanout, module.name, net)
+            if len(heap) < self.top_nets:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+
+def find_netlist(project_dir: Path) -> Optional[Path]:
+    """Find synthesis/<design>.vm in a Libero project."""
+    synthesis_dir = Path(project_dir) / "synthesis"
+    if not synthesis_dir.is_dir():
+        return None
+    netlists = sorted(synthesis_dir.glob("*.vm"), key=lambda p: p.stat().st_size, reverse=True)
+    return netlists[0] if netlists else None
+
+
+def print_summary(stats: NetlistStats, depth: int = 1):
+    """Print primitive counts, hierarchy tally and fanout histogram."""
+    print("\n" + "=" * 70)
+    print("NETLIST SUMMARY")
+    print("=" * 70)
+    print(f"\n{'Netlist:':<12} {stats.file}")
+    print(f"{'Top:':<12} {stats.top}")
+    print(f"{'Modules:':<12} {len(stats.modules)}")
+    print(f"{'Lines:':<12} {stats.lines:,}")
+
+    print("\nPRIMITIVES:")
+    for cell, n in sorted(stats.primitives.items(), key=lambda kv: (-kv[1], kv[0])):
+        if cell not in CONSTANT_CELLS:
+            print(f"  {cell:<14} {n:>10,}")
+
+    tally = stats.instance_tally(depth)
+    if tally:
+        columns = ["SLE", "CFG", "ARI1", "RAM1K20", "RAM64X12", "MACC_PA"]
+        print("\nHIERARCHY:")
+        print(f"  {'Instance':<40}" + "".join(f"{c:>10}" for c in columns))
+        for path, counts in sorted(tally.items()):
+            grouped = stats.groups(counts)
+            indent = "  " * path.count('/')
+            print(f"  {indent + path.rsplit('/', 1)[-1]:<40}" + "".join(f"{grouped[c]:>10,}" for c in columns))
+
+    print("\nFANOUT HISTOGRAM:")
+    for label in sorted(stats.fanout_histogram, key=_bucket_order):
+        print(f"  {label:>10}  {stats.fanout_histogram[label]:>10,}")
+
+    if stats.top_nets:
+        print("\nHIGHEST FANOUT NETS:")
+        for fanout, module, net in stats.top_nets:
+            print(f"  {fanout:>8,}  {module}: {net}")
+    print("\n" + "=" * 70)
+
+
+def main():
+    """Main entry point."""
+    args = sys.argv[1:]
+    as_json = '--json' in args
+    depth = 1
+    if '--depth' in args:
+        depth = int(args[args.index('--depth') + 1])
+        del args[args.index('--depth'):args.index('--depth') + 2]
+    args = [a for a in args if not a.startswith('--')]
+
+    if not args:
+        print("Usage: python netlist_stats.py <netlist.vm | project_dir> [--depth N] [--json]")
+        sys.exit(1)
+
+    path = Path(args[0])
+    if path.is_dir():
+        netlist = find_netlist(path)
+        if netlist is None:
+            print(f"ERROR: No synthesis/*.vm netlist in {path}")
+            sys.exit(1)
+        path = netlist
+    if not path.exists():
+        print(f"ERROR: Netlist not found: {path}")
+        sys.exit(1)
+
+    stats = NetlistScanner().scan(path)
+
+    if as_json:
+        print(json.dumps({
+            "file": stats.file,
+            "top": stats.top,
+            "primitives": dict(stats.primitives),
+            "groups": dict(stats.groups()),
+            "hierarchy": {p: dict(c) for p, c in stats.instance_tally(depth).items()},
+            "fanout_histogram": dict(stats.fanout_histogram),
+            "top_nets": [{"fanout": f, "module": m, "net": n} for f, m, n in stats.top_nets],
+        }, indent=2))
+    else:
+        print_summary(stats, depth)
+
+
+if __name__ == '__main__':
+    main()
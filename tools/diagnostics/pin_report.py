@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Libero Pin Report Loader
+
+Loads <design>_pinrpt_*.csv files (1,000+ rows x 24 columns on an MPF300
+FCG1152) into a compact columnar table:
+
+- The multi-row "Device Selection" preamble is skipped and kept as metadata
+- Low-cardinality text columns (Bank, State, I/O Std, ...) are dictionary
+  encoded into array('B') code vectors; high-cardinality ones into array('H')
+- Numeric columns (Odt Value, Output Drive, Output Load, ...) are array('d'),
+  NaN where the report has "---"
+
+Queries work on whole columns at once. An equality filter on an 8-bit
+column is a single bytes.translate() call, and masks are combined as
+big integers, so a bank/IO-standard audit of a full package takes a few
+milliseconds.
+
+Usage:
+    python pin_report.py <pinrpt.csv>              # summary + bank audit
+    python pin_report.py <pinrpt.csv> --json
+    python pin_report.py diff <old.csv> <new.csv>  # pinout changes between builds
+"""
+
+import csv
+import json
+import math
+import re
+import sys
+from array import array
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from itertools import compress
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+
+UNUSED = "---"
+
+NUMERIC_COLUMNS = (
+    "Odt Value (Ohm)",
+    "Output Drive (mA)",
+    "Impedance (ohm)",
+    "Output Load (pF)",
+    "Source Termination (Ohm)",
+)
+
+RESERVED_STATES = ("Reserved", "User Reserved")
+
+# Voltage encoded in the standard name: LVCMOS18 -> 1.8, SSTL135 -> 1.35
+IO_STD_VOLTAGE_RE = re.compile(r'(\d)(\d{1,2})(?:_\w+)?$')
+VOLTAGE_RE = re.compile(r'(\d\.\d+)v', re.IGNORECASE)
+VDDI_RE = re.compile(r'^VDDI(\d+)$')
+
+# HSIO banks only support 1.8 V and below
+HSIO_MAX_VOLTAGE = 1.8
+
+_NOT_TABLE = bytes([1]) + bytes(255)
+
+
+def io_std_voltage(io_std: Optional[str]) -> Optional[float]:
+    """Return the VDDI voltage an I/O standard needs, or None if unknown."""
+    if not io_std or io_std == UNUSED:
+        return None
+    std = io_std.upper()
+    if std.startswith("LVTTL"):
+        return 3.3
+    match = IO_STD_VOLTAGE_RE.search(std)
+    if not match:
+        return None
+    return float(f"{match.group(1)}.{match.group(2)}")
+
+
+@dataclass
+class PinAssignment:
+    """One row of a pin report."""
+    pin: str
+    port: Optional[str]
+    function: str
+    bank: Optional[str]
+    state: str
+    io_std: Optional[str]
+    direction: Optional[str]
+    board_layout: str = ""
+
+
+class CodedColumn:
+    """Dictionary-encoded text column. Code 0 is always the missing value."""
+
+    def __init__(self, values: List[str]):
+        self.categories: List[Optional[str]] = [None]
+        self.lookup: Dict[str, int] = {}
+        lookup = self.lookup
+        lookup[""] = lookup[UNUSED] = 0
+        for value in set(values):
+            if value not in lookup:
+                lookup[value] = len(self.categories)
+                self.categories.append(value)
+        codes = [lookup[v] for v in values]
+        del lookup[""], lookup[UNUSED]
+        self.codes = array('B' if len(self.categories) <= 256 else 'H', codes)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i) -> Optional[str]:
+        return self.categories[self.codes[i]]
+
+    def decode(self) -> List[Optional[str]]:
+        categories = self.categories
+        return [categories[c] for c in self.codes]
+
+    def mask(self, values: Iterable[Optional[str]]) -> bytes:
+        """1 for every row whose value is in values, else 0."""
+        wanted = {0 if v is None else self.lookup.get(v, -1) for v in values}
+        if self.codes.typecode == 'B':
+            table = bytes(1 if i in wanted else 0 for i in range(256))
+            return self.codes.tobytes().translate(table)
+        return bytes(1 if c in wanted else 0 for c in self.codes)
+
+
+def mask_and(*masks: bytes) -> bytes:
+    length = len(masks[0])
+    result = int.from_bytes(masks[0], 'little')
+    for m in masks[1:]:
+        result &= int.from_bytes(m, 'little')
+    return result.to_bytes(length, 'little')
+
+
+def mask_or(*masks: bytes) -> bytes:
+    length = len(masks[0])
+    result = 0
+    for m in masks:
+        result |= int.from_bytes(m, 'little')
+    return result.to_bytes(length, 'little')
+
+
+def mask_not(mask: bytes) -> bytes:
+    return mask.translate(_NOT_TABLE)
+
+
+@dataclass
+class BankSummary:
+    """I/O standards and VDDI of one bank."""
+    bank: str
+    hsio: bool = False
+    vddi: List[float] = field(default_factory=list)
+    io_stds: Dict[str, int] = field(default_factory=dict)
+    voltages: Dict[float, List[str]] = field(default_factory=dict)
+    conflicts: List[str] = field(default_factory=list)
+
+    @property
+    def consistent(self) -> bool:
+        return not self.conflicts
+
+
+@dataclass
+class PinoutDiff:
+    """Pinout changes between two pin reports."""
+    added: Dict[str, str] = field(default_factory=dict)      # port -> pin
+    removed: Dict[str, str] = field(default_factory=dict)    # port -> pin
+    moved: Dict[str, List[str]] = field(default_factory=dict)    # port -> [old, new]
+    changed: Dict[str, Dict[str, List[Optional[str]]]] = field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.moved or self.changed)
+
+
+class PinTable:
+    """Columnar pin report."""
+
+    def __init__(self, header: List[str], rows: List[List[str]],
+                 device: Optional[Dict[str, str]] = None, path: str = ""):
+        self.path = path
+        self.device = device or {}
+        self.header = header
+        self.columns: Dict[str, object] = {}
+        self._indexes: Dict[str, Dict[str, int]] = {}
+
+        width = len(header)
+        rows = [r if len(r) == width else (r + [""] * width)[:width] for r in rows]
+        transposed = list(zip(*rows)) if rows else [()] * width
+
+        for name, values in zip(header, transposed):
+            if name in NUMERIC_COLUMNS:
+                self.columns[name] = array('d', (_to_float(v) for v in values))
+            else:
+                self.columns[name] = CodedColumn(values)
+
+        self.length = len(rows)
+
+    def __len__(self):
+        return self.length
+
+    def column(self, name: str) -> List:
+        """Decoded values of one column."""
+        col = self.columns[name]
+        return col.decode() if isinstance(col, CodedColumn) else list(col)
+
+    def mask(self, name: str, *values: Optional[str]) -> bytes:
+        """Row mask where column name equals any of values (None = missing)."""
+        return self.columns[name].mask(values)
+
+    def rows(self, mask: bytes) -> List[int]:
+        return list(compress(range(self.length), mask))
+
+    def select(self, mask: bytes, name: str) -> List:
+        col = self.columns[name]
+        return [col[i] for i in compress(range(self.length), mask)]
+
+    def index(self, name: str) -> Dict[str, int]:
+        """Hash index value -> row for a unique-valued column (Pin, Port)."""
+        if name not in self._indexes:
+            col = self.columns[name]
+            self._indexes[name] = {col.categories[c]: i for i, c in enumerate(col.codes) if c}
+        return self._indexes[name]
+
+    def row(self, i: int) -> PinAssignment:
+        def text(name):
+            col = self.columns.get(name)
+            return col[i] if col is not None else None
+
+        return PinAssignment(
+            pin=text("Pin") or "",
+            port=text("Port"),
+            function=text("Function") or "",
+            bank=text("Bank"),
+            state=text("State") or "",
+            io_std=text("I/O Std"),
+            direction=text("Direction"),
+            board_layout=text("Board Layout") or "",
+        )
+
+    def user_ios(self) -> Dict[str, PinAssignment]:
+        """Port -> row for every pin with a user port."""
+        return {port: self.row(i) for port, i in self.index("Port").items()}
+
+    def find(self, column: str, value: str) -> Optional[PinAssignment]:
+        i = self.index(column).get(value)
+        return self.row(i) if i is not None else None
+
+    # Common masks
+
+    def used_mask(self) -> bytes:
+        """Pins with a user port."""
+        return mask_not(self.mask("Port", None))
+
+    def reserved_mask(self) -> bytes:
+        return self.mask("State", *RESERVED_STATES)
+
+    def used_pins(self) -> List[str]:
+        return self.select(self.used_mask(), "Pin")
+
+    def reserved_pins(self) -> List[str]:
+        return self.select(self.reserved_mask(), "Pin")
+
+    def state_counts(self) -> Dict[str, int]:
+        col = self.columns["State"]
+        counts = Counter(col.codes)
+        return {col.categories[c] or UNUSED: n for c, n in counts.items()}
+
+    # Bank audit
+
+    def bank_vddi(self) -> Dict[str, Set[float]]:
+        """Allowed VDDI voltages per bank, from the VDDIx supply rows."""
+        function = self.columns["Function"]
+        layout = self.columns.get("Board Layout")
+        if layout is None:
+            return {}  # older reports carry no supply voltages
+        result: Dict[str, Set[float]] = {}
+        for code, name in enumerate(function.categories):
+            match = VDDI_RE.match(name or "")
+            if not match:
+                continue
+            rows = self.rows(function.mask([name]))
+            voltages = {float(v) for v in VOLTAGE_RE.findall(layout[rows[0]] or "")}
+            if voltages:
+                result[f"Bank{match.group(1)}"] = voltages
+        return result
+
+    def bank_summary(self) -> Dict[str, BankSummary]:
+        """Per-bank I/O standard / voltage consistency of the used pins."""
+        used = self.used_mask()
+        banks = self.columns["Bank"]
+        io_std = self.columns["I/O Std"]
+        port = self.columns["Port"]
+        function = self.columns["Function"]
+        vddi = self.bank_vddi()
+
+        summaries = {}
+        for bank in banks.categories[1:]:
+            in_bank = mask_and(used, banks.mask([bank]))
+            rows = self.rows(in_bank)
+            if not rows:
+                continue
+
+            summary = BankSummary(bank=bank, vddi=sorted(vddi.get(bank, ())))
+            summary.hsio = any((function[i] or "").startswith("HSIO") for i in rows)
+            summary.io_stds = dict(Counter(io_std[i] for i in rows if io_std[i]))
+            for i in rows:
+                voltage = io_std_voltage(io_std[i])
+                if voltage is not None:
+                    summary.voltages.setdefault(voltage, []).append(port[i])
+
+            if len(summary.voltages) > 1:
+                mix = ", ".join(f"{v:g}V: {len(p)} port(s)" for v, p in sorted(summary.voltages.items()))
+                summary.conflicts.append(f"{bank} mixes I/O voltages ({mix})")
+            for voltage, ports in sorted(summary.voltages.items()):
+                if summary.hsio and voltage > HSIO_MAX_VOLTAGE:
+                    summary.conflicts.append(
+                        f"{bank} is HSIO (<= {HSIO_MAX_VOLTAGE}V) but {', '.join(ports)} need {voltage:g}V")
+                if summary.vddi and voltage not in summary.vddi:
+                    supported = "/".join(f"{v:g}V" for v in summary.vddi)
+                    summary.conflicts.append(
+                        f"{bank} VDDI is {supported} but {', '.join(ports)} need {voltage:g}V")
+
+            summaries[bank] = summary
+        return summaries
+
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+
+def load_pin_table(path: Path) -> PinTable:
+    """Load a <design>_pinrpt_*.csv, skipping the Device Selection preamble."""
+    device = {}
+    header = None
+    rows = []
+
+    with open(path, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+        reader = csv.reader(f)
+        device_header = None
+        for row in reader:
+            if not row:
+                continue
+            if header is not None:
+                rows.append(row)
+            elif row[0] == "Report Version":
+                device_header = row
+            elif device_header is not None and not device and len(row) == len(device_header):
+                device = dict(zip(device_header, row))
+            elif row[0] == "Pin" and "Port" in row:
+                header = row
+
+    if header is None:
+        raise ValueError(f"No pin table found in {path}")
+    return PinTable(header, rows, device=device, path=str(path))
+
+
+def diff_pinouts(old: PinTable, new: PinTable) -> PinoutDiff:
+    """Compare the user-port placement of two builds."""
+    diff = PinoutDiff()
+    old_ports = old.index("Port")
+    new_ports = new.index("Port")
+
+    for port in old_ports.keys() - new_ports.keys():
+        diff.removed[port] = old.columns["Pin"][old_ports[port]]
+    for port in new_ports.keys() - old_ports.keys():
+        diff.added[port] = new.columns["Pin"][new_ports[port]]
+
+    compared = [name for name in old.header if name in new.columns and name not in ("Pin", "Port")]
+    for port in sorted(old_ports.keys() & new_ports.keys()):
+        i, j = old_ports[port], new_ports[port]
+        old_pin, new_pin = old.columns["Pin"][i], new.columns["Pin"][j]
+        if old_pin != new_pin:
+            diff.moved[port] = [old_pin, new_pin]
+        changes = {}
+        for name in compared:
+            a, b = old.columns[name][i], new.columns[name][j]
+            if a != b and not (isinstance(a, float) and math.isnan(a) and math.isnan(b)):
+                changes[name] = [a, b]
+        # Function and Bank follow the pin; only report attribute changes
+        changes.pop("Function", None)
+        changes.pop("Bank", None)
+        changes.pop("Board Layout", None)
+        if changes:
+            diff.changed[port] = changes
+
+    return diff
+
+
+def print_summary(table: PinTable):
+    """Print pin usage and bank audit."""
+    device = table.device
+    print("\n" + "=" * 70)
+    print("PIN REPORT SUMMARY")
+    print("=" * 70)
+    if device:
+        print(f"\n{'Design:':<12} {device.get('Design Name', '')}")
+        print(f"{'Device:':<12} {device.get('Die', '')} {device.get('Package', '')}")
+        print(f"{'Release:':<12} {device.get('Release', '')}")
+
+    print(f"\n{'Pins:':<20} {len(table)}")
+    print(f"{'User I/O used:':<20} {len(table.used_pins())}")
+    print(f"{'Reserved:':<20} {len(table.reserved_pins())}")
+    for state, count in sorted(table.state_counts().items()):
+        print(f"  {state:<18} {count}")
+
+    print("\nBANKS:")
+    for bank, summary in sorted(table.bank_summary().items()):
+        stds = ", ".join(f"{s} x{n}" for s, n in sorted(summary.io_stds.items()))
+        vddi = "/".join(f"{v:g}V" for v in summary.vddi) or "?"
+        mark = "✓" if summary.consistent else "✗"
+        print(f"  {mark} {bank:<8} VDDI {vddi:<22} {stds}")
+        for conflict in summary.conflicts:
+            print(f"      {conflict}")
+    print("=" * 70)
+
+
+def print_diff(diff: PinoutDiff):
+    if diff.empty:
+        print("Pinouts are identical")
+        return
+    for port, pin in sorted(diff.added.items()):
+        print(f"  + {port:<24} {pin}")
+    for port, pin in sorted(diff.removed.items()):
+        print(f"  - {port:<24} {pin}")
+    for port, (old, new) in sorted(diff.moved.items()):
+        print(f"  ~ {port:<24} {old} -> {new}")
+    for port, changes in sorted(diff.changed.items()):
+        for name, (old, new) in changes.items():
+            print(f"  * {port:<24} {name}: {old} -> {new}")
+
+
+def main():
+    """Main entry point."""
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    as_json = '--json' in sys.argv
+
+    if not args:
+        print("Usage: python pin_report.py <pinrpt.csv> [--json]")
+        print("   or: python pin_report.py diff <old.csv> <new.csv> [--json]")
+        sys.exit(1)
+
+    try:
+        if args[0] == 'diff':
+            if len(args) != 3:
+                print("ERROR: diff requires <old.csv> <new.csv>")
+                sys.exit(1)
+            diff = diff_pinouts(load_pin_table(Path(args[1])), load_pin_table(Path(args[2])))
+            if as_json:
+                print(json.dumps(asdict(diff), indent=2))
+            else:
+                print_diff(diff)
+            sys.exit(0 if diff.empty else 2)
+
+        table = load_pin_table(Path(args[0]))
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    banks = table.bank_summary()
+    if as_json:
+        print(json.dumps({
+            "device": table.device,
+            "pins": len(table),
+            "used": table.used_pins(),
+            "reserved": len(table.reserved_pins()),
+            "states": table.state_counts(),
+            "banks": {b: asdict(s) for b, s in banks.items()},
+        }, indent=2))
+    else:
+        print_summary(table)
+
+    sys.exit(0 if all(s.consistent for s in banks.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()
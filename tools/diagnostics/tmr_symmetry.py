@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+TMR Replica Symmetry Checker
+
+The TMR flow (tcl_scripts/tmr/create_miv_tmr_cores.tcl) triplicates MI-V,
+GPIO, UART, Timer and SRAM as *_A / *_B / *_C. If synthesis merges or trims
+one replica, the design still builds but is no longer triple-redundant.
+
+This module groups per-instance data by lane and compares the replicas:
+- Synplify *_hier_area.csv rows (SLE, CFG, ARI1, RAM1K20, ...)
+- Instance tallies from the synthesized netlist (netlist_stats.py)
+- Worst start/end point slack from the synthesis report (.srr)
+
+An instance path is mapped to a replica group by masking the lane letter of
+its outermost *_A/_B/_C segment (MIV_RV32_CORE_B_0/u_core ->
+MIV_RV32_CORE_*_0/u_core), so grouping is one dict update per row.
+
+Usage:
+    python tmr_symmetry.py <project_dir> [--tolerance 0.01] [--slack-tolerance 0.5]
+"""
+
+import csv
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from netlist_stats import NetlistScanner, NetlistStats, find_netlist
+
+
+LANES = ("A", "B", "C")
+
+# <base>_<lane>[_<n>], e.g. CoreGPIO_A, MIV_RV32_CORE_B_0
+LANE_RE = re.compile(r'^(?P<base>.+?)_(?P<lane>[ABC])(?P<rest>_\d+)?$')
+PATH_SPLIT_RE = re.compile(r'[/.]')
+
+# Columns compared between replicas (hier_area names)
+AREA_COLUMNS = ("SLE", "CFG", "ARI1", "MACC_PA", "RAM1K20", "RAM64X12")
+
+# Relative difference above which an asymmetry is an ERROR instead of a WARNING
+ERROR_RATIO = 0.10
+
+SLACK_TABLE_RE = re.compile(r'^(Starting|Ending) Points with Worst Slack')
+
+
+@dataclass
+class TMRFinding:
+    """One replica asymmetry."""
+    severity: str  # WARNING, ERROR
+    source: str    # hier_area, netlist, slack
+    group: str
+    metric: str
+    values: Dict[str, float]
+    message: str
+
+
+@dataclass
+class TMRReport:
+    """Replica comparison for one project."""
+    project_dir: str
+    groups: Dict[str, Dict[str, Dict[str, float]]] = field(default_factory=dict)  # source -> group -> lanes
+    slack: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    findings: List[TMRFinding] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+
+    @property
+    def replica_groups(self) -> int:
+        return sum(len(g) for g in self.groups.values())
+
+
+def lane_key(path: str, root_only: bool = False) -> Optional[Tuple[str, str]]:
+    """Map an instance path to (replica group, lane), or None if not replicated.
+
+    With root_only, the group stops at the replicated instance itself, so
+    everything below MIV_RV32_CORE_A_0 lands in group MIV_RV32_CORE_*_0.
+    """
+    segments = PATH_SPLIT_RE.split(path)
+    for i, segment in enumerate(segments):
+        match = LANE_RE.match(segment)
+        if match:
+            segments[i] = f"{match.group('base')}_*{match.group('rest') or ''}"
+            if root_only:
+                del segments[i + 1:]
+            return '/'.join(segments), match.group('lane')
+    return None
+
+
+def group_replicas(items: Iterable[Tuple[str, Mapping[str, float]]]) -> Dict[str, Dict[str, Mapping[str, float]]]:
+    """Group (path, metrics) pairs into group -> lane -> metrics.
+
+    Groups with only one lane are dropped (a lone *_A is not a replica set).
+    """
+    groups: Dict[str, Dict[str, Mapping[str, float]]] = {}
+    # Rows arrive depth-first, so resolve each path from its parent's key
+    parents: Dict[str, Optional[Tuple[str, str]]] = {}
+    for path, metrics in items:
+        parent, _, leaf = path.rpartition('/')
+        if parent in parents:
+            parent_key = parents[parent]
+            key = (f"{parent_key[0]}/{leaf}", parent_key[1]) if parent_key else lane_key(leaf)
+            if key and not parent_key and parent:
+                key = (f"{parent}/{key[0]}", key[1])
+        else:
+            key = lane_key(path)
+        parents[path] = key
+        if key is None:
+            continue
+        group, lane = key
+        lanes = groups.setdefault(group, {})
+        if lane in lanes:
+            # Same group reached through several rows (e.g. repeated modules): accumulate
+            merged = Counter(lanes[lane])
+            merged.update(metrics)
+            lanes[lane] = merged
+        else:
+            lanes[lane] = metrics
+    return {g: lanes for g, lanes in groups.items() if len(lanes) > 1}
+
+
+def load_hier_area(path: Path) -> Iterable[Tuple[str, Dict[str, float]]]:
+    """Stream (instance path, {column: count}) rows from a *_hier_area.csv.
+
+    Hierarchy depth is given by the leading '.' markers of the first column.
+    """
+    stack: List[str] = []
+    with open(path, 'r', encoding='utf-8', errors='ignore', newline='') as f:
+        reader = csv.reader(f, skipinitialspace=True)
+        header = None
+        for row in reader:
+            if not row:
+                continue
+            first = row[0]
+            stripped = first.lstrip('. ')
+            if header is None:
+                if stripped == "Module name":
+                    header = [c.strip() for c in row]
+                continue
+
+            depth = first[:len(first) - len(stripped)].count('.')
+            name = stripped.strip()
+            # "instance (module)" -> instance
+            if name.endswith(')') and ' (' in name:
+                name = name.split(' (', 1)[0]
+            del stack[max(depth - 1, 0):]
+            stack.append(name)
+
+            try:
+                metrics = dict(zip(header[1:], map(float, row[1:])))
+            except ValueError:
+                metrics = {}
+                for column, value in zip(header[1:], row[1:]):
+                    try:
+                        metrics[column] = float(value)
+                    except ValueError:
+                        continue
+            yield '/'.join(stack), metrics
+
+
+def load_endpoint_slack(path: Path) -> Iterable[Tuple[str, float]]:
+    """Stream (instance, slack) from the worst start/end point tables of a .srr."""
+    in_table = False
+    in_rows = False
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            if SLACK_TABLE_RE.match(line):
+                in_table, in_rows = True, False
+                continue
+            if not in_table:
+                continue
+            if line.startswith('---'):
+                in_rows = True
+                continue
+            if in_rows and (line.startswith('===') or not line.strip()):
+                in_table = in_rows = False
+                continue
+            if in_rows:
+                parts = line.split()
+                try:
+                    yield parts[0], float(parts[-1])
+                except (IndexError, ValueError):
+                    continue
+
+
+def _find(project_dir: Path, pattern: str) -> Optional[Path]:
+    matches = sorted(project_dir.glob(pattern))
+    return matches[0] if matches else None
+
+
+class TMRAnalyzer:
+    """Compare *_A/_B/_C replicas of a TMR build."""
+
+    def __init__(self, tolerance: float = 0.01, slack_tolerance: float = 0.5):
+        self.tolerance = tolerance              # relative resource difference
+        self.slack_tolerance = slack_tolerance  # ns between replica worst slacks
+
+    def analyze_project(self, project_dir: Path, netlist: Optional[NetlistStats] = None) -> TMRReport:
+        project_dir = Path(project_dir)
+        report = TMRReport(project_dir=str(project_dir))
+
+        area_csv = _find(project_dir, "synthesis/synlog/report/*_hier_area.csv")
+        if area_csv:
+            report.sources.append(str(area_csv))
+            self.compare_resources(report, "hier_area", group_replicas(load_hier_area(area_csv)))
+
+        if netlist is not None:
+            report.sources.append(netlist.file)
+            tally = ((p, netlist.groups(c)) for p, c in netlist.instance_tally(depth=2).items())
+            self.compare_resources(report, "netlist", group_replicas(tally))
+
+        srr = _find(project_dir, "synthesis/*.srr")
+        if srr:
+            report.sources.append(str(srr))
+            self.compare_slack(report, self._worst_slack(load_endpoint_slack(srr)))
+
+        return report
+
+    @staticmethod
+    def _worst_slack(endpoints: Iterable[Tuple[str, float]]) -> Dict[str, Dict[str, float]]:
+        worst: Dict[str, Dict[str, float]] = {}
+        for instance, slack in endpoints:
+            key = lane_key(instance, root_only=True)
+            if key is None:
+                continue
+            group, lane = key
+            lanes = worst.setdefault(group, {})
+            if slack < lanes.get(lane, float('inf')):
+                lanes[lane] = slack
+        return worst
+
+    def compare_resources(self, report: TMRReport, source: str,
+                          groups: Dict[str, Dict[str, Mapping[str, float]]]):
+        totals = report.groups[source] = {}
+        incomplete: List[str] = []
+        for group, lanes in sorted(groups.items()):
+            vectors = {lane: tuple(m.get(c, 0) for c in AREA_COLUMNS) for lane, m in lanes.items()}
+            totals[group] = {lane: sum(v) for lane, v in vectors.items()}
+            # Fast path: every lane present and identical
+            if len(lanes) == len(LANES) and len(set(vectors.values())) == 1:
+                continue
+
+            missing = [lane for lane in LANES if lane not in lanes]
+            # Report a missing lane once, at the outermost group
+            if missing and not any(group.startswith(parent + '/') for parent in incomplete):
+                incomplete.append(group)
+                report.findings.append(TMRFinding(
+                    severity="ERROR", source=source, group=group, metric="lanes",
+                    values={lane: 1 for lane in lanes},
+                    message=f"{group}: lane(s) {'/'.join(missing)} missing from {source}"))
+
+            for i, column in enumerate(AREA_COLUMNS):
+                values = {lane: vectors[lane][i] for lane in sorted(lanes)}
+                high, low = max(values.values()), min(values.values())
+                if high == 0 or high - low <= self.tolerance * high:
+                    continue
+                ratio = (high - low) / high
+                detail = ", ".join(f"{lane}={v:g}" for lane, v in values.items())
+                report.findings.append(TMRFinding(
+                    severity="ERROR" if ratio >= ERROR_RATIO else "WARNING",
+                    source=source, group=group, metric=column, values=values,
+                    message=f"{group}: {column} differs between replicas by {ratio:.1%} ({detail})"))
+
+    def compare_slack(self, report: TMRReport, worst: Dict[str, Dict[str, float]]):
+        report.slack = {g: lanes for g, lanes in worst.items() if len(lanes) > 1}
+        for group, lanes in sorted(report.slack.items()):
+            high, low = max(lanes.values()), min(lanes.values())
+            if high - low <= self.slack_tolerance:
+                continue
+            detail = ", ".join(f"{lane}={v:.3f}" for lane, v in sorted(lanes.items()))
+            report.findings.append(TMRFinding(
+                severity="WARNING", source="slack", group=group, metric="slack", values=dict(lanes),
+                message=f"{group}: worst slack differs between replicas by {high - low:.3f} ns ({detail})"))
+
+
+def print_report(report: TMRReport):
+    """Print replica groups and asymmetries."""
+    print("\n" + "=" * 70)
+    print("TMR REPLICA SYMMETRY")
+    print("=" * 70)
+    print(f"\n{'Project:':<12} {report.project_dir}")
+    for source in report.sources:
+        print(f"{'Source:':<12} {source}")
+
+    for source, groups in report.groups.items():
+        print(f"\n{source.upper()} ({len(groups)} replica groups):")
+        for group, lanes in sorted(groups.items()):
+            print(f"  {group:<48} " + "  ".join(f"{lane}={lanes.get(lane, 0):>8,.0f}" for lane in LANES))
+
+    if report.slack:
+        print(f"\nWORST SLACK ({len(report.slack)} replica groups):")
+        for group, lanes in sorted(report.slack.items()):
+            print(f"  {group:<48} " + "  ".join(
+                f"{lane}={lanes[lane]:>8.3f}" if lane in lanes else f"{lane}={'-':>8}" for lane in LANES))
+
+    print()
+    if not report.replica_groups and not report.slack:
+        print("  No *_A/_B/_C replicas found")
+    elif not report.findings:
+        print("  ✓ Replicas are symmetric")
+    for finding in report.findings:
+        symbol = "✗" if finding.severity == "ERROR" else "⚠"
+        print(f"  {symbol} [{finding.source}] {finding.message}")
+    print("=" * 70)
+
+
+def main():
+    """Main entry point."""
+    args = sys.argv[1:]
+    options = {}
+    for name in ('--tolerance', '--slack-tolerance'):
+        if name in args:
+            i = args.index(name)
+            options[name] = float(args[i + 1])
+            del args[i:i + 2]
+
+    if not args:
+        print("Usage: python tmr_symmetry.py <project_dir> [--tolerance 0.01] [--slack-tolerance 0.5]")
+        sys.exit(1)
+
+    project_dir = Path(args[0])
+    if not project_dir.exists():
+        print(f"ERROR: Project directory not found: {project_dir}")
+        sys.exit(1)
+
+    netlist_path = find_netlist(project_dir)
+    netlist = NetlistScanner().scan(netlist_path) if netlist_path else None
+
+    analyzer = TMRAnalyzer(tolerance=options.get('--tolerance', 0.01),
+                           slack_tolerance=options.get('--slack-tolerance', 0.5))
+    report = analyzer.analyze_project(project_dir, netlist)
+    print_report(report)
+
+    if any(f.severity == "ERROR" for f in report.findings):
+        sys.exit(1)
+    sys.exit(2 if report.findings else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,754 @@
+#!/usr/bin/env python3
+"""
+TMR Voter Reference Model and Fault-Injection Campaigns
+
+Bit-accurate Python model of the voter library in hdl/tmr/ and of
+tmr_fault_monitor.v, for checking voter behaviour on any CI host without
+ModelSim.
+
+Vectors are evaluated bit-sliced: a batch of N vectors is held as one Python
+int per (field, lane, bit), bit k of that int belonging to vector k, so a
+single big-int AND/OR/XOR evaluates the voter logic for the whole batch
+(stdlib only; no NumPy needed).
+
+Campaign modes (upsets applied to the voter inputs of otherwise identical lanes):
+    seu     one bit flip per vector, uniform over every input bit of every lane
+    mbu     K adjacent bits flipped in one lane of one field (--upsets K)
+    mlu     the same bit flipped in two lanes (defeats 2-of-3 majority)
+    random  K independent single-bit flips per vector (--upsets K)
+
+Per voter and per field the report gives masking coverage (voted outputs
+still correct), detection coverage (a disagreement output fired), correct
+lane identification from the fault flags, and silent corruptions.
+
+Usage:
+    python voter_model.py list
+    python voter_model.py campaign <voter|all> [--mode seu] [--upsets K] [--vectors N]
+                                   [--seed S] [--monitor] [--json]
+    python voter_model.py export <voter> <out_dir> [--mode seu] [--vectors N] [--seed S]
+"""
+
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import or_
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+LANES = ("A", "B", "C")
+BATCH = 1 << 18
+MODES = ("seu", "mbu", "mlu", "random")
+
+MONITOR_INPUTS = ("mem_addr", "mem_wdata", "mem_rdata", "uart", "gpio")
+MONITOR_THRESHOLD = 100
+COUNTER_MAX = 0xFFFF
+
+Planes = List[int]  # one int per bit position, bit k = vector k
+
+
+def popcount(x: int) -> int:
+    return bin(x).count("1")
+
+
+@dataclass(frozen=True)
+class Field:
+    """One voted signal group: three lane input ports and its output ports."""
+    name: str
+    width: int
+    ports: Tuple[str, str, str]
+    outputs: Tuple[str, ...] = ()
+    vote: str = "majority"  # majority, and (HREADY), or (HRESP)
+    latency: int = 0
+
+
+@dataclass(frozen=True)
+class Detector:
+    """Disagreement output: high when any lane of its fields differs from the vote."""
+    port: str
+    fields: Tuple[str, ...]
+    latency: int = 0
+
+
+@dataclass(frozen=True)
+class FlagOutput:
+    """3-bit fault flag output; lane_bits gives the bit position of lanes A, B, C."""
+    port: str
+    fields: Tuple[str, ...]
+    lane_bits: Tuple[int, int, int] = (2, 1, 0)
+    latency: int = 0
+
+
+@dataclass(frozen=True)
+class VoterSpec:
+    module: str
+    hdl: str
+    fields: Tuple[Field, ...]
+    detectors: Tuple[Detector, ...] = ()
+    flags: Tuple[FlagOutput, ...] = ()
+    clock: Tuple[str, ...] = ()  # (clock, active-low reset) ports
+    params: Tuple[Tuple[str, int], ...] = ()
+    tie_offs: Tuple[Tuple[str, int], ...] = ()  # unmodelled inputs driven to 0 in testbenches
+
+    @property
+    def input_bits(self) -> int:
+        return 3 * sum(f.width for f in self.fields)
+
+
+def _simple(module, width, ports, output, latency=0, clocked=False, flag_bits=None, params=()):
+    data = Field("data", width, ports, (output,), latency=latency)
+    detectors = (Detector("disagreement", ("data",), latency),) if flag_bits else ()
+    flags = (FlagOutput("fault_flags", ("data",), flag_bits, latency),) if flag_bits else ()
+    return VoterSpec(module, f"hdl/tmr/{module}.v", (data,), detectors, flags,
+                     ("clk", "rst_n") if clocked else (), params)
+
+
+_VOTER_PORTS = ("input_a", "input_b", "input_c")
+
+VOTERS: Dict[str, VoterSpec] = {
+    "triple_voter": _simple("triple_voter", 32, _VOTER_PORTS, "voted_output", 1, True, (2, 1, 0),
+                            (("WIDTH", 32),)),
+    "triple_voter_1bit": _simple("triple_voter_1bit", 1, _VOTER_PORTS, "voted_output", 1, True, (2, 1, 0)),
+    "triple_voter_64bit": _simple("triple_voter_64bit", 64, _VOTER_PORTS, "voted_output", 1, True, (0, 1, 2)),
+    "gpio_voter": _simple("gpio_voter", 8, ("gpio_a", "gpio_b", "gpio_c"), "gpio_voted", params=(("WIDTH", 8),)),
+    "gpio_voter_32bit": _simple("gpio_voter_32bit", 32, ("gpio_a", "gpio_b", "gpio_c"), "gpio_voted"),
+    "memory_read_voter": _simple("memory_read_voter", 32, ("data_a", "data_b", "data_c"), "data_voted",
+                                 params=(("DATA_WIDTH", 32),)),
+    "uart_tx_voter": _simple("uart_tx_voter", 1, ("tx_a", "tx_b", "tx_c"), "tx_voted"),
+    # Address/data go through a registered triple_voter and are registered again (2 cycles);
+    # wen/ren are voted combinationally and registered once (1 cycle)
+    "memory_voter": VoterSpec(
+        "memory_voter", "hdl/tmr/memory_voter.v",
+        fields=(
+            Field("addr", 32, ("addr_a", "addr_b", "addr_c"), ("voted_addr",), latency=2),
+            Field("wdata", 32, ("wdata_a", "wdata_b", "wdata_c"), ("voted_wdata",), latency=2),
+            Field("wen", 1, ("wen_a", "wen_b", "wen_c"), ("voted_wen",), latency=1),
+            Field("ren", 1, ("ren_a", "ren_b", "ren_c"), ("voted_ren",), latency=1),
+            Field("rdata", 32, ("rdata_bank_a", "rdata_bank_b", "rdata_bank_c"),
+                  ("rdata_a", "rdata_b", "rdata_c"), latency=2),
+        ),
+        detectors=(
+            Detector("addr_disagreement", ("addr",), 2),
+            Detector("wdata_disagreement", ("wdata",), 2),
+            Detector("rdata_disagreement", ("rdata",), 2),
+        ),
+        flags=(
+            FlagOutput("addr_fault_flags", ("addr",), (2, 1, 0), 2),
+            FlagOutput("wdata_fault_flags", ("wdata",), (2, 1, 0), 2),
+            FlagOutput("rdata_fault_flags", ("rdata",), (2, 1, 0), 2),
+        ),
+        clock=("clk", "rst_n"),
+        params=(("ADDR_WIDTH", 32), ("DATA_WIDTH", 32)),
+    ),
+    "peripheral_voter": VoterSpec(
+        "peripheral_voter", "hdl/tmr/peripheral_voter.v",
+        fields=(
+            Field("data", 8, ("data_out_a", "data_out_b", "data_out_c"), ("voted_data_out",), latency=1),
+            Field("valid", 1, ("valid_a", "valid_b", "valid_c"), ("voted_valid",), latency=1),
+        ),
+        detectors=(Detector("data_disagreement", ("data",), 1), Detector("valid_disagreement", ("valid",), 1)),
+        flags=(FlagOutput("data_fault_flags", ("data",), (2, 1, 0), 1),
+               FlagOutput("valid_fault_flags", ("valid",), (2, 1, 0), 1)),
+        clock=("clk", "rst_n"),
+        params=(("DATA_WIDTH", 8),),
+        tie_offs=(("data_in", 8), ("valid_in", 1)),
+    ),
+    # Combinational; HREADY is ANDed and HRESP ORed rather than voted,
+    # control fields are voted but not covered by any disagreement output,
+    # and fault_flags use [0]=A
+    "ahb_tmr_voter": VoterSpec(
+        "ahb_tmr_voter", "hdl/tmr/ahb_tmr_voter.v",
+        fields=(
+            Field("haddr", 32, ("HADDR_A", "HADDR_B", "HADDR_C"), ("HADDR_MEM_A", "HADDR_MEM_B", "HADDR_MEM_C")),
+            Field("hwdata", 32, ("HWDATA_A", "HWDATA_B", "HWDATA_C"),
+                  ("HWDATA_MEM_A", "HWDATA_MEM_B", "HWDATA_MEM_C")),
+            Field("hwrite", 1, ("HWRITE_A", "HWRITE_B", "HWRITE_C"),
+                  ("HWRITE_MEM_A", "HWRITE_MEM_B", "HWRITE_MEM_C")),
+            Field("htrans", 2, ("HTRANS_A", "HTRANS_B", "HTRANS_C"),
+                  ("HTRANS_MEM_A", "HTRANS_MEM_B", "HTRANS_MEM_C")),
+            Field("hsize", 3, ("HSIZE_A", "HSIZE_B", "HSIZE_C"), ("HSIZE_MEM_A", "HSIZE_MEM_B", "HSIZE_MEM_C")),
+            Field("hburst", 3, ("HBURST_A", "HBURST_B", "HBURST_C"),
+                  ("HBURST_MEM_A", "HBURST_MEM_B", "HBURST_MEM_C")),
+            Field("hsel", 1, ("HSEL_A", "HSEL_B", "HSEL_C"), ("HSEL_MEM_A", "HSEL_MEM_B", "HSEL_MEM_C")),
+            Field("hrdata", 32, ("HRDATA_MEM_A", "HRDATA_MEM_B", "HRDATA_MEM_C"),
+                  ("HRDATA_A", "HRDATA_B", "HRDATA_C")),
+            Field("hready", 1, ("HREADY_MEM_A", "HREADY_MEM_B", "HREADY_MEM_C"),
+                  ("HREADY_A", "HREADY_B", "HREADY_C"), vote="and"),
+            Field("hresp", 1, ("HRESP_MEM_A", "HRESP_MEM_B", "HRESP_MEM_C"),
+                  ("HRESP_A", "HRESP_B", "HRESP_C"), vote="or"),
+        ),
+        detectors=(
+            Detector("addr_disagreement", ("haddr",)),
+            Detector("wdata_disagreement", ("hwdata",)),
+            Detector("rdata_disagreement", ("hrdata",)),
+        ),
+        flags=(FlagOutput("fault_flags", ("haddr", "hwdata"), (0, 1, 2)),),
+        clock=("HCLK", "HRESETn"),
+        params=(("ADDR_WIDTH", 32), ("DATA_WIDTH", 32)),
+    ),
+}
+
+
+# Evaluation
+
+@dataclass
+class Evaluation:
+    """Voter outputs for a batch (bit-sliced)."""
+    voted: Dict[str, Planes]
+    lane_diff: Dict[str, Tuple[int, int, int]]  # per field: vectors where lane != voted
+    detectors: Dict[str, int]
+    flags: Dict[str, Tuple[int, int, int]]      # per flag port: lane A, B, C masks
+
+
+def _vote(kind: str, a: Planes, b: Planes, c: Planes) -> Planes:
+    if kind == "majority":
+        return [(x & y) | (y & z) | (x & z) for x, y, z in zip(a, b, c)]
+    if kind == "and":
+        return [x & y & z for x, y, z in zip(a, b, c)]
+    return [x | y | z for x, y, z in zip(a, b, c)]
+
+
+def evaluate(spec: VoterSpec, lanes: Dict[str, Tuple[Planes, Planes, Planes]]) -> Evaluation:
+    """Evaluate the voter on bit-sliced lane inputs."""
+    voted, lane_diff = {}, {}
+    for f in spec.fields:
+        a, b, c = lanes[f.name]
+        v = _vote(f.vote, a, b, c)
+        voted[f.name] = v
+        lane_diff[f.name] = tuple(reduce(or_, (x ^ y for x, y in zip(lane, v)), 0) for lane in (a, b, c))
+
+    detectors = {d.port: reduce(or_, (m for name in d.fields for m in lane_diff[name]), 0)
+                 for d in spec.detectors}
+    flags = {}
+    for fl in spec.flags:
+        flags[fl.port] = tuple(reduce(or_, (lane_diff[name][i] for name in fl.fields), 0) for i in range(3))
+    return Evaluation(voted, lane_diff, detectors, flags)
+
+
+# Fault injection
+
+Site = Tuple[Tuple[str, int, int], ...]  # flips: (field, lane, bit)
+
+
+def upset_sites(spec: VoterSpec, mode: str, upsets: int = 1) -> List[Site]:
+    """All equally likely upset patterns of a mode."""
+    sites: List[Site] = []
+    for f in spec.fields:
+        if mode in ("seu", "random"):
+            sites += [((f.name, lane, bit),) for lane in range(3) for bit in range(f.width)]
+        elif mode == "mbu":
+            sites += [tuple((f.name, lane, b) for b in range(bit, min(bit + upsets, f.width)))
+                      for lane in range(3) for bit in range(f.width)]
+        elif mode == "mlu":
+            sites += [((f.name, l1, bit), (f.name, l2, bit))
+                      for l1, l2 in ((0, 1), (1, 2), (0, 2)) for bit in range(f.width)]
+    return sites
+
+
+def selector_masks(rng: random.Random, n: int, count: int) -> List[int]:
+    """Split n vectors uniformly at random into `count` disjoint masks (some vectors get none)."""
+    depth = max(1, (count - 1).bit_length())
+    masks = [(1 << n) - 1]
+    for _ in range(depth):
+        r = rng.getrandbits(n)
+        masks = [m for mask in masks for m in (mask & ~r, mask & r)]
+    return masks[:count]
+
+
+def inject(lanes: Dict[str, Tuple[Planes, Planes, Planes]], sites: List[Site], rng: random.Random,
+           n: int) -> int:
+    """Apply one randomly chosen site per vector in place; returns the mask of injected vectors."""
+    injected = 0
+    for site, mask in zip(sites, selector_masks(rng, n, len(sites))):
+        if not mask:
+            continue
+        injected |= mask
+        for name, lane, bit in site:
+            lanes[name][lane][bit] ^= mask
+    return injected
+
+
+# Campaigns
+
+@dataclass
+class FieldCoverage:
+    name: str
+    effective: int = 0
+    masked: int = 0
+    detected: int = 0
+    silent: int = 0
+
+
+@dataclass
+class CampaignResult:
+    voter: str
+    mode: str
+    upsets: int
+    vectors: int = 0
+    injected: int = 0
+    effective: int = 0     # an input actually differs from golden
+    masked: int = 0        # all voted outputs still correct
+    detected: int = 0      # some disagreement output fired
+    identified: int = 0    # fault flags name exactly the upset lanes
+    silent: int = 0        # wrong output and no detection
+    latent: int = 0        # masked but not reported (errors can accumulate)
+    seconds: float = 0.0
+    fields: Dict[str, FieldCoverage] = field(default_factory=dict)
+    monitor: Optional["MonitorState"] = None
+    has_detection: bool = False
+    has_flags: bool = False
+
+    @staticmethod
+    def _pct(part: int, whole: int) -> float:
+        return 100.0 * part / whole if whole else 0.0
+
+    @property
+    def masking_coverage(self) -> float:
+        return self._pct(self.masked, self.effective)
+
+    @property
+    def detection_coverage(self) -> float:
+        return self._pct(self.detected, self.effective)
+
+    @property
+    def identification_coverage(self) -> float:
+        return self._pct(self.identified, self.effective)
+
+    @property
+    def rate(self) -> float:
+        return self.vectors / self.seconds if self.seconds else 0.0
+
+
+def golden_lanes(spec: VoterSpec, rng: random.Random, n: int) -> Tuple[Dict[str, Planes], Dict]:
+    """Random golden data replicated identically into three lanes."""
+    golden = {f.name: [rng.getrandbits(n) for _ in range(f.width)] for f in spec.fields}
+    lanes = {name: (list(p), list(p), list(p)) for name, p in golden.items()}
+    return golden, lanes
+
+
+def run_batch(spec: VoterSpec, result: CampaignResult, rng: random.Random, n: int, sites: List[Site],
+              monitor: Optional["FaultMonitor"] = None):
+    golden, lanes = golden_lanes(spec, rng, n)
+    rounds = result.upsets if result.mode == "random" else 1
+    injected = 0
+    for _ in range(rounds):
+        injected |= inject(lanes, sites, rng, n)
+    ev = evaluate(spec, lanes)
+
+    lane_hit = [0, 0, 0]
+    field_hit, field_err = {}, {}
+    for f in spec.fields:
+        g = golden[f.name]
+        hits = [reduce(or_, (x ^ y for x, y in zip(lanes[f.name][i], g)), 0) for i in range(3)]
+        for i in range(3):
+            lane_hit[i] |= hits[i]
+        field_hit[f.name] = hits[0] | hits[1] | hits[2]
+        field_err[f.name] = reduce(or_, (x ^ y for x, y in zip(ev.voted[f.name], g)), 0)
+
+    effective = lane_hit[0] | lane_hit[1] | lane_hit[2]
+    wrong = reduce(or_, field_err.values(), 0)
+    detected = reduce(or_, ev.detectors.values(), 0) & effective
+    masked = effective & ~wrong
+
+    result.vectors += n
+    result.injected += popcount(injected)
+    result.effective += popcount(effective)
+    result.masked += popcount(masked)
+    result.detected += popcount(detected)
+    result.silent += popcount(effective & wrong & ~detected)
+    result.latent += popcount(masked & ~detected)
+    if spec.flags:
+        flagged = [reduce(or_, (f[i] for f in ev.flags.values()), 0) for i in range(3)]
+        mismatch = reduce(or_, (flagged[i] ^ lane_hit[i] for i in range(3)), 0)
+        result.identified += popcount(effective & ~mismatch)
+
+    for f in spec.fields:
+        cov = result.fields.setdefault(f.name, FieldCoverage(f.name))
+        hit = field_hit[f.name]
+        cov.effective += popcount(hit)
+        cov.masked += popcount(hit & ~wrong)
+        cov.detected += popcount(hit & detected)
+        cov.silent += popcount(hit & wrong & ~detected)
+
+    if monitor is not None and spec.flags:
+        # Drive one monitor input with this voter's fault flags, one vector per clock
+        faults = tuple(reduce(or_, (f[i] for f in ev.flags.values()), 0) for i in range(3))
+        disagreement = reduce(or_, ev.detectors.values(), 0)
+        monitor.run(n, {"mem_rdata": faults}, {"mem_rdata": disagreement})
+
+    return golden, lanes, ev
+
+
+def run_campaign(name: str, mode: str = "seu", vectors: int = 1_000_000, upsets: int = 1,
+                 seed: int = 1, with_monitor: bool = False) -> CampaignResult:
+    """Randomized upset campaign against one voter."""
+    spec = VOTERS[name]
+    rng = random.Random(seed)
+    sites = upset_sites(spec, mode, upsets)
+    result = CampaignResult(name, mode, upsets, has_detection=bool(spec.detectors), has_flags=bool(spec.flags))
+    monitor = FaultMonitor() if with_monitor else None
+    start = time.perf_counter()
+    remaining = vectors
+    while remaining > 0:
+        n = min(BATCH, remaining)
+        run_batch(spec, result, rng, n, sites, monitor)
+        remaining -= n
+    result.seconds = time.perf_counter() - start
+    if monitor is not None:
+        result.monitor = monitor.state
+    return result
+
+
+# Fault monitor (tmr_fault_monitor.v)
+
+@dataclass
+class MonitorState:
+    cycle: int = 0
+    counts: List[int] = field(default_factory=lambda: [0, 0, 0])
+    faulty: List[bool] = field(default_factory=lambda: [False, False, False])
+    faulty_cycle: List[Optional[int]] = field(default_factory=lambda: [None, None, None])
+    disagreement_cycles: int = 0
+    any_disagreement: bool = False
+    system_healthy: bool = False
+
+
+class FaultMonitor:
+    """Cycle-accurate tmr_fault_monitor: saturating-ish 16-bit counters, threshold flags.
+
+    Matches the RTL exactly, including its corner cases: the counter only stops
+    when it equals 16'hFFFF, so an increment that jumps past it wraps, and the
+    faulty flag is set from the registered count (one cycle after it exceeds
+    FAULT_THRESHOLD).
+    """
+
+    def __init__(self, threshold: int = MONITOR_THRESHOLD):
+        self.threshold = threshold
+        self.state = MonitorState()
+
+    @staticmethod
+    def _prefix(masks: Sequence[int], t: int) -> int:
+        window = (1 << t) - 1
+        return sum(popcount(m & window) for m in masks)
+
+    def run(self, n: int, faults: Dict[str, Tuple[int, int, int]], disagreement: Dict[str, int]):
+        """Advance n cycles; faults maps monitor input -> (A, B, C) bit-sliced fault flags."""
+        s = self.state
+        unknown = set(faults) - set(MONITOR_INPUTS)
+        if unknown:
+            raise KeyError(f"unknown monitor input(s): {', '.join(sorted(unknown))}")
+
+        for lane in range(3):
+            masks = [f[lane] for f in faults.values()]
+            total = sum(popcount(m) for m in masks)
+            start = s.counts[lane]
+            if start + total <= COUNTER_MAX:
+                crossing = None
+                if start > self.threshold:
+                    crossing = 0
+                elif start + total > self.threshold:
+                    lo, hi = 1, n  # smallest t with count before cycle t above threshold
+                    while lo < hi:
+                        mid = (lo + hi) // 2
+                        if start + self._prefix(masks, mid) > self.threshold:
+                            hi = mid
+                        else:
+                            lo = mid + 1
+                    crossing = lo
+                s.counts[lane] = start + total
+            else:
+                crossing = self._run_exact(lane, masks, n)
+            if crossing is not None and not s.faulty[lane] and crossing < n:
+                s.faulty[lane] = True
+                s.faulty_cycle[lane] = s.cycle + crossing + 1
+
+        any_mask = reduce(or_, disagreement.values(), 0)
+        s.disagreement_cycles += popcount(any_mask)
+        s.any_disagreement = bool((any_mask >> (n - 1)) & 1) if n else s.any_disagreement
+        s.system_healthy = not s.any_disagreement and not any(s.faulty)
+        s.cycle += n
+
+    def _run_exact(self, lane: int, masks: List[int], n: int) -> Optional[int]:
+        """Sequential path for counters that can reach 16'hFFFF."""
+        s = self.state
+        count, crossing = s.counts[lane], None
+        columns = [format(m, f"0{n}b")[::-1] for m in masks]
+        for t, bits in enumerate(zip(*columns)):
+            if crossing is None and count > self.threshold:
+                crossing = t
+            if count == COUNTER_MAX:
+                break  # stuck from here on
+            inc = bits.count("1")
+            if inc:
+                count = (count + inc) & COUNTER_MAX
+        s.counts[lane] = count
+        return crossing
+
+
+# Stimulus export
+
+def _bits(planes: Planes, n: int) -> List[str]:
+    """Per-bit strings of n vectors (index k = vector k)."""
+    return [format(p, f"0{n}b")[::-1] for p in planes]
+
+
+def _word(planes_bits: List[str], k: int) -> int:
+    return sum(1 << b for b, s in enumerate(planes_bits) if s[k] == "1")
+
+
+def export_stimulus(name: str, out_dir: Path, vectors: int = 1000, mode: str = "seu", upsets: int = 1,
+                    seed: int = 1) -> Tuple[Path, Path, Path]:
+    """Write <voter>_stim.memh, <voter>_expect.memh and a self-checking tb_<voter>.v."""
+    spec = VOTERS[name]
+    rng = random.Random(seed)
+    result = CampaignResult(name, mode, upsets)
+    _, lanes, ev = run_batch(spec, result, rng, vectors, upset_sites(spec, mode, upsets))
+
+    # Input word: fields in spec order, lanes A, B, C each; LSB first
+    in_layout, out_layout = [], []  # (port, lsb, width) / (port, lsb, width, latency)
+    pos = 0
+    for f in spec.fields:
+        for port in f.ports:
+            in_layout.append((port, pos, f.width))
+            pos += f.width
+    in_width = pos
+    pos = 0
+    out_values = []  # (width, per-vector value function)
+    for f in spec.fields:
+        bits = _bits(ev.voted[f.name], vectors)
+        for port in f.outputs:
+            out_layout.append((port, pos, f.width, f.latency))
+            out_values.append((f.width, lambda k, b=bits: _word(b, k)))
+            pos += f.width
+    for d in spec.detectors:
+        mask_bits = format(ev.detectors[d.port], f"0{vectors}b")[::-1]
+        out_layout.append((d.port, pos, 1, d.latency))
+        out_values.append((1, lambda k, s=mask_bits: int(s[k])))
+        pos += 1
+    for fl in spec.flags:
+        lane_bits = [format(m, f"0{vectors}b")[::-1] for m in ev.flags[fl.port]]
+        out_layout.append((fl.port, pos, 3, fl.latency))
+        out_values.append((3, lambda k, lb=lane_bits, order=fl.lane_bits:
+                           sum(int(lb[i][k]) << order[i] for i in range(3))))
+        pos += 3
+    out_width = pos
+
+    lane_bits = {f.name: [_bits(lanes[f.name][i], vectors) for i in range(3)] for f in spec.fields}
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stim_path = out_dir / f"{name}_stim.memh"
+    expect_path = out_dir / f"{name}_expect.memh"
+    with open(stim_path, "w") as stim, open(expect_path, "w") as expect:
+        for k in range(vectors):
+            word, shift = 0, 0
+            for f in spec.fields:
+                for i in range(3):
+                    word |= _word(lane_bits[f.name][i], k) << shift
+                    shift += f.width
+            stim.write(f"{word:0{(in_width + 3) // 4}x}\n")
+            word, shift = 0, 0
+            for width, value in out_values:
+                word |= value(k) << shift
+                shift += width
+            expect.write(f"{word:0{(out_width + 3) // 4}x}\n")
+
+    tb_path = out_dir / f"tb_{name}.v"
+    tb_path.write_text(_testbench(spec, vectors, in_layout, in_width, out_layout, out_width))
+    return stim_path, expect_path, tb_path
+
+
+def _testbench(spec: VoterSpec, vectors: int, in_layout, in_width: int, out_layout, out_width: int) -> str:
+    name = spec.module
+    max_latency = max([o[3] for o in out_layout] + [0])
+    lines = [
+        f"// Generated by tools/tmr/voter_model.py - stimulus for {spec.hdl}",
+        "`timescale 1ns/1ps",
+        f"module tb_{name};",
+        f"    localparam N = {vectors};",
+        f"    localparam IN_W = {in_width};",
+        f"    localparam OUT_W = {out_width};",
+        "",
+        "    reg clk = 1'b0;",
+        "    reg rst_n = 1'b0;",
+        "    always #5 clk = ~clk;",
+        "",
+        "    reg [IN_W-1:0] stim [0:N-1];",
+        "    reg [OUT_W-1:0] expected [0:N-1];",
+        "    reg [IN_W-1:0] vec = {IN_W{1'b0}};",
+        "    integer i, errors;",
+        "",
+    ]
+    for port, lsb, width in in_layout:
+        decl = f"[{width - 1}:0] " if width > 1 else ""
+        lines.append(f"    wire {decl}{port} = vec[{lsb + width - 1}:{lsb}];")
+    for port, width in spec.tie_offs:
+        decl = f"[{width - 1}:0] " if width > 1 else ""
+        lines.append(f"    wire {decl}{port} = {width}'d0;")
+    for port, _, width, _ in out_layout:
+        decl = f"[{width - 1}:0] " if width > 1 else ""
+        lines.append(f"    wire {decl}{port};")
+
+    params = ", ".join(f".{k}({v})" for k, v in spec.params)
+    lines += ["", f"    {name} {'#(' + params + ') ' if params else ''}dut ("]
+    conns = []
+    if spec.clock:
+        conns += [f"        .{spec.clock[0]}(clk)", f"        .{spec.clock[1]}(rst_n)"]
+    conns += [f"        .{port}({port})" for port, _, _ in in_layout]
+    conns += [f"        .{port}({port})" for port, _ in spec.tie_offs]
+    conns += [f"        .{port}({port})" for port, _, _, _ in out_layout]
+    lines.append(",\n".join(conns))
+    lines += ["    );", ""]
+
+    def check(port, lsb, width, offset):
+        idx = f"i - {offset}" if offset else "i"
+        return [
+            f"            if ({idx} >= 0 && {idx} < N && {port} !== expected[{idx}][{lsb + width - 1}:{lsb}]) begin",
+            "                errors = errors + 1;",
+            f"                if (errors <= 20) $display(\"MISMATCH vector %0d {port}: got %h expected %h\","
+            f" {idx}, {port}, expected[{idx}][{lsb + width - 1}:{lsb}]);",
+            "            end",
+        ]
+
+    lines += [
+        "    initial begin",
+        f"        $readmemh(\"{name}_stim.memh\", stim);",
+        f"        $readmemh(\"{name}_expect.memh\", expected);",
+        "        errors = 0;",
+        "        repeat (2) @(posedge clk);",
+        "        rst_n = 1'b1;",
+        f"        for (i = 0; i < N + {max_latency}; i = i + 1) begin",
+        "            if (i < N) vec = stim[i];",
+        "            #1;",
+    ]
+    for port, lsb, width, latency in out_layout:
+        if latency == 0:
+            lines += check(port, lsb, width, 0)
+    lines += ["            @(posedge clk);", "            #1;"]
+    for port, lsb, width, latency in out_layout:
+        if latency > 0:
+            lines += check(port, lsb, width, latency - 1)
+    lines += [
+        "        end",
+        f"        if (errors == 0) $display(\"PASS: {name} %0d vectors\", N);",
+        f"        else $display(\"FAIL: {name} %0d mismatches\", errors);",
+        "        $finish;",
+        "    end",
+        "endmodule",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+# Reporting
+
+def print_result(r: CampaignResult):
+    print(f"\n{r.voter}  [{r.mode}{'' if r.mode in ('seu', 'mlu') else f' x{r.upsets}'}]  "
+          f"{r.vectors:,} vectors in {r.seconds:.2f}s ({r.rate / 1e6:.2f} M/s)")
+    print(f"  {'Effective upsets:':<22} {r.effective:,} of {r.injected:,} injected")
+    print(f"  {'Masking coverage:':<22} {r.masking_coverage:6.2f}%")
+    if r.has_detection:
+        print(f"  {'Detection coverage:':<22} {r.detection_coverage:6.2f}%")
+    else:
+        print(f"  {'Detection coverage:':<22}    n/a (no disagreement output)")
+    if r.has_flags:
+        print(f"  {'Lane identification:':<22} {r.identification_coverage:6.2f}%")
+    print(f"  {'Silent corruptions:':<22} {r.silent:,}")
+    if r.has_detection:
+        print(f"  {'Masked, unreported:':<22} {r.latent:,}")
+
+    weak = [c for c in r.fields.values()
+            if c.effective and (c.masked < c.effective or (r.has_detection and c.detected < c.effective))]
+    if len(r.fields) > 1 or weak:
+        print(f"  {'Field':<10} {'Upsets':>10} {'Masked %':>9} {'Detected %':>11} {'Silent':>9}")
+        for c in r.fields.values():
+            pct = lambda part: 100.0 * part / c.effective if c.effective else 0.0
+            det = f"{pct(c.detected):>10.2f}%" if r.has_detection else f"{'n/a':>11}"
+            print(f"  {c.name:<10} {c.effective:>10,} {pct(c.masked):>8.2f}% {det} {c.silent:>9,}")
+    if r.monitor:
+        m = r.monitor
+        faulty = ", ".join(f"{LANES[i]}@{m.faulty_cycle[i]}" for i in range(3) if m.faulty[i]) or "none"
+        print(f"  Monitor: counts A/B/C {m.counts[0]}/{m.counts[1]}/{m.counts[2]}, faulty {faulty}, "
+              f"disagreement cycles {m.disagreement_cycles:,}")
+
+
+def result_to_dict(r: CampaignResult) -> Dict:
+    data = {
+        "voter": r.voter, "mode": r.mode, "upsets": r.upsets, "vectors": r.vectors,
+        "injected": r.injected, "effective": r.effective,
+        "masking_coverage": round(r.masking_coverage, 4),
+        "detection_coverage": round(r.detection_coverage, 4) if r.has_detection else None,
+        "identification_coverage": round(r.identification_coverage, 4) if r.has_flags else None,
+        "silent": r.silent, "latent": r.latent, "vectors_per_second": round(r.rate),
+        "fields": {c.name: c.__dict__ for c in r.fields.values()},
+    }
+    if r.monitor:
+        data["monitor"] = r.monitor.__dict__
+    return data
+
+
+def main():
+    """Main entry point."""
+    args = sys.argv[1:]
+    flags = {f: f in args for f in ('--json', '--monitor')}
+    for f, present in flags.items():
+        if present:
+            args.remove(f)
+    options = {}
+    for name in ('--mode', '--upsets', '--vectors', '--seed'):
+        if name in args:
+            i = args.index(name)
+            options[name] = args[i + 1]
+            del args[i:i + 2]
+
+    if not args or args[0] not in ('list', 'campaign', 'export'):
+        print("Usage: python voter_model.py list")
+        print("   or: python voter_model.py campaign <voter|all> [--mode seu|mbu|mlu|random] [--upsets K]")
+        print("                                      [--vectors N] [--seed S] [--monitor] [--json]")
+        print("   or: python voter_model.py export <voter> <out_dir> [--mode M] [--vectors N] [--seed S]")
+        sys.exit(1)
+
+    if args[0] == 'list':
+        for name, spec in VOTERS.items():
+            fields = ", ".join(f"{f.name}[{f.width}]" for f in spec.fields)
+            print(f"  {name:<20} {spec.hdl:<30} {fields}")
+        return
+
+    mode = options.get('--mode', 'seu')
+    if mode not in MODES:
+        print(f"ERROR: --mode must be one of {', '.join(MODES)}")
+        sys.exit(1)
+    upsets = int(options.get('--upsets', 2 if mode in ('mbu', 'random') else 1))
+    seed = int(options.get('--seed', 1))
+    names = list(VOTERS) if len(args) > 1 and args[1] == 'all' else args[1:2]
+    unknown = [n for n in names if n not in VOTERS]
+    if not names or unknown:
+        print(f"ERROR: unknown voter {', '.join(unknown) or '(none given)'}; see 'list'")
+        sys.exit(1)
+
+    if args[0] == 'export':
+        if len(args) < 3:
+            print("ERROR: export needs <voter> <out_dir>")
+            sys.exit(1)
+        paths = export_stimulus(names[0], Path(args[2]), int(options.get('--vectors', 1000)), mode, upsets, seed)
+        for path in paths:
+            print(f"Wrote {path}")
+        return
+
+    vectors = int(options.get('--vectors', 1_000_000))
+    results = [run_campaign(n, mode, vectors, upsets, seed, flags['--monitor']) for n in names]
+    if flags['--json']:
+        print(json.dumps([result_to_dict(r) for r in results], indent=2))
+        return
+
+    print("=" * 70)
+    print("TMR VOTER FAULT-INJECTION CAMPAIGN")
+    print("=" * 70)
+    for r in results:
+        print_result(r)
+    print("=" * 70)
+    sys.exit(1 if any(r.silent for r in results) and mode == "seu" else 0)
+
+
+if __name__ == '__main__':
+    main()